@@ -30,6 +30,7 @@ from st2common.constants import action as action_constants
 from st2common.constants import pack as pack_constants
 from st2common.constants import keyvalue as kv_constants
 from st2common.content.loader import MetaLoader
+from st2common.content.loader import get_metadata_cache
 from st2common.exceptions import action as action_exc
 from st2common.exceptions import actionrunner as runner_exc
 from st2common.exceptions import db as db_exc
@@ -41,6 +42,7 @@ from st2common.persistence.execution import ActionExecution
 from st2common.persistence.liveaction import LiveAction
 from st2common.services import action as action_service
 from st2common.services import keyvalues as kv_service
+from st2common.services import liveaction_watcher
 from st2common.util import action_db as action_db_util
 from st2common.util import isotime
 from st2common.util import date as date_utils
@@ -66,6 +68,10 @@ JINJA_START_MARKERS = [
 ]
 PUBLISHED_VARS_KEY = 'published'
 
+# How often (in seconds) to check the child execution status in the database when waiting for
+# status change events from the liveaction watcher. This is only a fallback for missed events.
+WATCHER_POLL_INTERVAL = 30.0
+
 
 class ChainHolder(object):
 
@@ -244,7 +250,7 @@ class ActionChainRunner(ActionRunner):
     def __init__(self, runner_id):
         super(ActionChainRunner, self).__init__(runner_id=runner_id)
         self.chain_holder = None
-        self._meta_loader = MetaLoader()
+        self._meta_loader = MetaLoader(cache=get_metadata_cache())
         self._skip_notify_tasks = []
         self._display_published = True
         self._chain_notify = None
@@ -741,12 +747,11 @@ class ActionChainRunner(ActionRunner):
             LOG.exception('Failed to schedule liveaction.')
             raise e
 
-        while (wait_for_completion and liveaction.status not in (
-                action_constants.LIVEACTION_COMPLETED_STATES +
-                [action_constants.LIVEACTION_STATUS_PAUSED,
-                 action_constants.LIVEACTION_STATUS_PENDING])):
-            eventlet.sleep(sleep_delay)
-            liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
+        if wait_for_completion:
+            statuses = (action_constants.LIVEACTION_COMPLETED_STATES +
+                        [action_constants.LIVEACTION_STATUS_PAUSED,
+                         action_constants.LIVEACTION_STATUS_PENDING])
+            liveaction = self._wait_for_status(liveaction, statuses, sleep_delay=sleep_delay)
 
         return liveaction
 
@@ -763,12 +768,38 @@ class ActionChainRunner(ActionRunner):
             LOG.exception('Failed to schedule liveaction.')
             raise e
 
-        while (wait_for_completion and liveaction.status not in (
-                action_constants.LIVEACTION_COMPLETED_STATES +
-                [action_constants.LIVEACTION_STATUS_PAUSED])):
-            eventlet.sleep(sleep_delay)
+        if wait_for_completion:
+            statuses = (action_constants.LIVEACTION_COMPLETED_STATES +
+                        [action_constants.LIVEACTION_STATUS_PAUSED])
+            liveaction = self._wait_for_status(liveaction, statuses, sleep_delay=sleep_delay)
+
+        return liveaction
+
+    def _wait_for_status(self, liveaction, statuses, sleep_delay=1.0):
+        """
+        Wait until the liveaction reaches one of the provided statuses.
+
+        If the liveaction watcher is running in this process, status change events are used and
+        the database is only polled every WATCHER_POLL_INTERVAL seconds as a fallback in case an
+        event is missed. Otherwise the database is polled every "sleep_delay" seconds.
+        """
+        watcher = liveaction_watcher.get_watcher()
+
+        if not watcher:
+            while liveaction.status not in statuses:
+                eventlet.sleep(sleep_delay)
+                liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
+
+            return liveaction
+
+        with watcher.subscribe(liveaction.id) as subscription:
+            # Status could have changed before the subscription was created
             liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
 
+            while liveaction.status not in statuses:
+                subscription.wait(timeout=WATCHER_POLL_INTERVAL)
+                liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
+
         return liveaction
 
     def _build_liveaction_object(self, action_node, resolved_params, parent_context):
@@ -15,6 +15,7 @@
 
 from __future__ import absolute_import
 
+import eventlet
 import six
 import mock
 
@@ -32,6 +33,7 @@ from st2common.models.system.common import ResourceReference
 from st2common.persistence.keyvalue import KeyValuePair
 from st2common.persistence.runner import RunnerType
 from st2common.services import action as action_service
+from st2common.services import liveaction_watcher
 from st2common.util import action_db as action_db_util
 from st2common.exceptions.action import ParameterRenderingFailedException
 from st2tests import ExecutionDbTestCase
@@ -316,6 +318,37 @@ class TestActionChainRunner(ExecutionDbTestCase):
         # based on the chain the callcount is known to be 3. Not great but works.
         self.assertEqual(request.call_count, 3)
 
+    @mock.patch('eventlet.sleep', mock.MagicMock())
+    @mock.patch.object(action_db_util, 'get_liveaction_by_id', mock.MagicMock(
+        side_effect=[DummyActionExecution(status=LIVEACTION_STATUS_RUNNING),
+                     DummyActionExecution()] * 3))
+    @mock.patch.object(action_db_util, 'get_action_by_ref',
+                       mock.MagicMock(return_value=ACTION_1))
+    @mock.patch.object(action_service, 'request',
+                       return_value=(DummyActionExecution(status=LIVEACTION_STATUS_RUNNING), None))
+    def test_chain_runner_success_path_with_wait_for_watcher_event(self, request):
+        watcher = mock.MagicMock()
+        subscription = watcher.subscribe.return_value.__enter__.return_value
+
+        with mock.patch.object(liveaction_watcher, 'get_watcher',
+                               mock.MagicMock(return_value=watcher)):
+            chain_runner = acr.get_runner()
+            chain_runner.entry_point = CHAIN_1_PATH
+            chain_runner.action = ACTION_1
+            action_ref = ResourceReference.to_string_reference(name=ACTION_1.name,
+                                                               pack=ACTION_1.pack)
+            chain_runner.liveaction = LiveActionDB(action=action_ref)
+            chain_runner.pre_run()
+            chain_runner.run({})
+
+        self.assertEqual(request.call_count, 3)
+
+        # Runner waits for the status change event once per task instead of polling
+        self.assertEqual(watcher.subscribe.call_count, 3)
+        self.assertEqual(subscription.wait.call_args_list,
+                         [mock.call(timeout=acr.WATCHER_POLL_INTERVAL)] * 3)
+        self.assertFalse(eventlet.sleep.called)
+
     @mock.patch.object(action_db_util, 'get_action_by_ref',
                        mock.MagicMock(return_value=ACTION_1))
     @mock.patch.object(action_service, 'request',
@@ -30,6 +30,7 @@ from st2common import log as logging
 from st2common.constants.action import LIVEACTION_STATUS_SUCCEEDED
 from st2common.constants.action import LIVEACTION_STATUS_FAILED
 from st2common.constants.action import LIVEACTION_STATUS_TIMED_OUT
+from http_runner.session_pool import get_session_pool
 import six
 from six.moves import range
 
@@ -67,6 +68,9 @@ FILE_NAME = 'file_name'
 FILE_CONTENT = 'file_content'
 FILE_CONTENT_TYPE = 'file_content_type'
 
+# Size of the chunks in which response body is read when max response size is specified
+RESPONSE_BODY_CHUNK_SIZE = 64 * 1024
+
 RESPONSE_BODY_PARSE_FUNCTIONS = {
     'application/json': json.loads
 }
@@ -144,11 +148,18 @@ class HttpRunner(ActionRunner):
         if self._https_proxy:
             proxies['https'] = self._https_proxy
 
+        if cfg.CONF.http_runner.use_session_pool:
+            session_pool = get_session_pool()
+        else:
+            session_pool = None
+
         return HTTPClient(url=self._url, method=method, body=body, params=params,
                           headers=headers, cookies=self._cookies, auth=auth,
                           timeout=timeout, allow_redirects=self._allow_redirects,
                           proxies=proxies, files=files, verify=self._verify_ssl_cert,
-                          username=self._username, password=self._password)
+                          username=self._username, password=self._password,
+                          session_pool=session_pool,
+                          max_response_size=cfg.CONF.http_runner.max_response_size)
 
     @staticmethod
     def _get_result_status(status_code):
@@ -159,7 +170,16 @@ class HttpRunner(ActionRunner):
 class HTTPClient(object):
     def __init__(self, url=None, method=None, body='', params=None, headers=None, cookies=None,
                  auth=None, timeout=60, allow_redirects=False, proxies=None,
-                 files=None, verify=False, username=None, password=None):
+                 files=None, verify=False, username=None, password=None, session_pool=None,
+                 max_response_size=0):
+        """
+        :param session_pool: Optional pool of sessions which are re-used across the requests.
+        :type session_pool: :class:`http_runner.session_pool.HTTPSessionPool`
+
+        :param max_response_size: Max size (in bytes) of the response body which is read. Body
+                                  is truncated once the limit is reached. 0 means no limit.
+        :type max_response_size: ``int``
+        """
         if url is None:
             raise Exception('URL must be specified.')
 
@@ -189,6 +209,8 @@ class HTTPClient(object):
         self.verify = verify
         self.username = username
         self.password = password
+        self.session_pool = session_pool
+        self.max_response_size = max_response_size
 
     def run(self):
         results = {}
@@ -211,7 +233,19 @@ class HTTPClient(object):
             if self.username or self.password:
                 self.auth = HTTPBasicAuth(self.username, self.password)
 
-            resp = requests.request(
+            kwargs = {}
+
+            if self.max_response_size > 0:
+                kwargs['stream'] = True
+
+            if self.session_pool:
+                session = self.session_pool.get_session(url=self.url, verify=self.verify,
+                                                        proxies=self.proxies)
+                request_func = session.request
+            else:
+                request_func = requests.request
+
+            resp = request_func(
                 self.method,
                 self.url,
                 params=self.params,
@@ -223,11 +257,23 @@ class HTTPClient(object):
                 allow_redirects=self.allow_redirects,
                 proxies=self.proxies,
                 files=self.files,
-                verify=self.verify
+                verify=self.verify,
+                **kwargs
             )
 
             headers = dict(resp.headers)
-            body, parsed = self._parse_response_body(headers=headers, body=resp.text)
+
+            if self.max_response_size > 0:
+                body, truncated = self._read_response_body(resp=resp)
+            else:
+                body, truncated = resp.text, False
+
+            if truncated:
+                # Truncated body can't be parsed
+                parsed = False
+                results['truncated'] = True
+            else:
+                body, parsed = self._parse_response_body(headers=headers, body=body)
 
             results['status_code'] = resp.status_code
             results['body'] = body
@@ -241,6 +287,30 @@ class HTTPClient(object):
             if resp:
                 resp.close()
 
+    def _read_response_body(self, resp):
+        """
+        Read response body in chunks up to max_response_size bytes.
+
+        :return: (body, flag which indicates if body has been truncated)
+        :rtype: (``str``, ``bool``)
+        """
+        chunks = []
+        size = 0
+        truncated = False
+
+        for chunk in resp.iter_content(chunk_size=RESPONSE_BODY_CHUNK_SIZE):
+            if size + len(chunk) > self.max_response_size:
+                chunks.append(chunk[:self.max_response_size - size])
+                truncated = True
+                break
+
+            chunks.append(chunk)
+            size += len(chunk)
+
+        body = six.binary_type().join(chunks)
+        body = body.decode(resp.encoding or 'utf-8', 'replace')
+        return (body, truncated)
+
     def _parse_response_body(self, headers, body):
         """
         :param body: Response body.
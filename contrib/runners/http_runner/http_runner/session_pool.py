@@ -0,0 +1,262 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Process wide pool of requests sessions which are re-used across HTTP runner executions so
+connections (and TLS sessions) to the same hosts are kept alive between executions.
+
+Sessions are keyed by (scheme, host, verify, proxies). Sessions never store cookies which are set
+by the remote server so no state leaks between executions which share a session.
+
+Once all the connections to a host are in use, requests wait for a free connection for at most
+the request (connect) timeout.
+"""
+
+from __future__ import absolute_import
+
+import collections
+
+import requests
+import six
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.connectionpool import HTTPConnectionPool
+from requests.packages.urllib3.connectionpool import HTTPSConnectionPool
+from requests.packages.urllib3.util.timeout import Timeout
+from six.moves import http_cookiejar
+from six.moves.urllib.parse import urlparse
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.metrics.collectors import register_collector
+
+__all__ = [
+    'HTTPSessionPool',
+    'PoolTimeoutHTTPAdapter',
+
+    'get_session_pool'
+]
+
+LOG = logging.getLogger(__name__)
+
+_POOL = None
+
+
+def _get_pool_timeout(timeout):
+    """
+    Return how long to wait for a free connection for a request with the provided timeout.
+    """
+    if isinstance(timeout, Timeout):
+        timeout = timeout.connect_timeout
+
+    if isinstance(timeout, six.integer_types + (float,)) and not isinstance(timeout, bool):
+        return timeout
+
+    return None
+
+
+class _PoolTimeoutMixin(object):
+    # NOTE: requests doesn't pass pool_timeout to urlopen so without it a request would wait for a
+    # free connection of a blocking pool forever (action timeout doesn't apply to that wait)
+    def urlopen(self, method, url, *args, **kwargs):
+        if kwargs.get('pool_timeout', None) is None:
+            kwargs['pool_timeout'] = _get_pool_timeout(kwargs.get('timeout', None))
+
+        return super(_PoolTimeoutMixin, self).urlopen(method, url, *args, **kwargs)
+
+
+class _PoolTimeoutHTTPConnectionPool(_PoolTimeoutMixin, HTTPConnectionPool):
+    pass
+
+
+class _PoolTimeoutHTTPSConnectionPool(_PoolTimeoutMixin, HTTPSConnectionPool):
+    pass
+
+
+_POOL_CLASSES_BY_SCHEME = {
+    'http': _PoolTimeoutHTTPConnectionPool,
+    'https': _PoolTimeoutHTTPSConnectionPool
+}
+
+
+class PoolTimeoutHTTPAdapter(HTTPAdapter):
+    """
+    Adapter which waits for a free connection of a blocking pool for at most the request timeout.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(PoolTimeoutHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _POOL_CLASSES_BY_SCHEME
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super(PoolTimeoutHTTPAdapter, self).proxy_manager_for(proxy, **proxy_kwargs)
+        manager.pool_classes_by_scheme = _POOL_CLASSES_BY_SCHEME
+        return manager
+
+
+class HTTPSessionPool(object):
+    def __init__(self, max_sessions=100, max_connections_per_host=10):
+        """
+        :param max_sessions: Maximum number of sessions kept in the pool. Least recently used
+                             session is closed once the limit is reached.
+        :type max_sessions: ``int``
+
+        :param max_connections_per_host: Maximum number of connections to a single host. Requests
+                                         wait for a free connection (for at most the request
+                                         timeout) once the limit is reached.
+        :type max_connections_per_host: ``int``
+        """
+        self._max_sessions = max_sessions
+        self._max_connections_per_host = max_connections_per_host
+
+        self._sessions = collections.OrderedDict()
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+        # Connection stats of the sessions which have already been closed
+        self._closed_connections = 0
+        self._closed_requests = 0
+
+    def get_session(self, url, verify=True, proxies=None):
+        """
+        Return session which should be used for a request to the provided URL.
+
+        :rtype: :class:`requests.Session`
+        """
+        key = self._get_key(url=url, verify=verify, proxies=proxies)
+
+        session = self._sessions.pop(key, None)
+
+        if session:
+            self._stats['hits'] += 1
+        else:
+            self._stats['misses'] += 1
+            session = self._create_session()
+
+        # Mark session as recently used
+        self._sessions[key] = session
+
+        while len(self._sessions) > max(self._max_sessions, 1):
+            _, evicted_session = self._sessions.popitem(last=False)
+            self._stats['evictions'] += 1
+            self._close_session(evicted_session)
+
+        return session
+
+    def close_all(self):
+        while self._sessions:
+            _, session = self._sessions.popitem()
+            self._close_session(session)
+
+    def get_stats(self):
+        """
+        Return pool usage statistics. Connection reuse rate is the ratio of requests which were
+        sent over an already established connection.
+
+        :rtype: ``dict``
+        """
+        connections = self._closed_connections
+        requests_count = self._closed_requests
+
+        for session in six.itervalues(self._sessions):
+            session_connections, session_requests = self._get_connection_stats(session)
+            connections += session_connections
+            requests_count += session_requests
+
+        result = dict(self._stats)
+        result['sessions'] = len(self._sessions)
+        result['connections'] = connections
+        result['requests'] = requests_count
+
+        if requests_count:
+            result['connection_reuse_rate'] = 1.0 - (float(connections) / requests_count)
+        else:
+            result['connection_reuse_rate'] = 0.0
+
+        return result
+
+    def get_metrics(self):
+        """
+        Return pool statistics as gauges (see st2common.metrics.collectors).
+        """
+        return dict([('http_runner.session_pool.%s' % (name), value) for name, value in
+                     six.iteritems(self.get_stats())])
+
+    def _get_key(self, url, verify, proxies):
+        parsed = urlparse(url)
+        proxies = tuple(sorted(six.iteritems(proxies or {})))
+        return (parsed.scheme, parsed.netloc, verify, proxies)
+
+    def _create_session(self):
+        session = requests.Session()
+
+        # Cookies set by the server are never stored in the shared session, cookies which are
+        # passed to the request are still sent
+        session.cookies.set_policy(http_cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+        adapter = PoolTimeoutHTTPAdapter(pool_connections=1,
+                                         pool_maxsize=self._max_connections_per_host,
+                                         pool_block=True)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
+    def _close_session(self, session):
+        connections, requests_count = self._get_connection_stats(session)
+        self._closed_connections += connections
+        self._closed_requests += requests_count
+
+        try:
+            session.close()
+        except Exception:
+            LOG.debug('Failed to close HTTP session', exc_info=True)
+
+    def _get_connection_stats(self, session):
+        connections = 0
+        requests_count = 0
+
+        for adapter in set(session.adapters.values()):
+            pools = getattr(getattr(adapter, 'poolmanager', None), 'pools', None)
+
+            if not pools:
+                continue
+
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key, None)
+                connections += getattr(pool, 'num_connections', 0)
+                requests_count += getattr(pool, 'num_requests', 0)
+
+        return connections, requests_count
+
+
+def get_session_pool():
+    """
+    Return HTTP session pool for this process.
+
+    :rtype: :class:`HTTPSessionPool`
+    """
+    global _POOL
+
+    if not _POOL:
+        _POOL = HTTPSessionPool(
+            max_sessions=cfg.CONF.http_runner.session_pool_max_sessions,
+            max_connections_per_host=cfg.CONF.http_runner.session_pool_max_connections_per_host)
+        register_collector(_POOL.get_metrics)
+
+    return _POOL
@@ -147,3 +147,49 @@ class HTTPRunnerTestCase(unittest2.TestCase):
             'GET', url, allow_redirects=False, auth=client.auth, cookies=None,
             data='', files=None, headers={}, params=None, proxies=None,
             timeout=60, verify=False)
+
+    @mock.patch('http_runner.http_runner.requests')
+    def test_max_response_size(self, mock_requests):
+        client = HTTPClient(url='http://127.0.0.1', max_response_size=10)
+        mock_result = MockResult()
+
+        mock_result.iter_content = mock.Mock(return_value=[b'{"test1": ', b'"val1"}'])
+        mock_result.encoding = 'utf-8'
+        mock_result.headers = {'Content-Type': 'application/json'}
+        mock_result.status_code = 200
+
+        mock_requests.request.return_value = mock_result
+        result = client.run()
+
+        self.assertEqual(result['body'], '{"test1": ')
+        self.assertFalse(result['parsed'])
+        self.assertTrue(result['truncated'])
+        self.assertTrue(mock_requests.request.call_args[1]['stream'])
+
+        # Body under the limit is parsed
+        client = HTTPClient(url='http://127.0.0.1', max_response_size=100)
+        result = client.run()
+
+        self.assertEqual(result['body'], {'test1': 'val1'})
+        self.assertFalse('truncated' in result)
+
+    def test_session_pool(self):
+        session_pool = mock.Mock()
+        session = session_pool.get_session.return_value
+
+        mock_result = MockResult()
+        mock_result.text = 'foo bar ponies'
+        mock_result.headers = {'Content-Type': 'text/html'}
+        mock_result.status_code = 200
+        session.request.return_value = mock_result
+
+        url = 'https://127.0.0.1:8888'
+        client = HTTPClient(url=url, verify=True, session_pool=session_pool)
+        result = client.run()
+
+        self.assertEqual(result['body'], 'foo bar ponies')
+        session_pool.get_session.assert_called_once_with(url=url, verify=True, proxies=None)
+        session.request.assert_called_once_with(
+            'GET', url, allow_redirects=False, auth=None, cookies=None,
+            data='', files=None, headers={}, params=None, proxies=None,
+            timeout=60, verify=True)
@@ -0,0 +1,113 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import time
+import socket
+import threading
+
+import mock
+import unittest2
+from requests.cookies import create_cookie
+from requests.packages.urllib3.exceptions import EmptyPoolError
+
+from http_runner.session_pool import HTTPSessionPool
+import st2tests.config as tests_config
+
+
+class HTTPSessionPoolTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        tests_config.parse_args()
+
+    def test_sessions_are_reused(self):
+        pool = HTTPSessionPool(max_sessions=2)
+
+        session1 = pool.get_session(url='https://127.0.0.1:8888/foo', verify=True)
+        session2 = pool.get_session(url='https://127.0.0.1:8888/bar', verify=True)
+        self.assertEqual(session1, session2)
+
+        # Different scheme, host, verify or proxies, different session
+        self.assertNotEqual(session1, pool.get_session(url='http://127.0.0.1:8888', verify=True))
+        self.assertNotEqual(session1, pool.get_session(url='https://127.0.0.1', verify=True))
+        self.assertNotEqual(session1, pool.get_session(url='https://127.0.0.1:8888/',
+                                                       verify=False))
+        self.assertNotEqual(session1, pool.get_session(url='https://127.0.0.1:8888/', verify=True,
+                                                       proxies={'https': 'http://proxy'}))
+
+        stats = pool.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 5)
+        self.assertEqual(stats['evictions'], 3)
+        self.assertEqual(stats['sessions'], 2)
+
+        pool.close_all()
+        self.assertEqual(pool.get_stats()['sessions'], 0)
+
+    def test_session_doesnt_store_cookies(self):
+        pool = HTTPSessionPool()
+        session = pool.get_session(url='https://127.0.0.1:8888', verify=True)
+
+        request = mock.Mock()
+        request.unverifiable = False
+        request.get_full_url.return_value = 'https://127.0.0.1:8888'
+        request.get_host.return_value = '127.0.0.1'
+
+        cookie = create_cookie(name='session', value='secret', domain='127.0.0.1')
+        self.assertFalse(session.cookies._policy.set_ok(cookie, request))
+
+    def test_connection_reuse_rate(self):
+        pool = HTTPSessionPool()
+        session = pool.get_session(url='https://127.0.0.1:8888', verify=True)
+
+        pools = session.adapters['https://'].poolmanager.pools
+        pools[('https', '127.0.0.1', 8888)] = mock.Mock(num_connections=1, num_requests=4)
+
+        stats = pool.get_stats()
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(stats['requests'], 4)
+        self.assertEqual(stats['connection_reuse_rate'], 0.75)
+        self.assertEqual(pool.get_metrics()['http_runner.session_pool.connection_reuse_rate'],
+                         0.75)
+
+    def test_request_doesnt_wait_for_free_connection_longer_than_timeout(self):
+        # Server which accepts connections but never responds
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        url = 'http://127.0.0.1:%s/' % (server.getsockname()[1])
+
+        pool = HTTPSessionPool(max_connections_per_host=1)
+        session = pool.get_session(url=url, verify=True)
+
+        # The only connection to the host is used by a request which waits for the response
+        thread = threading.Thread(target=self._send_request, args=(session, url, 10))
+        thread.start()
+        time.sleep(0.5)
+
+        start = time.time()
+        self.assertRaises(EmptyPoolError, session.get, url, timeout=0.2)
+        self.assertTrue(time.time() - start < 5)
+
+        server.close()
+        thread.join()
+        pool.close_all()
+
+    def _send_request(self, session, url, timeout):
+        try:
+            session.get(url, timeout=timeout)
+        except Exception:
+            pass
@@ -19,6 +19,8 @@ import os
 import re
 import abc
 import pwd
+import stat
+import shlex
 import functools
 
 import six
@@ -35,6 +37,8 @@ from st2common.runners.base import ShellRunnerMixin
 from st2common.util.misc import strip_shell_chars
 from st2common.util.green import shell
 from st2common.util.shell import kill_process
+from st2common.util.shell import split_simple_command
+from st2common.util.shell import is_directly_executable
 from st2common.util import jsonify
 from st2common.services.action import store_execution_output_data
 from st2common.runners.utils import make_read_and_store_stream_func
@@ -42,7 +46,9 @@ from st2common.runners.utils import make_read_and_store_stream_func
 __all__ = [
     'BaseLocalShellRunner',
 
-    'RUNNER_COMMAND'
+    'RUNNER_COMMAND',
+
+    'get_base_env'
 ]
 
 LOG = logging.getLogger(__name__)
@@ -60,6 +66,12 @@ RUNNER_ENV = 'env'
 RUNNER_KWARG_OP = 'kwarg_op'
 RUNNER_TIMEOUT = 'timeout'
 
+# Buffer size of the process stdout and stderr pipes
+PIPE_BUFFER_SIZE = 64 * 1024
+
+# Environment of the action runner process, computed once per process
+_BASE_ENV = None
+
 PROC_EXIT_CODE_TO_LIVEACTION_STATUS_MAP = {
     str(exit_code_constants.SUCCESS_EXIT_CODE): action_constants.LIVEACTION_STATUS_SUCCEEDED,
     str(exit_code_constants.FAILURE_EXIT_CODE): action_constants.LIVEACTION_STATUS_FAILED,
@@ -113,7 +125,7 @@ class BaseLocalShellRunner(ActionRunner, ShellRunnerMixin):
             args = 'chmod +x %s ; %s' % (script_local_path_abs, args)
             sanitized_args = 'chmod +x %s ; %s' % (script_local_path_abs, sanitized_args)
 
-        env = os.environ.copy()
+        env = get_base_env()
 
         # Include user provided env vars (if any)
         env.update(env_vars)
@@ -122,6 +134,14 @@ class BaseLocalShellRunner(ActionRunner, ShellRunnerMixin):
         st2_env_vars = self._get_common_action_env_variables()
         env.update(st2_env_vars)
 
+        # Commands which don't need sudo or any shell features are executed directly
+        direct_exec_args = self._get_direct_exec_args(action=action, script_action=script_action,
+                                                      env=env)
+
+        if direct_exec_args:
+            args = direct_exec_args
+            sanitized_args = action.get_sanitized_full_command_string()
+
         LOG.info('Executing action via LocalRunner: %s', self.runner_id)
         LOG.info('[Action info] name: %s, Id: %s, command: %s, user: %s, sudo: %s' %
                  (action.name, action.action_exec_id, sanitized_args, action.user, action.sudo))
@@ -150,7 +170,7 @@ class BaseLocalShellRunner(ActionRunner, ShellRunnerMixin):
         else:
             stdin = None
 
-        # Make sure os.setsid is called on each spawned process so that all processes
+        # Make sure each spawned process is started in a new session so that all processes
         # are in the same group.
 
         # Process is started as sudo -u {{system_user}} -- bash -c {{command}}. Introduction of the
@@ -163,16 +183,17 @@ class BaseLocalShellRunner(ActionRunner, ShellRunnerMixin):
                                                                  stdin=stdin,
                                                                  stdout=subprocess.PIPE,
                                                                  stderr=subprocess.PIPE,
-                                                                 shell=True,
+                                                                 shell=not direct_exec_args,
                                                                  cwd=self._cwd,
                                                                  env=env,
                                                                  timeout=self._timeout,
-                                                                 preexec_func=os.setsid,
+                                                                 start_new_session=True,
                                                                  kill_func=kill_process,
                                                            read_stdout_func=read_and_store_stdout,
                                                            read_stderr_func=read_and_store_stderr,
                                                            read_stdout_buffer=stdout,
-                                                           read_stderr_buffer=stderr)
+                                                           read_stderr_buffer=stderr,
+                                                           bufsize=PIPE_BUFFER_SIZE)
 
         error = None
 
@@ -213,3 +234,53 @@ class BaseLocalShellRunner(ActionRunner, ShellRunnerMixin):
         )
 
         return (status, jsonify.json_loads(result, BaseLocalShellRunner.KEYS_TO_TRANSFORM), None)
+
+    def _get_direct_exec_args(self, action, script_action, env):
+        """
+        Return list of arguments if the action can be executed directly without a shell (and sudo)
+        or None if it needs to be executed through a shell.
+
+        :rtype: ``list``
+        """
+        if not cfg.CONF.local_runner.direct_exec:
+            return None
+
+        if action.sudo or action.sudo_password:
+            return None
+
+        if action.user and action.user != LOGGED_USER_USERNAME:
+            return None
+
+        if not script_action:
+            return split_simple_command(action.get_full_command_string(), env=env)
+
+        script_path = self.entry_point
+
+        if not os.access(script_path, os.X_OK):
+            # Same as "chmod +x" which is used when the script is executed through a shell
+            try:
+                mode = os.stat(script_path).st_mode
+                os.chmod(script_path, mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+            except OSError:
+                return None
+
+        if not is_directly_executable(script_path):
+            return None
+
+        # Script path and arguments are already quoted
+        return shlex.split(action.get_full_command_string())
+
+
+def get_base_env():
+    """
+    Return a copy of the action runner process environment which is used as a base for the
+    action environment.
+
+    :rtype: ``dict``
+    """
+    global _BASE_ENV
+
+    if _BASE_ENV is None:
+        _BASE_ENV = os.environ.copy()
+
+    return dict(_BASE_ENV)
@@ -91,6 +91,47 @@ class LocalShellCommandRunnerTestCase(RunnerTestCase, CleanDbTestCase):
         self.assertEqual(output_dbs[0].output_type, 'stdout')
         self.assertEqual(output_dbs[0].data, '10\n')
 
+    def test_direct_exec(self):
+        models = self.fixtures_loader.load_models(
+            fixtures_pack='generic', fixtures_dict={'actions': ['local.yaml']})
+        action_db = models['actions']['local.yaml']
+
+        cfg.CONF.set_override(name='direct_exec', group='local_runner', override=True)
+        cfg.CONF.set_override(name='user', group='system_user',
+                              override=local_runner.LOGGED_USER_USERNAME)
+
+        try:
+            with mock.patch.object(shell, 'run_command',
+                                   mock.Mock(wraps=shell.run_command)) as mock_run_command:
+                # Simple command is executed without a shell
+                runner = self._get_runner(action_db, cmd='uname -s')
+                runner.pre_run()
+                status, result, _ = runner.run({})
+                runner.post_run(status, result)
+
+                self.assertEquals(status, action_constants.LIVEACTION_STATUS_SUCCEEDED)
+                self.assertEquals(result['stdout'], os.uname()[0])
+
+                call_kwargs = mock_run_command.call_args[1]
+                self.assertEqual(call_kwargs['cmd'], ['uname', '-s'])
+                self.assertFalse(call_kwargs['shell'])
+
+                # Command which uses shell features is still executed through a shell
+                runner = self._get_runner(action_db, cmd='echo 10 | cat')
+                runner.pre_run()
+                status, result, _ = runner.run({})
+                runner.post_run(status, result)
+
+                self.assertEquals(status, action_constants.LIVEACTION_STATUS_SUCCEEDED)
+                self.assertEquals(result['stdout'], 10)
+
+                call_kwargs = mock_run_command.call_args[1]
+                self.assertEqual(call_kwargs['cmd'], 'echo 10 | cat')
+                self.assertTrue(call_kwargs['shell'])
+        finally:
+            cfg.CONF.clear_override(name='direct_exec', group='local_runner')
+            cfg.CONF.clear_override(name='user', group='system_user')
+
     def test_timeout(self):
         models = self.fixtures_loader.load_models(
             fixtures_pack='generic', fixtures_dict={'actions': ['local.yaml']})
@@ -596,6 +637,35 @@ class LocalShellScriptRunnerTestCase(RunnerTestCase, CleanDbTestCase):
         self.assertEquals(status, action_constants.LIVEACTION_STATUS_SUCCEEDED)
         self.assertEquals(len(result['stdout']), 1000)
 
+    def test_shell_script_action_direct_exec(self):
+        models = self.fixtures_loader.load_models(
+            fixtures_pack='localrunner_pack', fixtures_dict={'actions': ['text_gen.yml']})
+        action_db = models['actions']['text_gen.yml']
+        entry_point = self.fixtures_loader.get_fixture_file_path_abs(
+            'localrunner_pack', 'actions', 'text_gen.py')
+
+        cfg.CONF.set_override(name='direct_exec', group='local_runner', override=True)
+        cfg.CONF.set_override(name='user', group='system_user',
+                              override=local_runner.LOGGED_USER_USERNAME)
+
+        try:
+            with mock.patch.object(shell, 'run_command',
+                                   mock.Mock(wraps=shell.run_command)) as mock_run_command:
+                runner = self._get_runner(action_db, entry_point=entry_point)
+                runner.pre_run()
+                status, result, _ = runner.run({'chars': 1000})
+                runner.post_run(status, result)
+
+                self.assertEquals(status, action_constants.LIVEACTION_STATUS_SUCCEEDED)
+                self.assertEquals(len(result['stdout']), 1000)
+
+                call_kwargs = mock_run_command.call_args[1]
+                self.assertEqual(call_kwargs['cmd'], [entry_point, '--chars=1000'])
+                self.assertFalse(call_kwargs['shell'])
+        finally:
+            cfg.CONF.clear_override(name='direct_exec', group='local_runner')
+            cfg.CONF.clear_override(name='user', group='system_user')
+
     def test_large_stdout(self):
         models = self.fixtures_loader.load_models(
             fixtures_pack='localrunner_pack', fixtures_dict={'actions': ['text_gen.yml']})
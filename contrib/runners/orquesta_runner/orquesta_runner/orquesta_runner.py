@@ -22,9 +22,11 @@ from oslo_config import cfg
 
 from orquesta import exceptions as wf_exc
 from orquesta import statuses as wf_statuses
+from orquesta.specs import loader as specs_loader
 
 from st2common.constants import action as ac_const
 from st2common import log as logging
+from st2common.content.loader import get_metadata_cache
 from st2common.models.api import notification as notify_api_models
 from st2common.persistence import execution as ex_db_access
 from st2common.persistence import liveaction as lv_db_access
@@ -51,6 +53,25 @@ class OrquestaRunner(runners.AsyncActionRunner):
         with open(entry_point, 'r') as def_file:
             return def_file.read()
 
+    @staticmethod
+    def load_workflow_definition(entry_point):
+        """
+        Return workflow definition for the provided entry point. Parsed workflow definitions (and
+        optionally compiled workflow specs) are cached so the same definition is not parsed again
+        on each run.
+        """
+        cache = get_metadata_cache()
+
+        if not cache:
+            return OrquestaRunner.get_workflow_definition(entry_point)
+
+        if cfg.CONF.content.cache_workflow_specs:
+            spec_module = specs_loader.get_spec_module('native')
+            return cache.load_compiled(file_path=entry_point, name='orquesta.native',
+                                       compile_func=spec_module.instantiate)
+
+        return cache.load(file_path=entry_point)
+
     def _get_notify_config(self):
         return (
             notify_api_models.NotificationsHelper.from_model(notify_model=self.liveaction.notify)
@@ -83,10 +104,10 @@ class OrquestaRunner(runners.AsyncActionRunner):
         return st2_ctx
 
     def run(self, action_parameters):
-        # Read workflow definition from file.
-        wf_def = self.get_workflow_definition(self.entry_point)
-
         try:
+            # Read workflow definition from file.
+            wf_def = self.load_workflow_definition(self.entry_point)
+
             # Request workflow execution.
             st2_ctx = self._construct_st2_context()
             notify_cfg = self._get_notify_config()
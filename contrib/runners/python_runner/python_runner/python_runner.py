@@ -245,12 +245,10 @@ class PythonRunner(GitWorktreeActionRunner):
         read_and_store_stderr = make_read_and_store_stream_func(execution_db=self.execution,
             action_db=self.action, store_data_func=store_execution_stderr_line)
 
-        command_string = list2cmdline(args)
-        if stdin_params:
-            command_string = 'echo %s | %s' % (quote_unix(stdin_params), command_string)
-
-        LOG.debug('Running command: PATH=%s PYTHONPATH=%s %s' % (env['PATH'], env['PYTHONPATH'],
-                                                                 command_string))
+        # Note: Command string can be large (it includes all the action parameters) so it's only
+        # built if the debug message is emitted
+        LOG.debug('Running command: PATH=%s PYTHONPATH=%s %s', env['PATH'], env['PYTHONPATH'],
+                  logging.lazy(self._get_command_string, args=args, stdin_params=stdin_params))
         exit_code, stdout, stderr, timed_out = run_command(cmd=args,
                                                            stdin=stdin,
                                                            stdout=subprocess.PIPE,
@@ -267,6 +265,17 @@ class PythonRunner(GitWorktreeActionRunner):
         LOG.debug('Returning.')
         return self._get_output_values(exit_code, stdout, stderr, timed_out)
 
+    def _get_command_string(self, args, stdin_params=None):
+        """
+        Return a string representation of the command which is executed (used for logging).
+        """
+        command_string = list2cmdline(args)
+
+        if stdin_params:
+            command_string = 'echo %s | %s' % (quote_unix(stdin_params), command_string)
+
+        return command_string
+
     def _get_pack_common_libs_path(self, pack_ref):
         """
         Retrieve path to the pack common lib/ directory taking git work tree path into account
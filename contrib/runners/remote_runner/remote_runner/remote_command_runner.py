@@ -21,6 +21,7 @@ from oslo_config import cfg
 from st2common import log as logging
 from st2common.runners.paramiko_ssh_runner import RUNNER_COMMAND
 from st2common.runners.paramiko_ssh_runner import BaseParallelSSHRunner
+from st2common.runners.parallel_ssh_results import StreamingResults
 from st2common.runners.base import get_metadata as get_runner_metadata
 from st2common.models.system.paramiko_command_action import ParamikoRemoteCommandAction
 
@@ -43,11 +44,15 @@ class ParamikoRemoteCommandRunner(BaseParallelSSHRunner):
         LOG.debug('Executed remote_action.', extra={'_result': result})
         status = self._get_result_status(result, cfg.CONF.ssh_runner.allow_partial_failure)
 
+        if isinstance(result, StreamingResults):
+            result = result.get_result()
+
         return (status, result, None)
 
     def _run(self, remote_action):
         command = remote_action.get_full_command_string()
-        return self._parallel_ssh_client.run(command, timeout=remote_action.get_timeout())
+        return self._parallel_ssh_client.run(command, timeout=remote_action.get_timeout(),
+                                             results=self._get_streaming_results())
 
     def _get_remote_action(self, action_paramaters):
         # remote script actions with entry_point don't make sense, user probably wanted to use
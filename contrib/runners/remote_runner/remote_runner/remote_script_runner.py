@@ -24,6 +24,7 @@ from oslo_config import cfg
 from st2common import log as logging
 from st2common.runners.paramiko_ssh_runner import RUNNER_REMOTE_DIR
 from st2common.runners.paramiko_ssh_runner import BaseParallelSSHRunner
+from st2common.runners.parallel_ssh_results import StreamingResults
 from st2common.runners.base import get_metadata as get_runner_metadata
 from st2common.models.system.paramiko_script_action import ParamikoRemoteScriptAction
 
@@ -46,6 +47,9 @@ class ParamikoRemoteScriptRunner(BaseParallelSSHRunner):
         LOG.debug('Executed remote action.', extra={'_result': result})
         status = self._get_result_status(result, cfg.CONF.ssh_runner.allow_partial_failure)
 
+        if isinstance(result, StreamingResults):
+            result = result.get_result()
+
         return (status, result, None)
 
     def _run(self, remote_action):
@@ -111,7 +115,8 @@ class ParamikoRemoteScriptRunner(BaseParallelSSHRunner):
     def _run_script_on_remote_host(self, remote_action):
         command = remote_action.get_full_command_string()
         LOG.info('Command to run: %s', command)
-        results = self._parallel_ssh_client.run(command, timeout=remote_action.get_timeout())
+        results = self._parallel_ssh_client.run(command, timeout=remote_action.get_timeout(),
+                                                results=self._get_streaming_results())
         LOG.debug('Results from script: %s', results)
         return results
 
@@ -8,10 +8,15 @@ import os
 import signal
 import sys
 
+from oslo_config import cfg
+
 from st2actions import config
 from st2actions import worker
+from st2actions.container import cache as dispatch_cache
 from st2common import log as logging
 from st2common.service_setup import setup as common_setup
+from st2common.runners import registry as runner_registry
+from st2common.services import liveaction_watcher
 from st2common.service_setup import teardown as common_teardown
 
 __all__ = [
@@ -40,6 +45,14 @@ def _setup():
     common_setup(service='actionrunner', config=config, setup_db=True, register_mq_exchanges=True,
                  register_signal_handlers=True, service_registry=True, capabilities=capabilities)
 
+    # Load all the runner modules upfront so the cost isn't paid by the first executions
+    runner_registry.get_registry().load_all()
+    runner_registry.start_watcher(queue_suffix='actionrunner')
+
+    # Cache actions, runner types and pack configs which are needed to dispatch the executions
+    dispatch_cache.enable_cache(size=cfg.CONF.actionrunner.dispatch_cache_size,
+                                queue_suffix='actionrunner')
+
     _setup_sigterm_handler()
 
 
@@ -49,6 +62,8 @@ def _run_worker():
     action_worker = worker.get_worker()
 
     try:
+        # Workflow runners (e.g. action chain) use the watcher to wait for child executions
+        liveaction_watcher.start_watcher(queue_suffix='actionrunner')
         action_worker.start()
         action_worker.wait()
     except (KeyboardInterrupt, SystemExit):
@@ -62,6 +77,24 @@ def _run_worker():
             LOG.exception('Unable to shutdown worker.')
             errors = True
 
+        try:
+            liveaction_watcher.stop_watcher()
+        except:
+            LOG.exception('Unable to stop liveaction watcher.')
+            errors = True
+
+        try:
+            dispatch_cache.disable_cache()
+        except:
+            LOG.exception('Unable to stop dispatch context cache watcher.')
+            errors = True
+
+        try:
+            runner_registry.stop_watcher()
+        except:
+            LOG.exception('Unable to stop runner registry watcher.')
+            errors = True
+
         if errors:
             return 1
     except:
@@ -3,6 +3,8 @@ import os
 import sys
 
 from st2common import log as logging
+from st2common.constants.runners import RUNNERS_QUERY_MODULES_NAMESPACE
+from st2common.runners import registry as runner_registry
 from st2common.service_setup import setup as common_setup
 from st2common.service_setup import teardown as common_teardown
 from st2common.util.monkey_patch import monkey_patch
@@ -27,15 +29,22 @@ def _setup():
     common_setup(service='resultstracker', config=config, setup_db=True, register_mq_exchanges=True,
                  register_signal_handlers=True, service_registry=True, capabilities=capabilities)
 
+    # Load all the query modules upfront so the cost isn't paid by the first queries
+    runner_registry.get_registry().load_all(namespaces=[RUNNERS_QUERY_MODULES_NAMESPACE])
+
 
 def _run_worker():
     LOG.info('(PID=%s) Results tracker started.', os.getpid())
     tracker = resultstracker.get_tracker()
     try:
+        # Pick up query modules of the runners which are installed while the tracker is running
+        runner_registry.start_watcher(queue_suffix='resultstracker',
+                                      reload_callback=tracker.reset_failed_imports)
         tracker.start(wait=True)
     except (KeyboardInterrupt, SystemExit):
         LOG.info('(PID=%s) Results tracker stopped.', os.getpid())
         tracker.shutdown()
+        runner_registry.stop_watcher()
     except:
         return 1
     return 0
@@ -26,11 +26,14 @@ import signal
 import sys
 import traceback
 
+from oslo_config import cfg
+
 from st2actions.workflows import config
 from st2actions.workflows import workflows
 from st2common import log as logging
 from st2common.service_setup import setup as common_setup
 from st2common.service_setup import teardown as common_teardown
+from st2common.services import workflows as wf_svc
 
 __all__ = [
     'main'
@@ -67,6 +70,9 @@ def setup():
 
     setup_sigterm_handler()
 
+    # Keep live conductors in memory between task completions of the same workflow execution
+    wf_svc.set_conductors_cache_size(cfg.CONF.workflow_engine.conductor_cache_size)
+
 
 def run_server():
     LOG.info('(PID=%s) Workflow engine started.', os.getpid())
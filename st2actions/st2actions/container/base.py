@@ -30,15 +30,15 @@ from st2common.exceptions.param import ParamException
 from st2common.models.system.action import ResolvedActionParameters
 from st2common.persistence.execution import ActionExecution
 from st2common.services import access, executions, queries
-from st2common.util.action_db import (get_action_by_ref, get_runnertype_by_name)
 from st2common.util.action_db import (update_liveaction_status, get_liveaction_by_id)
 from st2common.util import param as param_utils
-from st2common.util.config_loader import ContentPackConfigLoader
 from st2common.metrics.base import CounterWithTimer
+from st2common.metrics.base import Timer
 from st2common.util import jsonify
 
 from st2common.runners.base import get_runner
 from st2common.runners.base import AsyncActionRunner, PollingAsyncActionRunner
+from st2actions.container import cache as dispatch_cache
 
 LOG = logging.getLogger(__name__)
 
@@ -47,17 +47,22 @@ __all__ = [
     'get_runner_container'
 ]
 
+# How long (in seconds) signed execution auth token stays valid after the action timeout
+EXECUTION_TOKEN_TTL_GRACE_PERIOD = 60
+
 
 class RunnerContainer(object):
 
     def dispatch(self, liveaction_db):
-        action_db = get_action_by_ref(liveaction_db.action)
+        # Action, runner type and pack config are served from the dispatch context cache (if
+        # enabled) so they don't need to be retrieved from the database for every execution
+        action_db = dispatch_cache.get_cache().get_action(liveaction_db.action)
         if not action_db:
             raise Exception('Action %s not found in DB.' % (liveaction_db.action))
 
         liveaction_db.context['pack'] = action_db.pack
 
-        runner_type_db = get_runnertype_by_name(action_db.runner_type['name'])
+        runner_type_db = dispatch_cache.get_cache().get_runner_type(action_db.runner_type['name'])
 
         extra = {'liveaction_db': liveaction_db, 'runner_type_db': runner_type_db}
         LOG.info('Dispatching Action to a runner', extra=extra)
@@ -94,7 +99,8 @@ class RunnerContainer(object):
         runner.auth_token = self._create_auth_token(
             context=runner.context,
             action_db=runner.action,
-            liveaction_db=runner.liveaction)
+            liveaction_db=runner.liveaction,
+            runner_type_db=runner.runner_type)
 
         try:
             # Finalized parameters are resolved and then rendered. This process could
@@ -339,12 +345,12 @@ class RunnerContainer(object):
         if (runner_type_db.name == 'python-script' or
                 runner_type_db.runner_module == 'python_runner'):
             LOG.debug('Loading config from pack for python runner.')
-            config_loader = ContentPackConfigLoader(pack_name=action_db.pack, user=user)
-            config = config_loader.get_config()
+            config = dispatch_cache.get_cache().get_config(pack=action_db.pack, user=user)
 
-        runner = get_runner(
-            name=runner_type_db.name,
-            config=config)
+        with Timer(key='action.runner.get_runner'):
+            runner = get_runner(
+                name=runner_type_db.name,
+                config=config)
 
         # TODO: Pass those arguments to the constructor instead of late
         # assignment, late assignment is awful
@@ -367,7 +373,7 @@ class RunnerContainer(object):
 
         return runner
 
-    def _create_auth_token(self, context, action_db, liveaction_db):
+    def _create_auth_token(self, context, action_db, liveaction_db, runner_type_db=None):
         if not context:
             return None
 
@@ -382,10 +388,45 @@ class RunnerContainer(object):
 
         }
 
+        # Signed tokens are stateless and don't need to be stored in (and deleted from) the
+        # database. They can't be deleted when the execution finishes so they are only valid for
+        # as long as the execution can run.
+        if cfg.CONF.auth.execution_token_signing_key:
+            ttl = self._get_signed_auth_token_ttl(action_db=action_db,
+                                                  liveaction_db=liveaction_db,
+                                                  runner_type_db=runner_type_db)
+            return access.create_signed_token(username=user, ttl=ttl, metadata=metadata,
+                                              service=True)
+
         ttl = cfg.CONF.auth.service_token_ttl
         token_db = access.create_token(username=user, ttl=ttl, metadata=metadata, service=True)
         return token_db
 
+    def _get_signed_auth_token_ttl(self, action_db, liveaction_db, runner_type_db=None):
+        """
+        Return TTL of the signed auth token for the provided execution - the action timeout (plus
+        a grace period) if the action has one and "auth.execution_token_ttl" otherwise. TTL is
+        never longer than "auth.service_token_ttl".
+        """
+        timeout = None
+
+        # Same precedence as used when rendering the parameters - execution parameters, action
+        # parameter defaults and runner parameter defaults
+        if liveaction_db and 'timeout' in (liveaction_db.parameters or {}):
+            timeout = liveaction_db.parameters['timeout']
+        elif action_db and 'timeout' in (action_db.parameters or {}):
+            timeout = action_db.parameters['timeout'].get('default', None)
+        elif runner_type_db and 'timeout' in (runner_type_db.runner_parameters or {}):
+            timeout = runner_type_db.runner_parameters['timeout'].get('default', None)
+
+        # Timeout could also be a Jinja expression which hasn't been rendered yet
+        if isinstance(timeout, six.integer_types) and timeout > 0:
+            ttl = timeout + EXECUTION_TOKEN_TTL_GRACE_PERIOD
+        else:
+            ttl = cfg.CONF.auth.execution_token_ttl
+
+        return min(ttl, cfg.CONF.auth.service_token_ttl)
+
     def _delete_auth_token(self, auth_token):
         if auth_token:
             access.delete_token(auth_token.token)
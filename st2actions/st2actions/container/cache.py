@@ -0,0 +1,310 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cache for the resources which are needed to dispatch an action execution to a runner (action,
+runner type and rendered pack config).
+
+Entries are invalidated when the corresponding resource is created, updated or deleted. Cache is
+disabled by default and only enabled by the action runner service which also starts the watcher
+for the CUD events (see DispatchContextCacheWatcher).
+
+Datastore items which expire (TTL) are deleted by MongoDB without a CUD event so rendered configs
+are only cached until the first datastore item which has a TTL expires.
+"""
+
+from __future__ import absolute_import
+
+import copy
+import time
+import calendar
+import collections
+
+import eventlet
+from kombu.mixins import ConsumerMixin
+
+from st2common import log as logging
+from st2common.metrics import base as metrics
+from st2common.persistence.keyvalue import KeyValuePair
+from st2common.transport import content as content_transport
+from st2common.transport import utils as transport_utils
+from st2common.util import action_db as action_utils
+from st2common.util.config_loader import ContentPackConfigLoader
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'DispatchContextCache',
+    'DispatchContextCacheWatcher',
+
+    'get_cache',
+    'enable_cache',
+    'disable_cache'
+]
+
+LOG = logging.getLogger(__name__)
+
+_CACHE = None
+_WATCHER = None
+
+
+class DispatchContextCache(object):
+    """
+    LRU cache for actions (by ref), runner types (by name) and rendered pack configs (by pack and
+    user).
+    """
+
+    def __init__(self, size=0):
+        """
+        :param size: Maximum number of items of each type kept in the cache. 0 disables the cache.
+        :type size: ``int``
+        """
+        self._size = size
+
+        self._actions = collections.OrderedDict()
+        self._runner_types = collections.OrderedDict()
+        self._configs = collections.OrderedDict()
+
+        # Incremented on each invalidation. Loading an item yields to other green threads so the
+        # loaded item is only cached if no invalidation happened in the mean time (otherwise a
+        # stale item would be cached until the next CUD event).
+        self._generation = 0
+
+    def set_size(self, size):
+        self._size = size
+
+        for items in [self._actions, self._runner_types, self._configs]:
+            self._trim(items)
+
+    def get_action(self, ref):
+        return self._get(self._actions, 'action', ref,
+                         lambda: action_utils.get_action_by_ref(ref))
+
+    def get_runner_type(self, name):
+        return self._get(self._runner_types, 'runner_type', name,
+                         lambda: action_utils.get_runnertype_by_name(name))
+
+    def get_config(self, pack, user):
+        config_loader = ContentPackConfigLoader(pack_name=pack, user=user)
+        config = self._get(self._configs, 'config', (pack, config_loader.user),
+                           config_loader.get_config,
+                           get_expire_time_func=_get_next_key_value_pair_expire_time)
+
+        # Runners could modify the config so each one gets its own copy
+        return copy.deepcopy(config)
+
+    def invalidate_action(self, action_db):
+        self._generation += 1
+        self._actions.pop(action_db.ref, None)
+
+    def invalidate_runner_type(self, runner_type_db):
+        self._generation += 1
+        self._runner_types.pop(runner_type_db.name, None)
+
+    def invalidate_configs(self, pack=None):
+        """
+        Invalidate rendered configs for the provided pack (for all the users) or for all the packs
+        if pack is not provided.
+        """
+        self._generation += 1
+
+        if not pack:
+            self._configs.clear()
+            return
+
+        for key in [key for key in self._configs if key[0] == pack]:
+            self._configs.pop(key, None)
+
+    def clear(self):
+        self._generation += 1
+        self._actions.clear()
+        self._runner_types.clear()
+        self._configs.clear()
+
+    def _get(self, items, name, key, load_func, get_expire_time_func=None):
+        """
+        :param get_expire_time_func: Optional function which returns time (seconds since epoch)
+                                     after which the loaded item needs to be loaded again (or
+                                     None if the item doesn't expire).
+        """
+        if self._size <= 0:
+            return load_func()
+
+        if key in items:
+            # Mark item as recently used
+            value, expire_time = items.pop(key)
+
+            if expire_time is None or time.time() < expire_time:
+                items[key] = (value, expire_time)
+
+                metrics.get_driver().inc_counter('action.dispatch.cache.%s.hit' % (name))
+                return value
+
+        metrics.get_driver().inc_counter('action.dispatch.cache.%s.miss' % (name))
+
+        generation = self._generation
+        expire_time = get_expire_time_func() if get_expire_time_func else None
+        value = load_func()
+
+        if value is not None and generation == self._generation:
+            items[key] = (value, expire_time)
+            self._trim(items)
+
+        return value
+
+    def _trim(self, items):
+        while len(items) > max(self._size, 0):
+            items.popitem(last=False)
+
+
+class DispatchContextCacheWatcher(ConsumerMixin):
+    """
+    Consumer which invalidates cache entries on Action, RunnerType, Config, ConfigSchema and
+    KeyValuePair CUD events.
+    """
+
+    def __init__(self, cache, queue_suffix=None):
+        self._cache = cache
+
+        handlers = [
+            (content_transport.ACTION_CUD_XCHG, self._handle_action),
+            (content_transport.RUNNER_TYPE_CUD_XCHG, self._handle_runner_type),
+            (content_transport.CONFIG_CUD_XCHG, self._handle_config),
+            (content_transport.CONFIG_SCHEMA_CUD_XCHG, self._handle_config),
+            (content_transport.KEY_VALUE_PAIR_CUD_XCHG, self._handle_key_value_pair)
+        ]
+
+        self._handlers = {}
+        self._queues = []
+
+        for exchange, handler in handlers:
+            queue_name = queue_utils.get_queue_name(
+                queue_name_base='%s.dispatch_cache' % (exchange.name),
+                queue_name_suffix=queue_suffix,
+                add_random_uuid_to_suffix=True)
+
+            self._handlers[exchange.name] = handler
+            self._queues.append(content_transport.get_queue(exchange=exchange, name=queue_name,
+                                                            exclusive=True, auto_delete=True))
+
+        self.connection = None
+        self._updates_thread = None
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=self._queues, accept=['pickle'], callbacks=[self.process_task])]
+
+    def on_connection_revived(self):
+        # Events which were published while the connection was down are lost
+        LOG.debug('Connection revived, clearing dispatch context cache')
+        self._cache.clear()
+
+    def process_task(self, body, message):
+        try:
+            exchange_name = message.delivery_info.get('exchange', '')
+            handler = self._handlers.get(exchange_name, None)
+
+            if not handler:
+                LOG.debug('Skipping message %s as no handler was found.', message)
+                return
+
+            handler(body)
+        except Exception:
+            LOG.exception('Failed to invalidate dispatch context cache. Message body: %s', body)
+
+            # Better safe than sorry, never keep a stale entry around
+            self._cache.clear()
+        finally:
+            message.ack()
+
+    def start(self):
+        self.connection = transport_utils.get_connection()
+        self._updates_thread = eventlet.spawn(self.run)
+
+    def stop(self):
+        self.should_stop = True
+
+        if self._updates_thread:
+            self._updates_thread = eventlet.kill(self._updates_thread)
+
+        if self.connection:
+            self.connection.release()
+
+    def _handle_action(self, action_db):
+        self._cache.invalidate_action(action_db)
+
+    def _handle_runner_type(self, runner_type_db):
+        self._cache.invalidate_runner_type(runner_type_db)
+
+    def _handle_config(self, config_db):
+        self._cache.invalidate_configs(pack=config_db.pack)
+
+    def _handle_key_value_pair(self, kvp_db):
+        # Any of the configs could reference the datastore item
+        self._cache.invalidate_configs()
+
+
+def _get_next_key_value_pair_expire_time():
+    """
+    Return time (seconds since epoch) when the first datastore item which has a TTL expires or
+    None if there are no such items.
+    """
+    kvp_dbs = KeyValuePair.query(expire_timestamp__exists=True, order_by=['expire_timestamp'],
+                                 limit=1, only_fields=['expire_timestamp'])
+
+    for kvp_db in kvp_dbs:
+        if kvp_db.expire_timestamp:
+            return calendar.timegm(kvp_db.expire_timestamp.utctimetuple())
+
+    return None
+
+
+def get_cache():
+    global _CACHE
+
+    if not _CACHE:
+        _CACHE = DispatchContextCache()
+
+    return _CACHE
+
+
+def enable_cache(size, queue_suffix=None):
+    """
+    Enable the cache and start the watcher which invalidates cache entries.
+    """
+    global _WATCHER
+
+    cache = get_cache()
+
+    if size <= 0:
+        return cache
+
+    if not _WATCHER:
+        _WATCHER = DispatchContextCacheWatcher(cache=cache, queue_suffix=queue_suffix)
+        _WATCHER.start()
+
+    cache.set_size(size)
+    return cache
+
+
+def disable_cache():
+    global _WATCHER
+
+    cache = get_cache()
+    cache.set_size(0)
+
+    if _WATCHER:
+        _WATCHER.stop()
+        _WATCHER = None
+
+    return cache
@@ -93,6 +93,15 @@ class ResultsTracker(consumers.MessageHandler):
         querier.add_queries(query_contexts=[context])
         return
 
+    def reset_failed_imports(self):
+        """
+        Retry query modules which failed to import (e.g. once a missing runner has been installed).
+        """
+        for query_module_name in self._failed_imports:
+            self._queriers.pop(query_module_name, None)
+
+        self._failed_imports = set()
+
     def get_querier(self, query_module_name):
         if (query_module_name not in self._queriers and
                 query_module_name not in self._failed_imports):
@@ -20,6 +20,7 @@ from st2common.util import date
 from st2common.constants import action as action_constants
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.models.db.liveaction import LiveActionDB
+from st2common.tracing import base as tracing
 from st2common.transport import consumers
 from st2common.transport import utils as transport_utils
 from st2common.transport.queues import ACTIONSCHEDULER_REQUEST_QUEUE
@@ -100,6 +101,12 @@ class SchedulerEntrypoint(consumers.MessageHandler):
         )
         execution_queue_item_db.delay = delay
 
+        # Propagate tracing context so scheduling is recorded as part of the same trace
+        tracing_headers = tracing.get_message_headers()
+
+        if tracing_headers:
+            execution_queue_item_db.tracing_headers = tracing_headers
+
         return execution_queue_item_db
 
 
@@ -33,6 +33,7 @@ from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.execution_queue import ActionExecutionSchedulingQueue
 from st2common.util import action_db as action_utils
 from st2common.metrics import base as metrics
+from st2common.tracing import base as tracing
 from st2common.exceptions import db as db_exc
 
 __all__ = [
@@ -159,6 +160,19 @@ class ActionExecutionSchedulingQueueHandler(object):
 
     @metrics.CounterWithTimer(key='scheduler.handle_execution')
     def _handle_execution(self, execution_queue_item_db):
+        # Scheduling is recorded as part of the same trace as the execution request (the time
+        # item spent in the scheduling queue is recorded as the queue wait time)
+        attributes = {
+            'st2.resource_type': LiveActionDB.__name__,
+            'st2.resource_id': str(execution_queue_item_db.liveaction_id)
+        }
+
+        with tracing.start_span('%s.handle_execution' % (self.__class__.__name__),
+                                headers=execution_queue_item_db.tracing_headers or {},
+                                kind=tracing.SPAN_KIND_CONSUMER, attributes=attributes):
+            self._handle_execution_queue_item(execution_queue_item_db)
+
+    def _handle_execution_queue_item(self, execution_queue_item_db):
         liveaction_id = str(execution_queue_item_db.liveaction_id)
         queue_item_id = str(execution_queue_item_db.id)
 
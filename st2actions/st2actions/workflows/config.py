@@ -46,6 +46,13 @@ def _register_service_opts():
             'logging',
             default='/etc/st2/logging.workflowengine.conf',
             help='Location of the logging configuration file.'
+        ),
+        cfg.IntOpt(
+            'conductor_cache_size',
+            default=100,
+            help='Maximum number of workflow conductors (deserialized workflow state) to keep in '
+                 'memory between task completions. Cached conductor is only used if the workflow '
+                 'execution revision in the database matches. 0 disables the cache.'
         )
     ]
 
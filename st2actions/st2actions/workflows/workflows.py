@@ -96,8 +96,11 @@ class WorkflowExecutionHandler(consumers.VariableMessageHandler):
         wf_ex_id = ac_ex_db.context['orquesta']['workflow_execution_id']
         task_ex_id = ac_ex_db.context['orquesta']['task_execution_id']
 
-        # Get execution records for logging purposes.
-        wf_ex_db = wf_db_access.WorkflowExecution.get_by_id(wf_ex_id)
+        # Get execution records for logging purposes. Workflow state can be large and it's not
+        # needed here so only the reference to the action execution is retrieved.
+        wf_ex_db = wf_db_access.WorkflowExecution.get(id=wf_ex_id,
+                                                      only_fields=['action_execution'],
+                                                      raise_exception=True)
         task_ex_db = wf_db_access.TaskExecution.get_by_id(task_ex_id)
 
         wf_ac_ex_id = wf_ex_db.action_execution
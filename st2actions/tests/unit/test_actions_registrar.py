@@ -158,3 +158,49 @@ class ActionsRegistrarTest(tests_base.DbTestCase):
             expected_msg = 'Content pack must be set to wolfpack'
             self.assertEqual(action_db.pack, 'wolfpack', expected_msg)
             Action.delete(action_db)
+
+    @mock.patch.object(action_validator, '_is_valid_pack', mock.MagicMock(return_value=True))
+    @mock.patch.object(action_validator, 'get_runner_model',
+                       mock.MagicMock(return_value=MOCK_RUNNER_TYPE_DB))
+    def test_register_actions_incremental(self):
+        packs_base_path = fixtures_loader.get_fixtures_base_path()
+        registered_count = actions_registrar.register_actions(packs_base_paths=[packs_base_path],
+                                                              incremental=True)
+        self.assertTrue(registered_count > 0)
+
+        # Nothing has changed, nothing is written
+        with mock.patch.object(Action, 'add_or_update_many') as mock_add_or_update_many:
+            count = actions_registrar.register_actions(packs_base_paths=[packs_base_path],
+                                                       incremental=True)
+            self.assertEqual(count, registered_count)
+            self.assertEqual(mock_add_or_update_many.call_count, 0)
+
+        # Action which has been deleted is registered again
+        action_db = Action.get_all()[0]
+        Action.delete(action_db)
+
+        count = actions_registrar.register_actions(packs_base_paths=[packs_base_path],
+                                                   incremental=True)
+        self.assertEqual(count, registered_count)
+        self.assertEqual(Action.get_by_ref(action_db.ref).metadata_file, action_db.metadata_file)
+
+        # Metadata files which have changed are registered again
+        with mock.patch.object(Action, 'add_or_update_many') as mock_add_or_update_many:
+            with mock.patch('st2common.bootstrap.base.get_file_content_hash',
+                            mock.Mock(return_value='changed')):
+                actions_registrar.register_actions(packs_base_paths=[packs_base_path],
+                                                   incremental=True)
+
+            self.assertTrue(mock_add_or_update_many.call_count > 0)
+
+    @mock.patch.object(action_validator, '_is_valid_pack', mock.MagicMock(return_value=True))
+    @mock.patch.object(action_validator, 'get_runner_model',
+                       mock.MagicMock(return_value=MOCK_RUNNER_TYPE_DB))
+    @mock.patch.object(Action, 'add_or_update_many', mock.Mock(side_effect=Exception('fail')))
+    def test_register_actions_bulk_write_failure(self):
+        # Actions are written one by one when the bulk write fails
+        packs_base_path = fixtures_loader.get_fixtures_base_path()
+        registered_count = actions_registrar.register_actions(packs_base_paths=[packs_base_path])
+
+        self.assertTrue(registered_count > 0)
+        self.assertEqual(len(Action.get_all()), registered_count)
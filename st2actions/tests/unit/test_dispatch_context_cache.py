@@ -0,0 +1,192 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import time
+import datetime
+
+import mock
+
+from st2common.models.db.action import ActionDB
+from st2common.models.db.keyvalue import KeyValuePairDB
+from st2common.models.db.pack import ConfigDB
+from st2common.models.db.runner import RunnerTypeDB
+from st2common.persistence.action import Action
+from st2common.persistence.keyvalue import KeyValuePair
+from st2common.persistence.pack import Config
+from st2common.persistence.runner import RunnerType
+from st2common.transport import content as content_transport
+from st2common.transport.publishers import PoolPublisher
+from st2common.util import date as date_utils
+
+from st2tests.base import DbTestCase
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2actions.container.cache import DispatchContextCache
+from st2actions.container.cache import DispatchContextCacheWatcher
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class DispatchContextCacheTestCase(DbTestCase):
+    def setUp(self):
+        super(DispatchContextCacheTestCase, self).setUp()
+
+        runner_type_db = RunnerTypeDB(name='python-script', runner_module='python_runner')
+        self.runner_type_db = RunnerType.add_or_update(runner_type_db)
+
+        action_db = ActionDB(pack='dummy_pack_1', name='action1', entry_point='action.py',
+                             runner_type={'name': 'python-script'})
+        self.action_db = Action.add_or_update(action_db)
+
+        config_db = ConfigDB(pack='dummy_pack_1',
+                             values={'api_key': '{{ st2kv.system.api_key }}'})
+        self.config_db = Config.add_or_update(config_db)
+
+        kvp_db = KeyValuePairDB(name='api_key', value='key1')
+        self.kvp_db = KeyValuePair.add_or_update(kvp_db)
+
+    def test_cache_disabled(self):
+        cache = DispatchContextCache(size=0)
+
+        self.assertEqual(cache.get_action('dummy_pack_1.action1').id, self.action_db.id)
+        self.assertEqual(cache.get_config(pack='dummy_pack_1', user='stanley'),
+                         {'api_key': 'key1'})
+
+        Action.delete(self.action_db)
+        self.assertEqual(cache.get_action('dummy_pack_1.action1'), None)
+
+    def test_get_action_and_runner_type_are_cached(self):
+        cache = DispatchContextCache(size=10)
+
+        action_db = cache.get_action('dummy_pack_1.action1')
+        runner_type_db = cache.get_runner_type('python-script')
+
+        with mock.patch.object(Action, 'get_by_ref') as mock_get_by_ref:
+            with mock.patch.object(RunnerType, 'query') as mock_query:
+                self.assertEqual(cache.get_action('dummy_pack_1.action1'), action_db)
+                self.assertEqual(cache.get_runner_type('python-script'), runner_type_db)
+
+                self.assertEqual(mock_get_by_ref.call_count, 0)
+                self.assertEqual(mock_query.call_count, 0)
+
+        # Action which doesn't exist is not cached
+        self.assertEqual(cache.get_action('dummy_pack_1.unknown'), None)
+        self.assertEqual(cache.get_action('dummy_pack_1.unknown'), None)
+
+        cache.invalidate_action(self.action_db)
+        cache.invalidate_runner_type(self.runner_type_db)
+
+        with mock.patch.object(Action, 'get_by_ref') as mock_get_by_ref:
+            cache.get_action('dummy_pack_1.action1')
+            self.assertEqual(mock_get_by_ref.call_count, 1)
+
+    def test_get_config_is_cached_per_user(self):
+        cache = DispatchContextCache(size=10)
+
+        config = cache.get_config(pack='dummy_pack_1', user='stanley')
+        self.assertEqual(config, {'api_key': 'key1'})
+
+        # Each caller gets a copy
+        config['api_key'] = 'modified'
+
+        self.kvp_db.value = 'key2'
+        KeyValuePair.add_or_update(self.kvp_db)
+
+        self.assertEqual(cache.get_config(pack='dummy_pack_1', user='stanley'),
+                         {'api_key': 'key1'})
+        self.assertEqual(cache.get_config(pack='dummy_pack_1', user='user1'),
+                         {'api_key': 'key2'})
+
+        cache.invalidate_configs(pack='dummy_pack_1')
+        self.assertEqual(cache.get_config(pack='dummy_pack_1', user='stanley'),
+                         {'api_key': 'key2'})
+
+    def test_item_loaded_during_invalidation_is_not_cached(self):
+        cache = DispatchContextCache(size=10)
+        get_by_ref = Action.get_by_ref
+
+        def mock_get_by_ref(ref):
+            # Simulates CUD event processed while the item is being loaded
+            action_db = get_by_ref(ref)
+            cache.invalidate_action(action_db)
+            return action_db
+
+        with mock.patch.object(Action, 'get_by_ref', mock.Mock(side_effect=mock_get_by_ref)):
+            self.assertEqual(cache.get_action('dummy_pack_1.action1').id, self.action_db.id)
+
+        self.assertEqual(len(cache._actions), 0)
+
+        cache.get_action('dummy_pack_1.action1')
+        self.assertEqual(len(cache._actions), 1)
+
+    def test_config_expires_with_datastore_item_ttl(self):
+        cache = DispatchContextCache(size=10)
+
+        kvp_db = KeyValuePairDB(name='temporary_key', value='value1',
+                                expire_timestamp=date_utils.get_datetime_utc_now() +
+                                datetime.timedelta(seconds=10))
+        KeyValuePair.add_or_update(kvp_db)
+
+        cache.get_config(pack='dummy_pack_1', user='stanley')
+
+        self.kvp_db.value = 'key2'
+        KeyValuePair.add_or_update(self.kvp_db)
+
+        # Datastore item with a TTL didn't expire yet, cached config is used
+        self.assertEqual(cache.get_config(pack='dummy_pack_1', user='stanley'),
+                         {'api_key': 'key1'})
+
+        # Datastore item expired (deleted by MongoDB without a CUD event), config is rendered again
+        with mock.patch('st2actions.container.cache.time') as mock_time:
+            mock_time.time.return_value = time.time() + 60
+            self.assertEqual(cache.get_config(pack='dummy_pack_1', user='stanley'),
+                             {'api_key': 'key2'})
+
+    def test_lru_eviction(self):
+        cache = DispatchContextCache(size=1)
+
+        cache.get_config(pack='dummy_pack_1', user='stanley')
+        cache.get_config(pack='dummy_pack_1', user='user1')
+        self.assertEqual(list(cache._configs.keys()), [('dummy_pack_1', 'user1')])
+
+        cache.set_size(0)
+        self.assertEqual(len(cache._configs), 0)
+
+    def test_watcher_invalidates_entries(self):
+        cache = DispatchContextCache(size=10)
+        watcher = DispatchContextCacheWatcher(cache=cache)
+
+        cache.get_action('dummy_pack_1.action1')
+        cache.get_config(pack='dummy_pack_1', user='stanley')
+
+        self._process_message(watcher, content_transport.ACTION_CUD_XCHG, self.action_db)
+        self.assertEqual(len(cache._actions), 0)
+        self.assertEqual(len(cache._configs), 1)
+
+        self._process_message(watcher, content_transport.CONFIG_CUD_XCHG, self.config_db)
+        self.assertEqual(len(cache._configs), 0)
+
+        cache.get_config(pack='dummy_pack_1', user='stanley')
+        self._process_message(watcher, content_transport.KEY_VALUE_PAIR_CUD_XCHG, self.kvp_db)
+        self.assertEqual(len(cache._configs), 0)
+
+    def _process_message(self, watcher, exchange, body):
+        message = mock.Mock()
+        message.delivery_info = {'exchange': exchange.name, 'routing_key': 'update'}
+
+        watcher.process_task(body, message)
+        self.assertEqual(message.ack.call_count, 1)
@@ -0,0 +1,142 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+from mock import (patch, Mock, MagicMock)
+import unittest2
+
+from st2common.constants.action import LIVEACTION_STATUS_SUCCEEDED
+from st2common.constants.action import LIVEACTION_STATUS_FAILED
+from st2common.constants.action import LIVEACTION_STATUS_TIMED_OUT
+from st2common.runners.parallel_ssh import ParallelSSHClient
+from st2common.runners.parallel_ssh_results import StreamingResults
+from st2common.runners.parallel_ssh_results import truncate_host_result
+from st2common.runners.paramiko_ssh import ParamikoSSHClient
+from st2common.runners.paramiko_ssh_runner import BaseParallelSSHRunner
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+SUCCEEDED_RESULT = {'stdout': 'a' * 100, 'stderr': '', 'return_code': 0, 'succeeded': True,
+                    'failed': False}
+FAILED_RESULT = {'stdout': '', 'stderr': 'b' * 100, 'return_code': 1, 'succeeded': False,
+                 'failed': True}
+TIMEOUT_RESULT = {'stdout': '', 'stderr': '', 'return_code': -9, 'succeeded': False,
+                  'failed': True, 'timeout': True}
+
+
+class TruncateHostResultTestCase(unittest2.TestCase):
+    def test_no_limit(self):
+        result = truncate_host_result(SUCCEEDED_RESULT, max_output_size=0)
+        self.assertEqual(result, SUCCEEDED_RESULT)
+
+    def test_head_and_tail_policies(self):
+        result = {'stdout': 'abcdefghij', 'stderr': 'short'}
+
+        truncated = truncate_host_result(result, max_output_size=6, policy='head')
+        self.assertEqual(truncated['stdout'], 'abcdef')
+        self.assertTrue(truncated['stdout_truncated'])
+        self.assertEqual(truncated['stdout_size'], 10)
+        self.assertEqual(truncated['stderr'], 'short')
+        self.assertFalse('stderr_truncated' in truncated)
+
+        truncated = truncate_host_result(result, max_output_size=6, policy='tail')
+        self.assertEqual(truncated['stdout'], 'efghij')
+
+        # Original result is not modified
+        self.assertEqual(result['stdout'], 'abcdefghij')
+
+    def test_summary_policy(self):
+        truncated = truncate_host_result(SUCCEEDED_RESULT, policy='summary')
+        self.assertEqual(truncated['stdout'], '')
+        self.assertEqual(truncated['stdout_size'], 100)
+        self.assertEqual(truncated['return_code'], 0)
+
+    def test_json_stdout_is_truncated(self):
+        result = {'stdout': {'foo': 'bar' * 10}}
+
+        truncated = truncate_host_result(result, max_output_size=10, policy='head')
+        self.assertEqual(truncated['stdout'], '{"foo": "b')
+
+
+class StreamingResultsTestCase(unittest2.TestCase):
+    def test_aggregate_counts(self):
+        handle_host_result_func = Mock()
+        results = StreamingResults(handle_host_result_func=handle_host_result_func,
+                                   max_output_size=10, max_failed_hosts=1)
+
+        results['host1'] = SUCCEEDED_RESULT
+        results['host2'] = FAILED_RESULT
+        results['host3'] = TIMEOUT_RESULT
+
+        self.assertEqual(results.get_summary(), {'total': 3, 'succeeded': 1, 'failed': 2,
+                                                 'timeout': 1})
+        self.assertEqual(handle_host_result_func.call_count, 3)
+
+        host, result = handle_host_result_func.call_args_list[0][0]
+        self.assertEqual(host, 'host1')
+        self.assertEqual(result['stdout'], 'a' * 10)
+
+        # Number of failed host results which are kept is limited
+        result = results.get_result()
+        self.assertEqual(list(result['failed_hosts'].keys()), ['host2'])
+        self.assertEqual(result['failed_hosts']['host2']['stderr'], 'b' * 10)
+
+    def test_handle_host_result_func_failure(self):
+        results = StreamingResults(handle_host_result_func=Mock(side_effect=Exception('fail')))
+        results['host1'] = SUCCEEDED_RESULT
+
+        self.assertEqual(results.get_summary()['succeeded'], 1)
+
+    def test_invalid_truncation_policy(self):
+        self.assertRaises(ValueError, StreamingResults, truncation_policy='invalid')
+
+    def test_result_status(self):
+        results = StreamingResults()
+        results['host1'] = SUCCEEDED_RESULT
+        results['host2'] = FAILED_RESULT
+
+        status = BaseParallelSSHRunner._get_result_status(results, allow_partial_failure=False)
+        self.assertEqual(status, LIVEACTION_STATUS_FAILED)
+
+        status = BaseParallelSSHRunner._get_result_status(results, allow_partial_failure=True)
+        self.assertEqual(status, LIVEACTION_STATUS_SUCCEEDED)
+
+        results = StreamingResults()
+        results['host1'] = TIMEOUT_RESULT
+
+        status = BaseParallelSSHRunner._get_result_status(results, allow_partial_failure=False)
+        self.assertEqual(status, LIVEACTION_STATUS_TIMED_OUT)
+
+    @patch('paramiko.SSHClient', Mock)
+    @patch.object(ParamikoSSHClient, 'run', MagicMock(return_value=('x' * 100, '', 0)))
+    @patch.object(ParamikoSSHClient, '_is_key_file_needs_passphrase',
+                  MagicMock(return_value=False))
+    def test_parallel_ssh_client_run(self):
+        hosts = ['127.0.0.1', '127.0.0.2', '127.0.0.3']
+        client = ParallelSSHClient(hosts=hosts,
+                                   user='ubuntu',
+                                   pkey_file='~/.ssh/id_rsa',
+                                   connect=True)
+
+        handle_host_result_func = Mock()
+        results = StreamingResults(handle_host_result_func=handle_host_result_func,
+                                   max_output_size=10)
+
+        self.assertEqual(client.run('stuff', timeout=60, results=results), results)
+        self.assertEqual(results.get_summary()['succeeded'], 3)
+
+        stored_hosts = sorted([call[0][0] for call in handle_host_result_func.call_args_list])
+        self.assertEqual(stored_hosts, hosts)
@@ -23,6 +23,7 @@ from st2common.constants import action as action_constants
 from st2common.runners.base import get_runner
 from st2common.exceptions.actionrunner import ActionRunnerCreateError, ActionRunnerDispatchError
 from st2common.models.system.common import ResourceReference
+from st2common.models.db.action import ActionDB
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.models.db.runner import RunnerTypeDB
 from st2common.persistence.liveaction import LiveAction
@@ -42,6 +43,7 @@ from st2tests.fixturesloader import FixturesLoader
 # RunnerContainer. Do not move this until you fix config
 # dependencies.
 from st2actions.container.base import get_runner_container
+from st2actions.container.base import EXECUTION_TOKEN_TTL_GRACE_PERIOD
 
 TEST_FIXTURES = {
     'runners': [
@@ -411,6 +413,48 @@ class RunnerContainerTest(DbTestCase):
 
         self.assertTrue(len(found) == 0, 'There should not be a state db object.')
 
+    def test_signed_auth_token_ttl_is_limited_to_action_timeout(self):
+        cfg.CONF.set_override(name='execution_token_ttl', override=600, group='auth')
+        self.addCleanup(cfg.CONF.clear_override, name='execution_token_ttl', group='auth')
+
+        runner_container = get_runner_container()
+
+        action_db = ActionDB(pack='core', name='test', parameters={'timeout': {'default': 120}})
+        runner_type_db = RunnerTypeDB(name='test', runner_parameters={'timeout': {'default': 60}})
+        liveaction_db = LiveActionDB(action='core.test', parameters={'timeout': 30})
+
+        # Execution parameters take precedence over the action and runner parameter defaults
+        ttl = runner_container._get_signed_auth_token_ttl(
+            action_db=action_db, liveaction_db=liveaction_db, runner_type_db=runner_type_db)
+        self.assertEqual(ttl, 30 + EXECUTION_TOKEN_TTL_GRACE_PERIOD)
+
+        liveaction_db.parameters = {}
+        ttl = runner_container._get_signed_auth_token_ttl(
+            action_db=action_db, liveaction_db=liveaction_db, runner_type_db=runner_type_db)
+        self.assertEqual(ttl, 120 + EXECUTION_TOKEN_TTL_GRACE_PERIOD)
+
+        action_db.parameters = {}
+        ttl = runner_container._get_signed_auth_token_ttl(
+            action_db=action_db, liveaction_db=liveaction_db, runner_type_db=runner_type_db)
+        self.assertEqual(ttl, 60 + EXECUTION_TOKEN_TTL_GRACE_PERIOD)
+
+        # Action without a timeout or with a timeout which hasn't been rendered yet
+        runner_type_db.runner_parameters = {}
+        ttl = runner_container._get_signed_auth_token_ttl(
+            action_db=action_db, liveaction_db=liveaction_db, runner_type_db=runner_type_db)
+        self.assertEqual(ttl, 600)
+
+        liveaction_db.parameters = {'timeout': '{{ timeout }}'}
+        ttl = runner_container._get_signed_auth_token_ttl(
+            action_db=action_db, liveaction_db=liveaction_db, runner_type_db=runner_type_db)
+        self.assertEqual(ttl, 600)
+
+        # TTL is never longer than the service token TTL
+        liveaction_db.parameters = {'timeout': 10 ** 6}
+        ttl = runner_container._get_signed_auth_token_ttl(
+            action_db=action_db, liveaction_db=liveaction_db, runner_type_db=runner_type_db)
+        self.assertEqual(ttl, cfg.CONF.auth.service_token_ttl)
+
     def _get_liveaction_model(self, action_db, params):
         status = action_constants.LIVEACTION_STATUS_REQUESTED
         start_timestamp = date_utils.get_datetime_utc_now()
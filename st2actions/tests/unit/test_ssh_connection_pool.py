@@ -0,0 +1,145 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import time
+
+from mock import (patch, Mock, MagicMock)
+import unittest2
+
+from st2common.runners.paramiko_ssh import ParamikoSSHClient
+from st2common.runners.ssh_connection_pool import SSHConnectionPool
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+
+def mock_connect():
+    client = Mock()
+    client.get_transport.return_value.is_active.return_value = True
+    return client, None, None
+
+
+class SSHConnectionPoolTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(SSHConnectionPoolTestCase, self).setUp()
+        self.pool = SSHConnectionPool(max_idle_time=10, max_channels_per_connection=2)
+
+    def tearDown(self):
+        self.pool.close_all()
+        super(SSHConnectionPoolTestCase, self).tearDown()
+
+    def test_connection_is_reused(self):
+        connect_func = Mock(side_effect=mock_connect)
+
+        connection1 = self.pool.acquire(key='key1', connect_func=connect_func)
+        connection1.client.get_transport.return_value.set_keepalive.assert_called_once_with(30)
+        self.pool.release(connection1)
+
+        connection2 = self.pool.acquire(key='key1', connect_func=connect_func)
+        self.assertEqual(connection1, connection2)
+        self.assertEqual(connect_func.call_count, 1)
+        self.assertEqual(connection2.client.get_transport.return_value.send_ignore.call_count, 1)
+
+        # Different key, different connection
+        connection3 = self.pool.acquire(key='key2', connect_func=connect_func)
+        self.assertNotEqual(connection1, connection3)
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['connections'], 2)
+        self.assertEqual(stats['channels'], 2)
+        self.assertAlmostEqual(stats['reuse_rate'], 1.0 / 3)
+
+    def test_max_channels_per_connection(self):
+        connect_func = Mock(side_effect=mock_connect)
+
+        connection1 = self.pool.acquire(key='key1', connect_func=connect_func)
+        connection2 = self.pool.acquire(key='key1', connect_func=connect_func)
+        connection3 = self.pool.acquire(key='key1', connect_func=connect_func)
+
+        self.assertEqual(connection1, connection2)
+        self.assertNotEqual(connection1, connection3)
+        self.assertEqual(connection1.channels, 2)
+        self.assertEqual(connect_func.call_count, 2)
+
+    def test_unhealthy_connection_is_replaced(self):
+        connect_func = Mock(side_effect=mock_connect)
+
+        connection1 = self.pool.acquire(key='key1', connect_func=connect_func)
+        self.pool.release(connection1)
+
+        transport = connection1.client.get_transport.return_value
+        transport.send_ignore.side_effect = EOFError()
+
+        connection2 = self.pool.acquire(key='key1', connect_func=connect_func)
+        self.assertNotEqual(connection1, connection2)
+        self.assertEqual(connection1.client.close.call_count, 1)
+        self.assertEqual(self.pool.get_stats()['health_check_failures'], 1)
+
+    def test_idle_connections_are_evicted(self):
+        connection = self.pool.acquire(key='key1', connect_func=mock_connect)
+        self.pool.release(connection)
+
+        self.pool.evict_idle()
+        self.assertEqual(self.pool.get_stats()['connections'], 1)
+
+        connection.last_used = time.time() - 20
+        self.pool.evict_idle()
+
+        self.assertEqual(self.pool.get_stats()['connections'], 0)
+        self.assertEqual(self.pool.get_stats()['evictions'], 1)
+        self.assertEqual(connection.client.close.call_count, 1)
+
+    def test_release_not_reusable_connection(self):
+        connection1 = self.pool.acquire(key='key1', connect_func=mock_connect)
+        connection2 = self.pool.acquire(key='key1', connect_func=mock_connect)
+        self.assertEqual(connection1, connection2)
+
+        # Connection is still used by another execution so it's only closed once it's released
+        self.pool.release(connection1, reusable=False)
+        self.assertEqual(connection1.client.close.call_count, 0)
+
+        connection3 = self.pool.acquire(key='key1', connect_func=mock_connect)
+        self.assertNotEqual(connection1, connection3)
+
+        self.pool.release(connection2)
+        self.assertEqual(connection1.client.close.call_count, 1)
+
+    @patch('paramiko.SSHClient', Mock)
+    @patch.object(ParamikoSSHClient, '_is_key_file_needs_passphrase',
+                  MagicMock(return_value=False))
+    def test_paramiko_client_uses_pool(self):
+        client1 = ParamikoSSHClient(hostname='localhost', username='ubuntu', password='ubuntu',
+                                    connection_pool=self.pool)
+        client1.connect()
+        client1.close()
+        self.assertEqual(client1.client.close.call_count, 0)
+
+        client2 = ParamikoSSHClient(hostname='localhost', username='ubuntu', password='ubuntu',
+                                    connection_pool=self.pool)
+        client2.connect()
+        self.assertEqual(client1.client, client2.client)
+
+        # Different credentials, different connection
+        client3 = ParamikoSSHClient(hostname='localhost', username='ubuntu', password='other',
+                                    connection_pool=self.pool)
+        client3.connect()
+        self.assertNotEqual(client1.client, client3.client)
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
@@ -29,6 +29,7 @@ from st2common.util.monkey_patch import monkey_patch
 from st2common.constants.system import VERSION_STRING
 from st2common.service_setup import setup as common_setup
 from st2common.util import spec_loader
+from st2common.util import actionalias_matching
 from st2api.validation import validate_rbac_is_correctly_configured
 
 LOG = logging.getLogger(__name__)
@@ -67,6 +68,10 @@ def setup_app(config={}):
     # Additional pre-run time checks
     validate_rbac_is_correctly_configured()
 
+    # Match ChatOps commands against an in-memory index of the action alias formats
+    if cfg.CONF.api.action_alias_index:
+        actionalias_matching.enable_index(queue_suffix='api')
+
     router = Router(debug=cfg.CONF.api.debug, auth=cfg.CONF.auth.enable,
                     is_gunicorn=is_gunicorn)
 
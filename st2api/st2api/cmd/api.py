@@ -23,6 +23,7 @@ from eventlet import wsgi
 from st2common import log as logging
 from st2common.service_setup import setup as common_setup
 from st2common.service_setup import teardown as common_teardown
+from st2common.metrics.collectors import register_green_pool
 from st2common.util.monkey_patch import monkey_patch
 from st2api import config
 config.register_opts()
@@ -66,6 +67,7 @@ def _run_server():
 
     max_pool_size = eventlet.wsgi.DEFAULT_MAX_SIMULTANEOUS_REQUESTS
     worker_pool = eventlet.GreenPool(max_pool_size)
+    register_green_pool(name='wsgi', pool=worker_pool)
     sock = eventlet.listen((host, port))
 
     wsgi.server(sock, app.setup_app(), custom_pool=worker_pool, log=LOG, log_output=False)
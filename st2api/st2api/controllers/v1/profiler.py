@@ -0,0 +1,56 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from six.moves import http_client
+
+from st2common.rbac.backends import get_rbac_backend
+from st2common.router import Response
+from st2common.transport.profiler import ProfilerRequestPublisher
+
+__all__ = [
+    'ProfilerController'
+]
+
+
+class ProfilerController(object):
+    def __init__(self):
+        self._publisher = ProfilerRequestPublisher()
+
+    def post(self, profiling_request, requester_user):
+        """
+        Request a profiling session in all the processes of the provided service (optionally
+        only on a particular host or in a particular process).
+
+        Profile is written to the profiler.output_dir directory on the host where the service
+        runs once the session is finished.
+
+            Handles requests:
+                POST /profiler
+        """
+        rbac_utils = get_rbac_backend().get_utils_class()
+        rbac_utils.assert_user_is_admin(user_db=requester_user)
+
+        payload = {
+            'service': profiling_request.service,
+            'hostname': getattr(profiling_request, 'hostname', None),
+            'pid': getattr(profiling_request, 'pid', None),
+            'duration': getattr(profiling_request, 'duration', None)
+        }
+        self._publisher.publish(payload=payload, routing_key=profiling_request.service)
+
+        return Response(json=payload, status=http_client.ACCEPTED)
+
+
+profiler_controller = ProfilerController()
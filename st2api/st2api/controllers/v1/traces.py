@@ -13,10 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from six.moves import http_client
+
 from st2api.controllers.resource import ResourceController
 from st2common.models.api.trace import TraceAPI
 from st2common.persistence.trace import Trace
 from st2common.rbac.types import PermissionType
+from st2common.rbac.backends import get_rbac_backend
+from st2common.services import trace as trace_service
+from st2common.router import abort
 
 __all__ = [
     'TracesController'
@@ -60,5 +65,25 @@ class TracesController(ResourceController):
                                    requester_user=requester_user,
                                    permission_type=PermissionType.TRACE_VIEW)
 
+    def get_latency(self, id, requester_user):
+        """
+        Return latency breakdown of the trace recorded by the latency tracing.
+
+        Handles requests:
+            GET /traces/<id>/latency
+        """
+        trace_db = self._get_by_id(resource_id=id)
+
+        if not trace_db:
+            msg = 'Unable to identify resource with id "%s".' % id
+            abort(http_client.NOT_FOUND, msg)
+
+        rbac_utils = get_rbac_backend().get_utils_class()
+        rbac_utils.assert_user_has_resource_db_permission(user_db=requester_user,
+                                                          resource_db=trace_db,
+                                                          permission_type=PermissionType.TRACE_VIEW)
+
+        return trace_service.get_trace_latency(trace_db=trace_db)
+
 
 traces_controller = TracesController()
@@ -13,13 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import six
+import re
+import threading
 import uuid
+
+import six
 from six.moves.urllib import parse as urlparse  # pylint: disable=import-error
 urljoin = urlparse.urljoin
 
 from st2common import log as logging
 from st2common.constants.triggers import WEBHOOK_TRIGGER_TYPES
+from st2common.metrics.base import Timer
 from st2common.models.api.trace import TraceContext
 from st2common.models.api.trigger import TriggerAPI
 from st2common.models.db.webhook import WebhookDB
@@ -30,6 +34,7 @@ from st2common.services.triggerwatcher import TriggerWatcher
 from st2common.services.trigger_dispatcher import TriggerDispatcherService
 from st2common.router import abort
 from st2common.router import Response
+from st2common.tracing import base as tracing
 from st2common.util.jsonify import get_json_type_for_python_value
 
 http_client = six.moves.http_client
@@ -38,46 +43,182 @@ LOG = logging.getLogger(__name__)
 
 TRACE_TAG_HEADER = 'St2-Trace-Tag'
 
+# Matches named parameter webhook URL path segment (e.g. {repo})
+PATH_PARAMETER_RE = re.compile(r'^\{([a-zA-Z_][a-zA-Z0-9_]*)\}$')
+
 
 class HooksHolder(object):
     """
     Maintains a hook to TriggerDB mapping.
+
+    Besides exact hook URLs, URLs with wildcard (``*``) and named parameter (``{name}``) path
+    segments are also supported (e.g. ``github/{org}/{repo}`` or ``alerts/*/critical``). Each of
+    those matches exactly one path segment.
+
+    The mapping is stored as an immutable snapshot. Writers (trigger CUD event handlers) build a
+    new snapshot and swap it in with a single reference assignment. This means readers never need
+    to take a lock and always see a consistent routing table.
     """
+
     def __init__(self):
-        self._triggers_by_hook = {}
+        self._snapshot = RoutingTableSnapshot()
+        self._write_lock = threading.Lock()
+
+        # Compiled URL patterns are only accessed by writers
+        self._patterns = {}  # maps hook -> (sort key, regex)
 
     def __contains__(self, key):
-        return key in self._triggers_by_hook
+        return bool(self._snapshot.match(key)[0])
 
     def add_hook(self, hook, trigger):
-        if hook not in self._triggers_by_hook:
-            self._triggers_by_hook[hook] = []
-        self._triggers_by_hook[hook].append(trigger)
+        with self._write_lock:
+            triggers_by_hook = dict(self._snapshot.triggers_by_hook)
+            triggers_by_hook[hook] = triggers_by_hook.get(hook, ()) + (trigger,)
+
+            if is_url_pattern(hook) and hook not in self._patterns:
+                pattern = compile_url_pattern(hook)
+
+                if pattern:
+                    self._patterns[hook] = pattern
+
+            self._swap_snapshot(triggers_by_hook=triggers_by_hook)
 
     def remove_hook(self, hook, trigger):
-        if hook not in self._triggers_by_hook:
-            return False
-        remove_index = -1
-        for idx, item in enumerate(self._triggers_by_hook[hook]):
-            if item['id'] == trigger['id']:
-                remove_index = idx
-                break
-        if remove_index < 0:
-            return False
-        self._triggers_by_hook[hook].pop(remove_index)
-        if not self._triggers_by_hook[hook]:
-            del self._triggers_by_hook[hook]
-        return True
+        with self._write_lock:
+            triggers = self._snapshot.triggers_by_hook.get(hook, None)
+
+            if not triggers:
+                return False
+
+            remaining_triggers = tuple([item for item in triggers if item['id'] != trigger['id']])
+
+            if len(remaining_triggers) == len(triggers):
+                return False
+
+            triggers_by_hook = dict(self._snapshot.triggers_by_hook)
+
+            if remaining_triggers:
+                triggers_by_hook[hook] = remaining_triggers
+            else:
+                del triggers_by_hook[hook]
+                self._patterns.pop(hook, None)
+
+            self._swap_snapshot(triggers_by_hook=triggers_by_hook)
+            return True
+
+    def match(self, hook):
+        """
+        Return triggers and path parameter values for the provided hook.
+
+        Both are resolved from the same routing table snapshot so the result is consistent even if
+        the table is swapped by a concurrent writer.
+
+        :rtype: ``tuple`` of (``list``, ``dict``)
+        """
+        triggers, path_parameters = self._snapshot.match(hook)
+        return list(triggers), path_parameters
 
     def get_triggers_for_hook(self, hook):
-        return self._triggers_by_hook.get(hook, [])
+        return list(self._snapshot.match(hook)[0])
+
+    def get_path_parameters_for_hook(self, hook):
+        """
+        Return values of the named parameter path segments for the provided hook.
+
+        :rtype: ``dict``
+        """
+        return self._snapshot.match(hook)[1]
 
     def get_all(self):
         triggers = []
-        for values in six.itervalues(self._triggers_by_hook):
+        for values in six.itervalues(self._snapshot.triggers_by_hook):
             triggers.extend(values)
         return triggers
 
+    def _swap_snapshot(self, triggers_by_hook):
+        # Most specific patterns (the ones with least wildcard segments) are tried first
+        patterns = sorted([(sort_key, hook, regex) for hook, (sort_key, regex) in
+                           six.iteritems(self._patterns)])
+        patterns = tuple([(hook, regex) for _, hook, regex in patterns])
+
+        self._snapshot = RoutingTableSnapshot(triggers_by_hook=triggers_by_hook,
+                                              patterns=patterns)
+
+
+class RoutingTableSnapshot(object):
+    """
+    Immutable webhook routing table.
+
+    Exact hooks are resolved using a single dictionary lookup. URL patterns are only consulted if
+    there is no exact match.
+    """
+
+    def __init__(self, triggers_by_hook=None, patterns=None):
+        """
+        :param triggers_by_hook: Maps hook URL to a tuple of triggers.
+        :type triggers_by_hook: ``dict``
+
+        :param patterns: Compiled URL patterns ordered by priority.
+        :type patterns: ``tuple`` of (``str``, ``regex``)
+        """
+        self.triggers_by_hook = triggers_by_hook or {}
+        self.patterns = patterns or ()
+
+    def match(self, hook):
+        """
+        Return triggers and path parameter values for the provided hook.
+
+        :rtype: ``tuple`` of (``tuple``, ``dict``)
+        """
+        triggers = self.triggers_by_hook.get(hook, None)
+
+        if triggers:
+            return triggers, {}
+
+        for pattern_hook, regex in self.patterns:
+            match = regex.match(hook)
+
+            if match:
+                return self.triggers_by_hook[pattern_hook], match.groupdict()
+
+        return (), {}
+
+
+def is_url_pattern(hook):
+    return '*' in hook or '{' in hook
+
+
+def compile_url_pattern(hook):
+    """
+    Compile webhook URL pattern into a regular expression.
+
+    :return: Tuple of (sort key, regex) or None if the pattern is not valid.
+    :rtype: ``tuple``
+    """
+    segments = hook.split('/')
+    regex_segments = []
+    wildcard_count = 0
+
+    for segment in segments:
+        param_match = PATH_PARAMETER_RE.match(segment)
+
+        if segment == '*':
+            regex_segments.append('[^/]+')
+            wildcard_count += 1
+        elif param_match:
+            regex_segments.append('(?P<%s>[^/]+)' % (param_match.group(1)))
+            wildcard_count += 1
+        else:
+            regex_segments.append(re.escape(segment))
+
+    try:
+        regex = re.compile('^%s$' % ('/'.join(regex_segments)))
+    except re.error:
+        LOG.warning('Ignoring invalid webhook URL pattern: %s', hook)
+        return None
+
+    return (wildcard_count, -len(segments), hook), regex
+
 
 class WebhooksController(object):
     def __init__(self, *args, **kwargs):
@@ -117,6 +258,13 @@ class WebhooksController(object):
         return triggers[0]
 
     def post(self, hook, webhook_body_api, headers, requester_user):
+        # Webhook request is the first hop of the trace (if latency tracing is enabled)
+        with tracing.start_span('webhook', kind=tracing.SPAN_KIND_SERVER,
+                                attributes={'st2.webhook': hook}):
+            return self._post(hook=hook, webhook_body_api=webhook_body_api, headers=headers,
+                              requester_user=requester_user)
+
+    def _post(self, hook, webhook_body_api, headers, requester_user):
         body = webhook_body_api.data
 
         permission_type = PermissionType.WEBHOOK_SEND
@@ -150,32 +298,32 @@ class WebhooksController(object):
                    trace_context=trace_context,
                    throw_on_validation_error=True)
         else:
-            if not self._is_valid_hook(hook):
+            triggers, path_parameters = self._hooks.match(hook)
+
+            if not triggers:
                 self._log_request('Invalid hook.', headers, body)
                 msg = 'Webhook %s not registered with st2' % hook
                 return abort(http_client.NOT_FOUND, msg)
 
-            triggers = self._hooks.get_triggers_for_hook(hook)
             payload = {}
 
             payload['headers'] = headers
             payload['body'] = body
 
+            if path_parameters:
+                payload['path_parameters'] = path_parameters
+
             # Dispatch trigger instance for each of the trigger found
-            for trigger_dict in triggers:
-                # TODO: Instead of dispatching the whole dict we should just
-                # dispatch TriggerDB.ref or similar
-                self._trigger_dispatcher_service.dispatch_with_context(trigger=trigger_dict,
-                   payload=payload,
-                   trace_context=trace_context,
-                   throw_on_validation_error=True)
+            with Timer(key='webhooks.dispatch'):
+                for trigger_dict in triggers:
+                    self._trigger_dispatcher_service.dispatch_with_context(
+                        trigger=self._get_trigger_reference(trigger_dict),
+                        payload=payload,
+                        trace_context=trace_context,
+                        throw_on_validation_error=True)
 
         return Response(json=body, status=http_client.ACCEPTED)
 
-    def _is_valid_hook(self, hook):
-        # TODO: Validate hook payload with payload_schema.
-        return hook in self._hooks
-
     def _register_webhook_trigger_types(self):
         for trigger_type in WEBHOOK_TRIGGER_TYPES.values():
             trigger_service.create_trigger_type_db(trigger_type)
@@ -206,6 +354,24 @@ class WebhooksController(object):
         if removed:
             LOG.info('Stop listening to endpoint: %s', urljoin(self._base_url, url))
 
+    def _get_trigger_reference(self, trigger):
+        """
+        Return compact trigger reference which is published to the message bus instead of the
+        whole trigger dictionary.
+
+        Type is needed for payload validation in the API and id is used for a primary key lookup
+        by the consumer. If the trigger has no id, the whole trigger dictionary is returned so the
+        consumer can still look it up by uid or by type and parameters.
+        """
+        if not trigger.get('id', None):
+            return trigger
+
+        return {
+            'id': trigger['id'],
+            'ref': trigger['ref'],
+            'type': trigger['type']
+        }
+
     def _get_normalized_url(self, trigger):
         """
         remove the trailing and leading / so that the hook url and those coming
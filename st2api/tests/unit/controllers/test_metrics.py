@@ -0,0 +1,70 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from st2common.metrics import base as metrics_base
+from st2common.metrics import endpoint as metrics_endpoint
+from st2common.metrics.drivers.noop_driver import NoopDriver
+from st2common.metrics.drivers.prometheus_driver import PrometheusDriver
+from st2tests.api import FunctionalTest
+
+__all__ = [
+    'RequestMetricsTestCase'
+]
+
+
+class RequestMetricsTestCase(FunctionalTest):
+    def test_request_metrics(self):
+        driver = PrometheusDriver(export_driver=None)
+
+        with mock.patch.object(metrics_base, 'METRICS', driver):
+            resp = self.app.get('/v1/actions')
+            self.assertEqual(resp.status_int, 200)
+
+            resp = self.app.get('/v1/actions/doesnt.exist', expect_errors=True)
+            self.assertEqual(resp.status_int, 404)
+
+            body = metrics_endpoint.get_prometheus_metrics()
+
+        self.assertIn('# TYPE st2_api_request_latency_seconds summary', body)
+        self.assertIn('st2_api_request_latency_seconds_count{operation_id="st2api.controllers.v1.'
+                      'actions:actions_controller.get_all",status="200"} 1', body)
+        self.assertIn('st2_api_request_latency_seconds_count{operation_id="st2api.controllers.v1.'
+                      'actions:actions_controller.get_one",status="404"} 1', body)
+        self.assertIn('st2_api_router_match_seconds_count', body)
+        self.assertIn('st2_eventlet_hub_pending_timers', body)
+        self.assertIn('st2_mongodb_pool_in_use', body)
+
+        # Only /v1/actions GET request is counted (get one API endpoints aren't instrumented)
+        self.assertEqual(driver._counters['api.request.method.GET'], 1)
+
+    def test_metrics_are_not_exposed_on_the_api_port(self):
+        driver = PrometheusDriver(export_driver=None)
+
+        with mock.patch.object(metrics_base, 'METRICS', driver):
+            resp = self.app.get('/metrics', expect_errors=True)
+
+        self.assertEqual(resp.status_int, 404)
+
+    def test_router_match_time_is_not_recorded_by_other_drivers(self):
+        driver = mock.Mock(spec=NoopDriver())
+
+        with mock.patch.object(metrics_base, 'METRICS', driver):
+            resp = self.app.get('/v1/actions')
+            self.assertEqual(resp.status_int, 200)
+
+        timer_keys = [call[0][0] for call in driver.time.call_args_list]
+        self.assertNotIn('api.router.match', timer_keys)
@@ -0,0 +1,46 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from st2common.transport.profiler import ProfilerRequestPublisher
+from st2tests.api import FunctionalTest
+
+__all__ = [
+    'ProfilerControllerTestCase'
+]
+
+
+class ProfilerControllerTestCase(FunctionalTest):
+    @mock.patch.object(ProfilerRequestPublisher, 'publish')
+    def test_post(self, mock_publish):
+        body = {'service': 'actionrunner', 'hostname': 'host1', 'duration': 60}
+        resp = self.app.post_json('/v1/profiler', body)
+
+        self.assertEqual(resp.status_int, 202)
+
+        expected_payload = {'service': 'actionrunner', 'hostname': 'host1', 'pid': None,
+                            'duration': 60}
+        self.assertEqual(resp.json, expected_payload)
+        mock_publish.assert_called_once_with(payload=expected_payload,
+                                             routing_key='actionrunner')
+
+    @mock.patch.object(ProfilerRequestPublisher, 'publish')
+    def test_post_invalid_request(self, mock_publish):
+        resp = self.app.post_json('/v1/profiler', {'duration': 60}, expect_errors=True)
+
+        self.assertEqual(resp.status_int, 400)
+        self.assertIn('\'service\' is a required property', resp.json['faultstring'])
+        self.assertEqual(mock_publish.call_count, 0)
@@ -13,7 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
+import bson
+
 from st2api.controllers.v1.traces import TracesController
+from st2common.models.db.trace import TraceSpanDB
+from st2common.persistence.trace import TraceSpan
+from st2common.util import date as date_utils
 from st2tests.fixturesloader import FixturesLoader
 
 from st2tests.api import FunctionalTest
@@ -149,6 +156,34 @@ class TracesControllerTestCase(FunctionalTest,
         self.assertEqual(resp.json[0]['trace_tag'], self.trace3['trace_tag'],
                          'Correct trace not returned.')
 
+    def test_get_latency(self):
+        trigger_instance_id = self.trace3['trigger_instances'][0].object_id
+        start_timestamp = date_utils.get_datetime_utc_now()
+
+        span_db = TraceSpan.add_or_update(TraceSpanDB(
+            trace_id='a' * 32, span_id='b' * 16, name='TriggerInstanceDispatcher.process',
+            kind='consumer', service='rulesengine', resource_type='TriggerInstanceDB',
+            resource_id=trigger_instance_id, start_timestamp=start_timestamp,
+            end_timestamp=start_timestamp + datetime.timedelta(seconds=1),
+            queue_wait=0.5, duration=1.0, status='ok'))
+        self.addCleanup(TraceSpan.delete, span_db)
+
+        resp = self.app.get('/v1/traces/%s/latency' % self.trace3.id)
+        self.assertEqual(resp.status_int, 200)
+        self.assertEqual(resp.json['id'], str(self.trace3.id))
+        self.assertEqual(resp.json['queue_wait'], 0.5)
+        self.assertEqual(len(resp.json['spans']), 1)
+        self.assertEqual(resp.json['spans'][0]['name'], 'TriggerInstanceDispatcher.process')
+        self.assertEqual(resp.json['spans'][0]['resource_id'], trigger_instance_id)
+
+        resp = self.app.get('/v1/traces/%s/latency' % self.trace1.id)
+        self.assertEqual(resp.status_int, 200)
+        self.assertEqual(resp.json['spans'], [])
+
+    def test_get_latency_trace_doesnt_exist(self):
+        resp = self.app.get('/v1/traces/%s/latency' % str(bson.ObjectId()), expect_errors=True)
+        self.assertEqual(resp.status_int, 404)
+
     def _insert_mock_models(self):
         trace_ids = [trace['id'] for trace in self.models['traces'].values()]
         return trace_ids
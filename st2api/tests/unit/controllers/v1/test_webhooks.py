@@ -13,10 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import json
 
 import mock
 import six
+import unittest2
 from oslo_config import cfg
 
 import st2common.services.triggers as trigger_service
@@ -62,6 +64,9 @@ DUMMY_TRIGGER_DB.type = list(WEBHOOK_TRIGGER_TYPES.keys())[0]
 DUMMY_TRIGGER_API = TriggerAPI.from_model(DUMMY_TRIGGER_DB)
 DUMMY_TRIGGER_DICT = vars(DUMMY_TRIGGER_API)
 
+DUMMY_TRIGGER_DICT_WITH_ID = copy.deepcopy(DUMMY_TRIGGER_DICT)
+DUMMY_TRIGGER_DICT_WITH_ID['id'] = '5c5b3f4b9c7b2a1f1c8b4567'
+
 # 2. Custom TriggerType object
 DUMMY_TRIGGER_TYPE_DB = TriggerTypeDB(name='pr-merged', pack='git')
 DUMMY_TRIGGER_TYPE_DB.payload_schema = {
@@ -102,8 +107,6 @@ class TestWebhooksController(FunctionalTest):
 
     @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
         return_value=True))
-    @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
-        return_value=True))
     @mock.patch.object(HooksHolder, 'get_all', mock.MagicMock(
         return_value=[DUMMY_TRIGGER_DICT]))
     def test_get_all(self):
@@ -113,10 +116,8 @@ class TestWebhooksController(FunctionalTest):
 
     @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
         return_value=True))
-    @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
-        return_value=True))
-    @mock.patch.object(HooksHolder, 'get_triggers_for_hook', mock.MagicMock(
-        return_value=[DUMMY_TRIGGER_DICT]))
+    @mock.patch.object(HooksHolder, 'match', mock.MagicMock(
+        return_value=([DUMMY_TRIGGER_DICT], {})))
     @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
     def test_post(self, dispatch_mock):
         post_resp = self.__do_post('git', WEBHOOK_1, expect_errors=False)
@@ -125,10 +126,8 @@ class TestWebhooksController(FunctionalTest):
 
     @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
         return_value=True))
-    @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
-        return_value=True))
-    @mock.patch.object(HooksHolder, 'get_triggers_for_hook', mock.MagicMock(
-        return_value=[DUMMY_TRIGGER_DICT]))
+    @mock.patch.object(HooksHolder, 'match', mock.MagicMock(
+        return_value=([DUMMY_TRIGGER_DICT], {})))
     @mock.patch('st2common.services.triggers.get_trigger_type_db', mock.MagicMock(
         return_value=DUMMY_TRIGGER_TYPE_DB))
     @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
@@ -195,10 +194,8 @@ class TestWebhooksController(FunctionalTest):
 
     @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
         return_value=True))
-    @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
-        return_value=True))
-    @mock.patch.object(HooksHolder, 'get_triggers_for_hook', mock.MagicMock(
-        return_value=[DUMMY_TRIGGER_DICT]))
+    @mock.patch.object(HooksHolder, 'match', mock.MagicMock(
+        return_value=([DUMMY_TRIGGER_DICT], {})))
     @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
     def test_json_request_body(self, dispatch_mock):
         # 1. Send JSON using application/json content type
@@ -232,10 +229,8 @@ class TestWebhooksController(FunctionalTest):
 
     @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
         return_value=True))
-    @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
-        return_value=True))
-    @mock.patch.object(HooksHolder, 'get_triggers_for_hook', mock.MagicMock(
-        return_value=[DUMMY_TRIGGER_DICT]))
+    @mock.patch.object(HooksHolder, 'match', mock.MagicMock(
+        return_value=([DUMMY_TRIGGER_DICT], {})))
     @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
     def test_form_encoded_request_body(self, dispatch_mock):
         # Send request body as form urlencoded data
@@ -267,10 +262,8 @@ class TestWebhooksController(FunctionalTest):
 
     @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
         return_value=True))
-    @mock.patch.object(WebhooksController, '_is_valid_hook', mock.MagicMock(
-        return_value=True))
-    @mock.patch.object(HooksHolder, 'get_triggers_for_hook', mock.MagicMock(
-        return_value=[DUMMY_TRIGGER_DICT]))
+    @mock.patch.object(HooksHolder, 'match', mock.MagicMock(
+        return_value=([DUMMY_TRIGGER_DICT], {})))
     @mock.patch('st2common.services.triggers.get_trigger_type_db', mock.MagicMock(
         return_value=DUMMY_TRIGGER_TYPE_DB_2))
     @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
@@ -313,15 +306,113 @@ class TestWebhooksController(FunctionalTest):
         for trigger in test_triggers:
             controller.add_trigger(trigger)
 
-        self.assertTrue(controller._is_valid_hook('no_slash'))
-        self.assertFalse(controller._is_valid_hook('/no_slash'))
-        self.assertTrue(controller._is_valid_hook('with_leading_slash'))
-        self.assertTrue(controller._is_valid_hook('with_trailing_slash'))
-        self.assertTrue(controller._is_valid_hook('with_leading_trailing_slash'))
-        self.assertTrue(controller._is_valid_hook('with/mixed/slash'))
+        self.assertTrue('no_slash' in controller._hooks)
+        self.assertFalse('/no_slash' in controller._hooks)
+        self.assertTrue('with_leading_slash' in controller._hooks)
+        self.assertTrue('with_trailing_slash' in controller._hooks)
+        self.assertTrue('with_leading_trailing_slash' in controller._hooks)
+        self.assertTrue('with/mixed/slash' in controller._hooks)
+
+    @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
+        return_value=True))
+    @mock.patch.object(HooksHolder, 'match', mock.MagicMock(
+        return_value=([DUMMY_TRIGGER_DICT_WITH_ID], {'repo': 'st2'})))
+    @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
+    def test_post_only_trigger_reference_is_dispatched(self, dispatch_mock):
+        post_resp = self.__do_post('git/st2', WEBHOOK_1, expect_errors=False)
+        self.assertEqual(post_resp.status_int, http_client.ACCEPTED)
+        self.assertEqual(HooksHolder.match.call_count, 1)
+
+        trigger = dispatch_mock.call_args[0][0]
+        self.assertEqual(trigger, {'id': DUMMY_TRIGGER_DICT_WITH_ID['id'],
+                                   'ref': 'git.pr-merged',
+                                   'type': DUMMY_TRIGGER_DICT['type']})
+
+        payload = dispatch_mock.call_args[1]['payload']
+        self.assertEqual(payload['path_parameters'], {'repo': 'st2'})
+
+    @mock.patch.object(TriggerInstancePublisher, 'publish_trigger', mock.MagicMock(
+        return_value=True))
+    @mock.patch.object(HooksHolder, 'match', mock.MagicMock(
+        return_value=([DUMMY_TRIGGER_DICT], {})))
+    @mock.patch('st2common.transport.reactor.TriggerDispatcher.dispatch')
+    def test_post_whole_trigger_is_dispatched_if_id_is_missing(self, dispatch_mock):
+        post_resp = self.__do_post('git', WEBHOOK_1, expect_errors=False)
+        self.assertEqual(post_resp.status_int, http_client.ACCEPTED)
+
+        trigger = dispatch_mock.call_args[0][0]
+        self.assertEqual(trigger, DUMMY_TRIGGER_DICT)
+        self.assertNotIn('path_parameters', dispatch_mock.call_args[1]['payload'])
 
     def __do_post(self, hook, webhook, expect_errors=False, headers=None):
         return self.app.post_json('/v1/webhooks/' + hook,
                                   params=webhook,
                                   expect_errors=expect_errors,
                                   headers=headers)
+
+
+class HooksHolderTestCase(unittest2.TestCase):
+
+    def _get_trigger(self, trigger_id):
+        return {'id': trigger_id, 'ref': 'test.%s' % (trigger_id), 'type': 'core.st2.webhook'}
+
+    def test_exact_hooks(self):
+        hooks = HooksHolder()
+        trigger_1 = self._get_trigger('1')
+        trigger_2 = self._get_trigger('2')
+
+        hooks.add_hook('git', trigger_1)
+        hooks.add_hook('git', trigger_2)
+
+        self.assertTrue('git' in hooks)
+        self.assertFalse('git/foo' in hooks)
+        self.assertEqual(hooks.get_triggers_for_hook('git'), [trigger_1, trigger_2])
+        self.assertEqual(hooks.get_path_parameters_for_hook('git'), {})
+
+        self.assertTrue(hooks.remove_hook('git', trigger_1))
+        self.assertFalse(hooks.remove_hook('git', trigger_1))
+        self.assertEqual(hooks.get_all(), [trigger_2])
+
+        self.assertTrue(hooks.remove_hook('git', trigger_2))
+        self.assertFalse('git' in hooks)
+
+    def test_wildcard_and_parameter_hooks(self):
+        hooks = HooksHolder()
+        trigger_1 = self._get_trigger('1')
+        trigger_2 = self._get_trigger('2')
+        trigger_3 = self._get_trigger('3')
+
+        hooks.add_hook('github/{org}/{repo}', trigger_1)
+        hooks.add_hook('github/StackStorm/{repo}', trigger_2)
+        hooks.add_hook('alerts/*/critical', trigger_3)
+
+        self.assertEqual(hooks.get_triggers_for_hook('github/foo/bar'), [trigger_1])
+        self.assertEqual(hooks.get_path_parameters_for_hook('github/foo/bar'),
+                         {'org': 'foo', 'repo': 'bar'})
+
+        # The most specific pattern wins
+        self.assertEqual(hooks.get_triggers_for_hook('github/StackStorm/st2'), [trigger_2])
+        self.assertEqual(hooks.get_path_parameters_for_hook('github/StackStorm/st2'),
+                         {'repo': 'st2'})
+
+        self.assertEqual(hooks.get_triggers_for_hook('alerts/db/critical'), [trigger_3])
+        self.assertEqual(hooks.get_path_parameters_for_hook('alerts/db/critical'), {})
+
+        # Wildcards only match a single path segment
+        self.assertFalse('github/foo/bar/baz' in hooks)
+        self.assertFalse('alerts/db/1/critical' in hooks)
+
+        hooks.remove_hook('github/StackStorm/{repo}', trigger_2)
+        self.assertEqual(hooks.get_triggers_for_hook('github/StackStorm/st2'), [trigger_1])
+
+    def test_readers_keep_using_old_snapshot_while_table_is_updated(self):
+        hooks = HooksHolder()
+        trigger_1 = self._get_trigger('1')
+        hooks.add_hook('git', trigger_1)
+
+        snapshot = hooks._snapshot
+        hooks.add_hook('git', self._get_trigger('2'))
+        hooks.remove_hook('git', trigger_1)
+
+        self.assertEqual(snapshot.match('git'), ((trigger_1,), {}))
+        self.assertEqual(len(hooks.get_triggers_for_hook('git')), 1)
@@ -28,6 +28,7 @@ from st2client.models.core import ActionAliasResourceManager
 from st2client.models.core import ActionAliasExecutionManager
 from st2client.models.core import ExecutionResourceManager
 from st2client.models.core import InquiryResourceManager
+from st2client.models.core import TraceResourceManager
 from st2client.models.core import TriggerInstanceResourceManager
 from st2client.models.core import PackResourceManager
 from st2client.models.core import ConfigManager
@@ -161,7 +162,7 @@ class Client(object):
             models.Webhook, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
         self.managers['Timer'] = ResourceManager(
             models.Timer, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
-        self.managers['Trace'] = ResourceManager(
+        self.managers['Trace'] = TraceResourceManager(
             models.Trace, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
         self.managers['RuleEnforcement'] = ResourceManager(
             models.RuleEnforcement, self.endpoints['api'], cacert=self.cacert, debug=self.debug)
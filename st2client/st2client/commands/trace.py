@@ -15,6 +15,8 @@
 
 from __future__ import absolute_import
 
+import six
+
 from st2client.models import Resource, Trace, TriggerInstance, Rule, Execution
 from st2client.exceptions.operations import OperationFailureException
 from st2client.formatters import table
@@ -32,6 +34,9 @@ TRACE_COMPONENT_DISPLAY_LABELS = ['id', 'type', 'ref', 'updated_at']
 
 TRACE_DISPLAY_ATTRIBUTES = ['all']
 
+TRACE_LATENCY_DISPLAY_ATTRIBUTES = ['service', 'name', 'resource', 'offset_ms', 'queue_wait_ms',
+                                    'duration_ms', 'status']
+
 TRIGGER_INSTANCE_DISPLAY_OPTIONS = [
     'all',
     'trigger-instances',
@@ -61,6 +66,8 @@ class TraceBranch(resource.ResourceBranch):
                 'get': TraceGetCommand
             })
 
+        self.commands['latency'] = TraceLatencyCommand(self.resource, self.app, self.subparsers)
+
 
 class SingleTraceDisplayMixin(object):
 
@@ -364,3 +371,87 @@ class TraceGetCommand(resource.ResourceGetCommand, SingleTraceDisplayMixin):
             trace.trigger_instances = []
 
         return trace
+
+
+class TraceLatencyCommand(resource.ResourceCommand):
+    display_attributes = TRACE_LATENCY_DISPLAY_ATTRIBUTES
+
+    pk_argument_name = 'id'
+
+    def __init__(self, resource, *args, **kwargs):
+        super(TraceLatencyCommand, self).__init__(
+            resource, 'latency',
+            'Get latency breakdown (time spent waiting in a queue and processing in each of the '
+            'services) of a %s. Requires latency tracing to be enabled.' %
+            resource.get_display_name().lower(),
+            *args, **kwargs)
+
+        self.parser.add_argument('id', help='ID of the %s.' % resource.get_display_name().lower())
+
+    @resource.add_auth_token_to_kwargs_from_cli
+    def run(self, args, **kwargs):
+        return self.manager.get_latency(args.id, **kwargs)
+
+    def run_and_print(self, args, **kwargs):
+        latency = self.run(args, **kwargs)
+
+        if not latency:
+            self.print_not_found(args.id)
+            raise OperationFailureException('Trace %s not found.' % (args.id))
+
+        if args.json or args.yaml:
+            self.print_output(Resource(**latency), table.MultiColumnTable, json=args.json,
+                              yaml=args.yaml)
+            return
+
+        if not latency['spans']:
+            print('No latency tracing spans have been recorded for trace "%s". Make sure '
+                  'latency tracing is enabled (tracing.enable config option).' % (args.id))
+            return
+
+        print('Trace %s (%s): total %s ms, %s ms waiting in queues\n' %
+              (latency['id'], latency['trace_tag'], self._format_duration(latency['duration']),
+               self._format_duration(latency['queue_wait'])))
+
+        spans = [Resource(**item) for item in self._get_display_spans(latency['spans'])]
+        self.print_output(spans, table.MultiColumnTable, attributes=self.display_attributes)
+
+    @classmethod
+    def _get_display_spans(cls, spans):
+        # Child spans are indented under the parent span
+        depths = {}
+        span_ids = set([span['span_id'] for span in spans])
+
+        result = []
+        for span in spans:
+            parent_span_id = span.get('parent_span_id', None)
+
+            if parent_span_id in span_ids and parent_span_id in depths:
+                depth = depths[parent_span_id] + 1
+            else:
+                depth = 0
+
+            depths[span['span_id']] = depth
+
+            resource = None
+            if span.get('resource_id', None):
+                resource = '%s %s' % (span.get('resource_type', None), span['resource_id'])
+
+            result.append({
+                'service': span.get('service', None),
+                'name': '%s%s' % ('  ' * depth, span['name']),
+                'resource': resource,
+                'offset_ms': cls._format_duration(span.get('offset', None)),
+                'queue_wait_ms': cls._format_duration(span.get('queue_wait', None)),
+                'duration_ms': cls._format_duration(span.get('duration', None)),
+                'status': span.get('status', None)
+            })
+
+        return result
+
+    @staticmethod
+    def _format_duration(value):
+        if value is None:
+            return '-'
+
+        return six.text_type(round(value * 1000, 1))
@@ -454,6 +454,20 @@ class ExecutionResourceManager(ResourceManager):
         return [self.resource.deserialize(item) for item in response.json()]
 
 
+class TraceResourceManager(ResourceManager):
+    @add_auth_token_to_kwargs_from_env
+    def get_latency(self, trace_id, **kwargs):
+        url = '/%s/%s/latency' % (self.resource.get_url_path_name(), trace_id)
+
+        response = self.client.get(url, **kwargs)
+        if response.status_code == http_client.NOT_FOUND:
+            return None
+        if response.status_code != http_client.OK:
+            self.handle_error(response)
+
+        return response.json()
+
+
 class InquiryResourceManager(ResourceManager):
 
     @add_auth_token_to_kwargs_from_env
@@ -199,3 +199,30 @@ class TraceCommandTestCase(base.BaseCLITestCase):
         self.assertEquals(len(trace.action_executions), 1)
         self.assertEquals(len(trace.rules), 1)
         self.assertEquals(len(trace.trigger_instances), 1)
+
+    def test_trace_latency_display_spans(self):
+        spans = [
+            {'span_id': 's1', 'parent_span_id': None, 'name': 'webhook', 'service': 'api',
+             'offset': 0.0, 'queue_wait': None, 'duration': 0.0121, 'status': 'ok'},
+            {'span_id': 's2', 'parent_span_id': 's1', 'name': 'trigger.dispatch',
+             'service': 'api', 'offset': 0.001, 'queue_wait': None, 'duration': 0.002,
+             'status': 'ok'},
+            {'span_id': 's3', 'parent_span_id': 's2', 'name': 'TriggerInstanceDispatcher.process',
+             'service': 'rulesengine', 'resource_type': 'TriggerInstanceDB',
+             'resource_id': 't1', 'offset': 0.5, 'queue_wait': 0.4, 'duration': 0.1,
+             'status': 'ok'},
+            {'span_id': 's4', 'parent_span_id': 'unknown', 'name': 'Notifier.process',
+             'service': 'notifier', 'offset': 2.0, 'queue_wait': 0.01, 'duration': 0.02,
+             'status': 'error'}
+        ]
+
+        result = trace_commands.TraceLatencyCommand._get_display_spans(spans)
+        self.assertEqual([item['name'] for item in result],
+                         ['webhook', '  trigger.dispatch', '    TriggerInstanceDispatcher.process',
+                          'Notifier.process'])
+        self.assertEqual(result[0]['queue_wait_ms'], '-')
+        self.assertEqual(result[0]['duration_ms'], '12.1')
+        self.assertEqual(result[2]['resource'], 'TriggerInstanceDB t1')
+        self.assertEqual(result[2]['offset_ms'], '500.0')
+        self.assertEqual(result[2]['queue_wait_ms'], '400.0')
+        self.assertEqual(result[3]['status'], 'error')
@@ -67,7 +67,13 @@ setup(
         'st2common.metrics.driver': [
             'statsd = st2common.metrics.drivers.statsd_driver:StatsdDriver',
             'noop = st2common.metrics.drivers.noop_driver:NoopDriver',
-            'echo = st2common.metrics.drivers.echo_driver:EchoDriver'
+            'echo = st2common.metrics.drivers.echo_driver:EchoDriver',
+            'prometheus = st2common.metrics.drivers.prometheus_driver:PrometheusDriver'
+        ],
+        'st2common.tracing.sink': [
+            'database = st2common.tracing.sinks.database_sink:DatabaseSink',
+            'file = st2common.tracing.sinks.file_sink:FileSink',
+            'noop = st2common.tracing.sinks.noop_sink:NoopSink'
         ],
         'st2common.rbac.backend': [
             'noop = st2common.rbac.backends.noop:NoOpRBACBackend'
@@ -16,16 +16,17 @@
 from __future__ import absolute_import
 import os
 import re
+import time
 
 import six
 import jsonschema
 
 from st2common import log as logging
 from st2common.constants.meta import ALLOWED_EXTS
+from st2common.constants.types import ResourceType
 from st2common.bootstrap.base import ResourceRegistrar
 from st2common.persistence.action import Action
 from st2common.models.api.action import ActionAPI
-from st2common.models.system.common import ResourceReference
 import st2common.content.utils as content_utils
 import st2common.util.action_db as action_utils
 import st2common.validators.api.action as action_validator
@@ -56,20 +57,23 @@ class ActionsRegistrar(ResourceRegistrar):
         content = self._pack_loader.get_content(base_dirs=base_dirs,
                                                 content_type='actions')
 
-        for pack, actions_dir in six.iteritems(content):
-            if not actions_dir:
-                LOG.debug('Pack %s does not contain actions.', pack)
-                continue
-            try:
-                LOG.debug('Registering actions from pack %s:, dir: %s', pack, actions_dir)
-                actions = self._get_actions_from_pack(actions_dir)
-                count = self._register_actions_from_pack(pack=pack, actions=actions)
-                registered_count += count
-            except Exception as e:
-                if self._fail_on_failure:
-                    raise e
-
-                LOG.exception('Failed registering all actions from pack: %s', actions_dir)
+        try:
+            for pack, actions_dir in six.iteritems(content):
+                if not actions_dir:
+                    LOG.debug('Pack %s does not contain actions.', pack)
+                    continue
+                try:
+                    LOG.debug('Registering actions from pack %s:, dir: %s', pack, actions_dir)
+                    actions = self._get_actions_from_pack(actions_dir)
+                    count = self._register_actions_from_pack(pack=pack, actions=actions)
+                    registered_count += count
+                except Exception as e:
+                    if self._fail_on_failure:
+                        raise e
+
+                    LOG.exception('Failed registering all actions from pack: %s', actions_dir)
+        finally:
+            self._close_process_pool()
 
         return registered_count
 
@@ -102,6 +106,8 @@ class ActionsRegistrar(ResourceRegistrar):
                 raise e
 
             LOG.exception('Failed registering all actions from pack: %s', actions_dir)
+        finally:
+            self._close_process_pool()
 
         return registered_count
 
@@ -118,6 +124,29 @@ class ActionsRegistrar(ResourceRegistrar):
 
     def _register_action(self, pack, action):
         content = self._meta_loader.load(action)
+        model = self._get_action_db(pack=pack, action=action, content=content)
+
+        existing = action_utils.get_action_by_ref(model.ref)
+        if not existing:
+            LOG.debug('Action %s not found. Creating new one with: %s', model.ref, content)
+        else:
+            LOG.debug('Action %s found. Will be updated from: %s to: %s',
+                      model.ref, existing, model)
+            model.id = existing.id
+
+        try:
+            model = Action.add_or_update(model)
+            extra = {'action_db': model}
+            LOG.audit('Action updated. Action %s from %s.', model, action, extra=extra)
+        except Exception:
+            LOG.exception('Failed to write action to db %s.', model.name)
+            raise
+
+    def _get_action_db(self, pack, action, content):
+        """
+        Validate the action metadata file content and return ActionDB object (which hasn't been
+        written to the database yet).
+        """
         pack_field = content.get('pack', None)
         if not pack_field:
             content['pack'] = pack
@@ -168,60 +197,123 @@ class ActionsRegistrar(ResourceRegistrar):
             runner_type_db = None
 
         action_validator.validate_action(action_api, runner_type_db=runner_type_db)
-        model = ActionAPI.to_model(action_api)
+        return ActionAPI.to_model(action_api)
 
-        action_ref = ResourceReference.to_string_reference(pack=pack, name=str(content['name']))
-        existing = action_utils.get_action_by_ref(action_ref)
-        if not existing:
-            LOG.debug('Action %s not found. Creating new one with: %s', action_ref, content)
-        else:
-            LOG.debug('Action %s found. Will be updated from: %s to: %s',
-                      action_ref, existing, model)
-            model.id = existing.id
+    def _register_actions_from_pack(self, pack, actions):
+        """
+        Register actions from the provided metadata files. Metadata files are parsed first and all
+        the valid actions are then written to the database using a single bulk operation.
+        """
+        start_time = time.time()
 
-        try:
-            model = Action.add_or_update(model)
-            extra = {'action_db': model}
-            LOG.audit('Action updated. Action %s from %s.', model, action, extra=extra)
-        except Exception:
-            LOG.exception('Failed to write action to db %s.', model.name)
-            raise
+        changed_actions, content_hash_dbs = self._get_changed_metadata_files(
+            resource_type=ResourceType.ACTION, persistence_cls=Action, pack=pack,
+            file_paths=actions)
+        unchanged_count = len(actions) - len(changed_actions)
 
-    def _register_actions_from_pack(self, pack, actions):
-        registered_count = 0
-        for action in actions:
+        # Maps ref -> id of the actions from this pack which already exist in the database
+        existing_action_ids = {}
+
+        if changed_actions:
+            existing_action_ids = dict([(action_db.ref, action_db.id) for action_db in
+                                        Action.query(pack=pack, only_fields=['ref'])])
+
+        # List of (metadata file, ActionDB) tuples
+        action_dbs = []
+
+        for action, content, error in self._load_metadata_files(changed_actions):
             try:
                 LOG.debug('Loading action from %s.', action)
-                self._register_action(pack=pack, action=action)
+
+                if error:
+                    raise error
+
+                model = self._get_action_db(pack=pack, action=action, content=content)
+                model.id = existing_action_ids.get(model.ref, None)
             except Exception as e:
-                # We ignore mistral-v2 runner not found errors since those represent installations
-                # without Mistral
-                if 'mistral-v2 is not found' in six.text_type(e):
-                    continue
+                self._handle_action_registration_error(pack=pack, action=action, error=e)
+                continue
+
+            action_dbs.append((action, model))
+
+        registered_actions = self._write_actions(pack=pack, action_dbs=action_dbs)
+        self._save_content_hashes(content_hash_dbs=content_hash_dbs,
+                                  file_paths=registered_actions)
+
+        self._log_pack_resources_registered(resource_type=ResourceType.ACTION, pack=pack,
+                                            registered_count=len(registered_actions),
+                                            unchanged_count=unchanged_count,
+                                            start_time=start_time)
+
+        return len(registered_actions) + unchanged_count
 
-                if self._fail_on_failure:
-                    msg = ('Failed to register action "%s" from pack "%s": %s' % (action, pack,
-                                                                                  six.text_type(e)))
-                    raise ValueError(msg)
+    def _write_actions(self, pack, action_dbs):
+        """
+        Write actions to the database using a single bulk operation. If the bulk operation fails,
+        actions are written one by one so the failing action can be identified.
+
+        :return: Metadata files of the actions which have been written.
+        :rtype: ``list``
+        """
+        if not action_dbs:
+            return []
+
+        try:
+            Action.add_or_update_many([model for _, model in action_dbs])
+        except Exception:
+            LOG.debug('Bulk write of actions from pack "%s" failed, writing actions one by one.',
+                      pack, exc_info=True)
+        else:
+            for action, model in action_dbs:
+                extra = {'action_db': model}
+                LOG.audit('Action updated. Action %s from %s.', model, action, extra=extra)
+
+            return [action for action, _ in action_dbs]
 
-                LOG.exception('Unable to register action: %s', action)
+        written_actions = []
+
+        for action, model in action_dbs:
+            try:
+                model = Action.add_or_update(model)
+                extra = {'action_db': model}
+                LOG.audit('Action updated. Action %s from %s.', model, action, extra=extra)
+            except Exception as e:
+                LOG.exception('Failed to write action to db %s.', model.name)
+                self._handle_action_registration_error(pack=pack, action=action, error=e)
                 continue
-            else:
-                registered_count += 1
 
-        return registered_count
+            written_actions.append(action)
+
+        return written_actions
+
+    def _handle_action_registration_error(self, pack, action, error):
+        # We ignore mistral-v2 runner not found errors since those represent installations
+        # without Mistral
+        if 'mistral-v2 is not found' in six.text_type(error):
+            return
+
+        if self._fail_on_failure:
+            msg = ('Failed to register action "%s" from pack "%s": %s' % (action, pack,
+                                                                          six.text_type(error)))
+            raise ValueError(msg)
+
+        LOG.exception('Unable to register action: %s', action)
 
 
 def register_actions(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
-                     fail_on_failure=False):
+                     fail_on_failure=False, incremental=False, parallelism=1):
     if packs_base_paths:
         assert isinstance(packs_base_paths, list)
 
     if not packs_base_paths:
         packs_base_paths = content_utils.get_packs_base_paths()
 
+    # Runner types don't change during a single registration run
     registrar = ActionsRegistrar(use_pack_cache=use_pack_cache,
-                                 fail_on_failure=fail_on_failure)
+                                 use_runners_cache=True,
+                                 fail_on_failure=fail_on_failure,
+                                 incremental=incremental,
+                                 parallelism=parallelism)
 
     if pack_dir:
         result = registrar.register_from_pack(pack_dir=pack_dir)
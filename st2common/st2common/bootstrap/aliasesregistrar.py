@@ -15,12 +15,15 @@
 
 from __future__ import absolute_import
 import os
+import time
+
 import six
 
 import st2common.content.utils as content_utils
 
 from st2common import log as logging
 from st2common.constants.meta import ALLOWED_EXTS
+from st2common.constants.types import ResourceType
 from st2common.bootstrap.base import ResourceRegistrar
 from st2common.models.api.action import ActionAliasAPI
 from st2common.persistence.action import Action
@@ -167,9 +170,15 @@ class AliasesRegistrar(ResourceRegistrar):
             raise
 
     def _register_aliases_from_pack(self, pack, aliases):
-        registered_count = 0
+        start_time = time.time()
+        registered_aliases = []
+
+        changed_aliases, content_hash_dbs = self._get_changed_metadata_files(
+            resource_type=ResourceType.ACTION_ALIAS, persistence_cls=ActionAlias, pack=pack,
+            file_paths=aliases)
+        unchanged_count = len(aliases) - len(changed_aliases)
 
-        for alias in aliases:
+        for alias in changed_aliases:
             try:
                 LOG.debug('Loading alias from %s.', alias)
                 self._register_action_alias(pack, alias)
@@ -182,13 +191,20 @@ class AliasesRegistrar(ResourceRegistrar):
                 LOG.exception('Unable to register alias: %s', alias)
                 continue
             else:
-                registered_count += 1
+                registered_aliases.append(alias)
 
-        return registered_count
+        self._save_content_hashes(content_hash_dbs=content_hash_dbs,
+                                  file_paths=registered_aliases)
+        self._log_pack_resources_registered(resource_type=ResourceType.ACTION_ALIAS, pack=pack,
+                                            registered_count=len(registered_aliases),
+                                            unchanged_count=unchanged_count,
+                                            start_time=start_time)
+
+        return len(registered_aliases) + unchanged_count
 
 
 def register_aliases(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
-                     fail_on_failure=False):
+                     fail_on_failure=False, incremental=False):
 
     if packs_base_paths:
         assert isinstance(packs_base_paths, list)
@@ -197,7 +213,8 @@ def register_aliases(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
         packs_base_paths = content_utils.get_packs_base_paths()
 
     registrar = AliasesRegistrar(use_pack_cache=use_pack_cache,
-                                 fail_on_failure=fail_on_failure)
+                                 fail_on_failure=fail_on_failure,
+                                 incremental=incremental)
 
     if pack_dir:
         result = registrar.register_from_pack(pack_dir=pack_dir)
@@ -16,24 +16,33 @@
 from __future__ import absolute_import
 import os
 import glob
+import time
+import hashlib
+import multiprocessing
 
 import six
 
+from st2common import __version__
 from st2common import log as logging
 from st2common.constants.pack import CONFIG_SCHEMA_FILE_NAME
 from st2common.content.loader import MetaLoader
 from st2common.content.loader import ContentPackLoader
 from st2common.models.api.pack import PackAPI
 from st2common.models.api.pack import ConfigSchemaAPI
+from st2common.models.db.pack import ContentHashDB
 from st2common.persistence.pack import Pack
 from st2common.persistence.pack import ConfigSchema
+from st2common.persistence.pack import ContentHash
+from st2common.content.utils import get_relative_path_to_pack_file
 from st2common.util.file_system import get_file_list
 from st2common.util.pack import get_pack_metadata
 from st2common.util.pack import get_pack_ref_from_metadata
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
 
 __all__ = [
-    'ResourceRegistrar'
+    'ResourceRegistrar',
+
+    'get_file_content_hash'
 ]
 
 LOG = logging.getLogger(__name__)
@@ -49,11 +58,47 @@ EXCLUDE_FILE_PATTERNS = [
     '.git/*'
 ]
 
+# Metadata files are only parsed in the worker processes when there are at least this many files
+# to parse, otherwise the overhead of the inter process communication is not worth it
+MIN_PARALLEL_METADATA_FILES = 20
+
+
+def get_file_content_hash(file_path):
+    """
+    Return hash of the file content.
+
+    StackStorm version is included in the hash so all the resources are registered again after an
+    upgrade.
+
+    :rtype: ``str``
+    """
+    content_hash = hashlib.sha256()
+    content_hash.update(__version__.encode('utf-8'))
+
+    with open(file_path, 'rb') as fp:
+        content_hash.update(fp.read())
+
+    return content_hash.hexdigest()
+
+
+def _load_metadata_file(file_path):
+    """
+    Load and parse a single metadata file. Errors are returned instead of raised so this function
+    can be used in a process pool.
+
+    :rtype: ``tuple`` of (file_path, content, error)
+    """
+    try:
+        return file_path, MetaLoader().load(file_path), None
+    except Exception as e:
+        return file_path, None, e
+
 
 class ResourceRegistrar(object):
     ALLOWED_EXTENSIONS = []
 
-    def __init__(self, use_pack_cache=True, use_runners_cache=False, fail_on_failure=False):
+    def __init__(self, use_pack_cache=True, use_runners_cache=False, fail_on_failure=False,
+                 incremental=False, parallelism=1):
         """
         :param use_pack_cache: True to cache which packs have been registered in memory and making
                                 sure packs are only registered once.
@@ -65,10 +110,19 @@ class ResourceRegistrar(object):
 
         :param fail_on_failure: Throw an exception if resource registration fails.
         :type fail_on_failure: ``bool``
+
+        :param incremental: True to skip resources whose metadata files haven't changed since they
+                            have last been successfully registered.
+        :type incremental: ``bool``
+
+        :param parallelism: Number of worker processes which are used to parse metadata files.
+        :type parallelism: ``int``
         """
         self._use_pack_cache = use_pack_cache
         self._use_runners_cache = use_runners_cache
         self._fail_on_failure = fail_on_failure
+        self._incremental = incremental
+        self._parallelism = parallelism
 
         self._meta_loader = MetaLoader()
         self._pack_loader = ContentPackLoader()
@@ -76,6 +130,9 @@ class ResourceRegistrar(object):
         # Maps runner name -> RunnerTypeDB
         self._runner_type_db_cache = {}
 
+        # Pool of worker processes which parse metadata files (created lazily)
+        self._process_pool = None
+
     def get_resources_from_pack(self, resources_dir):
         resources = []
         for ext in self.ALLOWED_EXTENSIONS:
@@ -136,6 +193,111 @@ class ResourceRegistrar(object):
 
         return pack_db
 
+    def _get_changed_metadata_files(self, resource_type, persistence_cls, pack, file_paths):
+        """
+        Return metadata files which need to be registered and content hashes of those files.
+
+        When incremental registration is enabled, files whose content hash matches the hash stored
+        during the last successful registration are skipped, as long as the resource they define
+        still exists in the database.
+
+        :param persistence_cls: Persistence class of the resource defined in the metadata files.
+
+        :return: (list of file paths, dict mapping file path to ContentHashDB)
+        :rtype: ``tuple``
+        """
+        if not self._incremental:
+            return file_paths, {}
+
+        content_hash_dbs = ContentHash.query(resource_type=resource_type, pack=pack)
+        content_hash_dbs = dict([(content_hash_db.file_path, content_hash_db)
+                                 for content_hash_db in content_hash_dbs])
+
+        resource_dbs = persistence_cls.query(pack=pack, only_fields=['metadata_file'])
+        registered_metadata_files = set([resource_db.metadata_file for resource_db in resource_dbs])
+
+        changed_file_paths = []
+        changed_content_hash_dbs = {}
+
+        for file_path in file_paths:
+            content_hash = get_file_content_hash(file_path)
+            content_hash_db = content_hash_dbs.get(file_path, None)
+
+            if (content_hash_db and content_hash_db.hash == content_hash and
+                    content_hash_db.metadata_file in registered_metadata_files):
+                LOG.debug('Metadata file "%s" hasn\'t changed, skipping it.', file_path)
+                continue
+
+            if not content_hash_db:
+                content_hash_db = ContentHashDB(resource_type=resource_type, pack=pack,
+                                                file_path=file_path)
+
+            try:
+                content_hash_db.metadata_file = get_relative_path_to_pack_file(
+                    pack_ref=pack, file_path=file_path, use_pack_cache=True)
+            except ValueError:
+                # File is outside of the pack directory so it's always registered
+                content_hash_db.metadata_file = None
+
+            content_hash_db.hash = content_hash
+
+            changed_file_paths.append(file_path)
+            changed_content_hash_dbs[file_path] = content_hash_db
+
+        return changed_file_paths, changed_content_hash_dbs
+
+    def _save_content_hashes(self, content_hash_dbs, file_paths):
+        """
+        Store content hashes of the metadata files which have been successfully registered.
+        """
+        content_hash_dbs = [content_hash_dbs[file_path] for file_path in file_paths
+                            if file_path in content_hash_dbs]
+
+        if not content_hash_dbs:
+            return
+
+        try:
+            ContentHash.add_or_update_many(content_hash_dbs, publish=False,
+                                           dispatch_trigger=False)
+        except Exception:
+            # Not fatal, those files will simply be registered again during the next run
+            LOG.exception('Failed to store content hashes of the registered metadata files.')
+
+    def _load_metadata_files(self, file_paths):
+        """
+        Load and parse the provided metadata files. When parallelism is greater than 1, files are
+        parsed in a pool of worker processes.
+
+        :return: List of (file_path, content, error) tuples in the same order as file_paths.
+        :rtype: ``list``
+        """
+        if self._parallelism <= 1 or len(file_paths) < MIN_PARALLEL_METADATA_FILES:
+            return [_load_metadata_file(file_path) for file_path in file_paths]
+
+        if not self._process_pool:
+            self._process_pool = multiprocessing.Pool(processes=self._parallelism)
+
+        try:
+            return self._process_pool.map(_load_metadata_file, file_paths)
+        except Exception:
+            LOG.warning('Failed to parse metadata files in worker processes, parsing them in '
+                        'the main process.', exc_info=True)
+            return [_load_metadata_file(file_path) for file_path in file_paths]
+
+    def _close_process_pool(self):
+        if not self._process_pool:
+            return
+
+        self._process_pool.close()
+        self._process_pool.join()
+        self._process_pool = None
+
+    def _log_pack_resources_registered(self, resource_type, pack, registered_count,
+                                       unchanged_count, start_time):
+        LOG.info('Registered %s resources of type "%s" from pack "%s" in %.3f seconds '
+                 '(%s unchanged).', registered_count, resource_type, pack,
+                 (time.time() - start_time), unchanged_count)
+
     def _register_pack(self, pack_name, pack_dir):
         """
         Register a pack and corresponding pack config schema (create a DB object in the system).
@@ -18,11 +18,13 @@ import glob
 import os
 import six
 import sys
+import time
 
 import st2common.content.utils as content_utils
 
 from st2common import log as logging
 from st2common.constants.meta import ALLOWED_EXTS
+from st2common.constants.types import ResourceType
 from st2common.bootstrap.base import ResourceRegistrar
 from st2common.models.api.policy import PolicyTypeAPI, PolicyAPI
 from st2common.persistence.policy import PolicyType, Policy
@@ -113,9 +115,15 @@ class PolicyRegistrar(ResourceRegistrar):
         return self.get_resources_from_pack(resources_dir=policies_dir)
 
     def _register_policies_from_pack(self, pack, policies):
-        registered_count = 0
+        start_time = time.time()
+        registered_policies = []
+
+        changed_policies, content_hash_dbs = self._get_changed_metadata_files(
+            resource_type=ResourceType.POLICY, persistence_cls=Policy, pack=pack,
+            file_paths=policies)
+        unchanged_count = len(policies) - len(changed_policies)
 
-        for policy in policies:
+        for policy in changed_policies:
             try:
                 LOG.debug('Loading policy from %s.', policy)
                 self._register_policy(pack=pack, policy=policy)
@@ -128,9 +136,16 @@ class PolicyRegistrar(ResourceRegistrar):
                 LOG.exception('Unable to register policy: %s', policy)
                 continue
             else:
-                registered_count += 1
+                registered_policies.append(policy)
 
-        return registered_count
+        self._save_content_hashes(content_hash_dbs=content_hash_dbs,
+                                  file_paths=registered_policies)
+        self._log_pack_resources_registered(resource_type=ResourceType.POLICY, pack=pack,
+                                            registered_count=len(registered_policies),
+                                            unchanged_count=unchanged_count,
+                                            start_time=start_time)
+
+        return len(registered_policies) + unchanged_count
 
     def _register_policy(self, pack, policy):
         content = self._meta_loader.load(policy)
@@ -204,7 +219,7 @@ def register_policy_types(module):
 
 
 def register_policies(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
-                     fail_on_failure=False):
+                     fail_on_failure=False, incremental=False):
     if packs_base_paths:
         assert isinstance(packs_base_paths, list)
 
@@ -212,7 +227,8 @@ def register_policies(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
         packs_base_paths = content_utils.get_packs_base_paths()
 
     registrar = PolicyRegistrar(use_pack_cache=use_pack_cache,
-                                fail_on_failure=fail_on_failure)
+                                fail_on_failure=fail_on_failure,
+                                incremental=incremental)
 
     if pack_dir:
         result = registrar.register_from_pack(pack_dir=pack_dir)
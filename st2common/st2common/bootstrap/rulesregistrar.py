@@ -15,12 +15,14 @@
 
 from __future__ import absolute_import
 import os
+import time
 
 import six
 
 from st2common import log as logging
 from st2common.constants.meta import ALLOWED_EXTS
 from st2common.constants.pack import DEFAULT_PACK_NAME
+from st2common.constants.types import ResourceType
 from st2common.bootstrap.base import ResourceRegistrar
 from st2common.models.api.rule import RuleAPI
 from st2common.models.system.common import ResourceReference
@@ -104,10 +106,16 @@ class RulesRegistrar(ResourceRegistrar):
         return self.get_resources_from_pack(resources_dir=rules_dir)
 
     def _register_rules_from_pack(self, pack, rules):
-        registered_count = 0
+        start_time = time.time()
+        registered_rules = []
+
+        changed_rules, content_hash_dbs = self._get_changed_metadata_files(
+            resource_type=ResourceType.RULE, persistence_cls=Rule, pack=pack,
+            file_paths=rules)
+        unchanged_count = len(rules) - len(changed_rules)
 
         # TODO: Refactor this monstrosity
-        for rule in rules:
+        for rule in changed_rules:
             LOG.debug('Loading rule from %s.', rule)
             try:
                 content = self._meta_loader.load(rule)
@@ -177,13 +185,20 @@ class RulesRegistrar(ResourceRegistrar):
 
                 LOG.exception('Failed registering rule from %s.', rule)
             else:
-                registered_count += 1
+                registered_rules.append(rule)
 
-        return registered_count
+        self._save_content_hashes(content_hash_dbs=content_hash_dbs,
+                                  file_paths=registered_rules)
+        self._log_pack_resources_registered(resource_type=ResourceType.RULE, pack=pack,
+                                            registered_count=len(registered_rules),
+                                            unchanged_count=unchanged_count,
+                                            start_time=start_time)
+
+        return len(registered_rules) + unchanged_count
 
 
 def register_rules(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
-                   fail_on_failure=False):
+                   fail_on_failure=False, incremental=False):
     if packs_base_paths:
         assert isinstance(packs_base_paths, list)
 
@@ -191,7 +206,8 @@ def register_rules(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
         packs_base_paths = content_utils.get_packs_base_paths()
 
     registrar = RulesRegistrar(use_pack_cache=use_pack_cache,
-                               fail_on_failure=fail_on_failure)
+                               fail_on_failure=fail_on_failure,
+                               incremental=incremental)
 
     if pack_dir:
         result = registrar.register_from_pack(pack_dir=pack_dir)
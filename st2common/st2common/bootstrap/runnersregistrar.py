@@ -23,6 +23,7 @@ from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.models.api.action import RunnerTypeAPI
 from st2common.persistence.runner import RunnerType
 from st2common.constants.runners import RUNNERS_NAMESPACE
+from st2common.runners.registry import reload_registry
 from st2common.util.action_db import get_runnertype_by_name
 
 __all__ = [
@@ -50,6 +51,9 @@ def register_runners(experimental=False, fail_on_failure=True):
         runner_metadata = manager.driver.get_metadata()
         runner_count += register_runner(runner_metadata, experimental)
 
+    # Make sure newly installed runners are picked up by this process
+    reload_registry()
+
     LOG.debug('End : register runners')
 
     return runner_count
@@ -16,11 +16,13 @@
 from __future__ import absolute_import
 
 import os
+import time
 
 import six
 
 from st2common import log as logging
 from st2common.constants.meta import ALLOWED_EXTS
+from st2common.constants.types import ResourceType
 from st2common.bootstrap.base import ResourceRegistrar
 import st2common.content.utils as content_utils
 from st2common.models.api.sensor import SensorTypeAPI
@@ -109,8 +111,15 @@ class SensorsRegistrar(ResourceRegistrar):
         return self.get_resources_from_pack(resources_dir=sensors_dir)
 
     def _register_sensors_from_pack(self, pack, sensors):
-        registered_count = 0
-        for sensor in sensors:
+        start_time = time.time()
+        registered_sensors = []
+
+        changed_sensors, content_hash_dbs = self._get_changed_metadata_files(
+            resource_type=ResourceType.SENSOR_TYPE, persistence_cls=SensorType, pack=pack,
+            file_paths=sensors)
+        unchanged_count = len(sensors) - len(changed_sensors)
+
+        for sensor in changed_sensors:
             try:
                 self._register_sensor_from_pack(pack=pack, sensor=sensor)
             except Exception as e:
@@ -122,9 +131,16 @@ class SensorsRegistrar(ResourceRegistrar):
                 LOG.debug('Failed to register sensor "%s": %s', sensor, six.text_type(e))
             else:
                 LOG.debug('Sensor "%s" successfully registered', sensor)
-                registered_count += 1
+                registered_sensors.append(sensor)
 
-        return registered_count
+        self._save_content_hashes(content_hash_dbs=content_hash_dbs,
+                                  file_paths=registered_sensors)
+        self._log_pack_resources_registered(resource_type=ResourceType.SENSOR_TYPE, pack=pack,
+                                            registered_count=len(registered_sensors),
+                                            unchanged_count=unchanged_count,
+                                            start_time=start_time)
+
+        return len(registered_sensors) + unchanged_count
 
     def _register_sensor_from_pack(self, pack, sensor):
         sensor_metadata_file_path = sensor
@@ -176,7 +192,7 @@ class SensorsRegistrar(ResourceRegistrar):
 
 
 def register_sensors(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
-                     fail_on_failure=False):
+                     fail_on_failure=False, incremental=False):
     if packs_base_paths:
         assert isinstance(packs_base_paths, list)
 
@@ -184,7 +200,8 @@ def register_sensors(packs_base_paths=None, pack_dir=None, use_pack_cache=True,
         packs_base_paths = content_utils.get_packs_base_paths()
 
     registrar = SensorsRegistrar(use_pack_cache=use_pack_cache,
-                                 fail_on_failure=fail_on_failure)
+                                 fail_on_failure=fail_on_failure,
+                                 incremental=incremental)
 
     if pack_dir:
         result = registrar.register_from_pack(pack_dir=pack_dir)
@@ -148,6 +148,15 @@ def register_opts(ignore_errors=False):
             help='A URL pointing to the pack index. StackStorm Exchange is used by '
                  'default. Use a comma-separated list for multiple indexes if you '
                  'want to get other packs discovered with "st2 pack search".'),
+        cfg.IntOpt(
+            'metadata_cache_size', default=1000,
+            help='Max number of parsed workflow definition files (orquesta, action chain) kept in '
+                 'the in-process cache of each action runner. Cached files are only parsed '
+                 'again when they change. 0 to disable.'),
+        cfg.BoolOpt(
+            'cache_workflow_specs', default=False,
+            help='Also cache compiled orquesta workflow specs so they are not instantiated from '
+                 'the parsed workflow definition on each run.')
     ]
 
     do_register_opts(content_opts, 'content', ignore_errors)
@@ -284,7 +293,12 @@ def register_opts(ignore_errors=False):
             help='True to mask secrets in the log files.'),
         cfg.ListOpt(
             'mask_secrets_blacklist', default=[],
-            help='Blacklist of additional attribute names to mask in the log messages.')
+            help='Blacklist of additional attribute names to mask in the log messages.'),
+        cfg.IntOpt(
+            'max_extra_attribute_length', default=10000,
+            help='Maximum length of a string value in the serialized "extra" log record '
+                 'attributes (e.g. serialized database objects). Longer values are truncated. '
+                 '0 means no limit.')
     ]
 
     do_register_opts(log_opts, 'log', ignore_errors)
@@ -302,7 +316,12 @@ def register_opts(ignore_errors=False):
             help='List of origins allowed for api, auth and stream'),
         cfg.BoolOpt(
             'mask_secrets', default=True,
-            help='True to mask secrets in the API responses')
+            help='True to mask secrets in the API responses'),
+        cfg.BoolOpt(
+            'action_alias_index', default=False,
+            help='Match ChatOps commands against an in-memory index of precompiled action alias '
+                 'formats instead of loading and compiling all the aliases for each command. '
+                 'Index is rebuilt when an action alias is created, updated or deleted.')
     ]
 
     do_register_opts(api_opts, 'api', ignore_errors)
@@ -335,7 +354,20 @@ def register_opts(ignore_errors=False):
         # This TTL is used for tokens which belong to StackStorm services
         cfg.IntOpt(
             'service_token_ttl', default=(24 * 60 * 60),
-            help='Service token ttl in seconds.')
+            help='Service token ttl in seconds.'),
+        cfg.StrOpt(
+            'execution_token_signing_key', default=None, secret=True,
+            help='Secret key used to sign stateless auth tokens which are issued to action '
+                 'executions. When set, execution tokens are verified using the signature '
+                 'instead of being stored in the database. Needs to be the same for all the '
+                 'services. NOTE: Signed tokens can\'t be revoked - unlike the tokens stored in '
+                 'the database they are not deleted when the execution finishes and stay valid '
+                 'until they expire (see execution_token_ttl).'),
+        cfg.IntOpt(
+            'execution_token_ttl', default=(60 * 60),
+            help='TTL (in seconds) of the signed execution auth tokens for actions without a '
+                 'timeout. For actions with a timeout, the token expires one minute after the '
+                 'action timeout. Never longer than service_token_ttl.')
     ]
 
     do_register_opts(auth_opts, 'auth', ignore_errors)
@@ -373,7 +405,12 @@ def register_opts(ignore_errors=False):
                  'creates pack virtualenv.'),
         cfg.BoolOpt(
             'stream_output', default=True,
-            help='True to store and stream action output (stdout and stderr) in real-time.')
+            help='True to store and stream action output (stdout and stderr) in real-time.'),
+        cfg.IntOpt(
+            'dispatch_cache_size', default=1000,
+            help='Maximum number of actions, runner types and rendered pack configs (per pack '
+                 'and user) to keep in memory when dispatching action executions. Entries are '
+                 'invalidated when the corresponding resource changes. 0 disables the cache.')
     ]
 
     do_register_opts(action_runner_opts, group='actionrunner')
@@ -405,11 +442,71 @@ def register_opts(ignore_errors=False):
             help='Use the .ssh/config file. Useful to override ports etc.'),
         cfg.StrOpt(
             'ssh_config_file_path', default='~/.ssh/config',
-            help='Path to the ssh config file.')
+            help='Path to the ssh config file.'),
+        cfg.BoolOpt(
+            'use_connection_pool', default=False,
+            help='Re-use SSH connections across action executions. Works only with Paramiko SSH '
+                 'runner.'),
+        cfg.IntOpt(
+            'connection_pool_max_idle_time', default=300,
+            help='How long (in seconds) an unused pooled connection is kept open.'),
+        cfg.IntOpt(
+            'connection_pool_max_channels_per_connection', default=8,
+            help='Max number of executions which can share a single pooled connection. New '
+                 'connection to the same host is opened once all the existing connections are '
+                 'at the limit (number of connections per host is not limited).'),
+        cfg.IntOpt(
+            'connection_pool_keepalive_interval', default=30,
+            help='How often (in seconds) to send keepalive messages over the pooled '
+                 'connections. 0 to disable.'),
+        cfg.IntOpt(
+            'stream_results_hosts_threshold', default=0,
+            help='Store result of each host as an execution output record and only keep aggregate '
+                 'counts in the execution result when action runs on at least this many hosts. '
+                 '0 to disable.'),
+        cfg.IntOpt(
+            'stream_results_max_output_size', default=65536,
+            help='Max size (in characters) of stdout and stderr of each host result when results '
+                 'are streamed. 0 for no limit.'),
+        cfg.StrOpt(
+            'stream_results_truncation_policy', default='tail',
+            choices=['head', 'tail', 'summary'],
+            help='How stdout and stderr of each host result are truncated when results are '
+                 'streamed (head - keep the beginning, tail - keep the end, summary - only keep '
+                 'return code and output sizes).')
     ]
 
     do_register_opts(ssh_runner_opts, group='ssh_runner')
 
+    http_runner_opts = [
+        cfg.BoolOpt(
+            'use_session_pool', default=False,
+            help='Re-use HTTP sessions (and keep-alive connections) across action executions.'),
+        cfg.IntOpt(
+            'session_pool_max_sessions', default=100,
+            help='Max number of sessions (one per scheme, host, verify and proxy combination) '
+                 'kept in the pool.'),
+        cfg.IntOpt(
+            'session_pool_max_connections_per_host', default=10,
+            help='Max number of concurrent connections to a single host when session pool is '
+                 'used. Requests wait for a free connection for at most the request timeout.'),
+        cfg.IntOpt(
+            'max_response_size', default=0,
+            help='Max size (in bytes) of the response body which is read and stored in the '
+                 'execution result. Body is truncated once the limit is reached. 0 for no limit.')
+    ]
+
+    do_register_opts(http_runner_opts, group='http_runner')
+
+    local_runner_opts = [
+        cfg.BoolOpt(
+            'direct_exec', default=False,
+            help='Execute commands which don\'t use any shell features and scripts with a '
+                 'shebang line directly instead of through a shell when sudo is not needed.')
+    ]
+
+    do_register_opts(local_runner_opts, group='local_runner')
+
     # Common options (used by action runner and sensor container)
     action_sensor_opts = [
         cfg.BoolOpt(
@@ -580,12 +677,88 @@ def register_opts(ignore_errors=False):
             'sample_rate', default=1,
             help='Randomly sample and only send metrics for X% of metric operations to the '
                  'backend. Default value of 1 means no sampling is done and all the metrics are '
-                 'sent to the backend. E.g. 0.1 would mean 10% of operations are sampled.')
-
+                 'sent to the backend. E.g. 0.1 would mean 10% of operations are sampled.'),
+        cfg.IntOpt(
+            'flush_interval', default=60,
+            help='How often (in seconds) "prometheus" driver calculates timer percentiles and '
+                 'flushes aggregated metrics to the export driver.'),
+        cfg.StrOpt(
+            'export_driver', default='noop',
+            help='Driver which metrics aggregated by the "prometheus" driver are periodically '
+                 'flushed to (e.g. statsd).'),
+        cfg.ListOpt(
+            'percentiles', default=['50', '90', '99'],
+            help='Timer percentiles calculated by the "prometheus" driver.'),
+        cfg.StrOpt(
+            'prometheus_host', default='127.0.0.1',
+            help='Host the Prometheus metrics endpoint of the services listens on.'),
+        cfg.DictOpt(
+            'prometheus_ports', default={},
+            help='Port the Prometheus metrics endpoint listens on for each service (e.g. '
+                 'api:9101,stream:9102,auth:9100,rulesengine:9110). Endpoint is only started for '
+                 'the services listed here and only if "prometheus" driver is used. Metrics are '
+                 'never exposed on the public API, stream and auth ports.')
     ]
 
     do_register_opts(metrics_opts, group='metrics', ignore_errors=ignore_errors)
 
+    # Latency tracing options
+    tracing_opts = [
+        cfg.BoolOpt(
+            'enable', default=False,
+            help='True to record spans with per service queue wait and processing time for each '
+                 'message and propagate tracing context between the services.'),
+        cfg.StrOpt(
+            'sink', default='database',
+            help='Sink recorded spans are exported to (database, file, noop). Spans stored in the '
+                 'database can be viewed using "st2 trace latency" command and are deleted by the '
+                 'garbage collector (see garbagecollector.trace_spans_ttl).'),
+        cfg.StrOpt(
+            'file_path', default='/var/log/st2/st2.traces.otlp.json',
+            help='Path to the file spans are written to in the OTLP JSON format when using the '
+                 '"file" sink.'),
+        cfg.IntOpt(
+            'batch_size', default=100,
+            help='Maximum number of spans the "database" sink writes to the database in a single '
+                 'bulk insert.'),
+        cfg.FloatOpt(
+            'flush_interval', default=2.0,
+            help='How often (in seconds) the "database" sink writes buffered spans to the '
+                 'database. Spans are written sooner once there are "batch_size" spans buffered.'),
+        cfg.IntOpt(
+            'max_buffer_size', default=10000,
+            help='Maximum number of spans the "database" sink buffers in memory. New spans are '
+                 'dropped once the buffer is full.')
+    ]
+
+    do_register_opts(tracing_opts, group='tracing', ignore_errors=ignore_errors)
+
+    # Sampling profiler options
+    profiler_opts = [
+        cfg.BoolOpt(
+            'enable', default=False,
+            help='True to enable sampling profiler. Profiling session is started using SIGPROF '
+                 'signal or "POST /v1/profiler" API endpoint.'),
+        cfg.IntOpt(
+            'sample_rate', default=100,
+            help='How many stack samples per second are taken while profiling.'),
+        cfg.IntOpt(
+            'duration', default=30,
+            help='Default duration of a profiling session (in seconds).'),
+        cfg.StrOpt(
+            'output_dir', default='/var/log/st2/profiles',
+            help='Directory collapsed stacks and green threads listings are written to.'),
+        cfg.BoolOpt(
+            'continuous', default=False,
+            help='True to profile continuously and dump the profile every dump_interval '
+                 'seconds. Use lower sample_rate to reduce the overhead.'),
+        cfg.IntOpt(
+            'dump_interval', default=300,
+            help='How often (in seconds) profile is dumped in continuous mode.')
+    ]
+
+    do_register_opts(profiler_opts, group='profiler', ignore_errors=ignore_errors)
+
     # Common timers engine options
     timer_logging_opts = [
         cfg.StrOpt(
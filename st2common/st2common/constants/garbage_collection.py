@@ -17,7 +17,8 @@ __all__ = [
     'DEFAULT_COLLECTION_INTERVAL',
     'DEFAULT_SLEEP_DELAY',
     'MINIMUM_TTL_DAYS',
-    'MINIMUM_TTL_DAYS_EXECUTION_OUTPUT'
+    'MINIMUM_TTL_DAYS_EXECUTION_OUTPUT',
+    'MINIMUM_TTL_DAYS_TRACE_SPANS'
 ]
 
 
@@ -32,3 +33,6 @@ MINIMUM_TTL_DAYS = 7
 
 # Minimum TTL in days for action execution output objects.
 MINIMUM_TTL_DAYS_EXECUTION_OUTPUT = 1
+
+# Minimum TTL in days for latency tracing spans.
+MINIMUM_TTL_DAYS_TRACE_SPANS = 1
@@ -14,7 +14,7 @@
 # limitations under the License.
 
 from __future__ import absolute_import
-import yaml
+from st2common.util import yaml_loader
 
 __all__ = [
     'ALLOWED_EXTS',
@@ -22,4 +22,4 @@ __all__ = [
 ]
 
 ALLOWED_EXTS = ['.yaml', '.yml']
-PARSER_FUNCS = {'.yml': yaml.safe_load, '.yaml': yaml.safe_load}
+PARSER_FUNCS = {'.yml': yaml_loader.safe_load, '.yaml': yaml_loader.safe_load}
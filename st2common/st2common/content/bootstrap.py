@@ -63,6 +63,12 @@ def register_opts():
         cfg.StrOpt('runner-dir', default=None, help='Directory to load runners from.'),
         cfg.BoolOpt('setup-virtualenvs', default=False, help=('Setup Python virtual environments '
                                                               'all the Python runner actions.')),
+        cfg.BoolOpt('incremental', default=False,
+                    help=('Skip sensors, actions, rules, aliases and policies whose metadata '
+                          'files haven\'t changed since they have last been registered.')),
+        cfg.IntOpt('parallelism', default=1,
+                   help=('Number of worker processes which are used to parse action metadata '
+                         'files.')),
 
         # General options
         # Note: This value should default to False since we want fail on failure behavior by
@@ -165,7 +171,8 @@ def register_sensors():
         with Timer(key='st2.register.sensors'):
             registered_count = sensors_registrar.register_sensors(
                 pack_dir=pack_dir,
-                fail_on_failure=fail_on_failure
+                fail_on_failure=fail_on_failure,
+                incremental=cfg.CONF.register.incremental
             )
     except Exception as e:
         exc_info = not fail_on_failure
@@ -219,7 +226,9 @@ def register_actions():
         with Timer(key='st2.register.actions'):
             registered_count = actions_registrar.register_actions(
                 pack_dir=pack_dir,
-                fail_on_failure=fail_on_failure
+                fail_on_failure=fail_on_failure,
+                incremental=cfg.CONF.register.incremental,
+                parallelism=cfg.CONF.register.parallelism
             )
     except Exception as e:
         exc_info = not fail_on_failure
@@ -251,7 +260,8 @@ def register_rules():
         with Timer(key='st2.register.rules'):
             registered_count = rules_registrar.register_rules(
                 pack_dir=pack_dir,
-                fail_on_failure=fail_on_failure
+                fail_on_failure=fail_on_failure,
+                incremental=cfg.CONF.register.incremental
             )
     except Exception as e:
         exc_info = not fail_on_failure
@@ -276,7 +286,8 @@ def register_aliases():
         with Timer(key='st2.register.aliases'):
             registered_count = aliases_registrar.register_aliases(
                 pack_dir=pack_dir,
-                fail_on_failure=fail_on_failure
+                fail_on_failure=fail_on_failure,
+                incremental=cfg.CONF.register.incremental
             )
     except Exception as e:
         if fail_on_failure:
@@ -310,8 +321,11 @@ def register_policies():
         LOG.info('=========================================================')
         LOG.info('############## Registering policies #####################')
         LOG.info('=========================================================')
-        registered_count = policies_registrar.register_policies(pack_dir=pack_dir,
-                                                                fail_on_failure=fail_on_failure)
+        registered_count = policies_registrar.register_policies(
+            pack_dir=pack_dir,
+            fail_on_failure=fail_on_failure,
+            incremental=cfg.CONF.register.incremental
+        )
     except Exception as e:
         exc_info = not fail_on_failure
         LOG.warning('Failed to register policies: %s', e, exc_info=exc_info)
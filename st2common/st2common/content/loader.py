@@ -15,23 +15,34 @@
 
 from __future__ import absolute_import
 
+import collections
+import copy
+import hashlib
 import os
 
 from yaml.parser import ParserError
 import six
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.constants.meta import ALLOWED_EXTS
 from st2common.constants.meta import PARSER_FUNCS
 from st2common.constants.pack import MANIFEST_FILE_NAME
+from st2common.metrics.collectors import register_collector
+from st2common.util import yaml_loader
 
 __all__ = [
     'ContentPackLoader',
-    'MetaLoader'
+    'MetaLoader',
+    'MetadataCache',
+
+    'get_metadata_cache'
 ]
 
 LOG = logging.getLogger(__name__)
 
+_METADATA_CACHE = None
+
 
 class ContentPackLoader(object):
     """
@@ -211,6 +222,13 @@ class MetaLoader(object):
     Class for loading and parsing pack and resource metadata files.
     """
 
+    def __init__(self, cache=None):
+        """
+        :param cache: Cache which is used to avoid parsing the same (unchanged) file again.
+        :type cache: :class:`MetadataCache`
+        """
+        self._cache = cache
+
     def load(self, file_path, expected_type=None):
         """
         Loads content from file_path if file_path's extension
@@ -243,12 +261,140 @@ class MetaLoader(object):
         return result
 
     def _load(self, parser_func, file_path):
-        with open(file_path, 'r') as fd:
-            try:
+        try:
+            if self._cache:
+                return self._cache.load(file_path=file_path, parser_func=parser_func)
+
+            with open(file_path, 'r') as fd:
                 return parser_func(fd)
-            except ValueError:
-                LOG.exception('Failed loading content from %s.', file_path)
-                raise
-            except ParserError:
-                LOG.exception('Failed loading content from %s.', file_path)
-                raise
+        except ValueError:
+            LOG.exception('Failed loading content from %s.', file_path)
+            raise
+        except ParserError:
+            LOG.exception('Failed loading content from %s.', file_path)
+            raise
+
+
+class MetadataCache(object):
+    """
+    In-process LRU cache of parsed metadata files (e.g. workflow definitions) and objects which
+    are compiled from them (e.g. workflow specs).
+
+    Cache entries are validated using file modification time and size on each access. When those
+    change, hash of the file content is compared and the file is only parsed again if the content
+    has actually changed.
+    """
+
+    def __init__(self, max_size=1000):
+        """
+        :param max_size: Maximum number of files kept in the cache.
+        :type max_size: ``int``
+        """
+        self._max_size = max_size
+        self._entries = collections.OrderedDict()
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def load(self, file_path, parser_func=yaml_loader.safe_load):
+        """
+        Return parsed content of the provided file.
+
+        A copy of the cached content is returned so callers can safely modify it.
+        """
+        entry = self._get_entry(file_path=file_path, parser_func=parser_func)
+        return copy.deepcopy(entry['content'])
+
+    def load_compiled(self, file_path, name, compile_func, parser_func=yaml_loader.safe_load):
+        """
+        Return object which has been compiled from the parsed content of the provided file using
+        compile_func. Compiled object is shared between the callers and shouldn't be modified.
+
+        :param name: Name which identifies the compile function (a single file can be compiled
+                     by multiple functions).
+        :type name: ``str``
+        """
+        entry = self._get_entry(file_path=file_path, parser_func=parser_func)
+
+        if name not in entry['compiled']:
+            entry['compiled'][name] = compile_func(copy.deepcopy(entry['content']))
+
+        return entry['compiled'][name]
+
+    def invalidate(self, file_path=None):
+        """
+        Remove the provided file (or all the files if no file is provided) from the cache.
+        """
+        if file_path:
+            self._entries.pop(file_path, None)
+        else:
+            self._entries.clear()
+
+    def get_stats(self):
+        result = dict(self._stats)
+        result['size'] = len(self._entries)
+        return result
+
+    def get_metrics(self):
+        """
+        Return cache statistics as gauges (see st2common.metrics.collectors).
+        """
+        return dict([('metadata_cache.%s' % (name), value) for name, value in
+                     six.iteritems(self.get_stats())])
+
+    def _get_entry(self, file_path, parser_func):
+        stat = os.stat(file_path)
+        stat_key = (stat.st_mtime, stat.st_size)
+
+        entry = self._entries.pop(file_path, None)
+
+        if entry and entry['stat_key'] == stat_key:
+            self._stats['hits'] += 1
+        else:
+            with open(file_path, 'rb') as fp:
+                data = fp.read()
+
+            content_hash = hashlib.sha1(data).hexdigest()
+
+            if entry and entry['hash'] == content_hash:
+                # File has been touched, but its content hasn't changed
+                self._stats['hits'] += 1
+                entry['stat_key'] = stat_key
+            else:
+                self._stats['misses'] += 1
+                entry = {
+                    'stat_key': stat_key,
+                    'hash': content_hash,
+                    'content': parser_func(data),
+                    'compiled': {}
+                }
+
+        # Mark entry as recently used
+        self._entries[file_path] = entry
+
+        while len(self._entries) > max(self._max_size, 1):
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+        return entry
+
+
+def get_metadata_cache():
+    """
+    Return metadata cache for this process or None if the cache is disabled.
+
+    :rtype: :class:`MetadataCache`
+    """
+    global _METADATA_CACHE
+
+    if cfg.CONF.content.metadata_cache_size <= 0:
+        return None
+
+    if not _METADATA_CACHE:
+        _METADATA_CACHE = MetadataCache(max_size=cfg.CONF.content.metadata_cache_size)
+        register_collector(_METADATA_CACHE.get_metrics)
+
+    return _METADATA_CACHE
@@ -42,6 +42,9 @@ __all__ = [
 
     'LoggingStream',
 
+    'LazyValue',
+    'lazy',
+
     'ignore_lib2to3_log_messages',
     'ignore_statsd_log_messages'
 ]
@@ -64,6 +67,18 @@ LOGGER_KEYS = [
     'audit'
 ]
 
+# Level at which each of the wrapped logger methods logs. Used to skip all the argument processing
+# when the logger is not enabled for that level ("log" method receives level as a first argument).
+LOGGER_KEY_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL,
+    'exception': logging.ERROR,
+    'audit': logging.AUDIT
+}
+
 # Note: This attribute is used by "find_caller" so it can correctly exclude this file when looking
 # for the logger method caller frame.
 _srcfile = get_normalized_file_path(__file__)
@@ -95,9 +110,19 @@ def find_caller(stack_info=None):
     return rv
 
 
-def decorate_log_method(func):
+def decorate_log_method(func, logger=None, level=None):
     @wraps(func)
     def func_wrapper(*args, **kwargs):
+        # Fast path - don't process arguments for messages which wouldn't be emitted anyway
+        if logger is not None:
+            if level is not None:
+                log_level = level
+            else:
+                log_level = args[0] if args else kwargs.get('level', None)
+
+            if isinstance(log_level, int) and not logger.isEnabledFor(log_level):
+                return None
+
         # Prefix extra keys with underscore
         if 'extra' in kwargs:
             kwargs['extra'] = prefix_dict_keys(dictionary=kwargs['extra'], prefix='_')
@@ -131,7 +156,8 @@ def decorate_logger_methods(logger):
     logger.findCaller = find_caller
     for key in LOGGER_KEYS:
         log_method = getattr(logger, key)
-        log_method = decorate_log_method(log_method)
+        log_method = decorate_log_method(log_method, logger=logger,
+                                         level=LOGGER_KEY_LEVELS.get(key, None))
         setattr(logger, key, log_method)
 
     return logger
@@ -150,6 +176,56 @@ def getLogger(name):
     return logger
 
 
+class LazyValue(object):
+    """
+    Wrapper for a log message argument or an "extra" attribute value which is expensive to
+    compute.
+
+    The wrapped function is only called when the log record is actually formatted (e.g. not at
+    all for DEBUG messages when DEBUG logging is disabled) and the result is cached so multiple
+    handlers don't compute it again.
+
+    For example:
+
+        LOG.debug('Conductor state: %s', lazy(conductor.serialize))
+    """
+
+    __slots__ = ('_func', '_args', '_kwargs', '_value', '_evaluated')
+
+    def __init__(self, func, *args, **kwargs):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._value = None
+        self._evaluated = False
+
+    def evaluate(self):
+        if not self._evaluated:
+            self._value = self._func(*self._args, **self._kwargs)
+            self._evaluated = True
+
+            # Release references to the arguments, they are not needed anymore
+            self._func, self._args, self._kwargs = None, None, None
+
+        return self._value
+
+    def __str__(self):
+        return str(self.evaluate())
+
+    def __repr__(self):
+        return repr(self.evaluate())
+
+
+def lazy(func, *args, **kwargs):
+    """
+    Return a value which is only computed using the provided function when the log record which
+    references it is emitted.
+
+    :rtype: :class:`LazyValue`
+    """
+    return LazyValue(func, *args, **kwargs)
+
+
 class LoggingStream(object):
 
     def __init__(self, name, level=logging.ERROR):
@@ -26,6 +26,7 @@ from oslo_config import cfg
 
 from st2common.constants.secrets import MASKED_ATTRIBUTES_BLACKLIST
 from st2common.constants.secrets import MASKED_ATTRIBUTE_VALUE
+from st2common.log import LazyValue
 
 __all__ = [
     'ConsoleLogFormatter',
@@ -49,6 +50,13 @@ COMMON_ATTRIBUTE_NAMES = [
     'lineno'
 ]
 
+# Name of the log record attribute under which formatted extra attributes are cached so multiple
+# handlers don't serialize the same objects again. Note: It's intentionally not prefixed with "_"
+# so it's not picked up as an extra attribute.
+FORMATTED_EXTRA_ATTRIBUTES_NAME = 'st2_formatted_extra_attributes'
+
+TRUNCATED_VALUE_SUFFIX = '... (truncated)'
+
 
 def serialize_object(obj):
     """
@@ -93,6 +101,26 @@ def process_attribute_value(key, value):
     return value
 
 
+def truncate_attribute_value(value, max_length):
+    """
+    Truncate all the string values which are longer than max_length characters. Dictionaries and
+    lists are processed recursively.
+    """
+    if not max_length or max_length <= 0:
+        return value
+
+    if isinstance(value, six.string_types):
+        if len(value) > max_length:
+            value = value[:max_length] + TRUNCATED_VALUE_SUFFIX
+    elif isinstance(value, dict):
+        value = dict([(k, truncate_attribute_value(v, max_length))
+                      for k, v in six.iteritems(value)])
+    elif isinstance(value, (list, tuple)):
+        value = [truncate_attribute_value(item, max_length) for item in value]
+
+    return value
+
+
 class ObjectJSONEncoder(json.JSONEncoder):
     """
     Custom JSON encoder which also knows how to encode objects.
@@ -141,9 +169,30 @@ class BaseExtraLogFormatter(logging.Formatter):
 
         return result
 
+    def _get_formatted_extra_attributes(self, record):
+        """
+        Retrieve formatted extra attributes for the provided record.
+
+        Result is cached on the record since serializing objects can be expensive and the same
+        record is usually formatted by multiple handlers.
+        """
+        attributes = getattr(record, FORMATTED_EXTRA_ATTRIBUTES_NAME, None)
+
+        if attributes is None:
+            attributes = self._get_extra_attributes(record=record)
+            attributes = self._format_extra_attributes(attributes=attributes)
+            setattr(record, FORMATTED_EXTRA_ATTRIBUTES_NAME, attributes)
+
+        return attributes
+
     def _format_extra_attributes(self, attributes):
+        max_length = cfg.CONF.log.max_extra_attribute_length
+
         result = {}
         for key, value in six.iteritems(attributes):
+            if isinstance(value, LazyValue):
+                value = value.evaluate()
+
             if isinstance(value, NON_OBJECT_TYPES):
                 # Leave non-object types as is
                 value = value
@@ -153,6 +202,7 @@ class BaseExtraLogFormatter(logging.Formatter):
 
             # Note: We remove leading _ from the key
             value = process_attribute_value(key=key[1:], value=value)
+            value = truncate_attribute_value(value=value, max_length=max_length)
             result[key] = value
 
         return result
@@ -173,8 +223,7 @@ class ConsoleLogFormatter(BaseExtraLogFormatter):
     """
 
     def format(self, record):
-        attributes = self._get_extra_attributes(record=record)
-        attributes = self._format_extra_attributes(attributes=attributes)
+        attributes = self._get_formatted_extra_attributes(record=record)
         attributes = self._dict_to_str(attributes=attributes)
 
         # Call the parent format method so the final message is formed based on the "format"
@@ -238,8 +287,7 @@ class GelfLogFormatter(BaseExtraLogFormatter):
     DEFAULT_LOG_LEVEL = 6  # info
 
     def format(self, record):
-        attributes = self._get_extra_attributes(record=record)
-        attributes = self._format_extra_attributes(attributes=attributes)
+        attributes = self._get_formatted_extra_attributes(record=record)
 
         msg = record.msg
         exc_info = record.exc_info
@@ -62,6 +62,15 @@ class BaseMetricsDriver(object):
         """
         pass
 
+    def time_with_labels(self, key, time, labels):
+        """
+        Timer metric with labels (e.g. {'status': 200}).
+
+        NOTE: Only drivers which aggregate metrics in-process support labels, other drivers ignore
+        those metrics.
+        """
+        pass
+
     def inc_counter(self, key, amount=1):
         """
         Increment counter
@@ -0,0 +1,185 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Collectors which return gauges describing in-process state (connection pools, eventlet hub,
+stream listeners, etc.).
+
+Collectors are only called when the metrics endpoint is scraped so they add no overhead to the
+code paths which use those resources.
+"""
+
+from __future__ import absolute_import
+
+import eventlet
+import six
+
+from st2common import log as logging
+
+__all__ = [
+    'register_collector',
+    'register_green_pool',
+    'get_collected_metrics',
+
+    'get_eventlet_hub_metrics',
+    'get_green_pool_metrics',
+    'get_mongodb_pool_metrics',
+    'get_amqp_pool_metrics',
+    'get_stream_listener_metrics'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Additional collectors registered by the services
+_COLLECTORS = []
+
+# Green thread pools (e.g. WSGI server worker pool) registered by the services
+_GREEN_POOLS = {}
+
+
+def register_collector(collector):
+    """
+    Register a collector - a callable which returns a dictionary with gauge values keyed by the
+    metric key.
+    """
+    if collector not in _COLLECTORS:
+        _COLLECTORS.append(collector)
+
+
+def register_green_pool(name, pool):
+    """
+    Register green thread pool which usage should be reported (e.g. WSGI server worker pool).
+
+    :type pool: :class:`eventlet.GreenPool`
+    """
+    _GREEN_POOLS[name] = pool
+
+
+def get_collected_metrics():
+    """
+    Call all the collectors and return a dictionary with gauge values keyed by the metric key.
+
+    :rtype: ``dict``
+    """
+    collectors = [get_eventlet_hub_metrics, get_green_pool_metrics, get_mongodb_pool_metrics,
+                  get_amqp_pool_metrics, get_stream_listener_metrics] + _COLLECTORS
+
+    result = {}
+
+    for collector in collectors:
+        try:
+            result.update(collector())
+        except Exception:
+            # Failure of a single collector shouldn't affect the others
+            LOG.exception('Failed to collect metrics using collector %s', collector)
+
+    return result
+
+
+def get_eventlet_hub_metrics():
+    hub = eventlet.hubs.get_hub()
+
+    return {
+        # Green threads which are scheduled to run (sleeping, waiting for a timeout or switched
+        # out) in this process
+        'eventlet.hub.pending_timers': len(hub.timers) + len(hub.next_timers),
+        'eventlet.hub.readers': len(hub.get_readers()),
+        'eventlet.hub.writers': len(hub.get_writers())
+    }
+
+
+def get_green_pool_metrics():
+    result = {}
+
+    for name, pool in six.iteritems(_GREEN_POOLS):
+        result['green_pool.%s.size' % (name)] = pool.size
+        result['green_pool.%s.running' % (name)] = pool.running()
+        result['green_pool.%s.waiting' % (name)] = pool.waiting()
+
+    return result
+
+
+def get_mongodb_pool_metrics():
+    from mongoengine.connection import _connections
+
+    result = {}
+
+    if not _connections:
+        return result
+
+    pools = []
+    for client in _connections.values():
+        topology = getattr(client, '_topology', None)
+        servers = getattr(topology, '_servers', {}) or {}
+
+        for server in servers.values():
+            pool = getattr(server, 'pool', None)
+
+            if pool is not None:
+                pools.append(pool)
+
+    # NOTE: pymongo doesn't expose pool statistics using a public API (connection pool monitoring
+    # events are only available in newer versions) so we inspect the pool state which works with
+    # pymongo 3.x and 4.x
+    in_use = 0
+    idle = 0
+    max_size = 0
+
+    for pool in pools:
+        in_use += getattr(pool, 'active_sockets', 0) or 0
+        idle += len(getattr(pool, 'sockets', None) or getattr(pool, 'conns', None) or [])
+        max_size += getattr(pool.opts, 'max_pool_size', 0) or 0
+
+    result['mongodb.pool.servers'] = len(pools)
+    result['mongodb.pool.in_use'] = in_use
+    result['mongodb.pool.idle'] = idle
+    result['mongodb.pool.max_size'] = max_size
+
+    return result
+
+
+def get_amqp_pool_metrics():
+    from st2common.transport.publishers import SharedPoolPublishers
+
+    result = {}
+    publishers = list(SharedPoolPublishers.shared_publishers.values())
+
+    if not publishers:
+        return result
+
+    stats = [publisher.get_pool_stats() for publisher in publishers]
+
+    result['amqp.pool.in_use'] = sum([item['in_use'] for item in stats])
+    result['amqp.pool.idle'] = sum([item['idle'] for item in stats])
+    result['amqp.pool.limit'] = sum([item['limit'] for item in stats])
+
+    return result
+
+
+def get_stream_listener_metrics():
+    from st2common.stream.listener import get_listener_if_set
+
+    result = {}
+
+    for name in ['stream', 'execution_output']:
+        listener = get_listener_if_set(name=name)
+
+        if not listener:
+            continue
+
+        for key, value in six.iteritems(listener.get_stats()):
+            result['stream.listener.%s.%s' % (name, key)] = value
+
+    return result
@@ -31,6 +31,9 @@ class EchoDriver(BaseMetricsDriver):
     def time(self, key, time):
         LOG.debug('[metrics] time(key=%s, time=%s)' % (key, time))
 
+    def time_with_labels(self, key, time, labels):
+        LOG.debug('[metrics] time(key=%s, time=%s, labels=%s)' % (key, time, labels))
+
     def inc_counter(self, key, amount=1):
         LOG.debug('[metrics] counter.incr(%s, %s)' % (key, amount))
 
@@ -0,0 +1,323 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import re
+import time
+import threading
+from numbers import Number
+
+import six
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.metrics.base import BaseMetricsDriver
+from st2common.metrics.histogram import Histogram
+from st2common.metrics.utils import check_key
+from st2common.metrics.utils import get_full_key_name
+from st2common.util.loader import get_plugin_instance
+
+__all__ = [
+    'PrometheusDriver',
+
+    'get_prometheus_metric_name'
+]
+
+LOG = logging.getLogger(__name__)
+
+PLUGIN_NAMESPACE = 'st2common.metrics.driver'
+
+INVALID_METRIC_NAME_CHARACTERS_RE = re.compile(r'[^a-zA-Z0-9_:]')
+
+
+class PrometheusDriver(BaseMetricsDriver):
+    """
+    Metrics driver which aggregates metrics in-process.
+
+    Counters and gauges are stored in memory and timer values are recorded in HDR style histograms
+    (bounded memory, no per call network I/O). Every "flush_interval" seconds timer percentiles
+    are calculated for the past interval and aggregated metrics are flushed to the configured
+    export driver (e.g. statsd) - one value per metric and interval instead of one packet per
+    call.
+
+    Metrics are exposed in the Prometheus text format using get_prometheus_metrics() method.
+    """
+
+    def __init__(self, export_driver=None, flush_interval=None, percentiles=None):
+        self._flush_interval = flush_interval or cfg.CONF.metrics.flush_interval
+        self._percentiles = [float(percentile) for percentile in
+                             (percentiles or cfg.CONF.metrics.percentiles)]
+
+        if export_driver is None:
+            export_driver = self._get_export_driver()
+
+        self._export_driver = export_driver
+        self._lock = threading.Lock()
+
+        self._counters = {}
+        self._gauges = {}
+
+        # Timer histograms for the current flush interval
+        self._histograms = {}
+        # Timer percentiles calculated for the last flush interval
+        self._timer_percentiles = {}
+        # Total count and sum of all the recorded timer values
+        self._timer_totals = {}
+
+        # Counter values at the time of the last flush, used to export the increments
+        self._flushed_counters = {}
+        self._next_flush_time = time.time() + self._flush_interval
+
+    def time(self, key, time):
+        """
+        Timer metric
+        """
+        check_key(key)
+        assert isinstance(time, Number)
+
+        self._record_time(series=(key, ()), value=time)
+
+    def time_with_labels(self, key, time, labels):
+        """
+        Timer metric with labels
+        """
+        check_key(key)
+        assert isinstance(time, Number)
+
+        labels = tuple(sorted([(name, str(value)) for name, value in six.iteritems(labels)]))
+        self._record_time(series=(key, labels), value=time)
+
+    def inc_counter(self, key, amount=1):
+        """
+        Increment counter
+        """
+        check_key(key)
+        assert isinstance(amount, Number)
+
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+        self._maybe_flush()
+
+    def dec_counter(self, key, amount=1):
+        """
+        Decrement metric
+        """
+        self.inc_counter(key, -amount)
+
+    def set_gauge(self, key, value):
+        """
+        Set gauge value.
+        """
+        check_key(key)
+        assert isinstance(value, Number)
+
+        with self._lock:
+            self._gauges[key] = value
+
+        self._maybe_flush()
+
+    def inc_gauge(self, key, amount=1):
+        """
+        Increment gauge value.
+        """
+        check_key(key)
+        assert isinstance(amount, Number)
+
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + amount
+
+        self._maybe_flush()
+
+    def dec_gauge(self, key, amount=1):
+        """
+        Decrement gauge value.
+        """
+        self.inc_gauge(key, -amount)
+
+    def flush(self):
+        """
+        Calculate timer percentiles for the past interval and flush aggregated metrics to the
+        export driver.
+        """
+        with self._lock:
+            histograms = self._histograms
+            self._histograms = {}
+            self._next_flush_time = time.time() + self._flush_interval
+
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+            counter_increments = {}
+            for key, value in six.iteritems(counters):
+                increment = value - self._flushed_counters.get(key, 0)
+
+                if increment:
+                    counter_increments[key] = increment
+
+            self._flushed_counters = counters
+
+        timer_percentiles = {}
+        for series, histogram in six.iteritems(histograms):
+            timer_percentiles[series] = histogram.get_percentiles(self._percentiles)
+
+        # Series which haven't been updated during the past interval keep the old values
+        self._timer_percentiles.update(timer_percentiles)
+
+        if self._export_driver:
+            self._export(counter_increments=counter_increments, gauges=gauges,
+                         timer_percentiles=timer_percentiles)
+
+    def get_prometheus_metrics(self):
+        """
+        Return all the metrics in the Prometheus text exposition format.
+
+        Timers are exposed as summaries (percentiles for the last flush interval and total count
+        and sum), counters as counters and gauges as gauges.
+
+        :rtype: ``str``
+        """
+        self._maybe_flush()
+
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            timer_totals = dict([(key, list(value)) for key, value in
+                                 six.iteritems(self._timer_totals)])
+            timer_percentiles = dict(self._timer_percentiles)
+
+        lines = []
+
+        for key in sorted(counters.keys()):
+            name = get_prometheus_metric_name(key) + '_total'
+            lines.append('# TYPE %s counter' % (name))
+            lines.append('%s %s' % (name, _format_value(counters[key])))
+
+        for key in sorted(gauges.keys()):
+            name = get_prometheus_metric_name(key)
+            lines.append('# TYPE %s gauge' % (name))
+            lines.append('%s %s' % (name, _format_value(gauges[key])))
+
+        previous_key = None
+        for series in sorted(timer_totals.keys()):
+            key, labels = series
+            name = get_prometheus_metric_name(key) + '_seconds'
+
+            if key != previous_key:
+                lines.append('# TYPE %s summary' % (name))
+                previous_key = key
+
+            percentiles = timer_percentiles.get(series, {})
+            for percentile in sorted(percentiles.keys()):
+                value = percentiles[percentile]
+
+                if value is None:
+                    continue
+
+                quantile_labels = labels + (('quantile', '%g' % (percentile / 100.0)),)
+                lines.append('%s%s %s' % (name, _format_labels(quantile_labels),
+                                          _format_value(value)))
+
+            count, total = timer_totals[series]
+            lines.append('%s_sum%s %s' % (name, _format_labels(labels), _format_value(total)))
+            lines.append('%s_count%s %s' % (name, _format_labels(labels), count))
+
+        return '\n'.join(lines) + '\n'
+
+    def _record_time(self, series, value):
+        with self._lock:
+            histogram = self._histograms.get(series, None)
+
+            if histogram is None:
+                histogram = Histogram()
+                self._histograms[series] = histogram
+
+            histogram.record(value)
+
+            totals = self._timer_totals.get(series, None)
+
+            if totals is None:
+                totals = [0, 0.0]
+                self._timer_totals[series] = totals
+
+            totals[0] += 1
+            totals[1] += value
+
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if time.time() < self._next_flush_time:
+            return
+
+        try:
+            self.flush()
+        except Exception:
+            # Metrics should never affect the instrumented code
+            LOG.exception('Failed to flush metrics')
+
+    def _export(self, counter_increments, gauges, timer_percentiles):
+        for key, increment in six.iteritems(counter_increments):
+            if increment > 0:
+                self._export_driver.inc_counter(key, increment)
+            else:
+                self._export_driver.dec_counter(key, -increment)
+
+        for key, value in six.iteritems(gauges):
+            self._export_driver.set_gauge(key, value)
+
+        for (key, labels), percentiles in six.iteritems(timer_percentiles):
+            # Labelled timers are only exposed on the Prometheus endpoint since most of the
+            # export drivers don't support labels
+            if labels:
+                continue
+
+            for percentile, value in six.iteritems(percentiles):
+                if value is None:
+                    continue
+
+                suffix = ('p%g' % (percentile)).replace('.', '_')
+                self._export_driver.set_gauge('%s.%s' % (key, suffix), value)
+
+    def _get_export_driver(self):
+        name = cfg.CONF.metrics.export_driver
+
+        if not name or name in ['noop', 'prometheus']:
+            return None
+
+        return get_plugin_instance(PLUGIN_NAMESPACE, name)
+
+
+def get_prometheus_metric_name(key):
+    """
+    Return Prometheus metric name for the provided metric key (includes optional prefix).
+    """
+    return INVALID_METRIC_NAME_CHARACTERS_RE.sub('_', get_full_key_name(key))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+
+    labels = ['%s="%s"' % (name, value.replace('\\', '\\\\').replace('"', '\\"'))
+              for name, value in labels]
+    return '{%s}' % (','.join(labels))
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+
+    return repr(value)
@@ -0,0 +1,121 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prometheus metrics HTTP endpoint for the services which use "prometheus" metrics driver.
+"""
+
+from __future__ import absolute_import
+
+import eventlet
+from eventlet import wsgi
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.metrics.base import get_driver
+from st2common.metrics.collectors import get_collected_metrics
+from st2common.metrics.drivers.prometheus_driver import get_prometheus_metric_name
+
+__all__ = [
+    'CONTENT_TYPE',
+
+    'is_enabled',
+    'get_prometheus_metrics',
+    'metrics_app',
+    'start_metrics_server'
+]
+
+LOG = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def is_enabled():
+    """
+    Return True if the configured metrics driver aggregates metrics in-process and metrics can be
+    exposed on the metrics endpoint.
+    """
+    return hasattr(get_driver(), 'get_prometheus_metrics')
+
+
+def get_prometheus_metrics():
+    """
+    Return metrics in the Prometheus text format or None if the configured metrics driver doesn't
+    aggregate metrics in-process.
+
+    Besides the metrics recorded using the driver, this includes gauges returned by the collectors
+    which describe in-process state (connection pools, eventlet hub, etc.).
+
+    :rtype: ``str``
+    """
+    if not is_enabled():
+        return None
+
+    lines = [get_driver().get_prometheus_metrics().rstrip('\n')]
+
+    collected_metrics = get_collected_metrics()
+    for key in sorted(collected_metrics.keys()):
+        name = get_prometheus_metric_name(key)
+        lines.append('# TYPE %s gauge' % (name))
+        lines.append('%s %s' % (name, collected_metrics[key]))
+
+    return '\n'.join([line for line in lines if line]) + '\n'
+
+
+def metrics_app(environ, start_response):
+    """
+    WSGI app which serves metrics on the /metrics path.
+    """
+    if environ.get('PATH_INFO', '') not in ['/metrics', '/metrics/']:
+        start_response('404 Not Found', [('Content-Type', 'text/plain')])
+        return [b'Not Found\n']
+
+    body = get_prometheus_metrics() or ''
+    body = body.encode('utf-8')
+
+    start_response('200 OK', [('Content-Type', CONTENT_TYPE),
+                              ('Content-Length', str(len(body)))])
+    return [body]
+
+
+def start_metrics_server(service):
+    """
+    Start Prometheus metrics endpoint for the provided service in a green thread (only if
+    "prometheus" metrics driver is used and a port is configured for this service).
+
+    :return: Green thread serving the requests or None if the endpoint is not enabled.
+    """
+    if cfg.CONF.metrics.driver != 'prometheus':
+        return None
+
+    port = (cfg.CONF.metrics.prometheus_ports or {}).get(service, None)
+
+    if not port:
+        return None
+
+    host = cfg.CONF.metrics.prometheus_host
+
+    try:
+        sock = eventlet.listen((host, int(port)))
+    except Exception as e:
+        # E.g. multiple action runner processes on the same server
+        LOG.warning('Unable to start Prometheus metrics endpoint for service "%s" on %s:%s: %s',
+                    service, host, port, e)
+        return None
+
+    LOG.info('Prometheus metrics endpoint for service "%s" listening on %s:%s', service, host,
+             port)
+
+    return eventlet.spawn(wsgi.server, sock, metrics_app, log_output=False)
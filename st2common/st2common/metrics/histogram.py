@@ -0,0 +1,145 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+HDR style histogram used for in-process aggregation of timer metrics.
+
+Values are recorded in log-linear buckets - each power of two range is split into the same number
+of linear sub buckets which means relative error of a value (and percentile) stays the same for
+small and large values. Number of buckets is bounded by the configured precision and the highest
+trackable value and buckets are stored sparsely so memory usage is bounded and small for the
+typical (narrow) value distribution.
+"""
+
+from __future__ import absolute_import
+
+import math
+
+__all__ = [
+    'Histogram'
+]
+
+
+class Histogram(object):
+    def __init__(self, significant_figures=2, lowest_value=0.000001, highest_value=3600):
+        """
+        :param significant_figures: Number of significant decimal digits values are tracked with.
+        :type significant_figures: ``int``
+
+        :param lowest_value: Lowest distinguishable value (e.g. one microsecond for timers which
+                             record seconds). Values are tracked in units of this value.
+        :type lowest_value: ``float``
+
+        :param highest_value: Highest trackable value. Larger values are recorded as this value.
+        :type highest_value: ``float``
+        """
+        # Values are converted to integer units using multiplication (and back using division) by
+        # an integer to avoid floating point representation errors (e.g. 0.001 / 0.000001)
+        self._units_scale = int(round(1 / float(lowest_value)))
+        self._highest_units = int(highest_value * self._units_scale)
+
+        # Number of sub buckets needs to be large enough to provide the requested precision
+        self._sub_bucket_count_magnitude = int(math.ceil(math.log(2 * 10 ** significant_figures,
+                                                                  2)))
+        self._sub_bucket_count = 1 << self._sub_bucket_count_magnitude
+        self._sub_bucket_half_count_magnitude = self._sub_bucket_count_magnitude - 1
+
+        # Bucket index -> count
+        self._counts = {}
+
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        """
+        Record a single value.
+        """
+        if value < 0:
+            value = 0
+
+        index = self._get_counts_index(self._to_units(value))
+        self._counts[index] = self._counts.get(index, 0) + 1
+
+        self.count += 1
+        self.sum += value
+
+        if self.min is None or value < self.min:
+            self.min = value
+
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def get_value_at_percentile(self, percentile):
+        """
+        Return value at the provided percentile (0 - 100). Returned value is the highest value
+        which is equivalent (within the histogram precision) to the recorded value.
+
+        :rtype: ``float``
+        """
+        if not self.count:
+            return None
+
+        percentile = min(max(percentile, 0), 100)
+        target_count = max(int(math.ceil((percentile / 100.0) * self.count)), 1)
+
+        total = 0
+
+        for index in sorted(self._counts.keys()):
+            total += self._counts[index]
+
+            if total >= target_count:
+                value = self._get_highest_equivalent_value(index)
+
+                # Never report value outside of the recorded range
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    def get_percentiles(self, percentiles):
+        """
+        Return a dictionary with values at the provided percentiles.
+
+        :rtype: ``dict``
+        """
+        return dict([(percentile, self.get_value_at_percentile(percentile))
+                     for percentile in percentiles])
+
+    def get_bucket_count(self):
+        """
+        Return number of the buckets which are currently in use.
+        """
+        return len(self._counts)
+
+    def _to_units(self, value):
+        units = int(value * self._units_scale)
+        return min(units, self._highest_units)
+
+    def _get_counts_index(self, units):
+        bucket_index = max(units.bit_length() - self._sub_bucket_count_magnitude, 0)
+        sub_bucket_index = units >> bucket_index
+        return (bucket_index << self._sub_bucket_half_count_magnitude) + sub_bucket_index
+
+    def _get_highest_equivalent_value(self, index):
+        if index < self._sub_bucket_count:
+            bucket_index = 0
+            sub_bucket_index = index
+        else:
+            bucket_index = (index >> self._sub_bucket_half_count_magnitude) - 1
+            sub_bucket_index = index - (bucket_index << self._sub_bucket_half_count_magnitude)
+
+        units = ((sub_bucket_index + 1) << bucket_index) - 1
+        return float(units) / self._units_scale
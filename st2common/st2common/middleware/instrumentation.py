@@ -13,9 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
 from webob import Request
 
 from st2common import log as logging
+from st2common.metrics import endpoint as metrics_endpoint
 from st2common.metrics.base import CounterWithTimer
 from st2common.metrics.base import get_driver
 from st2common.util.date import get_datetime_utc_now
@@ -28,6 +31,9 @@ __all__ = [
 
 LOG = logging.getLogger(__name__)
 
+# WSGI environ key under which the operation id of the matched endpoint is stored
+OPERATION_ID_ENVIRON_KEY = 'st2.operation_id'
+
 
 class RequestInstrumentationMiddleware(object):
     """
@@ -46,16 +52,28 @@ class RequestInstrumentationMiddleware(object):
     def __call__(self, environ, start_response):
         request = Request(environ)
 
+        start_time = time.time()
+
         try:
             endpoint, _ = self.router.match(request)
         except NotFoundException:
             endpoint = {}
 
+        metrics_driver = get_driver()
+
+        # NOTE: Router match time is only recorded by the drivers which aggregate metrics
+        # in-process, other drivers (e.g. statsd) would send an additional packet for each request
+        if metrics_endpoint.is_enabled():
+            metrics_driver.time('%s.router.match' % (self._service_name),
+                                time.time() - start_time)
+
         # NOTE: We don't track per request and response metrics for /v1/executions/<id> and some
         # other endpoints because this would result in a lot of unique metrics which is an
         # anti-pattern and causes unnecessary load on the metrics server.
         submit_metrics = endpoint.get('x-submit-metrics', True)
         operation_id = endpoint.get('operationId', None)
+        environ[OPERATION_ID_ENVIRON_KEY] = operation_id
+
         is_get_one_endpoint = bool(operation_id) and (operation_id.endswith('.get') or
                                                       operation_id.endswith('.get_one'))
 
@@ -68,8 +86,6 @@ class RequestInstrumentationMiddleware(object):
             LOG.debug('Not submitting request metrics for path: %s' % (request.path))
             return self.app(environ, start_response)
 
-        metrics_driver = get_driver()
-
         key = '%s.request.total' % (self._service_name)
         metrics_driver.inc_counter(key)
 
@@ -136,9 +152,13 @@ class ResponseInstrumentationMiddleware(object):
         self._service_name = service_name
 
     def __call__(self, environ, start_response):
+        start_time = time.time()
+        status_codes = []
+
         # Track and time current number of processing requests
         def custom_start_response(status, headers, exc_info=None):
             status_code = int(status.split(' ')[0])
+            status_codes.append(status_code)
 
             metrics_driver = get_driver()
             metrics_driver.inc_counter('%s.response.status.%s' % (self._service_name,
@@ -146,4 +166,16 @@ class ResponseInstrumentationMiddleware(object):
 
             return start_response(status, headers, exc_info)
 
-        return self.app(environ, custom_start_response)
+        response = self.app(environ, custom_start_response)
+
+        # Latency by the operation id and the response status. Operation id is stored in the
+        # environ by RequestInstrumentationMiddleware so router match is only performed once.
+        # NOTE: For streaming responses this is time until the response has started
+        operation_id = environ.get(OPERATION_ID_ENVIRON_KEY, None)
+
+        if operation_id and status_codes:
+            labels = {'operation_id': operation_id, 'status': status_codes[-1]}
+            get_driver().time_with_labels('%s.request.latency' % (self._service_name),
+                                          time.time() - start_time, labels)
+
+        return response
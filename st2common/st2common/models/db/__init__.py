@@ -20,9 +20,11 @@ import importlib
 import traceback
 import ssl as ssl_lib
 
+import bson
 import six
 import mongoengine
 from mongoengine.queryset import visitor
+from pymongo import ReplaceOne
 from pymongo import uri_parser
 from pymongo.errors import OperationFailure
 from pymongo.errors import ConnectionFailure
@@ -448,6 +450,38 @@ class MongoDBAccess(object):
         instance = self.model.objects.insert(instance)
         return self._undo_dict_field_escape(instance)
 
+    def insert_many(self, instances):
+        """
+        Insert multiple new objects using a single bulk insert operation.
+
+        :rtype: ``list``
+        """
+        instances = self.model.objects.insert(instances)
+        return [self._undo_dict_field_escape(instance) for instance in instances]
+
+    def add_or_update_many(self, instances, validate=True):
+        """
+        Insert or replace multiple objects using a single bulk write operation. Objects without an
+        id are assigned a new one.
+
+        :rtype: ``list``
+        """
+        requests = []
+
+        for instance in instances:
+            if validate:
+                instance.validate()
+
+            if not instance.id:
+                instance.id = bson.ObjectId()
+
+            requests.append(ReplaceOne({'_id': instance.id}, instance.to_mongo(), upsert=True))
+
+        if requests:
+            self.model._get_collection().bulk_write(requests)
+
+        return [self._undo_dict_field_escape(instance) for instance in instances]
+
     def add_or_update(self, instance, validate=True):
         instance.save(validate=validate)
         return self._undo_dict_field_escape(instance)
@@ -455,6 +489,23 @@ class MongoDBAccess(object):
     def update(self, instance, **kwargs):
         return instance.update(**kwargs)
 
+    def update_fields(self, instance, set_fields, unset_fields=None):
+        """
+        Write only the provided document fields using $set and $unset operators.
+
+        Unlike update(), field names can point to nested values (e.g. "state.tasks.task1") and
+        values need to already be in the database format (e.g. escaped).
+
+        :param set_fields: Maps field path to a new value.
+        :type set_fields: ``dict``
+
+        :param unset_fields: Field paths to remove.
+        :type unset_fields: ``list``
+        """
+        self._update_fields(query={'_id': instance.id}, set_fields=set_fields,
+                            unset_fields=unset_fields)
+        return instance
+
     def delete(self, instance):
         return instance.delete()
 
@@ -468,6 +519,21 @@ class MongoDBAccess(object):
 
         return count
 
+    def _update_fields(self, query, set_fields, unset_fields=None):
+        update = {}
+
+        if set_fields:
+            update['$set'] = set_fields
+
+        if unset_fields:
+            update['$unset'] = dict([(field, '') for field in unset_fields])
+
+        if not update:
+            return True
+
+        result = self.model._get_collection().update_one(query, update)
+        return result.matched_count > 0
+
     def _undo_dict_field_escape(self, instance):
         for attr, field in six.iteritems(instance._fields):
             if isinstance(field, stormbase.EscapedDictField):
@@ -583,6 +649,21 @@ class ChangeRevisionMongoDBAccess(MongoDBAccess):
 
             return self._undo_dict_field_escape(instance)
 
+    def update_fields(self, instance, set_fields, unset_fields=None):
+        set_fields = dict(set_fields)
+        set_fields['rev'] = instance.rev + 1
+
+        query = {'_id': instance.id, 'rev': instance.rev}
+
+        if not self._update_fields(query=query, set_fields=set_fields,
+                                   unset_fields=unset_fields):
+            raise db_exc.StackStormDBObjectWriteConflictError(instance)
+
+        instance.rev = instance.rev + 1
+        instance._clear_changed_fields()
+
+        return instance
+
 
 def get_host_names_for_uri_dict(uri_dict):
     hosts = []
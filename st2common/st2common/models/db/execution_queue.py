@@ -53,6 +53,8 @@ class ActionExecutionSchedulingQueueItemDB(stormbase.StormFoundationDB,
     handling = me.BooleanField(default=False,
         help_text='Flag indicating if this item is currently being handled / '
                    'processed by a scheduler service')
+    tracing_headers = me.DictField(
+        help_text='Latency tracing context of the scheduling request (if tracing is enabled)')
 
     meta = {
         'indexes': [
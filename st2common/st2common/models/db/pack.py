@@ -28,7 +28,8 @@ from st2common.util.secrets import mask_secret_parameters
 __all__ = [
     'PackDB',
     'ConfigSchemaDB',
-    'ConfigDB'
+    'ConfigDB',
+    'ContentHashDB'
 ]
 
 
@@ -110,9 +111,38 @@ class ConfigDB(stormbase.StormFoundationDB):
         return result
 
 
+class ContentHashDB(stormbase.StormFoundationDB):
+    """
+    Content hash of a pack resource metadata file which has been successfully registered. It's used
+    by the incremental content registration to skip metadata files which haven't changed.
+    """
+    resource_type = me.StringField(
+        required=True,
+        help_text='Type of the resource defined in the metadata file.')
+    pack = me.StringField(
+        required=True,
+        help_text='Name of the content pack this metadata file belongs to.')
+    file_path = me.StringField(
+        required=True,
+        unique_with='resource_type',
+        help_text='Absolute path to the metadata file.')
+    metadata_file = me.StringField(
+        help_text='Path to the metadata file relative to the pack directory.')
+    hash = me.StringField(
+        required=True,
+        help_text='Hash of the metadata file content.')
+
+    meta = {
+        'indexes': [
+            {'fields': ['resource_type', 'pack']}
+        ]
+    }
+
+
 # specialized access objects
 pack_access = MongoDBAccess(PackDB)
 config_schema_access = MongoDBAccess(ConfigSchemaDB)
 config_access = MongoDBAccess(ConfigDB)
+content_hash_access = MongoDBAccess(ContentHashDB)
 
-MODELS = [PackDB, ConfigSchemaDB, ConfigDB]
+MODELS = [PackDB, ConfigSchemaDB, ConfigDB, ContentHashDB]
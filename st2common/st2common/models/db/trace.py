@@ -27,7 +27,8 @@ from st2common.models.db import MongoDBAccess
 
 __all__ = [
     'TraceDB',
-    'TraceComponentDB'
+    'TraceComponentDB',
+    'TraceSpanDB'
 ]
 
 
@@ -112,7 +113,47 @@ class TraceDB(stormbase.StormFoundationDB, stormbase.UIDFieldMixin):
         return uid
 
 
+class TraceSpanDB(stormbase.StormFoundationDB):
+    """
+    A single span recorded by the latency tracing (see st2common.tracing) and stored by the
+    database tracing sink.
+
+    :param queue_wait: How long (in seconds) the message which started this span waited in the
+                       queue.
+
+    :param duration: How long (in seconds) it took to process the span.
+    """
+
+    trace_id = me.StringField(required=True,
+                              help_text='ID of the trace span belongs to.')
+    span_id = me.StringField(required=True,
+                             help_text='ID of the span.')
+    parent_span_id = me.StringField(help_text='ID of the parent span.')
+    name = me.StringField(required=True,
+                          help_text='Name of the span.')
+    kind = me.StringField(help_text='Kind of the span.')
+    service = me.StringField(help_text='Service span was recorded by.')
+    resource_type = me.StringField(help_text='Type of the resource which was processed.')
+    resource_id = me.StringField(help_text='ID of the resource which was processed.')
+    start_timestamp = ComplexDateTimeField(help_text='The timestamp when the span started.')
+    end_timestamp = ComplexDateTimeField(help_text='The timestamp when the span ended.')
+    queue_wait = me.FloatField(help_text='Time message spent in the queue (in seconds).')
+    duration = me.FloatField(help_text='Processing time (in seconds).')
+    status = me.StringField(help_text='Status of the span.')
+    status_message = me.StringField(help_text='Error message for failed spans.')
+    attributes = stormbase.EscapedDictField(help_text='Additional span attributes.')
+
+    meta = {
+        'indexes': [
+            {'fields': ['trace_id']},
+            {'fields': ['resource_id']},
+            {'fields': ['start_timestamp']}
+        ]
+    }
+
+
 # specialized access objects
 trace_access = MongoDBAccess(TraceDB)
+trace_span_access = MongoDBAccess(TraceSpanDB)
 
-MODELS = [TraceDB]
+MODELS = [TraceDB, TraceSpanDB]
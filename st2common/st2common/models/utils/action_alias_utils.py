@@ -29,6 +29,7 @@ __all__ = [
 
     'extract_parameters_for_action_alias_db',
     'extract_parameters',
+    'compile_format_string',
     'search_regex_tokens',
 ]
 
@@ -44,7 +45,12 @@ else:
 
 class ActionAliasFormatParser(object):
 
-    def __init__(self, alias_format=None, param_stream=None):
+    def __init__(self, alias_format=None, param_stream=None, compiled_format=None):
+        """
+        :param compiled_format: Result of compile_format_string() for this format string. When
+                                provided, the format string is not compiled again.
+        :type compiled_format: ``tuple``
+        """
         self._format = alias_format or ''
         self._original_param_stream = param_stream or ''
         self._param_stream = self._original_param_stream
@@ -58,11 +64,14 @@ class ActionAliasFormatParser(object):
         # and cutting them from the command string afterwards.
         self._kv_pairs, self._param_stream = self.match_kv_pairs_at_end()
 
-        # 2. Matching optional parameters (with default values).
-        self._optional = self.generate_optional_params_regex()
+        if compiled_format:
+            self._optional, self._regex = compiled_format
+        else:
+            # 2. Matching optional parameters (with default values).
+            self._optional = self.generate_optional_params_regex()
 
-        # 3. Convert the mangled format string into a regex object
-        self._regex = self.transform_format_string_into_regex()
+            # 3. Convert the mangled format string into a regex object
+            self._regex = self.transform_format_string_into_regex()
 
     def generate_snippets(self):
         # I'll split the whole convoluted regex into snippets to make it
@@ -111,6 +120,14 @@ class ActionAliasFormatParser(object):
 
         return (kv_pairs, param_stream)
 
+    def get_param_stream(self):
+        """
+        Return the command string without the key-value pairs at the end.
+
+        :rtype: ``str``
+        """
+        return self._param_stream
+
     def generate_optional_params_regex(self):
         # 2. Matching optional parameters (with default values).
         return re.findall(self._snippets['optional'], self._format, re.DOTALL)
@@ -213,14 +230,26 @@ def extract_parameters_for_action_alias_db(action_alias_db, format_str, param_st
     return result
 
 
-def extract_parameters(format_str, param_stream, match_multiple=False):
-    parser = ActionAliasFormatParser(alias_format=format_str, param_stream=param_stream)
+def extract_parameters(format_str, param_stream, match_multiple=False, compiled_format=None):
+    parser = ActionAliasFormatParser(alias_format=format_str, param_stream=param_stream,
+                                     compiled_format=compiled_format)
     if match_multiple:
         return parser.get_multiple_extracted_param_value()
     else:
         return parser.get_extracted_param_value()
 
 
+def compile_format_string(format_str):
+    """
+    Compile the format string so it can be matched against many commands without compiling it
+    again for each command (see extract_parameters compiled_format argument).
+
+    :rtype: ``tuple`` of (optional parameters, compiled regex)
+    """
+    parser = ActionAliasFormatParser(alias_format=format_str)
+    return (parser._optional, parser._regex)
+
+
 def search_regex_tokens(needle_tokens, haystack_tokens, backwards=False):
     """
     Search a tokenized regex for any tokens in needle_tokens. Returns True if
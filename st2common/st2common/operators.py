@@ -49,30 +49,33 @@ class UnrecognizedConditionError(Exception):
 # Operation implementations
 
 
-def search(value, criteria_pattern, criteria_condition, check_function):
+def search(value, criteria_pattern, criteria_condition, check_function, criteria_count=None):
     """
     Search a list of values that match all child criteria. If condition is 'any', return a
     successful match if any items match all child criteria. If condition is 'all', return a
-    successful match if ALL items match all child criteria.
+    successful match if ALL items match all child criteria. If condition is one of the count
+    conditions, return a successful match if the number of items which match all child criteria
+    satisfies the condition.
 
     value: the payload list to search
     condition: one of:
       * any - return true if any items of the list match and false if none of them match
       * all - return true if all items of the list match and false if any of them do not match
+      * count - return true if exactly "count" items of the list match
+      * count_gt, count_gte, count_lt, count_lte - return true if the number of items which match
+        is greater than (or equal) / less than (or equal) "count"
     pattern: a dictionary of criteria to apply to each item of the list
+    count: number of matching items used with the count conditions
 
-    This operator has O(n) algorithmic complexity in terms of number of child patterns.
-    This operator has O(n) algorithmic complexity in terms of number of payload fields.
+    Evaluation short-circuits - it stops as soon as the result is known (e.g. on the first
+    matching item for 'any', on the first item which doesn't match for 'all' and on the first
+    child criterion which doesn't match for each item). A single payload lookup object is
+    re-used for all the list items.
 
-    However, it has O(n_patterns * n_payloads) algorithmic complexity, where:
+    Worst case complexity is still O(n_patterns * n_payloads), where:
       n_patterns = number of child patterns
-      n_payloads = number of fields in payload
-    It is therefore very easy to write a slow rule when using this operator.
-
-    This operator should ONLY be used when trying to match a small number of child patterns and/or
-    a small number of payload list elements.
-
-    Other conditions (such as 'count', 'count_gt', 'count_gte', etc.) can be added as needed.
+      n_payloads = number of items in the payload list
+    It is therefore still possible to write a slow rule when using this operator.
 
     Data from the trigger:
 
@@ -105,37 +108,51 @@ def search(value, criteria_pattern, criteria_condition, check_function):
             type: "equals"
             pattern: "Approved"
     """
+    if criteria_condition not in SEARCH_CONDITIONS:
+        raise UnrecognizedConditionError("The '%s' search condition is not recognized, only %s "
+                                         "are allowed" % (criteria_condition,
+                                                          ', '.join(SEARCH_CONDITIONS)))
+
+    if criteria_condition in SEARCH_COUNT_CONDITIONS and not isinstance(criteria_count, int):
+        raise ValueError("The '%s' search condition requires an integer 'count' value" %
+                         (criteria_condition))
+
+    # Child criteria are the same for all the items so we only convert them to a list once
+    child_criteria = list(six.iteritems(criteria_pattern))
+    payload_lookup = PayloadLookup(None, prefix=TRIGGER_ITEM_PAYLOAD_PREFIX)
+
+    def item_matches(child_payload):
+        payload_lookup.set_payload(child_payload)
+
+        # Match all patterns
+        for child_criterion_k, child_criterion_v in child_criteria:
+            if not check_function(child_criterion_k, child_criterion_v, payload_lookup):
+                return False
+
+        return True
+
     if criteria_condition == 'any':
         # Any item of the list can match all patterns
-        rtn = any([
-            # Any payload item can match
-            all([
-                # Match all patterns
-                check_function(
-                    child_criterion_k, child_criterion_v,
-                    PayloadLookup(child_payload, prefix=TRIGGER_ITEM_PAYLOAD_PREFIX))
-                for child_criterion_k, child_criterion_v in six.iteritems(criteria_pattern)
-            ])
-            for child_payload in value
-        ])
+        return any(item_matches(child_payload) for child_payload in value)
     elif criteria_condition == 'all':
         # Every item of the list must match all patterns
-        rtn = all([
-            # All payload items must match
-            all([
-                # Match all patterns
-                check_function(
-                    child_criterion_k, child_criterion_v,
-                    PayloadLookup(child_payload, prefix=TRIGGER_ITEM_PAYLOAD_PREFIX))
-                for child_criterion_k, child_criterion_v in six.iteritems(criteria_pattern)
-            ])
-            for child_payload in value
-        ])
+        return all(item_matches(child_payload) for child_payload in value)
+
+    # Count conditions, stop counting as soon as the result is known
+    if criteria_condition in ['count_gte', 'count_lt']:
+        limit = criteria_count
     else:
-        raise UnrecognizedConditionError("The '%s' search condition is not recognized, only 'any' "
-                                         "and 'all' are allowed" % criteria_condition)
+        limit = criteria_count + 1
+
+    count = 0
+    for child_payload in value:
+        if count >= limit:
+            break
 
-    return rtn
+        if item_matches(child_payload):
+            count += 1
+
+    return SEARCH_COUNT_CONDITIONS[criteria_condition](count, criteria_count)
 
 
 def equals(value, criteria_pattern):
@@ -333,6 +350,16 @@ NINSIDE_LONG = 'ninside'
 NINSIDE_SHORT = 'nin'
 SEARCH = 'search'
 
+# search operator conditions
+SEARCH_COUNT_CONDITIONS = {
+    'count': lambda count, expected: count == expected,
+    'count_gt': lambda count, expected: count > expected,
+    'count_gte': lambda count, expected: count >= expected,
+    'count_lt': lambda count, expected: count < expected,
+    'count_lte': lambda count, expected: count <= expected
+}
+SEARCH_CONDITIONS = ['any', 'all'] + sorted(SEARCH_COUNT_CONDITIONS.keys())
+
 # operator lookups
 operators = {
     MATCH_WILDCARD: match_wildcard,
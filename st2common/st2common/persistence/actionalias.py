@@ -16,11 +16,19 @@
 from __future__ import absolute_import
 from st2common.models.db.actionalias import actionalias_access
 from st2common.persistence import base as persistence
+from st2common.transport import content as content_transport
 
 
 class ActionAlias(persistence.Access):
     impl = actionalias_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
+
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = content_transport.ActionAliasCUDPublisher()
+        return cls.publisher
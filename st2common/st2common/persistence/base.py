@@ -162,6 +162,75 @@ class Access(object):
 
         return model_object
 
+    @classmethod
+    def insert_many(cls, model_objects, publish=True, dispatch_trigger=True):
+        """
+        Insert multiple new objects using a single bulk database operation.
+
+        Unlike insert(), conflicts are not resolved to the conflicting object and are propagated
+        as they are.
+        """
+        if not model_objects:
+            return []
+
+        model_objects = cls._get_impl().insert_many(model_objects)
+
+        for model_object in model_objects:
+            # Publish internal event on the message bus
+            if publish:
+                try:
+                    cls.publish_create(model_object)
+                except:
+                    LOG.exception('Publish failed.')
+
+            # Dispatch trigger
+            if dispatch_trigger:
+                try:
+                    cls.dispatch_create_trigger(model_object)
+                except:
+                    LOG.exception('Trigger dispatch failed.')
+
+        return model_objects
+
+    @classmethod
+    def add_or_update_many(cls, model_objects, publish=True, dispatch_trigger=True):
+        """
+        Insert or update multiple objects using a single bulk database operation.
+
+        Unlike add_or_update(), conflicts are not resolved to the conflicting object and are
+        propagated as they are.
+        """
+        if not model_objects:
+            return []
+
+        pre_persist_ids = [model_object.id for model_object in model_objects]
+        model_objects = cls._get_impl().add_or_update_many(model_objects)
+
+        for pre_persist_id, model_object in zip(pre_persist_ids, model_objects):
+            is_update = str(pre_persist_id) == str(model_object.id)
+
+            # Publish internal event on the message bus
+            if publish:
+                try:
+                    if is_update:
+                        cls.publish_update(model_object)
+                    else:
+                        cls.publish_create(model_object)
+                except:
+                    LOG.exception('Publish failed.')
+
+            # Dispatch trigger
+            if dispatch_trigger:
+                try:
+                    if is_update:
+                        cls.dispatch_update_trigger(model_object)
+                    else:
+                        cls.dispatch_create_trigger(model_object)
+                except:
+                    LOG.exception('Trigger dispatch failed.')
+
+        return model_objects
+
     @classmethod
     def add_or_update(cls, model_object, publish=True, dispatch_trigger=True, validate=True,
                       log_not_unique_error_as_debug=False):
@@ -238,6 +307,35 @@ class Access(object):
 
         return model_object
 
+    @classmethod
+    def update_fields(cls, model_object, set_fields, unset_fields=None, publish=True,
+                      dispatch_trigger=True):
+        """
+        Use this method when only some of the (potentially nested) fields of a large object have
+        changed and the changes have already been serialized into the database format (e.g. using
+        st2common.util.deltas).
+
+        Note: Unlike update(), object is not retrieved from the database again after the update.
+        """
+        model_object = cls._get_impl().update_fields(model_object, set_fields=set_fields,
+                                                     unset_fields=unset_fields)
+
+        # Publish internal event on the message bus
+        if publish:
+            try:
+                cls.publish_update(model_object)
+            except:
+                LOG.exception('Publish failed.')
+
+        # Dispatch trigger
+        if dispatch_trigger:
+            try:
+                cls.dispatch_update_trigger(model_object)
+            except:
+                LOG.exception('Trigger dispatch failed.')
+
+        return model_object
+
     @classmethod
     def delete(cls, model_object, publish=True, dispatch_trigger=True):
         persisted_object = cls._get_impl().delete(model_object)
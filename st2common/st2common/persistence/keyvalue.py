@@ -23,6 +23,7 @@ from st2common.models.api.keyvalue import KeyValuePairAPI
 from st2common.models.db.keyvalue import keyvaluepair_access
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.base import Access
+from st2common.transport import content as content_transport
 
 LOG = logging.getLogger(__name__)
 
@@ -48,6 +49,12 @@ class KeyValuePair(Access):
             pack=KEY_VALUE_PAIR_DELETE_TRIGGER['pack']),
     }
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = content_transport.KeyValuePairCUDPublisher()
+        return cls.publisher
+
     @classmethod
     def add_or_update(cls, model_object, publish=True, dispatch_trigger=True, validate=True):
         """
@@ -18,11 +18,14 @@ from st2common.persistence import base
 from st2common.models.db.pack import pack_access
 from st2common.models.db.pack import config_schema_access
 from st2common.models.db.pack import config_access
+from st2common.models.db.pack import content_hash_access
+from st2common.transport import content as content_transport
 
 __all__ = [
     'Pack',
     'ConfigSchema',
-    'Config'
+    'Config',
+    'ContentHash'
 ]
 
 
@@ -36,14 +39,37 @@ class Pack(base.Access):
 
 class ConfigSchema(base.Access):
     impl = config_schema_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = content_transport.ConfigSchemaCUDPublisher()
+        return cls.publisher
+
 
 class Config(base.Access):
     impl = config_access
+    publisher = None
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = content_transport.ConfigCUDPublisher()
+        return cls.publisher
+
+
+class ContentHash(base.Access):
+    impl = content_hash_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
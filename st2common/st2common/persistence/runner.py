@@ -16,15 +16,23 @@
 from __future__ import absolute_import
 from st2common.persistence import base as persistence
 from st2common.models.db.runner import runnertype_access
+from st2common.transport import content as content_transport
 
 
 class RunnerType(persistence.Access):
     impl = runnertype_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = content_transport.RunnerTypeCUDPublisher()
+        return cls.publisher
+
     @classmethod
     def _get_by_object(cls, object):
         # For RunnerType name is unique.
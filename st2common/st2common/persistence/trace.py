@@ -15,6 +15,7 @@
 
 from __future__ import absolute_import
 from st2common.models.db.trace import trace_access
+from st2common.models.db.trace import trace_span_access
 from st2common.persistence.base import Access
 
 
@@ -49,3 +50,15 @@ class Trace(Access):
     @classmethod
     def push_trigger_instance(cls, instance, trigger_instance):
         return cls.update(instance, push__trigger_instances=trigger_instance)
+
+
+class TraceSpan(Access):
+    impl = trace_span_access
+
+    @classmethod
+    def _get_impl(cls):
+        return cls.impl
+
+    @classmethod
+    def delete_by_query(cls, *args, **query):
+        return cls._get_impl().delete_by_query(*args, **query)
@@ -15,10 +15,14 @@
 
 from __future__ import absolute_import
 
+import collections
+
 from st2common import transport
 from st2common.models import db
 from st2common.models.db import workflow as wf_db_models
 from st2common.persistence import base as persistence
+from st2common.util import deltas
+from st2common.util.ujson import fast_deepcopy
 
 
 __all__ = [
@@ -27,10 +31,18 @@ __all__ = [
 ]
 
 
+# Maximum number of workflow execution snapshots to keep in memory
+SNAPSHOTS_CACHE_SIZE = 100
+
+
 class WorkflowExecution(persistence.StatusBasedResource):
     impl = db.ChangeRevisionMongoDBAccess(wf_db_models.WorkflowExecutionDB)
     publisher = None
 
+    # Maps workflow execution id to the raw document of the last revision which has been read or
+    # written by this process
+    snapshots = collections.OrderedDict()
+
     @classmethod
     def _get_impl(cls):
         return cls.impl
@@ -42,6 +54,76 @@ class WorkflowExecution(persistence.StatusBasedResource):
 
         return cls.publisher
 
+    @classmethod
+    def get_latest_by_id(cls, value):
+        """
+        Retrieve the latest revision of the workflow execution.
+
+        If the in-memory snapshot of the workflow execution is up to date, only the revision is
+        retrieved from the database and the object is constructed from the snapshot.
+        """
+        snapshot = cls.snapshots.get(str(value), None)
+
+        if snapshot is not None:
+            current = cls._get_impl().get(id=value, only_fields=['rev'], raise_exception=True)
+
+            # NOTE: Snapshot could have been evicted or replaced by another green thread while
+            # waiting for the database so we need to check it again
+            if current.rev == snapshot['rev'] and cls.snapshots.get(str(value)) is snapshot:
+                # Mark snapshot as the most recently used one
+                cls.snapshots.pop(str(value), None)
+                cls.snapshots[str(value)] = snapshot
+
+                return cls._get_object_from_snapshot(snapshot)
+
+        instance = cls.get_by_id(value)
+        cls._add_snapshot(instance.to_mongo().to_dict())
+
+        return instance
+
+    @classmethod
+    def update_fields(cls, model_object, set_fields, unset_fields=None, publish=True,
+                      dispatch_trigger=True):
+        rev = model_object.rev
+
+        try:
+            model_object = super(WorkflowExecution, cls).update_fields(
+                model_object,
+                set_fields=set_fields,
+                unset_fields=unset_fields,
+                publish=publish,
+                dispatch_trigger=dispatch_trigger)
+        except Exception:
+            cls.snapshots.pop(str(model_object.id), None)
+            raise
+
+        # Apply the same changes to the snapshot so it stays in sync with the database
+        snapshot = cls.snapshots.get(str(model_object.id), None)
+
+        if snapshot is not None and snapshot['rev'] == rev:
+            deltas.apply_field_updates(snapshot, set_fields, unset_fields)
+            snapshot['rev'] = model_object.rev
+        else:
+            cls.snapshots.pop(str(model_object.id), None)
+
+        return model_object
+
+    @classmethod
+    def _add_snapshot(cls, document):
+        cls.snapshots[str(document['_id'])] = document
+
+        while len(cls.snapshots) > SNAPSHOTS_CACHE_SIZE:
+            cls.snapshots.popitem(last=False)
+
+    @classmethod
+    def _get_object_from_snapshot(cls, snapshot):
+        document = dict(snapshot)
+
+        # NOTE: Dict fields are copied on conversion, but the list of errors isn't
+        document['errors'] = fast_deepcopy(document.get('errors', None))
+
+        return cls._get_impl().model._from_son(document)
+
 
 class TaskExecution(persistence.StatusBasedResource):
     impl = db.ChangeRevisionMongoDBAccess(wf_db_models.TaskExecutionDB)
@@ -35,8 +35,7 @@ from st2common.constants.runners import RUNNERS_CALLBACK_MODULES_NAMESPACE
 from st2common.content.utils import get_pack_directory
 from st2common.content.utils import get_pack_base_path
 from st2common.exceptions import actionrunner as exc
-from st2common.util.loader import get_plugin_instance
-from st2common.util.loader import get_available_plugins
+from st2common.runners.registry import get_registry
 from st2common.util.api import get_full_public_api_url
 from st2common.util.deprecation import deprecated
 from st2common.util.green.shell import run_command
@@ -71,25 +70,20 @@ def get_runner(name, config=None):
     """
     LOG.debug('Runner loading Python module: %s', name)
 
-    # NOTE: For backward compatibility we also support "_" in place of "-"
-    from stevedore.exception import NoMatches
+    # NOTE: Modules are cached in the process wide registry so entry points are only resolved once
+    registry = get_registry()
 
     try:
-        module = get_plugin_instance(RUNNERS_NAMESPACE, name, invoke_on_load=False)
-    except NoMatches:
-        name = name.replace('_', '-')
-
-        try:
-            module = get_plugin_instance(RUNNERS_NAMESPACE, name, invoke_on_load=False)
-        except Exception as e:
-            available_runners = get_available_plugins(namespace=RUNNERS_NAMESPACE)
-            available_runners = ', '.join(available_runners)
-            msg = ('Failed to find runner %s. Make sure that the runner is available and installed '
-                   'in StackStorm virtual environment. Available runners are: %s' %
-                   (name, available_runners))
-            LOG.exception(msg)
-
-            raise exc.ActionRunnerCreateError('%s\n\n%s' % (msg, six.text_type(e)))
+        module = registry.get_module(namespace=RUNNERS_NAMESPACE, name=name)
+    except Exception as e:
+        available_runners = registry.get_available(namespace=RUNNERS_NAMESPACE)
+        available_runners = ', '.join(available_runners)
+        msg = ('Failed to find runner %s. Make sure that the runner is available and installed '
+               'in StackStorm virtual environment. Available runners are: %s' %
+               (name.replace('_', '-'), available_runners))
+        LOG.exception(msg)
+
+        raise exc.ActionRunnerCreateError('%s\n\n%s' % (msg, six.text_type(e)))
 
     LOG.debug('Instance of runner module: %s', module)
 
@@ -107,32 +101,14 @@ def get_query_module(name):
     """
     Retrieve runner query module for the provided runner.
     """
-    # NOTE: For backward compatibility we also support "_" in place of "-"
-    from stevedore.exception import NoMatches
-
-    try:
-        module = get_plugin_instance(RUNNERS_QUERY_MODULES_NAMESPACE, name, invoke_on_load=False)
-    except NoMatches:
-        name = name.replace('_', '-')
-        module = get_plugin_instance(RUNNERS_QUERY_MODULES_NAMESPACE, name, invoke_on_load=False)
-
-    return module
+    return get_registry().get_module(namespace=RUNNERS_QUERY_MODULES_NAMESPACE, name=name)
 
 
 def get_callback_module(name):
     """
     Retrieve runner callback module for the provided runner.
     """
-    # NOTE: For backward compatibility we also support "_" in place of "-"
-    from stevedore.exception import NoMatches
-
-    try:
-        module = get_plugin_instance(RUNNERS_CALLBACK_MODULES_NAMESPACE, name, invoke_on_load=False)
-    except NoMatches:
-        name = name.replace('_', '-')
-        module = get_plugin_instance(RUNNERS_CALLBACK_MODULES_NAMESPACE, name, invoke_on_load=False)
-
-    return module
+    return get_registry().get_module(namespace=RUNNERS_CALLBACK_MODULES_NAMESPACE, name=name)
 
 
 def get_metadata(package_name):
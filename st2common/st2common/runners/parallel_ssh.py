@@ -40,7 +40,7 @@ class ParallelSSHClient(object):
     def __init__(self, hosts, user=None, password=None, pkey_file=None, pkey_material=None, port=22,
                  bastion_host=None, concurrency=10, raise_on_any_error=False, connect=True,
                  passphrase=None, handle_stdout_line_func=None, handle_stderr_line_func=None,
-                 sudo_password=False):
+                 sudo_password=False, connection_pool=None):
         """
         :param handle_stdout_line_func: Callback function which is called dynamically each time a
                                         new stdout line is received.
@@ -49,6 +49,10 @@ class ParallelSSHClient(object):
         :param handle_stderr_line_func: Callback function which is called dynamically each time a
                                         new stderr line is received.
         :type handle_stderr_line_func: ``func``
+
+        :param connection_pool: Optional pool of persistent SSH connections which are re-used
+                                across the clients.
+        :type connection_pool: :class:`st2common.runners.ssh_connection_pool.SSHConnectionPool`
         """
         self._ssh_user = user
 
@@ -64,6 +68,7 @@ class ParallelSSHClient(object):
         self._handle_stdout_line_func = handle_stdout_line_func
         self._handle_stderr_line_func = handle_stderr_line_func
         self._sudo_password = sudo_password
+        self._connection_pool = connection_pool
 
         if not hosts:
             raise Exception('Need an non-empty list of hosts to talk to.')
@@ -108,7 +113,7 @@ class ParallelSSHClient(object):
 
         return results
 
-    def run(self, cmd, timeout=None):
+    def run(self, cmd, timeout=None, results=None):
         """
         Run a command on remote hosts. Returns a dict containing results
         of execution from all hosts.
@@ -122,6 +127,10 @@ class ParallelSSHClient(object):
         :param cwd: Optional Current working directory. Must be shlex quoted.
         :type cwd: ``str``
 
+        :param results: Optional dict like object to which host results are written (e.g.
+                        :class:`st2common.runners.parallel_ssh_results.StreamingResults`).
+        :type results: ``object``
+
         :rtype: ``dict`` of ``str`` to ``dict``
         """
 
@@ -129,7 +138,7 @@ class ParallelSSHClient(object):
             'cmd': cmd,
             'timeout': timeout
         }
-        results = self._execute_in_pool(self._run_command, **options)
+        results = self._execute_in_pool(self._run_command, results=results, **options)
         return results
 
     def put(self, local_path, remote_path, mode=None, mirror_local_mode=False):
@@ -221,8 +230,9 @@ class ParallelSSHClient(object):
             except:
                 LOG.exception('Failed shutting down SSH connection to host: %s', host)
 
-    def _execute_in_pool(self, execute_method, **kwargs):
-        results = {}
+    def _execute_in_pool(self, execute_method, results=None, **kwargs):
+        if results is None:
+            results = {}
 
         for host in self._bad_hosts.keys():
             results[host] = self._bad_hosts[host]
@@ -256,7 +266,8 @@ class ParallelSSHClient(object):
                                    key_material=self._ssh_key_material,
                                    passphrase=self._passphrase,
                                    handle_stdout_line_func=self._handle_stdout_line_func,
-                                   handle_stderr_line_func=self._handle_stderr_line_func)
+                                   handle_stderr_line_func=self._handle_stderr_line_func,
+                                   connection_pool=self._connection_pool)
         try:
             client.connect()
         except SSHException as ex:
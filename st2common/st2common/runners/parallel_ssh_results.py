@@ -0,0 +1,191 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Memory bounded collection of the ParallelSSHClient results.
+
+Instead of keeping the full result of each host in memory (and in the execution result), each
+host result is truncated according to the truncation policy and handed over to a callback (e.g.
+which stores it as an execution output record) as soon as it's available. Only aggregate counts
+and a limited number of failed host results are kept.
+"""
+
+from __future__ import absolute_import
+
+import copy
+import json
+
+import six
+
+from st2common import log as logging
+
+__all__ = [
+    'TRUNCATION_POLICY_HEAD',
+    'TRUNCATION_POLICY_TAIL',
+    'TRUNCATION_POLICY_SUMMARY',
+    'TRUNCATION_POLICIES',
+
+    'StreamingResults',
+
+    'truncate_host_result'
+]
+
+# Keep the beginning of the output
+TRUNCATION_POLICY_HEAD = 'head'
+
+# Keep the end of the output
+TRUNCATION_POLICY_TAIL = 'tail'
+
+# Only keep return code and output sizes
+TRUNCATION_POLICY_SUMMARY = 'summary'
+
+TRUNCATION_POLICIES = [
+    TRUNCATION_POLICY_HEAD,
+    TRUNCATION_POLICY_TAIL,
+    TRUNCATION_POLICY_SUMMARY
+]
+
+LOG = logging.getLogger(__name__)
+
+OUTPUT_KEYS = ['stdout', 'stderr']
+
+
+def truncate_host_result(result, max_output_size=0, policy=TRUNCATION_POLICY_TAIL):
+    """
+    Truncate stdout and stderr of a single host result.
+
+    Truncated attributes are marked using "<name>_truncated" and "<name>_size" keys.
+
+    :param max_output_size: Max size (in characters) of stdout and stderr. 0 means no limit.
+    :type max_output_size: ``int``
+
+    :rtype: ``dict``
+    """
+    if not isinstance(result, dict):
+        return result
+
+    if policy != TRUNCATION_POLICY_SUMMARY and max_output_size <= 0:
+        return result
+
+    result = copy.copy(result)
+
+    for key in OUTPUT_KEYS:
+        value = result.get(key, None)
+
+        if value is None:
+            continue
+
+        # stdout could already be parsed as JSON
+        if not isinstance(value, six.string_types):
+            value = json.dumps(value)
+
+        if policy == TRUNCATION_POLICY_SUMMARY:
+            result[key] = ''
+        elif len(value) <= max_output_size:
+            continue
+        elif policy == TRUNCATION_POLICY_HEAD:
+            result[key] = value[:max_output_size]
+        else:
+            result[key] = value[-max_output_size:]
+
+        result['%s_truncated' % (key)] = True
+        result['%s_size' % (key)] = len(value)
+
+    return result
+
+
+class StreamingResults(object):
+    """
+    Dict like object which can be passed to ParallelSSHClient methods instead of the default
+    results dictionary.
+    """
+
+    def __init__(self, handle_host_result_func=None, max_output_size=0,
+                 truncation_policy=TRUNCATION_POLICY_TAIL, max_failed_hosts=100):
+        """
+        :param handle_host_result_func: Function which is called with (host, result) for each
+                                        host result (after the result has been truncated).
+        :type handle_host_result_func: ``callable``
+
+        :param max_failed_hosts: Maximum number of failed host results which are included in the
+                                 final result.
+        :type max_failed_hosts: ``int``
+        """
+        if truncation_policy not in TRUNCATION_POLICIES:
+            raise ValueError('Invalid truncation policy "%s". Valid policies are: %s' %
+                             (truncation_policy, ', '.join(TRUNCATION_POLICIES)))
+
+        self._handle_host_result_func = handle_host_result_func
+        self._max_output_size = max_output_size
+        self._truncation_policy = truncation_policy
+        self._max_failed_hosts = max_failed_hosts
+
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.timeout = 0
+
+        self._failed_hosts = {}
+
+    def __setitem__(self, host, result):
+        result = truncate_host_result(result=result, max_output_size=self._max_output_size,
+                                      policy=self._truncation_policy)
+
+        self.total += 1
+
+        if result and result.get('succeeded', False):
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+            if result and result.get('timeout', False):
+                self.timeout += 1
+
+            if len(self._failed_hosts) < self._max_failed_hosts:
+                self._failed_hosts[host] = result
+
+        if not self._handle_host_result_func:
+            return
+
+        # Result is already counted so failure to handle it shouldn't be reported as a host failure
+        try:
+            self._handle_host_result_func(host, result)
+        except Exception:
+            LOG.exception('Failed to handle result for host "%s"', host)
+
+    def __len__(self):
+        return self.total
+
+    def __repr__(self):
+        return '<StreamingResults summary=%s>' % (self.get_summary())
+
+    def get_summary(self):
+        return {
+            'total': self.total,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'timeout': self.timeout
+        }
+
+    def get_result(self):
+        """
+        Return execution result with aggregate counts and (limited number of) failed host results.
+
+        :rtype: ``dict``
+        """
+        return {
+            'summary': self.get_summary(),
+            'failed_hosts': copy.copy(self._failed_hosts)
+        }
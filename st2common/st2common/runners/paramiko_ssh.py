@@ -15,6 +15,7 @@
 
 from __future__ import absolute_import
 import os
+import hashlib
 import posixpath
 import time
 
@@ -86,7 +87,8 @@ class ParamikoSSHClient(object):
 
     def __init__(self, hostname, port=DEFAULT_SSH_PORT, username=None, password=None,
                  bastion_host=None, key_files=None, key_material=None, timeout=None,
-                 passphrase=None, handle_stdout_line_func=None, handle_stderr_line_func=None):
+                 passphrase=None, handle_stdout_line_func=None, handle_stderr_line_func=None,
+                 connection_pool=None):
         """
         Authentication is always attempted in the following order:
 
@@ -97,6 +99,10 @@ class ParamikoSSHClient(object):
           password and key is provided)
         - Plain username/password auth, if a password was given (if password is
           provided)
+
+        :param connection_pool: Optional pool of persistent connections. If provided, connection
+                                is retrieved from the pool and returned to it on close().
+        :type connection_pool: :class:`st2common.runners.ssh_connection_pool.SSHConnectionPool`
         """
         self.hostname = hostname
         self.port = port
@@ -122,6 +128,9 @@ class ParamikoSSHClient(object):
         self.bastion_client = None
         self.bastion_socket = None
 
+        self._connection_pool = connection_pool
+        self._pooled_connection = None
+
     def connect(self):
         """
         Connect to the remote node over SSH.
@@ -130,17 +139,16 @@ class ParamikoSSHClient(object):
                  False otherwise.
         :rtype: ``bool``
         """
-        if self.bastion_host:
-            self.logger.debug('Bastion host specified, connecting')
-            self.bastion_client = self._connect(host=self.bastion_host)
-            transport = self.bastion_client.get_transport()
-            real_addr = (self.hostname, self.port)
-            # fabric uses ('', 0) for direct-tcpip, this duplicates that behaviour
-            # see https://github.com/fabric/fabric/commit/c2a9bbfd50f560df6c6f9675603fb405c4071cad
-            local_addr = ('', 0)
-            self.bastion_socket = transport.open_channel('direct-tcpip', real_addr, local_addr)
+        if self._connection_pool:
+            self._pooled_connection = self._connection_pool.acquire(
+                key=self._get_connection_pool_key(), connect_func=self._open_connection)
 
-        self.client = self._connect(host=self.hostname, socket=self.bastion_socket)
+            self.client = self._pooled_connection.client
+            self.bastion_client = self._pooled_connection.bastion_client
+            self.bastion_socket = self._pooled_connection.bastion_socket
+            return True
+
+        self.client, self.bastion_client, self.bastion_socket = self._open_connection()
         return True
 
     def put(self, local_path, remote_path, mode=None, mirror_local_mode=False):
@@ -443,6 +451,17 @@ class ParamikoSSHClient(object):
         return [stdout, stderr, status]
 
     def close(self):
+        if self._pooled_connection:
+            self.logger.debug('Returning server connection to the pool')
+
+            if self.sftp_client:
+                self.sftp_client.close()
+                self.sftp_client = None
+
+            self._connection_pool.release(self._pooled_connection)
+            self._pooled_connection = None
+            return True
+
         self.logger.debug('Closing server connection')
 
         self.client.close()
@@ -593,6 +612,42 @@ class ParamikoSSHClient(object):
 
         raise paramiko.ssh_exception.SSHException(msg)
 
+    def _open_connection(self):
+        """
+        Open a new connection (through the bastion host if specified).
+
+        :return: Tuple of (client, bastion_client, bastion_socket).
+        :rtype: ``tuple``
+        """
+        bastion_client = None
+        bastion_socket = None
+
+        if self.bastion_host:
+            self.logger.debug('Bastion host specified, connecting')
+            bastion_client = self._connect(host=self.bastion_host)
+            transport = bastion_client.get_transport()
+            real_addr = (self.hostname, self.port)
+            # fabric uses ('', 0) for direct-tcpip, this duplicates that behaviour
+            # see https://github.com/fabric/fabric/commit/c2a9bbfd50f560df6c6f9675603fb405c4071cad
+            local_addr = ('', 0)
+            bastion_socket = transport.open_channel('direct-tcpip', real_addr, local_addr)
+
+        client = self._connect(host=self.hostname, socket=bastion_socket)
+        return client, bastion_client, bastion_socket
+
+    def _get_connection_pool_key(self):
+        """
+        Return key which identifies connections which can be shared. Credentials are only
+        included as a fingerprint.
+
+        :rtype: ``tuple``
+        """
+        credentials = [self.password, self.key_files, self.key_material, self.passphrase]
+        credentials = '\0'.join([six.text_type(item or '') for item in credentials])
+        fingerprint = hashlib.sha256(credentials.encode('utf-8')).hexdigest()
+
+        return (self.username, self.hostname, self.port, fingerprint, self.bastion_host)
+
     def _connect(self, host, socket=None):
         """
         Order of precedence for SSH connection parameters:
@@ -14,6 +14,8 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+import json
+
 from oslo_config import cfg
 import six
 
@@ -21,6 +23,8 @@ from st2common.runners.base import ShellRunnerMixin
 from st2common.runners.base import ActionRunner
 from st2common.constants.runners import REMOTE_RUNNER_PRIVATE_KEY_HEADER
 from st2common.runners.parallel_ssh import ParallelSSHClient
+from st2common.runners.parallel_ssh_results import StreamingResults
+from st2common.runners.ssh_connection_pool import get_connection_pool
 from st2common import log as logging
 from st2common.constants.action import LIVEACTION_STATUS_SUCCEEDED
 from st2common.constants.action import LIVEACTION_STATUS_TIMED_OUT
@@ -183,6 +187,9 @@ class BaseParallelSSHRunner(ActionRunner, ShellRunnerMixin):
         if self._sudo_password:
             client_kwargs['sudo_password'] = True
 
+        if cfg.CONF.ssh_runner.use_connection_pool:
+            client_kwargs['connection_pool'] = get_connection_pool()
+
         self._parallel_ssh_client = ParallelSSHClient(**client_kwargs)
 
     def post_run(self, status, result):
@@ -192,6 +199,33 @@ class BaseParallelSSHRunner(ActionRunner, ShellRunnerMixin):
         if self._parallel_ssh_client:
             self._parallel_ssh_client.close()
 
+    def _get_streaming_results(self):
+        """
+        Return StreamingResults object if per host results should be streamed (action runs on
+        at least ssh_runner.stream_results_hosts_threshold hosts), None otherwise.
+
+        Result of each host is stored as an execution output record with "host_result" type.
+
+        :rtype: :class:`StreamingResults`
+        """
+        threshold = cfg.CONF.ssh_runner.stream_results_hosts_threshold
+
+        if threshold <= 0 or len(self._hosts) < threshold:
+            return None
+
+        execution_db = self.execution
+        action_db = self.action
+
+        def store_host_result(host, result):
+            data = json.dumps({'host': host, 'result': result})
+            store_execution_output_data(execution_db=execution_db, action_db=action_db,
+                                        data=data, output_type='host_result')
+
+        return StreamingResults(
+            handle_host_result_func=store_host_result,
+            max_output_size=cfg.CONF.ssh_runner.stream_results_max_output_size,
+            truncation_policy=cfg.CONF.ssh_runner.stream_results_truncation_policy)
+
     def _is_private_key_material(self, private_key):
         return private_key and REMOTE_RUNNER_PRIVATE_KEY_HEADER in private_key.lower()
 
@@ -213,6 +247,17 @@ class BaseParallelSSHRunner(ActionRunner, ShellRunnerMixin):
     @staticmethod
     def _get_result_status(result, allow_partial_failure):
 
+        if isinstance(result, StreamingResults):
+            if allow_partial_failure:
+                success = result.succeeded > 0
+            else:
+                success = result.succeeded == result.total
+
+            timeout = result.total > 0 and result.timeout == result.total
+            status = BaseParallelSSHRunner._get_status_for_success_and_timeout(success=success,
+                                                                               timeout=timeout)
+            return status
+
         if 'error' in result and 'traceback' in result:
             # Assume this is a global failure where the result dictionary doesn't contain entry
             # per host
@@ -0,0 +1,292 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Process wide registry of the runner modules.
+
+Runner, query and callback modules are resolved using stevedore entry points. Resolving an entry
+point requires scanning all the installed distributions which is expensive so modules are only
+resolved once per process (either eagerly on service startup using load_all() or lazily on first
+use) and cached after that.
+
+Services which use the runner modules (action runner, results tracker) start RunnerRegistryWatcher
+which reloads the registry when the runners are (re-)registered (RunnerType CUD events).
+"""
+
+from __future__ import absolute_import
+
+import threading
+
+import eventlet
+import six
+from kombu.mixins import ConsumerMixin
+
+from st2common import log as logging
+from st2common.constants.runners import RUNNERS_NAMESPACE
+from st2common.constants.runners import RUNNERS_QUERY_MODULES_NAMESPACE
+from st2common.constants.runners import RUNNERS_CALLBACK_MODULES_NAMESPACE
+from st2common.transport import content as content_transport
+from st2common.transport import utils as transport_utils
+from st2common.util.loader import get_plugin_instance
+from st2common.util.loader import get_available_plugins
+from st2common.util.date import get_datetime_utc_now
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'RunnerRegistry',
+    'RunnerRegistryWatcher',
+
+    'get_registry',
+    'reload_registry',
+    'start_watcher',
+    'stop_watcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+RUNNER_NAMESPACES = [
+    RUNNERS_NAMESPACE,
+    RUNNERS_QUERY_MODULES_NAMESPACE,
+    RUNNERS_CALLBACK_MODULES_NAMESPACE
+]
+
+_REGISTRY = None
+_WATCHER = None
+
+
+class RunnerRegistry(object):
+    """
+    Registry which caches runner modules per (namespace, name).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modules = {}
+        self._available = {}
+
+        # Time (in seconds) it took to load a particular module
+        self._load_times = {}
+
+    def get_module(self, namespace, name):
+        """
+        Return module for the provided plugin name and namespace.
+
+        For backward compatibility "_" in the name is also accepted in place of "-".
+
+        :raises: stevedore.exception.NoMatches if plugin is not found.
+        """
+        module = self._modules.get((namespace, name), None)
+
+        if module is not None:
+            return module
+
+        from stevedore.exception import NoMatches
+
+        with self._lock:
+            try:
+                module = self._load_module(namespace=namespace, name=name)
+            except NoMatches:
+                normalized_name = name.replace('_', '-')
+
+                if normalized_name == name:
+                    raise
+
+                module = self._load_module(namespace=namespace, name=normalized_name)
+
+            # Also cache the module under the name it was requested with so the name doesn't
+            # need to be normalized again
+            self._modules[(namespace, name)] = module
+
+        return module
+
+    def get_available(self, namespace):
+        """
+        Return names of the plugins which are available in the provided namespace.
+
+        :rtype: ``list``
+        """
+        if namespace not in self._available:
+            self._available[namespace] = get_available_plugins(namespace=namespace)
+
+        return self._available[namespace]
+
+    def load_all(self, namespaces=None):
+        """
+        Load all the available modules in the provided namespaces and log how long it took to
+        load each of them.
+
+        :return: Dictionary with load time (in seconds) for each (namespace, name) pair.
+        :rtype: ``dict``
+        """
+        namespaces = namespaces or RUNNER_NAMESPACES
+        start_time = get_datetime_utc_now()
+
+        for namespace in namespaces:
+            for name in self.get_available(namespace=namespace):
+                try:
+                    self.get_module(namespace=namespace, name=name)
+                except Exception:
+                    LOG.exception('Failed to load "%s" module from "%s" namespace', name,
+                                  namespace)
+
+        total_time = (get_datetime_utc_now() - start_time).total_seconds()
+        load_times = self.get_load_times()
+
+        for (namespace, name), load_time in sorted(six.iteritems(load_times)):
+            LOG.debug('Loaded "%s" module from "%s" namespace in %.4f seconds', name, namespace,
+                      load_time)
+
+        LOG.info('Loaded %s runner modules in %.4f seconds', len(load_times), total_time)
+        return load_times
+
+    def get_load_times(self):
+        return dict(self._load_times)
+
+    def reload(self):
+        """
+        Clear all the cached modules and entry points so newly installed runners are picked up.
+        """
+        with self._lock:
+            self._modules = {}
+            self._available = {}
+            self._load_times = {}
+
+        # stevedore caches entry points per namespace in the newer versions
+        from stevedore.extension import ExtensionManager
+
+        entry_point_cache = getattr(ExtensionManager, 'ENTRY_POINT_CACHE', None)
+
+        if isinstance(entry_point_cache, dict):
+            entry_point_cache.clear()
+
+        LOG.debug('Runner registry has been reloaded')
+
+    def _load_module(self, namespace, name):
+        module = self._modules.get((namespace, name), None)
+
+        if module is not None:
+            return module
+
+        start_time = get_datetime_utc_now()
+        module = get_plugin_instance(namespace, name, invoke_on_load=False)
+        load_time = (get_datetime_utc_now() - start_time).total_seconds()
+
+        self._modules[(namespace, name)] = module
+        self._load_times[(namespace, name)] = load_time
+
+        return module
+
+
+class RunnerRegistryWatcher(ConsumerMixin):
+    """
+    Consumer which reloads the runner registry on RunnerType CUD events.
+    """
+
+    def __init__(self, registry, queue_suffix=None, reload_callback=None):
+        """
+        :param reload_callback: Optional function which is called after the registry has been
+                                reloaded (e.g. to drop modules cached by the service itself).
+        :type reload_callback: ``callable``
+        """
+        self._registry = registry
+        self._reload_callback = reload_callback
+
+        queue_name = queue_utils.get_queue_name(
+            queue_name_base='%s.runner_registry' % (content_transport.RUNNER_TYPE_CUD_XCHG.name),
+            queue_name_suffix=queue_suffix,
+            add_random_uuid_to_suffix=True)
+        self._queue = content_transport.get_queue(exchange=content_transport.RUNNER_TYPE_CUD_XCHG,
+                                                  name=queue_name, exclusive=True,
+                                                  auto_delete=True)
+
+        self.connection = None
+        self._updates_thread = None
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[self._queue], accept=['pickle'], callbacks=[self.process_task])]
+
+    def on_connection_revived(self):
+        # Events which were published while the connection was down are lost
+        LOG.debug('Connection revived, reloading runner registry')
+        self._reload()
+
+    def process_task(self, body, message):
+        try:
+            LOG.debug('Runner type "%s" has been registered, reloading runner registry',
+                      getattr(body, 'name', None))
+            self._reload()
+        except Exception:
+            LOG.exception('Failed to reload runner registry. Message body: %s', body)
+        finally:
+            message.ack()
+
+    def start(self):
+        self.connection = transport_utils.get_connection()
+        self._updates_thread = eventlet.spawn(self.run)
+
+    def stop(self):
+        self.should_stop = True
+
+        if self._updates_thread:
+            self._updates_thread = eventlet.kill(self._updates_thread)
+
+        if self.connection:
+            self.connection.release()
+
+    def _reload(self):
+        self._registry.reload()
+
+        if self._reload_callback:
+            self._reload_callback()
+
+
+def get_registry():
+    global _REGISTRY
+
+    if not _REGISTRY:
+        _REGISTRY = RunnerRegistry()
+
+    return _REGISTRY
+
+
+def reload_registry():
+    """
+    Hook which is called after the runners have been (re-)registered in this process. Other
+    processes reload the registry on RunnerType CUD events (see start_watcher).
+    """
+    get_registry().reload()
+
+
+def start_watcher(queue_suffix=None, reload_callback=None):
+    """
+    Start the watcher which reloads the registry of this process when the runners are
+    (re-)registered.
+    """
+    global _WATCHER
+
+    if not _WATCHER:
+        _WATCHER = RunnerRegistryWatcher(registry=get_registry(), queue_suffix=queue_suffix,
+                                         reload_callback=reload_callback)
+        _WATCHER.start()
+
+    return _WATCHER
+
+
+def stop_watcher():
+    global _WATCHER
+
+    if _WATCHER:
+        _WATCHER.stop()
+        _WATCHER = None
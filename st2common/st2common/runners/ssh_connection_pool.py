@@ -0,0 +1,292 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pool of persistent SSH connections which are re-used across remote runner action executions.
+
+Connections are keyed by (username, host, port, credentials fingerprint, bastion host). Each
+execution opens its own channels over the pooled transport so a single connection can be used by
+multiple executions at the same time (up to max_channels_per_connection). Number of connections
+to a single host is not limited, new connection is opened once all the existing connections are
+at the limit. Idle connections are kept alive using SSH keepalive messages and closed after
+max_idle_time seconds.
+"""
+
+from __future__ import absolute_import
+
+import time
+from collections import defaultdict
+
+import eventlet
+import six
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.metrics import base as metrics
+from st2common.metrics.collectors import register_collector
+
+__all__ = [
+    'PooledSSHConnection',
+    'SSHConnectionPool',
+
+    'get_connection_pool'
+]
+
+LOG = logging.getLogger(__name__)
+
+_POOL = None
+
+
+class PooledSSHConnection(object):
+    """
+    Connected paramiko client (and bastion client if bastion host is used) which is managed by
+    the pool.
+    """
+
+    def __init__(self, key, client, bastion_client=None, bastion_socket=None):
+        self.key = key
+        self.client = client
+        self.bastion_client = bastion_client
+        self.bastion_socket = bastion_socket
+
+        # Number of executions which are currently using this connection
+        self.channels = 0
+        self.last_used = time.time()
+
+        # Connection which is not reusable is closed once it's released by all the executions
+        self.reusable = True
+
+    def is_active(self):
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def check_health(self):
+        """
+        Verify that the connection is still usable by sending an "ignore" message over it.
+        """
+        if not self.is_active():
+            return False
+
+        try:
+            self.client.get_transport().send_ignore()
+        except Exception:
+            return False
+
+        return True
+
+    def close(self):
+        for client in [self.client, self.bastion_client]:
+            if not client:
+                continue
+
+            try:
+                client.close()
+            except Exception:
+                LOG.debug('Failed to close pooled SSH connection %s', self.key, exc_info=True)
+
+
+class SSHConnectionPool(object):
+    def __init__(self, max_idle_time=300, max_channels_per_connection=8, keepalive_interval=30):
+        """
+        :param max_idle_time: How long (in seconds) an unused connection is kept open.
+        :type max_idle_time: ``int``
+
+        :param max_channels_per_connection: Maximum number of executions which can use the same
+                                            connection at the same time. New connection is opened
+                                            once all the connections to a host are at the limit.
+        :type max_channels_per_connection: ``int``
+
+        :param keepalive_interval: How often (in seconds) to send keepalive message over the idle
+                                   connections. 0 disables keepalive messages.
+        :type keepalive_interval: ``int``
+        """
+        self._max_idle_time = max_idle_time
+        self._max_channels_per_connection = max_channels_per_connection
+        self._keepalive_interval = keepalive_interval
+
+        self._connections = defaultdict(list)
+        self._reaper_thread = None
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'health_check_failures': 0
+        }
+
+    def acquire(self, key, connect_func):
+        """
+        Return pooled connection for the provided key. If there is no connection which can be
+        used, new connection is established using connect_func.
+
+        :param connect_func: Function which opens a new connection and returns a tuple of
+                             (client, bastion_client, bastion_socket).
+        :type connect_func: ``callable``
+
+        :rtype: :class:`PooledSSHConnection`
+        """
+        self.evict_idle()
+
+        for connection in list(self._connections[key]):
+            if not connection.reusable or connection.channels >= self._max_channels_per_connection:
+                continue
+
+            # Health check is only performed for the idle connections, connections which are in use
+            # would fail the commands which are running over them
+            if connection.channels == 0:
+                healthy = connection.check_health()
+            else:
+                healthy = connection.is_active()
+
+            if not healthy:
+                self._stats['health_check_failures'] += 1
+                self._remove(connection)
+                continue
+
+            connection.channels += 1
+            connection.last_used = time.time()
+
+            self._stats['hits'] += 1
+            metrics.get_driver().inc_counter('ssh.connection_pool.hit')
+            return connection
+
+        self._stats['misses'] += 1
+        metrics.get_driver().inc_counter('ssh.connection_pool.miss')
+
+        client, bastion_client, bastion_socket = connect_func()
+        connection = PooledSSHConnection(key=key, client=client, bastion_client=bastion_client,
+                                         bastion_socket=bastion_socket)
+        connection.channels = 1
+
+        if self._keepalive_interval:
+            for item in [client, bastion_client]:
+                if item and item.get_transport():
+                    item.get_transport().set_keepalive(self._keepalive_interval)
+
+        self._connections[key].append(connection)
+        self._start_reaper()
+
+        return connection
+
+    def release(self, connection, reusable=True):
+        """
+        Return connection to the pool.
+
+        :param reusable: False to close the connection (e.g. when it's in an unknown state).
+        :type reusable: ``bool``
+        """
+        connection.channels = max(connection.channels - 1, 0)
+        connection.last_used = time.time()
+
+        if not reusable:
+            connection.reusable = False
+
+        if not connection.is_active() or (not connection.reusable and connection.channels == 0):
+            self._remove(connection)
+
+    def evict_idle(self):
+        """
+        Close connections which haven't been used for more than max_idle_time seconds.
+        """
+        now = time.time()
+
+        for key in list(self._connections.keys()):
+            for connection in list(self._connections.get(key, [])):
+                idle_time = now - connection.last_used
+
+                if connection.channels == 0 and idle_time > self._max_idle_time:
+                    self._stats['evictions'] += 1
+                    self._remove(connection)
+
+    def close_all(self):
+        for connections in list(self._connections.values()):
+            for connection in list(connections):
+                self._remove(connection)
+
+        if self._reaper_thread:
+            self._reaper_thread = eventlet.kill(self._reaper_thread)
+
+    def get_stats(self):
+        """
+        Return pool usage statistics.
+
+        :rtype: ``dict``
+        """
+        connections = [connection for items in six.itervalues(self._connections)
+                       for connection in items]
+        total = self._stats['hits'] + self._stats['misses']
+
+        result = dict(self._stats)
+        result['connections'] = len(connections)
+        result['idle'] = len([item for item in connections if item.channels == 0])
+        result['channels'] = sum([item.channels for item in connections])
+        result['reuse_rate'] = (float(self._stats['hits']) / total) if total else 0.0
+
+        return result
+
+    def get_metrics(self):
+        """
+        Return pool statistics as gauges (see st2common.metrics.collectors).
+        """
+        return dict([('ssh.connection_pool.%s' % (name), value) for name, value in
+                     six.iteritems(self.get_stats())])
+
+    def _remove(self, connection):
+        connections = self._connections.get(connection.key, [])
+
+        if connection in connections:
+            connections.remove(connection)
+
+        if not connections:
+            self._connections.pop(connection.key, None)
+
+        connection.close()
+
+    def _start_reaper(self):
+        if self._reaper_thread:
+            return
+
+        self._reaper_thread = eventlet.spawn(self._reap_idle)
+
+    def _reap_idle(self):
+        interval = max(min(self._max_idle_time, 60), 1)
+
+        while True:
+            eventlet.sleep(interval)
+
+            try:
+                self.evict_idle()
+                LOG.debug('SSH connection pool stats: %s', self.get_stats())
+            except Exception:
+                LOG.exception('Failed to evict idle SSH connections')
+
+
+def get_connection_pool():
+    """
+    Return SSH connection pool for this process.
+
+    :rtype: :class:`SSHConnectionPool`
+    """
+    global _POOL
+
+    if not _POOL:
+        _POOL = SSHConnectionPool(
+            max_idle_time=cfg.CONF.ssh_runner.connection_pool_max_idle_time,
+            max_channels_per_connection=(
+                cfg.CONF.ssh_runner.connection_pool_max_channels_per_connection),
+            keepalive_interval=cfg.CONF.ssh_runner.connection_pool_keepalive_interval)
+        register_collector(_POOL.get_metrics)
+
+    return _POOL
@@ -49,6 +49,9 @@ from st2common.logging.misc import add_global_filters_for_all_loggers
 from st2common.database_setup import db_setup
 from st2common.database_setup import db_teardown
 from st2common.metrics.base import metrics_initialize
+from st2common.metrics.endpoint import start_metrics_server
+from st2common.tracing.base import tracing_initialize
+from st2common.util.sampling_profiler import profiler_initialize
 
 
 __all__ = [
@@ -179,6 +182,9 @@ def setup(service, config, setup_db=True, register_mq_exchanges=True,
     register_kombu_serializers()
 
     metrics_initialize()
+    start_metrics_server(service=service)
+    tracing_initialize(service=service)
+    profiler_initialize(service=service, register_signal_handlers=register_signal_handlers)
 
     # Register service in the service registry
     if cfg.CONF.coordination.service_registry and service_registry:
@@ -14,9 +14,15 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+import hmac
+import json
 import uuid
+import base64
+import hashlib
 import datetime
 
+import six
+
 from oslo_config import cfg
 
 from st2common.util import isotime
@@ -29,11 +35,21 @@ from st2common import log as logging
 
 __all__ = [
     'create_token',
+    'create_signed_token',
+    'is_signed_token',
+    'get_signed_token',
     'delete_token'
 ]
 
 LOG = logging.getLogger(__name__)
 
+# Prefix (and a format version) of the stateless signed tokens. Random tokens which are stored in
+# the database never contain a "." character.
+SIGNED_TOKEN_PREFIX = 's1.'
+
+# Names of the users which are known to exist
+_EXISTING_USERS = set()
+
 
 def create_token(username, ttl=None, metadata=None, add_missing_user=True, service=False):
     """
@@ -64,17 +80,7 @@ def create_token(username, ttl=None, metadata=None, add_missing_user=True, servi
         ttl = cfg.CONF.auth.token_ttl
 
     if username:
-        try:
-            User.get_by_name(username)
-        except:
-            if add_missing_user:
-                user_db = UserDB(name=username)
-                User.add_or_update(user_db)
-
-                extra = {'username': username, 'user': user_db}
-                LOG.audit('Registered new user "%s".' % (username), extra=extra)
-            else:
-                raise UserNotFoundError()
+        _ensure_user_exists(username=username, add_missing_user=add_missing_user)
 
     token = uuid.uuid4().hex
     expiry = date_utils.get_datetime_utc_now() + datetime.timedelta(seconds=ttl)
@@ -91,7 +97,98 @@ def create_token(username, ttl=None, metadata=None, add_missing_user=True, servi
     return token
 
 
+def create_signed_token(username, ttl=None, metadata=None, service=True):
+    """
+    Create a stateless token which is signed using "auth.execution_token_signing_key" instead of
+    being stored in the database. Signed token can't be revoked, it's valid until it expires.
+
+    :param username: Username of the user to create the token for. If the account for this user
+                     doesn't exist yet it will be created.
+    :type username: ``str``
+
+    :param ttl: Token TTL (in seconds).
+    :type ttl: ``int``
+
+    :param metadata: Optional metadata to associate with the token.
+    :type metadata: ``dict``
+
+    :rtype: :class:`.TokenDB`
+    """
+    signing_key = cfg.CONF.auth.execution_token_signing_key
+
+    if not signing_key:
+        raise ValueError('Token signing key (auth.execution_token_signing_key) is not set.')
+
+    if not username:
+        raise ValueError('User is not provided in the token.')
+
+    # Existence of the user is only checked once per process so issuing a token usually doesn't
+    # require any database operations
+    if username not in _EXISTING_USERS:
+        _ensure_user_exists(username=username, add_missing_user=True)
+        _EXISTING_USERS.add(username)
+
+    ttl = ttl or cfg.CONF.auth.service_token_ttl
+    expiry = date_utils.get_datetime_utc_now() + datetime.timedelta(seconds=ttl)
+    expiry = expiry.replace(microsecond=0)
+
+    payload = {
+        'user': username,
+        'expiry': isotime.format(expiry, offset=False),
+        'metadata': metadata or {},
+        'service': service,
+        'nonce': uuid.uuid4().hex
+    }
+    payload = _base64_encode(json.dumps(payload, sort_keys=True))
+    token = '%s%s.%s' % (SIGNED_TOKEN_PREFIX, payload, _get_signature(payload, signing_key))
+
+    token_expire_string = isotime.format(expiry, offset=False)
+    extra = {'username': username, 'token_expiration': token_expire_string}
+    LOG.audit('Access granted to "%s" with the signed token set to expire at "%s".' %
+              (username, token_expire_string), extra=extra)
+
+    return TokenDB(user=username, token=token, expiry=expiry, metadata=metadata, service=service)
+
+
+def is_signed_token(token):
+    return bool(token) and token.startswith(SIGNED_TOKEN_PREFIX)
+
+
+def get_signed_token(token):
+    """
+    Verify signature of the provided signed token and return corresponding (non persisted)
+    TokenDB object.
+
+    Note: This function doesn't check if the token has expired.
+
+    :rtype: :class:`.TokenDB`
+    """
+    signing_key = cfg.CONF.auth.execution_token_signing_key
+
+    if not signing_key or not is_signed_token(token):
+        raise TokenNotFoundError()
+
+    try:
+        payload, signature = token[len(SIGNED_TOKEN_PREFIX):].split('.', 1)
+    except ValueError:
+        raise TokenNotFoundError()
+
+    if not hmac.compare_digest(_to_bytes(_get_signature(payload, signing_key)),
+                               _to_bytes(signature)):
+        LOG.audit('Signed token has an invalid signature.')
+        raise TokenNotFoundError()
+
+    payload = json.loads(_base64_decode(payload))
+    return TokenDB(user=payload['user'], token=token,
+                   expiry=date_utils.parse(payload['expiry']),
+                   metadata=payload['metadata'], service=payload['service'])
+
+
 def delete_token(token):
+    # Signed tokens are not stored in the database
+    if is_signed_token(token):
+        return None
+
     try:
         token_db = Token.get(token)
         return Token.delete(token_db)
@@ -99,3 +196,38 @@ def delete_token(token):
         pass
     except Exception:
         raise
+
+
+def _ensure_user_exists(username, add_missing_user=True):
+    try:
+        User.get_by_name(username)
+    except:
+        if add_missing_user:
+            user_db = UserDB(name=username)
+            User.add_or_update(user_db)
+
+            extra = {'username': username, 'user': user_db}
+            LOG.audit('Registered new user "%s".' % (username), extra=extra)
+        else:
+            raise UserNotFoundError()
+
+
+def _get_signature(payload, signing_key):
+    digest = hmac.new(_to_bytes(signing_key), _to_bytes(payload), hashlib.sha256).digest()
+    return _base64_encode(digest)
+
+
+def _to_bytes(value):
+    if isinstance(value, six.text_type):
+        value = value.encode('utf-8')
+
+    return value
+
+
+def _base64_encode(value):
+    return base64.urlsafe_b64encode(_to_bytes(value)).decode('ascii').rstrip('=')
+
+
+def _base64_decode(value):
+    value = value + '=' * (-len(value) % 4)
+    return base64.urlsafe_b64decode(_to_bytes(value)).decode('utf-8')
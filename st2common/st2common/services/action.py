@@ -18,6 +18,7 @@ import six
 
 from st2common import log as logging
 from st2common.constants import action as action_constants
+from st2common.constants.trace import TRACE_CONTEXT
 from st2common.exceptions import actionrunner as runner_exc
 from st2common.exceptions import db as db_exc
 from st2common.exceptions import trace as trace_exc
@@ -28,6 +29,8 @@ from st2common.models.db.execution import ActionExecutionOutputDB
 from st2common.runners import utils as runners_utils
 from st2common.services import executions
 from st2common.services import trace as trace_service
+from st2common.transport import utils as transport_utils
+from st2common.transport.publishers import SharedPoolPublishers
 from st2common.util import date as date_utils
 from st2common.util import action_db as action_utils
 from st2common.util import schema as util_schema
@@ -36,7 +39,9 @@ from st2common.util import schema as util_schema
 __all__ = [
     'request',
     'create_request',
+    'create_requests',
     'publish_request',
+    'publish_requests',
     'is_action_canceled_or_canceling',
 
     'request_pause',
@@ -73,6 +78,107 @@ def create_request(liveaction, action_db=None, runnertype_db=None):
     # file since the runners don't have the config context by default.
     from st2common.metrics.base import get_driver
 
+    # Validate action
+    if not action_db:
+        action_db = action_utils.get_action_by_ref(liveaction.action)
+
+    if action_db and not runnertype_db:
+        runnertype_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'])
+
+    _prepare_request(liveaction, action_db=action_db, runnertype_db=runnertype_db)
+
+    # Publish creation after both liveaction and actionexecution are created.
+    liveaction = LiveAction.add_or_update(liveaction, publish=False)
+    # Get trace_db if it exists. This could throw. If it throws, we have to cleanup
+    # liveaction object so we don't see things in requested mode.
+    trace_db = None
+    try:
+        _, trace_db = trace_service.get_trace_db_by_live_action(liveaction)
+    except db_exc.StackStormDBObjectNotFoundError as e:
+        _cleanup_liveaction(liveaction)
+        raise trace_exc.TraceNotFoundException(six.text_type(e))
+
+    execution = executions.create_execution_object(liveaction=liveaction, action_db=action_db,
+                                                   runnertype_db=runnertype_db, publish=False)
+
+    if trace_db:
+        trace_service.add_or_update_given_trace_db(
+            trace_db=trace_db,
+            action_executions=[
+                trace_service.get_trace_component_for_action_execution(execution, liveaction)
+            ])
+
+    get_driver().inc_counter('action.executions.%s' % (liveaction.status))
+
+    return liveaction, execution
+
+
+def create_requests(liveactions):
+    """
+    Create multiple action executions (e.g. items of a with items workflow task).
+
+    Each liveaction is validated the same way as in create_request(), but the liveaction and
+    execution records are written using bulk inserts and the trace is updated once for all the
+    executions which share the same parent execution.
+
+    :return: List of (liveaction, execution) tuples.
+    :rtype: ``list``
+    """
+    from st2common.metrics.base import get_driver
+
+    action_dbs = {}
+    runnertype_dbs = {}
+
+    for liveaction in liveactions:
+        if liveaction.action not in action_dbs:
+            action_db = action_utils.get_action_by_ref(liveaction.action)
+            action_dbs[liveaction.action] = action_db
+
+            if action_db:
+                runner_name = action_db.runner_type['name']
+                runnertype_dbs[liveaction.action] = action_utils.get_runnertype_by_name(
+                    runner_name)
+
+        _prepare_request(liveaction, action_db=action_dbs[liveaction.action],
+                         runnertype_db=runnertype_dbs.get(liveaction.action, None))
+
+    liveactions = LiveAction.insert_many(liveactions, publish=False)
+
+    try:
+        trace_dbs = _get_trace_dbs_for_live_actions(liveactions)
+    except db_exc.StackStormDBObjectNotFoundError as e:
+        for liveaction in liveactions:
+            _cleanup_liveaction(liveaction)
+        raise trace_exc.TraceNotFoundException(six.text_type(e))
+
+    execution_dbs = executions.create_execution_objects(liveactions=liveactions, publish=False)
+
+    # Add all the executions which belong to the same trace using a single update
+    traces = []
+    trace_components = {}
+
+    for liveaction, execution, trace_db in zip(liveactions, execution_dbs, trace_dbs):
+        if id(trace_db) not in trace_components:
+            traces.append(trace_db)
+            trace_components[id(trace_db)] = []
+
+        trace_components[id(trace_db)].append(
+            trace_service.get_trace_component_for_action_execution(execution, liveaction))
+
+    for trace_db in traces:
+        trace_service.add_or_update_given_trace_db(trace_db=trace_db,
+                                                   action_executions=trace_components[id(trace_db)])
+
+    status = action_constants.LIVEACTION_STATUS_REQUESTED
+    get_driver().inc_counter('action.executions.%s' % (status), amount=len(liveactions))
+
+    return list(zip(liveactions, execution_dbs))
+
+
+def _prepare_request(liveaction, action_db, runnertype_db):
+    """
+    Validate the liveaction and set the attributes which are needed before it is persisted.
+    """
     # Use the user context from the parent action execution. Subtasks in a workflow
     # action can be invoked by a system user and so we want to use the user context
     # from the original workflow action.
@@ -82,18 +188,11 @@ def create_request(liveaction, action_db=None, runnertype_db=None):
     if parent_user:
         liveaction.context['user'] = parent_user
 
-    # Validate action
-    if not action_db:
-        action_db = action_utils.get_action_by_ref(liveaction.action)
-
     if not action_db:
         raise ValueError('Action "%s" cannot be found.' % liveaction.action)
     if not action_db.enabled:
         raise ValueError('Unable to execute. Action "%s" is disabled.' % liveaction.action)
 
-    if not runnertype_db:
-        runnertype_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'])
-
     if not hasattr(liveaction, 'parameters'):
         liveaction.parameters = dict()
 
@@ -129,30 +228,35 @@ def create_request(liveaction, action_db=None, runnertype_db=None):
     # Set the "action_is_workflow" attribute
     liveaction.action_is_workflow = action_db.is_workflow()
 
-    # Publish creation after both liveaction and actionexecution are created.
-    liveaction = LiveAction.add_or_update(liveaction, publish=False)
-    # Get trace_db if it exists. This could throw. If it throws, we have to cleanup
-    # liveaction object so we don't see things in requested mode.
-    trace_db = None
-    try:
-        _, trace_db = trace_service.get_trace_db_by_live_action(liveaction)
-    except db_exc.StackStormDBObjectNotFoundError as e:
-        _cleanup_liveaction(liveaction)
-        raise trace_exc.TraceNotFoundException(six.text_type(e))
+    return liveaction
 
-    execution = executions.create_execution_object(liveaction=liveaction, action_db=action_db,
-                                                   runnertype_db=runnertype_db, publish=False)
 
-    if trace_db:
-        trace_service.add_or_update_given_trace_db(
-            trace_db=trace_db,
-            action_executions=[
-                trace_service.get_trace_component_for_action_execution(execution, liveaction)
-            ])
+def _get_trace_dbs_for_live_actions(liveactions):
+    """
+    Return TraceDB for each of the provided liveactions. Trace of the parent execution is only
+    retrieved once for all of its children.
+    """
+    trace_dbs = []
+    parent_trace_dbs = {}
 
-    get_driver().inc_counter('action.executions.%s' % (liveaction.status))
+    for liveaction in liveactions:
+        parent_execution_id = None
 
-    return liveaction, execution
+        if TRACE_CONTEXT not in liveaction.context:
+            parent_context = executions.get_parent_context(liveaction) or {}
+            parent_execution_id = parent_context.get('execution_id', None)
+
+        if parent_execution_id and parent_execution_id in parent_trace_dbs:
+            trace_dbs.append(parent_trace_dbs[parent_execution_id])
+            continue
+
+        _, trace_db = trace_service.get_trace_db_by_live_action(liveaction)
+        trace_dbs.append(trace_db)
+
+        if parent_execution_id:
+            parent_trace_dbs[parent_execution_id] = trace_db
+
+    return trace_dbs
 
 
 def publish_request(liveaction, execution):
@@ -176,6 +280,25 @@ def publish_request(liveaction, execution):
     return liveaction, execution
 
 
+def publish_requests(requests):
+    """
+    Publish multiple action executions. All the messages are pipelined over a single message bus
+    connection and channel.
+
+    :param requests: List of (liveaction, execution) tuples.
+    :type requests: ``list``
+
+    :rtype: ``list``
+    """
+    publisher = SharedPoolPublishers().get_publisher(urls=transport_utils.get_messaging_urls())
+
+    with publisher.batch():
+        for liveaction, execution in requests:
+            publish_request(liveaction, execution)
+
+    return requests
+
+
 def request(liveaction):
     liveaction, execution = create_request(liveaction)
     liveaction, execution = publish_request(liveaction, execution)
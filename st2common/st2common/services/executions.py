@@ -30,6 +30,8 @@
 
 from __future__ import absolute_import
 
+import copy
+
 import six
 from oslo_config import cfg
 from bson.objectid import ObjectId
@@ -53,6 +55,7 @@ from six.moves import range
 
 __all__ = [
     'create_execution_object',
+    'create_execution_objects',
     'update_execution',
     'abandon_execution_if_incomplete',
     'is_execution_canceled',
@@ -108,10 +111,78 @@ def create_execution_object(liveaction, action_db=None, runnertype_db=None, publ
     if not runnertype_db:
         runnertype_db = RunnerType.get_by_name(action_db.runner_type['name'])
 
+    parent = _get_parent_execution(liveaction)
+    execution = _create_execution_db(liveaction=liveaction,
+                                     action=vars(ActionAPI.from_model(action_db)),
+                                     runner=vars(RunnerTypeAPI.from_model(runnertype_db)),
+                                     parent=parent)
+
+    # NOTE: User input data is already validate as part of the API request,
+    # other data is set by us. Skipping validation here makes operation 10%-30% faster
+    execution = ActionExecution.add_or_update(execution, publish=publish, validate=False)
+
+    if parent and str(execution.id) not in parent.children:
+        values = {}
+        values['push__children'] = str(execution.id)
+        ActionExecution.update(parent, **values)
+
+    return execution
+
+
+def create_execution_objects(liveactions, publish=True):
+    """
+    Create execution objects for multiple liveactions (e.g. items of a with items task).
+
+    Action, runner and parent execution are only retrieved once for all the liveactions which
+    share them and all the execution objects are inserted using a single bulk insert.
+
+    :rtype: ``list`` of :class:`ActionExecutionDB`
+    """
+    actions = {}
+    runners = {}
+    parents = {}
+    executions = []
+
+    for liveaction in liveactions:
+        if liveaction.action not in actions:
+            action_db = action_utils.get_action_by_ref(liveaction.action)
+            runnertype_db = RunnerType.get_by_name(action_db.runner_type['name'])
+            actions[liveaction.action] = vars(ActionAPI.from_model(action_db))
+            runners[liveaction.action] = vars(RunnerTypeAPI.from_model(runnertype_db))
+
+        parent_execution_id = liveaction.context.get('parent', {}).get('execution_id', None)
+
+        if parent_execution_id not in parents:
+            parents[parent_execution_id] = _get_parent_execution(liveaction)
+
+        execution = _create_execution_db(liveaction=liveaction,
+                                         action=copy.deepcopy(actions[liveaction.action]),
+                                         runner=copy.deepcopy(runners[liveaction.action]),
+                                         parent=parents[parent_execution_id])
+        executions.append(execution)
+
+    executions = ActionExecution.insert_many(executions, publish=publish)
+
+    # Add all the new children to the parent execution using a single update
+    children = {}
+
+    for execution in executions:
+        if execution.parent:
+            children.setdefault(execution.parent, []).append(str(execution.id))
+
+    for parent_execution_id, children_ids in six.iteritems(children):
+        values = {}
+        values['push_all__children'] = children_ids
+        ActionExecution.update(parents[parent_execution_id], **values)
+
+    return executions
+
+
+def _create_execution_db(liveaction, action, runner, parent=None):
     attrs = {
-        'action': vars(ActionAPI.from_model(action_db)),
+        'action': action,
         'parameters': liveaction['parameters'],
-        'runner': vars(RunnerTypeAPI.from_model(runnertype_db))
+        'runner': runner
     }
     attrs.update(_decompose_liveaction(liveaction))
 
@@ -133,27 +204,20 @@ def create_execution_object(liveaction, action_db=None, runnertype_db=None, publ
         attrs['trigger'] = vars(TriggerAPI.from_model(trigger))
         attrs['trigger_type'] = vars(TriggerTypeAPI.from_model(trigger_type))
 
-    parent = _get_parent_execution(liveaction)
     if parent:
         attrs['parent'] = str(parent.id)
 
     attrs['log'] = [_create_execution_log_entry(liveaction['status'])]
 
+    # TODO: Do 100% research this is fully safe and unique in distributed setups
+    # NOTE: id is passed to the constructor so the object is still treated as a new document and
+    # can also be written using a bulk insert
+    attrs['id'] = ObjectId()
+
     # TODO: This object initialization takes 20-30or so ms
     execution = ActionExecutionDB(**attrs)
-    # TODO: Do 100% research this is fully safe and unique in distributed setups
-    execution.id = ObjectId()
     execution.web_url = _get_web_url_for_execution(str(execution.id))
 
-    # NOTE: User input data is already validate as part of the API request,
-    # other data is set by us. Skipping validation here makes operation 10%-30% faster
-    execution = ActionExecution.add_or_update(execution, publish=publish, validate=False)
-
-    if parent and str(execution.id) not in parent.children:
-        values = {}
-        values['push__children'] = str(execution.id)
-        ActionExecution.update(parent, **values)
-
     return execution
 
 
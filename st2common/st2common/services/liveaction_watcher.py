@@ -0,0 +1,210 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import eventlet
+from eventlet import queue as eventlet_queue
+from kombu import Queue
+from kombu import binding
+from kombu.mixins import ConsumerMixin
+
+from st2common import log as logging
+from st2common.constants import action as action_constants
+from st2common.transport import liveaction
+from st2common.transport import utils as transport_utils
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'LiveActionWatcher',
+    'LiveActionSubscription',
+
+    'get_watcher',
+    'start_watcher',
+    'stop_watcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Statuses the watcher listens for. Those are the statuses workflow runners wait for before
+# continuing with the next task.
+WATCHED_STATUSES = action_constants.LIVEACTION_COMPLETED_STATES + [
+    action_constants.LIVEACTION_STATUS_PAUSED,
+    action_constants.LIVEACTION_STATUS_PENDING
+]
+
+# Watcher used by this process, set by start_watcher()
+WATCHER = None
+
+
+class LiveActionSubscription(object):
+    """
+    Subscription to the status changes of a single liveaction.
+    """
+
+    def __init__(self, watcher, liveaction_id):
+        self.liveaction_id = liveaction_id
+        self._watcher = watcher
+        self._queue = eventlet_queue.LightQueue()
+
+    def notify(self, status):
+        self._queue.put(status)
+
+    def wait(self, timeout=None):
+        """
+        Wait until the liveaction status changes.
+
+        :return: New liveaction status or None if no status change was received before timeout.
+        :rtype: ``str``
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except eventlet_queue.Empty:
+            return None
+
+    def close(self):
+        self._watcher.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class LiveActionWatcher(ConsumerMixin):
+    """
+    Watches liveaction status changes published to the liveaction status exchange and notifies
+    the subscribers waiting on a particular liveaction.
+
+    This allows workflow runners which run in this process to continue with the next task as soon
+    as the child execution completes instead of polling the database for the child status.
+    """
+
+    sleep_interval = 0  # sleep to co-operatively yield after processing each message
+
+    def __init__(self, queue_suffix=None):
+        self._queue = self._get_queue(queue_suffix)
+
+        # Maps liveaction id to a list of subscriptions
+        self._subscriptions = {}
+
+        self.connection = None
+        self._updates_thread = None
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[self._queue],
+                         accept=['pickle'],
+                         callbacks=[self.process_task])]
+
+    def process_task(self, body, message):
+        try:
+            liveaction_id = str(getattr(body, 'id', None))
+            status = message.delivery_info.get('routing_key', None)
+
+            for subscription in self._subscriptions.get(liveaction_id, []):
+                subscription.notify(status)
+        except Exception:
+            LOG.exception('Failed to notify subscribers. Message body: %s.', body)
+        finally:
+            message.ack()
+
+        eventlet.sleep(self.sleep_interval)
+
+    def subscribe(self, liveaction_id):
+        """
+        Subscribe to the status changes of the provided liveaction.
+
+        :rtype: :class:`LiveActionSubscription`
+        """
+        subscription = LiveActionSubscription(watcher=self, liveaction_id=str(liveaction_id))
+        self._subscriptions.setdefault(subscription.liveaction_id, []).append(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscriptions = self._subscriptions.get(subscription.liveaction_id, [])
+
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+
+        if not subscriptions:
+            self._subscriptions.pop(subscription.liveaction_id, None)
+
+    def start(self):
+        try:
+            self.connection = transport_utils.get_connection()
+            self._updates_thread = eventlet.spawn(self.run)
+        except:
+            LOG.exception('Failed to start liveaction watcher.')
+            self.connection.release()
+
+    def stop(self):
+        try:
+            self.should_stop = True
+            self._updates_thread = eventlet.kill(self._updates_thread)
+        finally:
+            self.connection.release()
+
+    # Note: We sleep after we consume a message so we give a chance to other
+    # green threads to run. If we don't do that, ConsumerMixin will block on
+    # waiting for a message on the queue.
+
+    def on_consume_end(self, connection, channel):
+        super(LiveActionWatcher, self).on_consume_end(connection=connection,
+                                                      channel=channel)
+        eventlet.sleep(seconds=self.sleep_interval)
+
+    def on_iteration(self):
+        super(LiveActionWatcher, self).on_iteration()
+        eventlet.sleep(seconds=self.sleep_interval)
+
+    @staticmethod
+    def _get_queue(queue_suffix):
+        # NOTE: Each process needs its own queue so a random UUID is always added to the name
+        queue_name = queue_utils.get_queue_name(queue_name_base='st2.liveaction.watch',
+                                                queue_name_suffix=queue_suffix or 'watcher',
+                                                add_random_uuid_to_suffix=True)
+        bindings = [binding(liveaction.LIVEACTION_STATUS_MGMT_XCHG, routing_key=status)
+                    for status in WATCHED_STATUSES]
+
+        return Queue(queue_name, bindings=bindings, exclusive=True, auto_delete=True)
+
+
+def get_watcher():
+    """
+    Return liveaction watcher for this process or None if the watcher hasn't been started.
+
+    :rtype: :class:`LiveActionWatcher`
+    """
+    return WATCHER
+
+
+def start_watcher(queue_suffix=None):
+    global WATCHER
+
+    if not WATCHER:
+        WATCHER = LiveActionWatcher(queue_suffix=queue_suffix)
+        WATCHER.start()
+
+    return WATCHER
+
+
+def stop_watcher():
+    global WATCHER
+
+    if WATCHER:
+        WATCHER.stop()
+        WATCHER = None
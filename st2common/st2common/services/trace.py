@@ -14,6 +14,9 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+
+import calendar
+
 from mongoengine import ValidationError
 
 from st2common import log as logging
@@ -26,7 +29,9 @@ from st2common.models.db.trace import TraceDB, TraceComponentDB
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.execution import ActionExecution
 from st2common.persistence.trace import Trace
+from st2common.persistence.trace import TraceSpan
 from st2common.services import executions
+from st2common.util import isotime
 import six
 
 LOG = logging.getLogger(__name__)
@@ -40,7 +45,9 @@ __all__ = [
     'add_or_update_given_trace_db',
     'get_trace_component_for_action_execution',
     'get_trace_component_for_rule',
-    'get_trace_component_for_trigger_instance'
+    'get_trace_component_for_trigger_instance',
+    'get_trace_spans',
+    'get_trace_latency'
 ]
 
 
@@ -383,3 +390,90 @@ def _to_trace_component_db(component):
     caused_by = component.get('caused_by', {}) if isinstance(component, dict) else {}
 
     return TraceComponentDB(object_id=object_id, ref=ref, caused_by=caused_by)
+
+
+def get_trace_spans(trace_db):
+    """
+    Retrieve all the latency tracing spans (see st2common.tracing) which were recorded for the
+    trigger instances and action executions which belong to the provided trace.
+
+    :rtype: ``list`` of :class:`TraceSpanDB`
+    """
+    resource_ids = [component.object_id for component in trace_db.trigger_instances]
+    resource_ids += [component.object_id for component in trace_db.action_executions]
+
+    # Scheduler and action runner spans reference live actions
+    execution_ids = [component.object_id for component in trace_db.action_executions]
+
+    if execution_ids:
+        execution_dbs = ActionExecution.query(id__in=execution_ids, only_fields=['liveaction'])
+        resource_ids += [execution_db.liveaction['id'] for execution_db in execution_dbs]
+
+    if not resource_ids:
+        return []
+
+    # Include all the spans from the same traces (e.g. webhook and trigger dispatch spans which
+    # are recorded before trigger instance is created)
+    trace_ids = TraceSpan.distinct(field='trace_id', resource_id__in=resource_ids)
+
+    if not trace_ids:
+        return []
+
+    return list(TraceSpan.query(trace_id__in=trace_ids, order_by=['start_timestamp']))
+
+
+def get_trace_latency(trace_db):
+    """
+    Return latency breakdown (queue wait and processing time for each hop) for the provided
+    trace.
+
+    :rtype: ``dict``
+    """
+    span_dbs = get_trace_spans(trace_db=trace_db)
+
+    result = {
+        'id': str(trace_db.id),
+        'trace_tag': trace_db.trace_tag,
+        'duration': None,
+        'queue_wait': None,
+        'spans': []
+    }
+
+    if not span_dbs:
+        return result
+
+    # Time at which the first message was published (if trace doesn't start with a webhook
+    # request) or the first span started
+    start_time = min([_get_span_publish_time(span_db) for span_db in span_dbs])
+    end_time = max([_to_timestamp(span_db.end_timestamp) for span_db in span_dbs])
+
+    result['start_timestamp'] = isotime.format(span_dbs[0].start_timestamp, offset=False)
+    result['duration'] = end_time - start_time
+    result['queue_wait'] = sum([span_db.queue_wait or 0 for span_db in span_dbs])
+
+    for span_db in span_dbs:
+        result['spans'].append({
+            'trace_id': span_db.trace_id,
+            'span_id': span_db.span_id,
+            'parent_span_id': span_db.parent_span_id,
+            'name': span_db.name,
+            'service': span_db.service,
+            'resource_type': span_db.resource_type,
+            'resource_id': span_db.resource_id,
+            'start_timestamp': isotime.format(span_db.start_timestamp, offset=False),
+            'offset': _to_timestamp(span_db.start_timestamp) - start_time,
+            'queue_wait': span_db.queue_wait,
+            'duration': span_db.duration,
+            'status': span_db.status,
+            'status_message': span_db.status_message
+        })
+
+    return result
+
+
+def _get_span_publish_time(span_db):
+    return _to_timestamp(span_db.start_timestamp) - (span_db.queue_wait or 0)
+
+
+def _to_timestamp(dt):
+    return calendar.timegm(dt.utctimetuple()) + dt.microsecond / 1000000.0
@@ -15,6 +15,7 @@
 
 from __future__ import absolute_import
 
+import collections
 import copy
 import retrying
 import six
@@ -23,6 +24,7 @@ from orquesta import conducting
 from orquesta import events
 from orquesta import exceptions as orquesta_exc
 from orquesta.expressions import base as expressions
+from orquesta.specs import base as specs_base
 from orquesta.specs import loader as specs_loader
 from orquesta import statuses
 
@@ -30,6 +32,7 @@ from st2common.constants import action as ac_const
 from st2common.exceptions import action as ac_exc
 from st2common.exceptions import workflow as wf_exc
 from st2common import log as logging
+from st2common.metrics import base as metrics
 from st2common.models.api import notification as notify_api_models
 from st2common.models.db import liveaction as lv_db_models
 from st2common.models.db import workflow as wf_db_models
@@ -44,11 +47,20 @@ from st2common.services import coordination as coord_svc
 from st2common.services import executions as ex_svc
 from st2common.util import action_db as action_utils
 from st2common.util import date as date_utils
+from st2common.util import deltas
 from st2common.util import param as param_utils
 
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of live workflow conductors kept in memory. Cache is disabled by default and only
+# enabled by the workflow engine service (see set_conductors_cache_size).
+CONDUCTORS_CACHE_SIZE = 0
+
+# Maps workflow execution id to a tuple of (workflow execution revision, conductor). Conductor is
+# only added to the cache once its state has been persisted.
+CONDUCTORS_CACHE = collections.OrderedDict()
+
 
 def is_action_execution_under_workflow_context(ac_ex_db):
     # The action execution is executed under the context of a workflow
@@ -185,9 +197,12 @@ def request(wf_def, ac_ex_db, st2_ctx, notify_cfg=None):
     wf_ac_ex_id = str(ac_ex_db.id)
     LOG.info('[%s] Processing action execution request for workflow.', wf_ac_ex_id)
 
-    # Load workflow definition into workflow spec model.
-    spec_module = specs_loader.get_spec_module('native')
-    wf_spec = spec_module.instantiate(wf_def)
+    # Load workflow definition into workflow spec model (unless it's already a compiled spec).
+    if isinstance(wf_def, specs_base.Spec):
+        wf_spec = wf_def
+    else:
+        spec_module = specs_loader.get_spec_module('native')
+        wf_spec = spec_module.instantiate(wf_def)
 
     # Inspect the workflow spec.
     inspect(wf_spec, st2_ctx, raise_exception=True)
@@ -399,7 +414,7 @@ def request_cancellation(ac_ex_db):
         root_lv_ac_db = lv_db_access.LiveAction.get(id=root_ac_ex_db.liveaction['id'])
         ac_svc.request_cancellation(root_lv_ac_db, None)
 
-    LOG.debug('[%s] %s', wf_ac_ex_id, conductor.serialize())
+    LOG.debug('[%s] %s', wf_ac_ex_id, logging.lazy(conductor.serialize))
     LOG.info('[%s] Completed processing cancelation request for workflow.', wf_ac_ex_id)
 
     return wf_ex_db
@@ -490,11 +505,22 @@ def request_task_execution(wf_ex_db, st2_ctx, task_ex_req):
             # Refresh and return the task execution
             return wf_db_access.TaskExecution.get_by_id(str(task_ex_db.id))
 
-        # Request action execution for each actions in the task request.
-        for ac_ex_req in task_actions:
-            ac_ex_delay = eval_action_execution_delay(task_ex_req, ac_ex_req, task_ex_db.itemized)
-            request_action_execution(wf_ex_db, task_ex_db, st2_ctx, ac_ex_req, delay=ac_ex_delay)
+        # Request action executions for all the items in the task request at once.
+        if task_ex_db.itemized and len(task_actions) > 1:
+            ac_ex_delays = [eval_action_execution_delay(task_ex_req, ac_ex_req, True)
+                            for ac_ex_req in task_actions]
+            request_action_executions(wf_ex_db, task_ex_db, st2_ctx, task_actions,
+                                      delays=ac_ex_delays)
             task_ex_db = wf_db_access.TaskExecution.get_by_id(str(task_ex_db.id))
+
+        # Request action execution for each actions in the task request.
+        else:
+            for ac_ex_req in task_actions:
+                ac_ex_delay = eval_action_execution_delay(task_ex_req, ac_ex_req,
+                                                          task_ex_db.itemized)
+                request_action_execution(wf_ex_db, task_ex_db, st2_ctx, ac_ex_req,
+                                         delay=ac_ex_delay)
+                task_ex_db = wf_db_access.TaskExecution.get_by_id(str(task_ex_db.id))
     except Exception as e:
         msg = '[%s] Failed action execution(s) for task "%s", route "%s". %s'
         LOG.exception(msg, wf_ac_ex_id, task_id, str(task_route), six.text_type(e))
@@ -529,6 +555,65 @@ def eval_action_execution_delay(task_ex_req, ac_ex_req, itemized=False):
 @retrying.retry(retry_on_exception=wf_exc.retry_on_exceptions)
 def request_action_execution(wf_ex_db, task_ex_db, st2_ctx, ac_ex_req, delay=None):
     wf_ac_ex_id = wf_ex_db.action_execution
+
+    # Instantiate the live action record.
+    lv_ac_db = _create_live_action(wf_ex_db, task_ex_db, st2_ctx, ac_ex_req, delay=delay)
+
+    # Set the task execution to running first otherwise a race can occur
+    # where the action execution finishes first and the completion handler
+    # conflicts with this status update.
+    task_ex_db.status = statuses.RUNNING
+    task_ex_db = wf_db_access.TaskExecution.update(task_ex_db, publish=False)
+
+    # Request action execution.
+    lv_ac_db, ac_ex_db = ac_svc.request(lv_ac_db)
+    msg = '[%s] Action execution "%s" requested for task "%s", route "%s".'
+    LOG.info(msg, wf_ac_ex_id, str(ac_ex_db.id), task_ex_db.task_id, str(task_ex_db.task_route))
+
+    return ac_ex_db
+
+
+@retrying.retry(retry_on_exception=wf_exc.retry_on_exceptions)
+def request_action_executions(wf_ex_db, task_ex_db, st2_ctx, ac_ex_reqs, delays=None):
+    """
+    Request action executions for multiple items of a with items task at once.
+
+    Live action and action execution records for all the items are created using bulk inserts
+    and the requests are published to the message bus in a single pipelined batch. Items are
+    limited by the task concurrency before they get here (see request_next_tasks).
+    """
+    wf_ac_ex_id = wf_ex_db.action_execution
+    delays = delays or [None] * len(ac_ex_reqs)
+    action_cache = {}
+
+    with metrics.Timer(key='orquesta.task.items.request') as timer:
+        # Instantiate the live action records.
+        lv_ac_dbs = [
+            _create_live_action(wf_ex_db, task_ex_db, st2_ctx, ac_ex_req, delay=delay,
+                                action_cache=action_cache)
+            for ac_ex_req, delay in zip(ac_ex_reqs, delays)
+        ]
+
+        # Set the task execution to running first otherwise a race can occur
+        # where the action execution finishes first and the completion handler
+        # conflicts with this status update.
+        task_ex_db.status = statuses.RUNNING
+        task_ex_db = wf_db_access.TaskExecution.update(task_ex_db, publish=False)
+
+        # Request action executions.
+        requests = ac_svc.create_requests(lv_ac_dbs)
+        requests = ac_svc.publish_requests(requests)
+
+        duration = timer.get_time_delta().total_seconds()
+
+    msg = '[%s] %s action executions requested for task "%s", route "%s", in %.3f seconds.'
+    LOG.info(msg, wf_ac_ex_id, len(requests), task_ex_db.task_id, str(task_ex_db.task_route),
+             duration)
+
+    return [ac_ex_db for _, ac_ex_db in requests]
+
+
+def _create_live_action(wf_ex_db, task_ex_db, st2_ctx, ac_ex_req, delay=None, action_cache=None):
     action_ref = ac_ex_req['action']
     action_input = ac_ex_req['input']
     item_id = ac_ex_req.get('item_id')
@@ -538,15 +623,21 @@ def request_action_execution(wf_ex_db, task_ex_db, st2_ctx, ac_ex_req, delay=Non
         msg = 'Unable to request action execution. Identifier for the item is not provided.'
         raise Exception(msg)
 
-    # Identify the action to execute.
-    action_db = action_utils.get_action_by_ref(ref=action_ref)
+    # Identify the action and the runner for the action. Items usually share the same action so
+    # it's only looked up once for all of them.
+    action_cache = action_cache if action_cache is not None else {}
 
-    if not action_db:
-        error = 'Unable to find action "%s".' % action_ref
-        raise ac_exc.InvalidActionReferencedException(error)
+    if action_ref not in action_cache:
+        action_db = action_utils.get_action_by_ref(ref=action_ref)
 
-    # Identify the runner for the action.
-    runner_type_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'])
+        if not action_db:
+            error = 'Unable to find action "%s".' % action_ref
+            raise ac_exc.InvalidActionReferencedException(error)
+
+        runner_type_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'])
+        action_cache[action_ref] = (action_db, runner_type_db)
+
+    action_db, runner_type_db = action_cache[action_ref]
 
     # Identify action pack name
     pack_name = action_ref.split('.')[0] if action_ref else st2_ctx.get('pack')
@@ -598,18 +689,7 @@ def request_action_execution(wf_ex_db, task_ex_db, st2_ctx, ac_ex_req, delay=Non
             wf_ex_db.notify.get('tasks') and task_ex_db.task_name in wf_ex_db.notify['tasks']):
         lv_ac_db.notify = notify_api_models.NotificationsHelper.to_model(wf_ex_db.notify['config'])
 
-    # Set the task execution to running first otherwise a race can occur
-    # where the action execution finishes first and the completion handler
-    # conflicts with this status update.
-    task_ex_db.status = statuses.RUNNING
-    task_ex_db = wf_db_access.TaskExecution.update(task_ex_db, publish=False)
-
-    # Request action execution.
-    lv_ac_db, ac_ex_db = ac_svc.request(lv_ac_db)
-    msg = '[%s] Action execution "%s" requested for task "%s", route "%s".'
-    LOG.info(msg, wf_ac_ex_id, str(ac_ex_db.id), task_ex_db.task_id, str(task_ex_db.task_route))
-
-    return ac_ex_db
+    return lv_ac_db
 
 
 def handle_action_execution_pending(ac_ex_db):
@@ -760,6 +840,55 @@ def handle_action_execution_completion(ac_ex_db):
         update_workflow_execution(wf_ex_id)
 
 
+def set_conductors_cache_size(size):
+    global CONDUCTORS_CACHE_SIZE
+    CONDUCTORS_CACHE_SIZE = size
+
+    while len(CONDUCTORS_CACHE) > max(CONDUCTORS_CACHE_SIZE, 0):
+        CONDUCTORS_CACHE.popitem(last=False)
+
+
+def checkout_cached_conductor(wf_ex_db):
+    """
+    Remove and return the cached conductor for the workflow execution if it matches the revision
+    of the workflow execution.
+
+    Conductor is removed from the cache so a caller has exclusive access to it while it's being
+    updated. If the updated state fails to persist, the conductor is discarded.
+    """
+    if CONDUCTORS_CACHE_SIZE <= 0:
+        return None
+
+    rev, conductor = CONDUCTORS_CACHE.pop(str(wf_ex_db.id), (None, None))
+
+    if conductor is not None and rev == wf_ex_db.rev:
+        metrics.get_driver().inc_counter('orquesta.conductor.cache.hit')
+        return conductor
+
+    metrics.get_driver().inc_counter('orquesta.conductor.cache.miss')
+    return None
+
+
+def checkin_cached_conductor(wf_ex_db, conductor):
+    """
+    Add the conductor which state matches the persisted workflow execution revision to the cache.
+    """
+    if CONDUCTORS_CACHE_SIZE <= 0:
+        return
+
+    wf_ex_id = str(wf_ex_db.id)
+    CONDUCTORS_CACHE.pop(wf_ex_id, None)
+
+    # There will be no more events to process for a completed workflow execution
+    if wf_ex_db.status in statuses.COMPLETED_STATUSES:
+        return
+
+    CONDUCTORS_CACHE[wf_ex_id] = (wf_ex_db.rev, conductor)
+
+    while len(CONDUCTORS_CACHE) > CONDUCTORS_CACHE_SIZE:
+        CONDUCTORS_CACHE.popitem(last=False)
+
+
 def deserialize_conductor(wf_ex_db):
     data = {
         'spec': wf_ex_db.spec,
@@ -771,12 +900,16 @@ def deserialize_conductor(wf_ex_db):
         'errors': wf_ex_db.errors
     }
 
-    return conducting.WorkflowConductor.deserialize(data)
+    with metrics.Timer(key='orquesta.conductor.deserialize'):
+        return conducting.WorkflowConductor.deserialize(data)
 
 
 def refresh_conductor(wf_ex_id):
-    wf_ex_db = wf_db_access.WorkflowExecution.get_by_id(wf_ex_id)
-    conductor = deserialize_conductor(wf_ex_db)
+    wf_ex_db = wf_db_access.WorkflowExecution.get_latest_by_id(wf_ex_id)
+    conductor = checkout_cached_conductor(wf_ex_db)
+
+    if conductor is None:
+        conductor = deserialize_conductor(wf_ex_db)
 
     return conductor, wf_ex_db
 
@@ -809,7 +942,7 @@ def update_task_state(task_ex_id, ac_ex_status, ac_ex_result=None, ac_ex_ctx=Non
     msg = '[%s] Publish task "%s", route "%s", with status "%s" to conductor.'
     LOG.info(msg, wf_ac_ex_id, task_ex_db.task_id, str(task_ex_db.task_route), task_ex_db.status)
     ac_ex_event = events.ActionExecutionEvent(ac_ex_status, result=ac_ex_result, context=ac_ex_ctx)
-    LOG.debug('[%s] %s', wf_ac_ex_id, conductor.serialize())
+    LOG.debug('[%s] %s', wf_ac_ex_id, logging.lazy(conductor.serialize))
     conductor.update_task_state(task_ex_db.task_id, task_ex_db.task_route, ac_ex_event)
 
     # Update workflow execution and related liveaction and action execution.
@@ -841,12 +974,12 @@ def request_next_tasks(wf_ex_db, task_ex_id=None):
         task_ex_db = wf_db_access.TaskExecution.get_by_id(task_ex_id)
         msg = '[%s] Identifying next set (%s) of tasks after completion of task "%s", route "%s".'
         LOG.info(msg, wf_ac_ex_id, str(iteration), task_ex_db.task_id, str(task_ex_db.task_route))
-        LOG.debug('[%s] %s', wf_ac_ex_id, conductor.serialize())
+        LOG.debug('[%s] %s', wf_ac_ex_id, logging.lazy(conductor.serialize))
         next_tasks = conductor.get_next_tasks()
     else:
         msg = '[%s] Identifying next set (%s) of tasks for workflow execution in status "%s".'
         LOG.info(msg, wf_ac_ex_id, str(iteration), conductor.get_workflow_status())
-        LOG.debug('[%s] %s', wf_ac_ex_id, conductor.serialize())
+        LOG.debug('[%s] %s', wf_ac_ex_id, logging.lazy(conductor.serialize))
         next_tasks = conductor.get_next_tasks()
 
     # If there is no new tasks, update execution records to handle possible completion.
@@ -896,7 +1029,7 @@ def request_next_tasks(wf_ex_db, task_ex_id=None):
                 conductor.update_task_state(task['id'], task['route'], ac_ex_event)
 
         # Update workflow execution and related liveaction and action execution.
-        LOG.debug('[%s] %s', wf_ac_ex_id, conductor.serialize())
+        LOG.debug('[%s] %s', wf_ac_ex_id, logging.lazy(conductor.serialize))
         update_execution_records(wf_ex_db, conductor)
 
         # If workflow execution is no longer active, then stop processing here.
@@ -934,7 +1067,7 @@ def request_next_tasks(wf_ex_db, task_ex_id=None):
         conductor, wf_ex_db = refresh_conductor(str(wf_ex_db.id))
         msg = '[%s] Identifying next set (%s) of tasks for workflow execution in status "%s".'
         LOG.info(msg, wf_ac_ex_id, str(iteration), conductor.get_workflow_status())
-        LOG.debug('[%s] %s', wf_ac_ex_id, conductor.serialize())
+        LOG.debug('[%s] %s', wf_ac_ex_id, logging.lazy(conductor.serialize))
         next_tasks = conductor.get_next_tasks()
 
         if not next_tasks:
@@ -1066,17 +1199,44 @@ def update_execution_records(wf_ex_db, conductor, update_lv_ac_on_statuses=None,
         msg = '[%s] Updating workflow execution from status "%s" to "%s".'
         LOG.info(msg, wf_ac_ex_id, wf_old_status, wf_ex_db.status)
 
+    changed_fields = ['status']
+
     # Update timestamp and output if workflow is completed.
     if wf_ex_db.status in statuses.COMPLETED_STATUSES:
         wf_ex_db.end_timestamp = date_utils.get_datetime_utc_now()
         wf_ex_db.output = conductor.get_workflow_output()
+        changed_fields.extend(['end_timestamp', 'output'])
 
     # Update task flow and other attributes.
+    old_errors = wf_ex_db.errors
+    old_state = wf_ex_db.state
     wf_ex_db.errors = copy.deepcopy(conductor.errors)
     wf_ex_db.state = conductor.workflow_state.serialize()
 
-    # Write changes to the database.
-    wf_ex_db = wf_db_access.WorkflowExecution.update(wf_ex_db, publish=pub_wf_ex)
+    # Write only the changes to the database. The size of the write is proportional to the
+    # size of the change instead of to the size of the whole workflow state.
+    set_fields, unset_fields = deltas.get_field_updates(old_state, wf_ex_db.state, 'state')
+    errors_set_fields, errors_unset_fields = deltas.get_field_updates(
+        old_errors, wf_ex_db.errors, 'errors', escape=deltas.ESCAPE_NONE)
+    set_fields.update(errors_set_fields)
+    unset_fields.update(errors_unset_fields)
+
+    for field_name in changed_fields:
+        value = getattr(wf_ex_db, field_name)
+
+        if value is None:
+            unset_fields[field_name] = ''
+        else:
+            set_fields[field_name] = wf_ex_db._fields[field_name].to_mongo(value)
+
+    wf_ex_db = wf_db_access.WorkflowExecution.update_fields(
+        wf_ex_db,
+        set_fields=set_fields,
+        unset_fields=unset_fields,
+        publish=pub_wf_ex)
+
+    # Conductor state now matches the persisted workflow execution so it can be re-used.
+    checkin_cached_conductor(wf_ex_db, conductor)
 
     # Return if workflow execution status is not specified in update_lv_ac_on_statuses.
     if (isinstance(update_lv_ac_on_statuses, list) and
@@ -126,6 +126,21 @@ class BaseListener(ConsumerMixin):
     def shutdown(self):
         self._stopped = True
 
+    def get_stats(self):
+        """
+        Return number of the connected clients and number of the events which are waiting to be
+        sent to those clients.
+
+        :rtype: ``dict``
+        """
+        queue_sizes = [queue.qsize() for queue in self.queues]
+
+        return {
+            'clients': len(queue_sizes),
+            'queued_events': sum(queue_sizes),
+            'max_queue_depth': max(queue_sizes) if queue_sizes else 0
+        }
+
     def _should_include_event(self, event_names_whitelist, event_name):
         """
         Return True if particular event should be included based on the event names filter.
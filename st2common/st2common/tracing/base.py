@@ -0,0 +1,327 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Span based latency tracing.
+
+A span represents a single unit of work (e.g. processing a message in one of the services). Span
+context (trace id and span id) is propagated between the services using message headers so the
+spans which belong to the same activity (e.g. webhook -> rules engine -> scheduler -> action runner
+-> notifier) share the same trace id. Besides the processing time, each span which was started
+for a message also records how long the message waited in the queue.
+
+Finished spans are exported to the configured sink.
+"""
+
+from __future__ import absolute_import
+
+import os
+import time
+import binascii
+import logging
+import threading
+import contextlib
+
+import six
+from oslo_config import cfg
+from oslo_config.cfg import NoSuchOptError
+from stevedore.exception import NoMatches, MultipleMatches
+
+from st2common.util.loader import get_plugin_instance
+from st2common.exceptions.plugins import PluginLoadError
+
+__all__ = [
+    'BaseTracingSink',
+
+    'Span',
+
+    'tracing_initialize',
+    'is_enabled',
+    'get_sink',
+    'get_current_span',
+    'start_span',
+    'get_message_headers',
+    'get_consumer_span_attributes'
+]
+
+if not hasattr(cfg.CONF, 'tracing'):
+    from st2common.config import register_opts
+    register_opts()
+
+LOG = logging.getLogger(__name__)
+
+PLUGIN_NAMESPACE = 'st2common.tracing.sink'
+
+# Span kinds (same as in OpenTelemetry)
+SPAN_KIND_INTERNAL = 'internal'
+SPAN_KIND_SERVER = 'server'
+SPAN_KIND_PRODUCER = 'producer'
+SPAN_KIND_CONSUMER = 'consumer'
+
+SPAN_STATUS_OK = 'ok'
+SPAN_STATUS_ERROR = 'error'
+
+# Message header which carries span context in the W3C trace context format
+# (00-<trace id>-<span id>-<flags>)
+TRACEPARENT_HEADER = 'traceparent'
+
+# Message header which carries the time (seconds since epoch) message was published at. Used to
+# calculate how long the message waited in the queue
+PUBLISHED_AT_HEADER = 'st2-published-at'
+
+# Name of the service spans are recorded for and the sink instance
+# NOTE: Those values are populated on tracing_initialize() function call
+SERVICE_NAME = None
+SINK = None
+
+# Holds the span which is currently active in this thread / green thread
+_local = threading.local()
+
+
+class BaseTracingSink(object):
+    """
+    Base class for the sink implementations finished spans are exported to.
+    """
+
+    def export(self, span):
+        """
+        Export a finished span.
+
+        :type span: :class:`Span`
+        """
+        pass
+
+
+class Span(object):
+    def __init__(self, name, trace_id=None, parent_span_id=None, kind=SPAN_KIND_INTERNAL,
+                 service=None, queue_wait=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id or _generate_id(16)
+        self.span_id = _generate_id(8)
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.service = service
+        self.queue_wait = queue_wait
+        self.attributes = attributes or {}
+        self.status = SPAN_STATUS_OK
+        self.status_message = None
+        self.start_time = time.time()
+        self.end_time = None
+
+    @property
+    def duration(self):
+        if self.end_time is None:
+            return None
+
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_error(self, error):
+        self.status = SPAN_STATUS_ERROR
+        self.status_message = six.text_type(error)
+
+    def finish(self):
+        self.end_time = time.time()
+
+    def get_traceparent(self):
+        return '00-%s-%s-01' % (self.trace_id, self.span_id)
+
+    def to_dict(self):
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent_span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'service': self.service,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'duration': self.duration,
+            'queue_wait': self.queue_wait,
+            'attributes': self.attributes,
+            'status': self.status,
+            'status_message': self.status_message
+        }
+
+    def __repr__(self):
+        return ('<Span name=%s,trace_id=%s,span_id=%s,parent_span_id=%s>' %
+                (self.name, self.trace_id, self.span_id, self.parent_span_id))
+
+
+def tracing_initialize(service):
+    """
+    Initialize tracing for the provided service (loads the configured sink).
+    """
+    global SERVICE_NAME, SINK
+
+    SERVICE_NAME = service
+
+    if not is_enabled():
+        return None
+
+    try:
+        SINK = get_plugin_instance(PLUGIN_NAMESPACE, cfg.CONF.tracing.sink)
+    except (NoMatches, MultipleMatches, NoSuchOptError) as error:
+        raise PluginLoadError('Error loading tracing sink. Check configuration: %s' % error)
+
+    return SINK
+
+
+def is_enabled():
+    return cfg.CONF.tracing.enable
+
+
+def get_sink():
+    """
+    Return tracing sink instance.
+    """
+    if not SINK:
+        return tracing_initialize(service=SERVICE_NAME)
+
+    return SINK
+
+
+def get_current_span():
+    """
+    Return span which is currently active in this thread (if any).
+
+    :rtype: :class:`Span`
+    """
+    return getattr(_local, 'span', None)
+
+
+@contextlib.contextmanager
+def start_span(name, headers=None, kind=SPAN_KIND_INTERNAL, attributes=None):
+    """
+    Context manager which records a span for the code inside the block. The span becomes the
+    current span for the duration of the block so all the messages published inside it carry its
+    context.
+
+    If tracing is disabled, this is a no-op and None is yielded.
+
+    :param headers: Message headers (as returned by get_message_headers) of the message which is
+                    being processed. If provided, span is a child of the span which published the
+                    message and time the message spent in the queue is recorded. If not
+                    provided, span is a child of the currently active span (if any).
+    :type headers: ``dict``
+    """
+    if not is_enabled():
+        yield None
+        return
+
+    parent = get_current_span()
+
+    if headers is not None:
+        trace_id, parent_span_id, queue_wait = _parse_message_headers(headers=headers)
+    elif parent:
+        trace_id, parent_span_id, queue_wait = parent.trace_id, parent.span_id, None
+    else:
+        trace_id, parent_span_id, queue_wait = None, None, None
+
+    span = Span(name=name, trace_id=trace_id, parent_span_id=parent_span_id, kind=kind,
+                service=SERVICE_NAME, queue_wait=queue_wait, attributes=attributes)
+    _local.span = span
+
+    try:
+        yield span
+    except Exception as e:
+        span.set_error(e)
+        raise
+    finally:
+        span.finish()
+        _local.span = parent
+        _export(span=span)
+
+
+def get_message_headers():
+    """
+    Return headers which need to be included in a published message to propagate context of the
+    currently active span.
+
+    If tracing is disabled, None is returned.
+
+    :rtype: ``dict``
+    """
+    if not is_enabled():
+        return None
+
+    headers = {
+        PUBLISHED_AT_HEADER: time.time()
+    }
+
+    span = get_current_span()
+
+    if span:
+        headers[TRACEPARENT_HEADER] = span.get_traceparent()
+
+    return headers
+
+
+def get_consumer_span_attributes(body):
+    """
+    Return span attributes which identify the resource included in the consumed message.
+    """
+    attributes = {
+        'st2.resource_type': type(body).__name__
+    }
+
+    resource_id = getattr(body, 'id', None)
+
+    if resource_id:
+        attributes['st2.resource_id'] = str(resource_id)
+
+    return attributes
+
+
+def _parse_message_headers(headers):
+    """
+    Parse message headers and return (trace_id, parent_span_id, queue_wait) tuple.
+    """
+    trace_id, parent_span_id, queue_wait = None, None, None
+
+    traceparent = headers.get(TRACEPARENT_HEADER, None)
+
+    if traceparent:
+        parts = traceparent.split('-')
+
+        if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+            trace_id, parent_span_id = parts[1], parts[2]
+        else:
+            LOG.debug('Ignoring invalid traceparent header: %s', traceparent)
+
+    published_at = headers.get(PUBLISHED_AT_HEADER, None)
+
+    if published_at:
+        # Clocks on different servers can be slightly off so we never report negative wait
+        queue_wait = max(time.time() - float(published_at), 0.0)
+
+    return trace_id, parent_span_id, queue_wait
+
+
+def _export(span):
+    try:
+        sink = get_sink()
+
+        if sink:
+            sink.export(span)
+    except Exception:
+        # Tracing should never affect the traced code
+        LOG.exception('Failed to export span %s', span)
+
+
+def _generate_id(num_bytes):
+    return binascii.hexlify(os.urandom(num_bytes)).decode('ascii')
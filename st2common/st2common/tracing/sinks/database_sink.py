@@ -0,0 +1,131 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import atexit
+import datetime
+import threading
+
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.models.db.trace import TraceSpanDB
+from st2common.persistence.trace import TraceSpan
+from st2common.tracing.base import BaseTracingSink
+from st2common.util import date as date_utils
+
+__all__ = [
+    'DatabaseSink'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class DatabaseSink(BaseTracingSink):
+    """
+    Sink which stores spans in the database. This way latency breakdown of a particular trace
+    can be retrieved using the API and "st2 trace latency" command without running a separate
+    tracing backend.
+
+    Spans are buffered in memory and written in batches by a background thread so exporting a
+    span never performs database I/O on the traced code path. If the buffer is full (e.g. the
+    database is unavailable), new spans are dropped.
+    """
+
+    def __init__(self, batch_size=None, flush_interval=None, max_buffer_size=None):
+        self._batch_size = batch_size or cfg.CONF.tracing.batch_size
+        self._flush_interval = flush_interval or cfg.CONF.tracing.flush_interval
+        self._max_buffer_size = max_buffer_size or cfg.CONF.tracing.max_buffer_size
+
+        self._lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._flush_thread = None
+
+        self._spans = []
+        self._dropped_count = 0
+
+    def export(self, span):
+        with self._lock:
+            if len(self._spans) >= self._max_buffer_size:
+                self._dropped_count += 1
+                return
+
+            self._spans.append(span)
+            batch_full = len(self._spans) >= self._batch_size
+
+            if not self._flush_thread:
+                self._start_flush_thread()
+
+        if batch_full:
+            self._flush_event.set()
+
+    def flush(self):
+        """
+        Write all the buffered spans to the database.
+        """
+        with self._lock:
+            spans = self._spans
+            self._spans = []
+
+            dropped_count = self._dropped_count
+            self._dropped_count = 0
+
+        if dropped_count:
+            LOG.warning('Span buffer is full, dropped %s spans.', dropped_count)
+
+        for index in range(0, len(spans), self._batch_size):
+            span_dbs = [_to_span_db(span) for span in spans[index:index + self._batch_size]]
+
+            try:
+                TraceSpan.insert_many(span_dbs, publish=False, dispatch_trigger=False)
+            except Exception:
+                LOG.exception('Failed to store %s spans.', len(span_dbs))
+
+    def _start_flush_thread(self):
+        self._flush_thread = threading.Thread(target=self._flush_loop,
+                                              name='DatabaseSinkFlushThread')
+        self._flush_thread.daemon = True
+        self._flush_thread.start()
+
+        # Make sure spans which are still buffered are not lost on a clean shutdown
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            self._flush_event.wait(self._flush_interval)
+            self._flush_event.clear()
+
+            try:
+                self.flush()
+            except Exception:
+                LOG.exception('Failed to flush spans.')
+
+
+def _to_span_db(span):
+    return TraceSpanDB(trace_id=span.trace_id, span_id=span.span_id,
+                       parent_span_id=span.parent_span_id, name=span.name, kind=span.kind,
+                       service=span.service,
+                       resource_type=span.attributes.get('st2.resource_type', None),
+                       resource_id=span.attributes.get('st2.resource_id', None),
+                       start_timestamp=_to_datetime(span.start_time),
+                       end_timestamp=_to_datetime(span.end_time),
+                       queue_wait=span.queue_wait, duration=span.duration,
+                       status=span.status, status_message=span.status_message,
+                       attributes=span.attributes)
+
+
+def _to_datetime(timestamp):
+    return date_utils.add_utc_tz(datetime.datetime.utcfromtimestamp(timestamp))
@@ -0,0 +1,158 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import os
+import json
+import threading
+
+import six
+from oslo_config import cfg
+
+from st2common.tracing.base import BaseTracingSink
+from st2common.tracing.base import SPAN_STATUS_ERROR
+
+__all__ = [
+    'FileSink'
+]
+
+# Maps span kind to the OTLP span kind enum value
+OTLP_SPAN_KINDS = {
+    'internal': 1,
+    'server': 2,
+    'client': 3,
+    'producer': 4,
+    'consumer': 5
+}
+
+OTLP_STATUS_CODE_OK = 1
+OTLP_STATUS_CODE_ERROR = 2
+
+
+class FileSink(BaseTracingSink):
+    """
+    Sink which appends spans to a file in the OTLP JSON format (one ExportTraceServiceRequest per
+    line). The file can be sent to any OTLP compatible collector (e.g. using OpenTelemetry
+    Collector file receiver).
+
+    File is kept open between the spans and is only re-opened when it has been moved or removed
+    (e.g. by logrotate), same as with logging.handlers.WatchedFileHandler.
+    """
+
+    def __init__(self, file_path=None):
+        self._file_path = file_path or cfg.CONF.tracing.file_path
+        self._lock = threading.Lock()
+
+        self._fp = None
+        self._file_id = None
+
+    def export(self, span):
+        line = json.dumps(span_to_otlp(span=span)) + '\n'
+
+        with self._lock:
+            fp = self._get_file()
+            fp.write(line)
+            fp.flush()
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+
+    def _get_file(self):
+        try:
+            stat = os.stat(self._file_path)
+            file_id = (stat.st_dev, stat.st_ino)
+        except OSError:
+            file_id = None
+
+        if self._fp and file_id != self._file_id:
+            self._close_file()
+
+        if not self._fp:
+            self._fp = open(self._file_path, 'a')
+            stat = os.fstat(self._fp.fileno())
+            self._file_id = (stat.st_dev, stat.st_ino)
+
+        return self._fp
+
+    def _close_file(self):
+        if self._fp:
+            self._fp.close()
+
+        self._fp = None
+        self._file_id = None
+
+
+def span_to_otlp(span):
+    """
+    Convert the provided span to the OTLP JSON format.
+
+    :rtype: dict
+    """
+    attributes = dict(span.attributes)
+
+    if span.queue_wait is not None:
+        attributes['st2.queue_wait_ms'] = span.queue_wait * 1000
+
+    otlp_span = {
+        'traceId': span.trace_id,
+        'spanId': span.span_id,
+        'name': span.name,
+        'kind': OTLP_SPAN_KINDS.get(span.kind, OTLP_SPAN_KINDS['internal']),
+        'startTimeUnixNano': str(int(span.start_time * 1e9)),
+        'endTimeUnixNano': str(int(span.end_time * 1e9)),
+        'attributes': _get_otlp_attributes(attributes),
+        'status': {
+            'code': OTLP_STATUS_CODE_ERROR if span.status == SPAN_STATUS_ERROR else
+            OTLP_STATUS_CODE_OK
+        }
+    }
+
+    if span.parent_span_id:
+        otlp_span['parentSpanId'] = span.parent_span_id
+
+    if span.status_message:
+        otlp_span['status']['message'] = span.status_message
+
+    return {
+        'resourceSpans': [{
+            'resource': {
+                'attributes': _get_otlp_attributes({'service.name': 'st2%s' % (span.service or '')})
+            },
+            'scopeSpans': [{
+                'scope': {'name': 'st2'},
+                'spans': [otlp_span]
+            }]
+        }]
+    }
+
+
+def _get_otlp_attributes(attributes):
+    result = []
+
+    for key, value in sorted(six.iteritems(attributes)):
+        if isinstance(value, bool):
+            otlp_value = {'boolValue': value}
+        elif isinstance(value, six.integer_types):
+            otlp_value = {'intValue': str(value)}
+        elif isinstance(value, float):
+            otlp_value = {'doubleValue': value}
+        else:
+            otlp_value = {'stringValue': six.text_type(value)}
+
+        result.append({'key': key, 'value': otlp_value})
+
+    return result
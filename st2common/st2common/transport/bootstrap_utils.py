@@ -30,8 +30,13 @@ from st2common.transport import utils as transport_utils
 from st2common.transport.actionexecutionstate import ACTIONEXECUTIONSTATE_XCHG
 from st2common.transport.announcement import ANNOUNCEMENT_XCHG
 from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
+from st2common.transport.content import ACTION_CUD_XCHG, RUNNER_TYPE_CUD_XCHG
+from st2common.transport.content import CONFIG_CUD_XCHG, CONFIG_SCHEMA_CUD_XCHG
+from st2common.transport.content import KEY_VALUE_PAIR_CUD_XCHG
+from st2common.transport.content import ACTION_ALIAS_CUD_XCHG
 from st2common.transport.execution import EXECUTION_XCHG
 from st2common.transport.liveaction import LIVEACTION_XCHG, LIVEACTION_STATUS_MGMT_XCHG
+from st2common.transport.profiler import PROFILER_XCHG
 from st2common.transport.reactor import SENSOR_CUD_XCHG
 from st2common.transport.reactor import TRIGGER_CUD_XCHG, TRIGGER_INSTANCE_XCHG
 from st2common.transport import reactor
@@ -63,11 +68,18 @@ __all__ = [
 
 # List of exchanges which are pre-declared on service set up.
 EXCHANGES = [
+    ACTION_ALIAS_CUD_XCHG,
+    ACTION_CUD_XCHG,
     ACTIONEXECUTIONSTATE_XCHG,
     ANNOUNCEMENT_XCHG,
+    CONFIG_CUD_XCHG,
+    CONFIG_SCHEMA_CUD_XCHG,
     EXECUTION_XCHG,
+    KEY_VALUE_PAIR_CUD_XCHG,
     LIVEACTION_XCHG,
     LIVEACTION_STATUS_MGMT_XCHG,
+    PROFILER_XCHG,
+    RUNNER_TYPE_CUD_XCHG,
     TRIGGER_CUD_XCHG,
     TRIGGER_INSTANCE_XCHG,
     SENSOR_CUD_XCHG,
@@ -22,6 +22,7 @@ from kombu.mixins import ConsumerMixin
 from oslo_config import cfg
 
 from st2common import log as logging
+from st2common.tracing import base as tracing
 from st2common.util.greenpooldispatch import BufferedDispatcher
 
 __all__ = [
@@ -60,19 +61,46 @@ class QueueConsumer(ConsumerMixin):
             if not isinstance(body, self._handler.message_type):
                 raise TypeError('Received an unexpected type "%s" for payload.' % type(body))
 
-            self._dispatcher.dispatch(self._process_message, body)
+            self._dispatch(self._dispatcher, body, message)
         except:
             LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
         finally:
             # At this point we will always ack a message.
             message.ack()
 
-    def _process_message(self, body):
+    def _dispatch(self, dispatcher, body, message):
+        tracing_headers = self._get_tracing_headers(message)
+
+        if tracing_headers is None:
+            dispatcher.dispatch(self._process_message, body)
+        else:
+            dispatcher.dispatch(self._process_message, body, tracing_headers)
+
+    def _process_message(self, body, tracing_headers=None):
         try:
-            self._handler.process(body)
+            if tracing_headers is None:
+                self._handler.process(body)
+                return
+
+            # Span is started here (and not when the message is received) so the time message
+            # waited for a free dispatcher thread is also included in the queue wait time
+            with tracing.start_span('%s.process' % (self._handler.__class__.__name__),
+                                    headers=tracing_headers, kind=tracing.SPAN_KIND_CONSUMER,
+                                    attributes=tracing.get_consumer_span_attributes(body)):
+                self._handler.process(body)
         except:
             LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
 
+    @staticmethod
+    def _get_tracing_headers(message):
+        """
+        Return tracing headers of the provided message or None if tracing is disabled.
+        """
+        if not tracing.is_enabled():
+            return None
+
+        return getattr(message, 'headers', None) or {}
+
 
 class StagedQueueConsumer(QueueConsumer):
     """
@@ -84,7 +112,7 @@ class StagedQueueConsumer(QueueConsumer):
             if not isinstance(body, self._handler.message_type):
                 raise TypeError('Received an unexpected type "%s" for payload.' % type(body))
             response = self._handler.pre_ack_process(body)
-            self._dispatcher.dispatch(self._process_message, response)
+            self._dispatch(self._dispatcher, response, message)
         except:
             LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
         finally:
@@ -129,7 +157,7 @@ class ActionsQueueConsumer(QueueConsumer):
                 dispatcher = self._actions_dispatcher
 
             LOG.debug('Using BufferedDispatcher pool: "%s"', str(dispatcher))
-            dispatcher.dispatch(self._process_message, body)
+            self._dispatch(dispatcher, body, message)
         except:
             LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
         finally:
@@ -151,7 +179,7 @@ class VariableMessageQueueConsumer(QueueConsumer):
             if not self._handler.message_types.get(type(body)):
                 raise TypeError('Received an unexpected type "%s" for payload.' % type(body))
 
-            self._dispatcher.dispatch(self._process_message, body)
+            self._dispatch(self._dispatcher, body, message)
         except:
             LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
         finally:
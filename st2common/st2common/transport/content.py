@@ -0,0 +1,114 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Exchanges for CUD events of the content resources which are used when dispatching an action
+(actions, runner types, pack configs and datastore items) and when matching ChatOps commands
+(action aliases).
+"""
+
+from __future__ import absolute_import
+
+from kombu import Exchange, Queue
+
+from st2common.transport import publishers
+
+__all__ = [
+    'ActionCUDPublisher',
+    'RunnerTypeCUDPublisher',
+    'ConfigCUDPublisher',
+    'ConfigSchemaCUDPublisher',
+    'KeyValuePairCUDPublisher',
+    'ActionAliasCUDPublisher',
+
+    'get_queue'
+]
+
+# Exchange for Action CUD events
+ACTION_CUD_XCHG = Exchange('st2.action', type='topic')
+
+# Exchange for RunnerType CUD events
+RUNNER_TYPE_CUD_XCHG = Exchange('st2.runnertype', type='topic')
+
+# Exchange for pack Config CUD events
+CONFIG_CUD_XCHG = Exchange('st2.config', type='topic')
+
+# Exchange for pack ConfigSchema CUD events
+CONFIG_SCHEMA_CUD_XCHG = Exchange('st2.config_schema', type='topic')
+
+# Exchange for KeyValuePair CUD events
+KEY_VALUE_PAIR_CUD_XCHG = Exchange('st2.key_value_pair', type='topic')
+
+# Exchange for ActionAlias CUD events
+ACTION_ALIAS_CUD_XCHG = Exchange('st2.action_alias', type='topic')
+
+
+class ActionCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing Action model CUD events.
+    """
+
+    def __init__(self):
+        super(ActionCUDPublisher, self).__init__(exchange=ACTION_CUD_XCHG)
+
+
+class RunnerTypeCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing RunnerType model CUD events.
+    """
+
+    def __init__(self):
+        super(RunnerTypeCUDPublisher, self).__init__(exchange=RUNNER_TYPE_CUD_XCHG)
+
+
+class ConfigCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing Config model CUD events.
+    """
+
+    def __init__(self):
+        super(ConfigCUDPublisher, self).__init__(exchange=CONFIG_CUD_XCHG)
+
+
+class ConfigSchemaCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing ConfigSchema model CUD events.
+    """
+
+    def __init__(self):
+        super(ConfigSchemaCUDPublisher, self).__init__(exchange=CONFIG_SCHEMA_CUD_XCHG)
+
+
+class KeyValuePairCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing KeyValuePair model CUD events.
+    """
+
+    def __init__(self):
+        super(KeyValuePairCUDPublisher, self).__init__(exchange=KEY_VALUE_PAIR_CUD_XCHG)
+
+
+class ActionAliasCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing ActionAlias model CUD events.
+    """
+
+    def __init__(self):
+        super(ActionAliasCUDPublisher, self).__init__(exchange=ACTION_ALIAS_CUD_XCHG)
+
+
+def get_queue(exchange, name=None, routing_key='#', exclusive=False, auto_delete=False):
+    return Queue(name, exchange, routing_key=routing_key, exclusive=exclusive,
+                 auto_delete=auto_delete)
@@ -0,0 +1,46 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Exchange which is used to publish profiling requests to the running services.
+"""
+
+from __future__ import absolute_import
+
+from kombu import Exchange, Queue
+
+from st2common.transport import publishers
+
+__all__ = [
+    'ProfilerRequestPublisher',
+
+    'get_queue'
+]
+
+# Exchange for profiling requests, routing key is the service name
+PROFILER_XCHG = Exchange('st2.profiler', type='topic')
+
+
+class ProfilerRequestPublisher(object):
+    def __init__(self):
+        self._publisher = publishers.PoolPublisher()
+
+    def publish(self, payload, routing_key):
+        self._publisher.publish(payload, PROFILER_XCHG, routing_key)
+
+
+def get_queue(name=None, routing_key='#', exclusive=False, auto_delete=False):
+    return Queue(name, PROFILER_XCHG, routing_key=routing_key, exclusive=exclusive,
+                 auto_delete=auto_delete)
@@ -16,11 +16,14 @@
 from __future__ import absolute_import
 
 import copy
+import contextlib
+import threading
 
 from kombu.messaging import Producer
 
 from st2common import log as logging
 from st2common.metrics.base import Timer
+from st2common.tracing import base as tracing
 from st2common.transport import utils as transport_utils
 from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
 
@@ -53,10 +56,67 @@ class PoolPublisher(object):
         self.pool = connection.Pool(limit=10)
         self.cluster_size = len(urls)
 
+        # Holds the state of the batch (if any) the current thread is publishing in
+        self._local = threading.local()
+
     def errback(self, exc, interval):
         LOG.error('Rabbitmq connection error: %s', exc.message, exc_info=False)
 
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager which pipelines all the messages published by the current thread inside
+        the block over a single connection and channel instead of acquiring a connection and
+        opening a new channel for each message.
+
+        Connection is only acquired when the first message is published.
+        """
+        if getattr(self._local, 'batch', None) is not None:
+            # Nested batch, messages are published as part of the outer one
+            yield
+            return
+
+        self._local.batch = {}
+
+        try:
+            yield
+        finally:
+            batch = self._local.batch
+            self._local.batch = None
+
+            if batch.get('producer', None):
+                try:
+                    # Producer might have been revived on a different channel
+                    batch['producer'].channel.close()
+                except Exception:
+                    LOG.warning('Error closing channel.', exc_info=True)
+
+            if batch.get('connection', None):
+                batch['connection'].release()
+
+    def get_pool_stats(self):
+        """
+        Return connection pool usage statistics.
+
+        :rtype: ``dict``
+        """
+        # NOTE: kombu doesn't expose those values using a public API
+        return {
+            'limit': self.pool.limit or 0,
+            'in_use': len(self.pool._dirty),
+            'idle': self.pool._resource.qsize()
+        }
+
     def publish(self, payload, exchange, routing_key=''):
+        batch = getattr(self._local, 'batch', None)
+
+        if batch is not None:
+            self._publish_in_batch(batch, payload, exchange, routing_key)
+            return
+
+        # Propagate tracing context (if enabled) of the currently active span
+        headers = tracing.get_message_headers()
+
         with Timer(key='amqp.pool_publisher.publish_with_retries.' + exchange.name):
             with self.pool.acquire(block=True) as connection:
                 retry_wrapper = ConnectionRetryWrapper(cluster_size=self.cluster_size, logger=LOG)
@@ -75,6 +135,9 @@ class PoolPublisher(object):
                         'content_encoding': 'utf-8'
                     }
 
+                    if headers:
+                        kwargs['headers'] = headers
+
                     retry_wrapper.ensured(
                         connection=connection,
                         obj=producer,
@@ -84,6 +147,40 @@ class PoolPublisher(object):
 
                 retry_wrapper.run(connection=connection, wrapped_callback=do_publish)
 
+    def _publish_in_batch(self, batch, payload, exchange, routing_key):
+        with Timer(key='amqp.pool_publisher.publish_in_batch.' + exchange.name):
+            if not batch.get('connection', None):
+                batch['connection'] = self.pool.acquire(block=True)
+
+            connection = batch['connection']
+
+            if not batch.get('producer', None):
+                batch['producer'] = Producer(connection.channel())
+
+            producer = batch['producer']
+            retry_wrapper = ConnectionRetryWrapper(cluster_size=self.cluster_size, logger=LOG)
+
+            kwargs = {
+                'body': payload,
+                'exchange': exchange,
+                'routing_key': routing_key,
+                'serializer': 'pickle',
+                'content_encoding': 'utf-8'
+            }
+
+            headers = tracing.get_message_headers()
+
+            if headers:
+                kwargs['headers'] = headers
+
+            # Recoverable errors are retried and the producer is revived on a new channel
+            retry_wrapper.ensured(
+                connection=connection,
+                obj=producer,
+                to_ensure_func=producer.publish,
+                **kwargs
+            )
+
 
 class SharedPoolPublishers(object):
     """
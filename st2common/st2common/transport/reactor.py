@@ -14,11 +14,14 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+
+import six
 from kombu import Exchange, Queue
 
 from st2common import log as logging
 from st2common.constants.trace import TRACE_CONTEXT
 from st2common.models.api.trace import TraceContext
+from st2common.tracing import base as tracing
 from st2common.transport import publishers
 
 __all__ = [
@@ -104,7 +107,15 @@ class TriggerDispatcher(object):
         routing_key = 'trigger_instance'
 
         self._logger.debug('Dispatching trigger (trigger=%s,payload=%s)', trigger, payload)
-        self._publisher.publish_trigger(payload=payload, routing_key=routing_key)
+
+        attributes = {}
+
+        if isinstance(trigger, six.string_types):
+            attributes['st2.trigger'] = trigger
+
+        with tracing.start_span('trigger.dispatch', kind=tracing.SPAN_KIND_PRODUCER,
+                                attributes=attributes):
+            self._publisher.publish_trigger(payload=payload, routing_key=routing_key)
 
 
 def get_trigger_cud_queue(name, routing_key, exclusive=False):
@@ -14,22 +14,54 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+import re
+
+import eventlet
 import six
+from kombu.mixins import ConsumerMixin
 
 from mongoengine.queryset.visitor import Q
 
+from st2common import log as logging
 from st2common.exceptions.content import ParseException
 from st2common.exceptions.actionalias import ActionAliasAmbiguityException
 from st2common.persistence.actionalias import ActionAlias
+from st2common.models.utils.action_alias_utils import ActionAliasFormatParser
+from st2common.models.utils.action_alias_utils import compile_format_string
 from st2common.models.utils.action_alias_utils import extract_parameters
+from st2common.transport import content as content_transport
+from st2common.transport import utils as transport_utils
+import st2common.util.queues as queue_utils
 
 __all__ = [
+    'ActionAliasIndex',
+    'ActionAliasIndexWatcher',
+
     'list_format_strings_from_aliases',
     'normalise_alias_format_string',
+    'get_format_string_prefix',
     'match_command_to_alias',
     'get_matching_alias',
+
+    'get_index',
+    'enable_index',
+    'disable_index'
 ]
 
+LOG = logging.getLogger(__name__)
+
+# Word in a format string which doesn't contain any parameters or regular expression special
+# characters
+LITERAL_WORD_REGEX = re.compile(r'^[^\s.^$*+?{}\[\]\\|()]+$')
+
+# Format strings which contain any of those (alternation, inline flags and groups, beginning
+# anchors other than the leading one) can match commands which don't start with the leading
+# words of the format string
+NON_PREFIX_FORMAT_TOKENS = ['|', '(?', '\\A']
+
+_INDEX = None
+_WATCHER = None
+
 
 def list_format_strings_from_aliases(aliases, match_multiple=False):
     '''
@@ -100,6 +132,50 @@ def normalise_alias_format_string(alias_format):
     return (display, representation, match_multiple)
 
 
+def get_format_string_prefix(format_str):
+    """
+    Return leading literal words of the format string. Each command which matches the format
+    string starts with those words (once the key-value pairs at the end of the command have been
+    removed).
+
+    :rtype: ``list`` of ``str``
+    """
+    if any(token in format_str for token in NON_PREFIX_FORMAT_TOKENS):
+        return []
+
+    format_str = format_str.strip()
+
+    if format_str.startswith('^'):
+        format_str = format_str[1:].lstrip()
+
+    if '^' in format_str:
+        return []
+
+    # Words alternating with the whitespace which separates them
+    tokens = re.split(r'(\s+)', format_str)
+    words = []
+
+    for index in range(0, len(tokens), 2):
+        word = tokens[index]
+
+        if not LITERAL_WORD_REGEX.match(word):
+            break
+
+        if index + 2 < len(tokens):
+            # Whitespace followed by a quantifier is optional so the word could continue
+            next_word = tokens[index + 2]
+
+            if next_word[:1] in ['?', '*'] or (next_word[:1] == '{' and next_word[:2] != '{{'):
+                break
+        elif '$' in format_str or '\\Z' in format_str:
+            # Ending anchor is only added if there is none so the last word could continue
+            break
+
+        words.append(word)
+
+    return words
+
+
 def match_command_to_alias(command, aliases, match_multiple=False):
     """
     Match the text against an action and return the action reference.
@@ -123,13 +199,18 @@ def get_matching_alias(command):
     """
     Find a matching ActionAliasDB object (if any) for the provided command.
     """
-    # 1. Get aliases
-    action_alias_dbs = ActionAlias.query(
-        Q(formats__match_multiple=None) | Q(formats__match_multiple=False),
-        enabled=True)
+    index = get_index()
+
+    if index:
+        matches = index.match(command=command)
+    else:
+        # 1. Get aliases
+        action_alias_dbs = ActionAlias.query(
+            Q(formats__match_multiple=None) | Q(formats__match_multiple=False),
+            enabled=True)
 
-    # 2. Match alias(es) to command
-    matches = match_command_to_alias(command=command, aliases=action_alias_dbs)
+        # 2. Match alias(es) to command
+        matches = match_command_to_alias(command=command, aliases=action_alias_dbs)
 
     if len(matches) > 1:
         raise ActionAliasAmbiguityException("Command '%s' matched more than 1 pattern" %
@@ -137,12 +218,16 @@ def get_matching_alias(command):
                                             matches=matches,
                                             command=command)
     elif len(matches) == 0:
-        match_multiple_action_alias_dbs = ActionAlias.query(
-            formats__match_multiple=True,
-            enabled=True)
+        if index:
+            matches = index.match(command=command, match_multiple=True)
+        else:
+            match_multiple_action_alias_dbs = ActionAlias.query(
+                formats__match_multiple=True,
+                enabled=True)
 
-        matches = match_command_to_alias(command=command, aliases=match_multiple_action_alias_dbs,
-                                         match_multiple=True)
+            matches = match_command_to_alias(command=command,
+                                             aliases=match_multiple_action_alias_dbs,
+                                             match_multiple=True)
 
         if len(matches) > 1:
             raise ActionAliasAmbiguityException("Command '%s' matched more than 1 (multi) pattern" %
@@ -157,3 +242,254 @@ def get_matching_alias(command):
                                                 command=command)
 
     return matches[0]
+
+
+class ActionAliasIndex(object):
+    """
+    In-memory index of the formats of all the enabled action aliases.
+
+    Format strings are compiled once when the index is built. Formats are stored in a trie keyed
+    by their leading literal words (see get_format_string_prefix) so a command is only matched
+    against the formats whose leading words are also the leading words of the command.
+
+    Index is built lazily on the first match after it has been invalidated. Compiled format
+    strings are re-used when the index is built again so only new and changed formats are
+    compiled.
+    """
+
+    # Number of format strings which are compiled before yielding to other green threads
+    compile_batch_size = 100
+
+    def __init__(self):
+        self._root = None
+
+        # Maps format string to the compiled format string
+        self._compiled_formats = {}
+
+        # Incremented on each invalidation so an index which has been built from stale data is
+        # never used
+        self._version = 0
+
+        self._empty_format = compile_format_string('')
+
+    def invalidate(self):
+        self._version += 1
+        self._root = None
+
+    def match(self, command, match_multiple=False):
+        """
+        Return formats which match the command. Result is the same as the result of
+        match_command_to_alias for all the enabled aliases which (don't) have a format with
+        match_multiple set.
+
+        :rtype: ``list`` of ``dict``
+        """
+        root = self._get_root()
+
+        parser = ActionAliasFormatParser(param_stream=command, compiled_format=self._empty_format)
+        words = parser.get_param_stream().split()
+
+        entries = list(root['entries'])
+        node = root
+
+        for word in words:
+            node = node['children'].get(word, None)
+
+            if not node:
+                break
+
+            entries.extend(node['entries'])
+
+        # Preserve the order in which the aliases are returned by the database
+        entries.sort(key=lambda entry: entry['index'])
+
+        results = []
+
+        for entry in entries:
+            if match_multiple and not entry['multiple']:
+                continue
+            elif not match_multiple and not entry['single']:
+                continue
+
+            try:
+                extract_parameters(format_str=entry['format']['representation'],
+                                   param_stream=command,
+                                   compiled_format=entry['compiled_format'])
+            except ParseException:
+                continue
+
+            results.append(dict(entry['format']))
+
+        return results
+
+    def build(self, action_alias_dbs=None):
+        """
+        Build the index from the provided aliases or from all the enabled aliases in the database
+        if no aliases are provided.
+        """
+        version = self._version
+
+        if action_alias_dbs is None:
+            action_alias_dbs = ActionAlias.query(enabled=True)
+
+        root = self._build(action_alias_dbs=action_alias_dbs)
+
+        if version == self._version:
+            self._root = root
+
+        return root
+
+    def _get_root(self):
+        if self._root is None:
+            return self.build()
+
+        return self._root
+
+    def _build(self, action_alias_dbs):
+        root = self._get_node()
+        count = 0
+
+        compiled_formats = {}
+
+        for action_alias_db in action_alias_dbs:
+            match_multiple_values = [format_.get('match_multiple', None)
+                                     if isinstance(format_, dict) else None
+                                     for format_ in action_alias_db.formats or []]
+
+            # Same conditions as used by the database queries in get_matching_alias
+            single = any([value is None or value is False for value in match_multiple_values])
+            multiple = any([value is True for value in match_multiple_values])
+
+            for format_ in list_format_strings_from_aliases([action_alias_db]):
+                representation = format_['representation']
+
+                if representation in compiled_formats:
+                    compiled_format = compiled_formats[representation]
+                elif representation in self._compiled_formats:
+                    compiled_format = self._compiled_formats[representation]
+                else:
+                    compiled_format = self._compile_format(representation, action_alias_db)
+
+                    if len(compiled_formats) % self.compile_batch_size == 0:
+                        eventlet.sleep(0)
+
+                compiled_formats[representation] = compiled_format
+
+                node = root
+
+                for word in get_format_string_prefix(representation):
+                    node = node['children'].setdefault(word, self._get_node())
+
+                node['entries'].append({
+                    'index': count,
+                    'format': format_,
+                    'compiled_format': compiled_format,
+                    'single': single,
+                    'multiple': multiple
+                })
+                count += 1
+
+        self._compiled_formats = compiled_formats
+
+        LOG.debug('Action alias index has been built (%s formats).', count)
+        return root
+
+    @staticmethod
+    def _compile_format(representation, action_alias_db):
+        try:
+            return compile_format_string(representation)
+        except Exception:
+            # Format is compiled again (and the error is raised) when it's matched
+            LOG.debug('Failed to compile format "%s" of action alias "%s"', representation,
+                      action_alias_db.ref, exc_info=True)
+            return None
+
+    @staticmethod
+    def _get_node():
+        return {
+            'children': {},
+            'entries': []
+        }
+
+
+class ActionAliasIndexWatcher(ConsumerMixin):
+    """
+    Consumer which invalidates the action alias index on ActionAlias CUD events.
+    """
+
+    def __init__(self, index, queue_suffix=None):
+        self._index = index
+
+        queue_name = queue_utils.get_queue_name(queue_name_base='st2.action_alias.index',
+                                                queue_name_suffix=queue_suffix,
+                                                add_random_uuid_to_suffix=True)
+        self._queue = content_transport.get_queue(
+            exchange=content_transport.ACTION_ALIAS_CUD_XCHG, name=queue_name, exclusive=True,
+            auto_delete=True)
+
+        self.connection = None
+        self._updates_thread = None
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[self._queue], accept=['pickle'], callbacks=[self.process_task])]
+
+    def on_connection_revived(self):
+        # Events which were published while the connection was down are lost
+        LOG.debug('Connection revived, invalidating action alias index')
+        self._index.invalidate()
+
+    def process_task(self, body, message):
+        try:
+            self._index.invalidate()
+        finally:
+            message.ack()
+
+    def start(self):
+        self.connection = transport_utils.get_connection()
+        self._updates_thread = eventlet.spawn(self.run)
+
+    def stop(self):
+        self.should_stop = True
+
+        if self._updates_thread:
+            self._updates_thread = eventlet.kill(self._updates_thread)
+
+        if self.connection:
+            self.connection.release()
+
+
+def get_index():
+    """
+    Return action alias index for this process or None if the index is not enabled.
+
+    :rtype: :class:`ActionAliasIndex`
+    """
+    return _INDEX
+
+
+def enable_index(queue_suffix=None):
+    """
+    Enable the index and start the watcher which invalidates it.
+    """
+    global _INDEX
+    global _WATCHER
+
+    if not _INDEX:
+        _INDEX = ActionAliasIndex()
+
+    if not _WATCHER:
+        _WATCHER = ActionAliasIndexWatcher(index=_INDEX, queue_suffix=queue_suffix)
+        _WATCHER.start()
+
+    return _INDEX
+
+
+def disable_index():
+    global _INDEX
+    global _WATCHER
+
+    if _WATCHER:
+        _WATCHER.stop()
+        _WATCHER = None
+
+    _INDEX = None
@@ -24,6 +24,7 @@ import six
 from st2common import log as logging
 from st2common.persistence.auth import Token, ApiKey
 from st2common.exceptions import auth as exceptions
+from st2common.services import access
 from st2common.util import date as date_utils
 from st2common.util import hash as hash_utils
 
@@ -48,7 +49,11 @@ def validate_token(token_string):
     :return: TokenDB object on success.
     :rtype: :class:`.TokenDB`
     """
-    token = Token.get(token_string)
+    if access.is_signed_token(token_string):
+        # Stateless signed tokens (e.g. issued to action executions) are not stored in the database
+        token = access.get_signed_token(token_string)
+    else:
+        token = Token.get(token_string)
 
     if token.expiry <= date_utils.get_datetime_utc_now():
         # TODO: purge expired tokens
@@ -16,10 +16,10 @@
 from __future__ import absolute_import
 import os
 
-import yaml
 import io
 
 from st2common.content import utils
+from st2common.util import yaml_loader
 
 __all__ = [
     'ContentPackConfigParser',
@@ -96,7 +96,7 @@ class ContentPackConfigParser(object):
 
         if os.path.exists(config_path) and os.path.isfile(config_path):
             with io.open(config_path, 'r', encoding='utf8') as fp:
-                config = yaml.safe_load(fp.read())
+                config = yaml_loader.safe_load(fp.read())
 
             return ContentPackConfig(file_path=config_path, config=config)
 
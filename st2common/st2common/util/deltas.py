@@ -0,0 +1,236 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Utility functions for computing field level MongoDB update operations ($set and $unset) from two
+versions of a (potentially large) document field value.
+
+This allows us to persist a change to a large field (e.g. workflow execution state) by only
+writing parts of the value which have actually changed instead of re-writing the whole value.
+"""
+
+from __future__ import absolute_import
+
+import six
+
+from st2common.util import mongoescape
+
+__all__ = [
+    'ESCAPE_DICT',
+    'ESCAPE_NONE',
+
+    'get_field_updates',
+    'apply_field_updates'
+]
+
+# Escaping modes which mirror what mongoescape.escape_chars does for the EscapedDictField and
+# EscapedDynamicField values. escape_chars only translates keys of dicts which are nested inside
+# other dicts or inside lists which are values of those dicts so we need to track that while
+# walking the value to produce the same document a full write would.
+ESCAPE_DICT = 'dict'
+ESCAPE_LIST = 'list'
+ESCAPE_NONE = None
+
+
+def get_field_updates(old_value, new_value, path, escape=ESCAPE_DICT):
+    """
+    Compare two versions of the field value and return MongoDB update operations which need to
+    be performed to transform the old (persisted) version into the new one.
+
+    Only dict keys and list items which have changed are included. Items which were appended to
+    a list are set using their index. If a list shrinks, the whole list is set.
+
+    :param old_value: Currently persisted field value.
+    :param new_value: New field value.
+
+    :param path: Path (name) of the field in the document.
+    :type path: ``str``
+
+    :param escape: Escaping mode for the field (ESCAPE_DICT for EscapedDictField and ESCAPE_NONE
+                   for EscapedDynamicField which contains a list).
+
+    :return: Tuple of ($set fields, $unset fields) with escaped keys and values.
+    :rtype: ``tuple`` of (``dict``, ``dict``)
+    """
+    set_fields = {}
+    unset_fields = {}
+
+    _diff(old_value, new_value, path, escape, set_fields, unset_fields)
+
+    return set_fields, unset_fields
+
+
+def apply_field_updates(document, set_fields, unset_fields=None):
+    """
+    Apply update operations returned by get_field_updates to a raw (escaped) document in place.
+
+    :param document: Raw document as retrieved from the database.
+    :type document: ``dict``
+    """
+    # NOTE: Paths are applied in the natural order of the list indexes so items which were
+    # appended to a list are applied in order
+    for path in sorted(set_fields.keys(), key=_get_path_sort_key):
+        parent, key = _get_parent(document, path, create=True)
+
+        if isinstance(parent, list):
+            while len(parent) <= key:
+                parent.append(None)
+
+        parent[key] = set_fields[path]
+
+    for path in (unset_fields or {}):
+        parent, key = _get_parent(document, path, create=False)
+
+        if isinstance(parent, dict):
+            parent.pop(key, None)
+
+    return document
+
+
+def _diff(old_value, new_value, path, escape, set_fields, unset_fields):
+    if _is_equal(old_value, new_value):
+        return
+
+    if isinstance(old_value, dict) and isinstance(new_value, dict):
+        escaped_keys = {}
+
+        for key in set(old_value.keys()) | set(new_value.keys()):
+            escaped_key = _escape_key(key, escape)
+
+            if not _is_valid_key(escaped_key):
+                # Key can't be used as part of the path, fall back to setting the whole value
+                set_fields[path] = _escape_value(new_value, escape)
+                return
+
+            escaped_keys[key] = escaped_key
+
+        for key in old_value:
+            if key not in new_value:
+                unset_fields['%s.%s' % (path, escaped_keys[key])] = ''
+
+        for key, value in six.iteritems(new_value):
+            child_path = '%s.%s' % (path, escaped_keys[key])
+            child_escape = _get_child_escape(value, escape)
+
+            if key not in old_value:
+                set_fields[child_path] = _escape_value(value, child_escape)
+            else:
+                _diff(old_value[key], value, child_path, child_escape, set_fields,
+                      unset_fields)
+    elif (isinstance(old_value, list) and isinstance(new_value, list) and
+            len(new_value) >= len(old_value)):
+        old_len = len(old_value)
+
+        for index, value in enumerate(new_value):
+            if index < old_len and _is_equal(old_value[index], value):
+                continue
+
+            child_path = '%s.%s' % (path, index)
+            child_escape = _get_child_escape(value, escape, parent_is_list=True)
+
+            if index < old_len:
+                _diff(old_value[index], value, child_path, child_escape, set_fields,
+                      unset_fields)
+            else:
+                set_fields[child_path] = _escape_value(value, child_escape)
+    else:
+        set_fields[path] = _escape_value(new_value, escape)
+
+
+def _is_equal(old_value, new_value):
+    # NOTE: Values loaded from the database are mongoengine BaseDict and BaseList instances while
+    # new values are plain dicts and lists so we can't compare the container types directly. Same
+    # as mongoengine change tracking, we rely on the equality operator for nested values, but we
+    # also compare types of scalar values so a changed value such as 1 -> True is not skipped.
+    if isinstance(old_value, dict):
+        return isinstance(new_value, dict) and old_value == new_value
+
+    if isinstance(old_value, list):
+        return isinstance(new_value, list) and old_value == new_value
+
+    return type(old_value) is type(new_value) and old_value == new_value
+
+
+def _get_child_escape(value, escape, parent_is_list=False):
+    if escape == ESCAPE_NONE:
+        return ESCAPE_NONE
+
+    if parent_is_list:
+        # escape_chars only descends into dicts which are items of a list, but not into lists
+        # which are items of a list
+        return ESCAPE_DICT if isinstance(value, dict) else ESCAPE_NONE
+
+    return ESCAPE_LIST if isinstance(value, list) else ESCAPE_DICT
+
+
+def _escape_key(key, escape):
+    if escape != ESCAPE_DICT:
+        return key
+
+    for unescaped, escaped in six.iteritems(mongoescape.ESCAPE_TRANSLATION):
+        key = key.replace(unescaped, escaped)
+
+    return key
+
+
+def _escape_value(value, escape):
+    if escape == ESCAPE_NONE:
+        return value
+
+    if isinstance(value, dict):
+        return mongoescape.escape_chars(value)
+
+    if isinstance(value, list):
+        return [mongoescape.escape_chars(item) if isinstance(item, dict) else item
+                for item in value]
+
+    return value
+
+
+def _is_valid_key(key):
+    return (isinstance(key, six.string_types) and key and '.' not in key and
+            not key.startswith('$'))
+
+
+def _get_path_sort_key(path):
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part) for part in path.split('.')]
+
+
+def _get_parent(document, path, create):
+    parts = path.split('.')
+    parent = document
+
+    for index, part in enumerate(parts[:-1]):
+        if isinstance(parent, list):
+            part = int(part)
+            child = parent[part] if part < len(parent) else None
+        else:
+            child = parent.get(part, None)
+
+        if child is None:
+            if not create:
+                return None, None
+
+            child = [] if parts[index + 1].isdigit() else {}
+            parent[part] = child
+
+        parent = child
+
+    key = parts[-1]
+
+    if isinstance(parent, list):
+        key = int(key)
+
+    return parent, key
@@ -39,7 +39,8 @@ LOG = logging.getLogger(__name__)
 def run_command(cmd, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False,
                 cwd=None, env=None, timeout=60, preexec_func=None, kill_func=None,
                 read_stdout_func=None, read_stderr_func=None,
-                read_stdout_buffer=None, read_stderr_buffer=None, stdin_value=None):
+                read_stdout_buffer=None, read_stderr_buffer=None, stdin_value=None,
+                start_new_session=False, bufsize=0):
     """
     Run the provided command in a subprocess and wait until it completes.
 
@@ -83,6 +84,13 @@ def run_command(cmd, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
                                  using live read mode.
     :type read_stdout_func: ``func``
 
+    :param start_new_session: True to start the process in a new session. On Python 3 this is
+                              done without a pre-exec function which means faster (vfork based)
+                              spawn can be used.
+    :type start_new_session: ``bool``
+
+    :param bufsize: Buffer size of the process pipes (0 means unbuffered).
+    :type bufsize: ``int``
 
     :rtype: ``tuple`` (exit_code, stdout, stderr, timed_out)
     """
@@ -102,11 +110,22 @@ def run_command(cmd, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
         LOG.debug('env argument not provided. using process env (os.environ).')
         env = os.environ.copy()
 
+    kwargs = {}
+
+    if start_new_session:
+        if six.PY3:
+            kwargs['start_new_session'] = True
+        elif not preexec_func:
+            preexec_func = os.setsid
+
+    if bufsize:
+        kwargs['bufsize'] = bufsize
+
     # Note: We are using eventlet friendly implementation of subprocess
     # which uses GreenPipe so it doesn't block
     LOG.debug('Creating subprocess.')
     process = subprocess.Popen(args=cmd, stdin=stdin, stdout=stdout, stderr=stderr,
-                               env=env, cwd=cwd, shell=shell, preexec_fn=preexec_func)
+                               env=env, cwd=cwd, shell=shell, preexec_fn=preexec_func, **kwargs)
 
     if read_stdout_func:
         LOG.debug('Spawning read_stdout_func function')
@@ -150,6 +169,9 @@ def run_command(cmd, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
 
         process.stdin.write(stdin_value)
 
+        if bufsize:
+            process.stdin.flush()
+
     if read_stdout_func and read_stderr_func:
         LOG.debug('Using real-time stdout and stderr read mode, calling process.wait()')
         process.wait()
@@ -23,10 +23,10 @@ import sys
 from collections import defaultdict
 
 import six
-import yaml
 
 from st2common.exceptions.plugins import IncompatiblePluginException
 from st2common import log as logging
+from st2common.util import yaml_loader
 
 __all__ = [
     'register_plugin',
@@ -40,7 +40,8 @@ LOG = logging.getLogger(__name__)
 
 PYTHON_EXTENSION = '.py'
 ALLOWED_EXTS = ['.json', '.yaml', '.yml']
-PARSER_FUNCS = {'.json': json.load, '.yml': yaml.safe_load, '.yaml': yaml.safe_load}
+PARSER_FUNCS = {'.json': json.load, '.yml': yaml_loader.safe_load,
+                '.yaml': yaml_loader.safe_load}
 
 # Cache for dynamically loaded runner modules
 RUNNER_MODULES_CACHE = defaultdict(dict)
@@ -21,9 +21,35 @@ from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX
 from st2common.services.keyvalues import KeyValueLookup
 
 
+__all__ = [
+    'PayloadLookup'
+]
+
+# Maximum number of parsed JSON path expressions to cache
+EXPRESSION_CACHE_MAX_SIZE = 1000
+
+# Parsing JSON path expression is expensive (it constructs a new parser each time) and the same
+# (rule criteria) keys are looked up over and over again so we cache parsed expressions
+_EXPRESSION_CACHE = {}
+
+
+def _parse_expression(lookup_key):
+    expr = _EXPRESSION_CACHE.get(lookup_key, None)
+
+    if expr is None:
+        if len(_EXPRESSION_CACHE) >= EXPRESSION_CACHE_MAX_SIZE:
+            _EXPRESSION_CACHE.clear()
+
+        expr = parse(lookup_key)
+        _EXPRESSION_CACHE[lookup_key] = expr
+
+    return expr
+
+
 class PayloadLookup(object):
 
     def __init__(self, payload, prefix=TRIGGER_PAYLOAD_PREFIX):
+        self._prefix = prefix
         self.context = {
             prefix: payload
         }
@@ -31,8 +57,17 @@ class PayloadLookup(object):
         for system_scope in SYSTEM_SCOPES:
             self.context[system_scope] = KeyValueLookup(scope=system_scope)
 
+    def set_payload(self, payload):
+        """
+        Replace the payload this object performs lookups on.
+
+        This allows the same object (and its system scope lookups) to be re-used when performing
+        lookups on many payloads (e.g. items of a list).
+        """
+        self.context[self._prefix] = payload
+
     def get_value(self, lookup_key):
-        expr = parse(lookup_key)
+        expr = _parse_expression(lookup_key)
         matches = [match.value for match in expr.find(self.context)]
         if not matches:
             return None
@@ -0,0 +1,392 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Sampling profiler which works with eventlet green threads.
+
+Samples are taken from a native (non monkey patched) thread which periodically captures the stack
+of the main thread. All the green threads run inside the main thread so each sample contains the
+stack of the green thread which was running at that time (or the eventlet hub if the process was
+idle). Samples are aggregated in memory in the collapsed stack format which can be rendered using
+flamegraph.pl or speedscope.
+
+Profiling session can be started using SIGPROF signal or "POST /v1/profiler" API endpoint and in
+continuous mode profile is dumped every profiler.dump_interval seconds.
+"""
+
+from __future__ import absolute_import
+
+import gc
+import os
+import sys
+import signal
+import socket
+import traceback
+from collections import defaultdict
+
+import eventlet
+import greenlet
+import six
+from kombu.mixins import ConsumerMixin
+from oslo_config import cfg
+
+from st2common import log as logging
+from st2common.transport import profiler as profiler_transport
+from st2common.transport import utils as transport_utils
+from st2common.util.date import get_datetime_utc_now
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'SamplingProfiler',
+    'ProfilerRequestWatcher',
+
+    'profiler_initialize',
+    'get_profiler',
+    'start_profiling',
+    'dump_profile',
+    'get_collapsed_stacks',
+    'get_greenlet_stacks'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Native thread and time modules are used so sampling works even when the process is busy and the
+# eventlet hub doesn't get a chance to run
+_original_threading = eventlet.patcher.original('threading')
+_original_thread = eventlet.patcher.original('_thread' if six.PY3 else 'thread')
+_original_time = eventlet.patcher.original('time')
+
+# Maximum number of frames included in a single sample
+MAX_STACK_DEPTH = 128
+
+_PROFILER = None
+
+
+class SamplingProfiler(object):
+    """
+    Sampling profiler which periodically samples stack of the main thread.
+    """
+
+    def __init__(self, service, sample_rate=100, output_dir='/tmp'):
+        """
+        :param service: Service name which is included in the names of the dumped files.
+        :type service: ``str``
+
+        :param sample_rate: How many samples per second are taken.
+        :type sample_rate: ``int``
+
+        :param output_dir: Directory profiles are dumped to.
+        :type output_dir: ``str``
+        """
+        self._service = service
+        self._sample_interval = 1.0 / sample_rate
+        self._output_dir = output_dir
+
+        self._lock = _original_threading.Lock()
+        self._samples = defaultdict(int)
+        self._sample_count = 0
+
+        self._thread = None
+        self._deadline = None
+        self._thread_id = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration=None):
+        """
+        Start sampling.
+
+        :param duration: Optional duration (in seconds) after which sampling stops. If not
+                         provided, sampling runs until stop() is called.
+        :type duration: ``int``
+
+        :return: False if profiler is already running, True otherwise.
+        :rtype: ``bool``
+        """
+        if self.is_running():
+            return False
+
+        # NOTE: This method is called from the main thread (signal handler or a green thread)
+        self._thread_id = _original_thread.get_ident()
+        self._deadline = (_original_time.time() + duration) if duration else None
+
+        self._thread = _original_threading.Thread(target=self._sample_loop,
+                                                  name='st2-sampling-profiler')
+        self._thread.daemon = True
+        self._thread.start()
+
+        LOG.info('Sampling profiler started (duration=%s, sample_interval=%s)', duration,
+                 self._sample_interval)
+        return True
+
+    def stop(self):
+        self._deadline = 0
+
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def get_samples(self, reset=False):
+        """
+        Return collected samples as a dictionary of collapsed stacks and sample counts.
+
+        :param reset: True to start a new profile.
+        :type reset: ``bool``
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            samples = self._samples
+
+            if reset:
+                self._samples = defaultdict(int)
+                self._sample_count = 0
+
+        return dict(samples)
+
+    def dump(self, reset=True):
+        """
+        Write collected samples and current green threads stacks to the output directory.
+
+        :return: Paths to the collapsed stacks and green threads listing file.
+        :rtype: ``tuple``
+        """
+        samples = self.get_samples(reset=reset)
+
+        timestamp = get_datetime_utc_now().strftime('%Y%m%dT%H%M%S')
+        file_name_prefix = '%s-%s-%s-%s' % (self._service, socket.gethostname(), os.getpid(),
+                                            timestamp)
+        stacks_path = os.path.join(self._output_dir, file_name_prefix + '.collapsed')
+        greenlets_path = os.path.join(self._output_dir, file_name_prefix + '.greenlets.txt')
+
+        if not os.path.isdir(self._output_dir):
+            os.makedirs(self._output_dir)
+
+        with open(stacks_path, 'w') as fp:
+            fp.write(get_collapsed_stacks(samples=samples))
+
+        with open(greenlets_path, 'w') as fp:
+            fp.write(get_greenlet_stacks())
+
+        LOG.info('Profile with %s samples written to "%s" and green threads to "%s"',
+                 sum(samples.values()), stacks_path, greenlets_path)
+        return stacks_path, greenlets_path
+
+    def _sample_loop(self):
+        while self._deadline is None or _original_time.time() < self._deadline:
+            frame = sys._current_frames().get(self._thread_id, None)
+
+            if frame is not None:
+                stack = _get_collapsed_stack(frame=frame)
+                del frame
+
+                with self._lock:
+                    self._samples[stack] += 1
+                    self._sample_count += 1
+
+            _original_time.sleep(self._sample_interval)
+
+
+class ProfilerRequestWatcher(ConsumerMixin):
+    """
+    Consumer which listens for profiling requests which are published by the API for this service.
+    """
+
+    def __init__(self, service, handler):
+        self._service = service
+        self._handler = handler
+
+        queue_name = queue_utils.get_queue_name(queue_name_base='st2.profiler.%s' % (service),
+                                                queue_name_suffix=socket.gethostname(),
+                                                add_random_uuid_to_suffix=True)
+        self._queue = profiler_transport.get_queue(name=queue_name, routing_key=service,
+                                                   exclusive=True, auto_delete=True)
+
+        self.connection = None
+        self._thread = None
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[self._queue], accept=['pickle'], callbacks=[self.process_task])]
+
+    def process_task(self, body, message):
+        try:
+            hostname = body.get('hostname', None)
+            pid = body.get('pid', None)
+
+            if hostname and hostname != socket.gethostname():
+                return
+
+            if pid and int(pid) != os.getpid():
+                return
+
+            self._handler(duration=body.get('duration', None))
+        except Exception:
+            LOG.exception('Failed to handle profiling request: %s', body)
+        finally:
+            message.ack()
+
+    def start(self):
+        self.connection = transport_utils.get_connection()
+        self._thread = eventlet.spawn(self.run)
+
+    def stop(self):
+        self.should_stop = True
+
+        if self._thread:
+            self._thread = eventlet.kill(self._thread)
+
+        if self.connection:
+            self.connection.release()
+
+
+def profiler_initialize(service, register_signal_handlers=True):
+    """
+    Initialize the sampling profiler for the provided service if it's enabled.
+
+    In continuous mode sampling is started right away, otherwise profiling session is started
+    on SIGPROF signal or a request published using the API.
+    """
+    global _PROFILER
+
+    if not cfg.CONF.profiler.enable:
+        return None
+
+    _PROFILER = SamplingProfiler(service=service, sample_rate=cfg.CONF.profiler.sample_rate,
+                                 output_dir=cfg.CONF.profiler.output_dir)
+
+    if register_signal_handlers:
+        signal.signal(signal.SIGPROF, _handle_sigprof)
+
+    try:
+        ProfilerRequestWatcher(service=service, handler=start_profiling).start()
+    except Exception:
+        LOG.exception('Failed to start profiler request watcher')
+
+    if cfg.CONF.profiler.continuous:
+        _PROFILER.start()
+        eventlet.spawn(_dump_periodically, _PROFILER, cfg.CONF.profiler.dump_interval)
+
+    return _PROFILER
+
+
+def get_profiler():
+    return _PROFILER
+
+
+def start_profiling(duration=None):
+    """
+    Start profiling session and dump the profile once it's finished.
+
+    In continuous mode profile is dumped right away instead.
+    """
+    profiler = get_profiler()
+
+    if not profiler:
+        return None
+
+    if cfg.CONF.profiler.continuous:
+        return eventlet.spawn(dump_profile)
+
+    duration = duration or cfg.CONF.profiler.duration
+
+    if not profiler.start(duration=duration):
+        LOG.info('Ignoring profiling request, profiling session is already in progress')
+        return None
+
+    return eventlet.spawn_after(duration, _finish_profiling, profiler)
+
+
+def dump_profile():
+    profiler = get_profiler()
+
+    if not profiler:
+        return None
+
+    return profiler.dump()
+
+
+def get_collapsed_stacks(samples):
+    """
+    Return samples in the collapsed stack format (one stack per line followed by a sample count).
+
+    :rtype: ``str``
+    """
+    lines = ['%s %s\n' % (stack, count) for stack, count in sorted(six.iteritems(samples))]
+    return ''.join(lines)
+
+
+def get_greenlet_stacks():
+    """
+    Return stacks of all the green threads and native threads in this process.
+
+    :rtype: ``str``
+    """
+    result = []
+
+    current = greenlet.getcurrent()
+    greenlets = [obj for obj in gc.get_objects() if isinstance(obj, greenlet.greenlet)]
+
+    result.append('Green threads: %s\n' % (len(greenlets)))
+
+    for item in greenlets:
+        if item is current:
+            frame = sys._getframe()
+        else:
+            frame = item.gr_frame
+
+        if item.dead or frame is None:
+            continue
+
+        result.append('\nGreen thread %s (%r)\n' % (id(item), item))
+        result.extend(traceback.format_stack(frame))
+
+    for thread_id, frame in six.iteritems(sys._current_frames()):
+        result.append('\nNative thread %s\n' % (thread_id))
+        result.extend(traceback.format_stack(frame))
+
+    return ''.join(result)
+
+
+def _get_collapsed_stack(frame):
+    items = []
+
+    while frame is not None and len(items) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        items.append('%s (%s:%s)' % (code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+
+    return ';'.join(reversed(items))
+
+
+def _finish_profiling(profiler):
+    profiler.stop()
+    profiler.dump()
+
+
+def _dump_periodically(profiler, interval):
+    while True:
+        eventlet.sleep(interval)
+
+        try:
+            profiler.dump()
+        except Exception:
+            LOG.exception('Failed to dump profile')
+
+
+def _handle_sigprof(signal_number, stack_frame):
+    # NOTE: Profile is dumped by a green thread once the session is finished, not inside the
+    # signal handler
+    start_profiling()
@@ -15,6 +15,7 @@
 
 from __future__ import absolute_import
 import os
+import re
 import shlex
 import signal
 from subprocess import list2cmdline
@@ -32,7 +33,10 @@ __all__ = [
     'kill_process',
 
     'quote_unix',
-    'quote_windows'
+    'quote_windows',
+
+    'split_simple_command',
+    'is_directly_executable'
 ]
 
 LOG = logging.getLogger(__name__)
@@ -40,6 +44,23 @@ LOG = logging.getLogger(__name__)
 # Constant taken from http://linux.die.net/include/linux/prctl.h
 PR_SET_PDEATHSIG = 1
 
+# Commands which only consist of those characters don't use any shell features (quoting,
+# expansion, redirection, pipes, etc.)
+SIMPLE_COMMAND_REGEX = re.compile(r'^[\w \t@%+=:,./-]+$', re.UNICODE)
+
+# Shell builtins and keywords which either don't exist as a standalone executable or behave
+# differently when executed outside of the shell
+SHELL_BUILTINS = frozenset([
+    '.', ':', '[', 'alias', 'bg', 'break', 'builtin', 'cd', 'command', 'continue', 'declare',
+    'echo', 'eval', 'exec', 'exit', 'export', 'false', 'fg', 'getopts', 'hash', 'jobs', 'kill',
+    'let', 'local', 'printf', 'pwd', 'read', 'readonly', 'return', 'set', 'shift', 'source',
+    'test', 'time', 'times', 'trap', 'true', 'type', 'typeset', 'ulimit', 'umask', 'unalias',
+    'unset', 'wait'
+])
+
+# Files which the kernel can execute directly (script with a shebang line and ELF binary)
+EXECUTABLE_MAGIC_HEADERS = (b'#!', b'\x7fELF')
+
 
 # pylint: disable=too-many-function-args
 def run_command(cmd, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False,
@@ -141,6 +162,67 @@ def quote_windows(value):
     return value
 
 
+def split_simple_command(command, env=None):
+    """
+    Split a command string into a list of arguments if the command can be executed directly
+    (without a shell) with the same end result.
+
+    :param command: Command string.
+    :type command: ``str``
+
+    :param env: Environment the command will be executed with (used to resolve the executable).
+    :type env: ``dict``
+
+    :return: List of arguments or None if the command needs to be executed through a shell.
+    :rtype: ``list``
+    """
+    if not command or not SIMPLE_COMMAND_REGEX.match(command):
+        return None
+
+    args = command.split()
+
+    # Variable assignments and builtins need a shell
+    if not args or '=' in args[0] or args[0] in SHELL_BUILTINS:
+        return None
+
+    executable = args[0]
+
+    if os.path.isabs(executable):
+        paths = [executable]
+    elif '/' in executable:
+        # Relative to the working directory of the command
+        return None
+    else:
+        path = (env or os.environ).get('PATH', os.defpath)
+        paths = [os.path.join(directory, executable) for directory in path.split(os.pathsep)
+                 if directory]
+
+    for path in paths:
+        if is_directly_executable(path):
+            return args
+
+    return None
+
+
+def is_directly_executable(path):
+    """
+    Return True if the provided file is executable and can be executed without a shell (shell
+    executes files without a shebang line as shell scripts).
+
+    :rtype: ``bool``
+    """
+    if not os.path.isfile(path) or not os.access(path, os.X_OK):
+        return False
+
+    try:
+        with open(path, 'rb') as fp:
+            header = fp.read(4)
+    except (IOError, OSError):
+        return False
+
+    return header.startswith(EXECUTABLE_MAGIC_HEADERS)
+
+
 def on_parent_exit(signame):
     """
     Return a function to be run in a child process which will trigger SIGNAME to be sent when the
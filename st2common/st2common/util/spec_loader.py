@@ -32,6 +32,7 @@ import st2common.constants.action
 
 from st2common.rbac.types import PermissionType
 from st2common.util import isotime
+from st2common.util import yaml_loader
 
 __all__ = [
     'load_spec',
@@ -80,7 +81,7 @@ def load_spec(module_name, spec_file, allow_duplicate_keys=False):
         yaml.load(spec_string, UniqueKeyLoader)
 
     # 2. Generate actual spec
-    spec = yaml.safe_load(spec_string)
+    spec = yaml_loader.safe_load(spec_string)
     return spec
 
 
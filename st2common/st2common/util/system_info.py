@@ -19,9 +19,19 @@ import socket
 
 __all__ = [
     'get_host_info',
-    'get_process_info'
+    'get_process_info',
+    'get_process_resource_usage'
 ]
 
+# Number of clock ticks per second and page size used to interpret values in /proc/<pid>/stat
+# and /proc/<pid>/statm
+try:
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = 100
+    PAGE_SIZE = 4096
+
 
 def get_host_info():
     host_info = {
@@ -36,3 +46,36 @@ def get_process_info():
         'pid': os.getpid()
     }
     return process_info
+
+
+def get_process_resource_usage(pid):
+    """
+    Return CPU time and resident memory usage for the provided process.
+
+    Values are read directly from /proc so this is cheap enough to be called periodically for a
+    large number of processes.
+
+    :return: Dictionary with "cpu_time" (user + system time in seconds) and "rss" (resident set
+             size in bytes) keys or None if the information is not available (process has exited
+             or /proc is not available on this platform).
+    :rtype: ``dict`` or ``None``
+    """
+    try:
+        with open('/proc/%s/stat' % (pid), 'r') as fp:
+            stat = fp.read()
+
+        with open('/proc/%s/statm' % (pid), 'r') as fp:
+            statm = fp.read()
+    except (IOError, OSError):
+        return None
+
+    # Process name (2nd field) can contain spaces and is wrapped in parenthesis so we split on the
+    # last closing parenthesis. utime and stime are fields 14 and 15.
+    fields = stat[stat.rfind(')') + 2:].split()
+    cpu_time = float(int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    rss = int(statm.split()[1]) * PAGE_SIZE
+
+    return {
+        'cpu_time': cpu_time,
+        'rss': rss
+    }
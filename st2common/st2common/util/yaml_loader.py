@@ -0,0 +1,46 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+YAML loading which uses the libyaml based C loader when PyYAML has been compiled with libyaml
+support and falls back to the pure Python loader otherwise.
+"""
+
+from __future__ import absolute_import
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+__all__ = [
+    'SafeLoader',
+    'HAS_LIBYAML',
+
+    'safe_load'
+]
+
+HAS_LIBYAML = SafeLoader.__name__ == 'CSafeLoader'
+
+
+def safe_load(stream):
+    """
+    Parse the first YAML document in a stream (string or file object) and produce the
+    corresponding Python object. Same as yaml.safe_load(), but a lot faster when libyaml is
+    available.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
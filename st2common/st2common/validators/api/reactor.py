@@ -58,6 +58,13 @@ def validate_criteria(criteria):
             raise ValueValidationException('For field: ' + key + ', no pattern specified ' +
                                            'for operator ' + operator)
 
+        condition = value.get('condition', None)
+        if (operator == criteria_operators.SEARCH and
+                condition in criteria_operators.SEARCH_COUNT_CONDITIONS and
+                not isinstance(value.get('count', None), int)):
+            raise ValueValidationException('For field: ' + key + ', condition ' + condition +
+                                           ' requires an integer count value')
+
 
 def validate_trigger_parameters(trigger_type_ref, parameters):
     """
@@ -22,8 +22,10 @@ from st2tests.base import DbTestCase
 from st2common.util import isotime
 from st2common.util import date as date_utils
 from st2common.exceptions.auth import TokenNotFoundError
+from st2common.exceptions.auth import TokenExpiredError
 from st2common.persistence.auth import Token
 from st2common.services import access
+from st2common.util import auth as auth_utils
 from st2common.exceptions.auth import TTLTooLargeException
 import st2tests.config as tests_config
 
@@ -100,3 +102,53 @@ class AccessServiceTest(DbTestCase):
         # Non service token should throw on TTL which is too large
         self.assertRaises(TTLTooLargeException, access.create_token, USERNAME, ttl=ttl,
                           service=False)
+
+    def test_create_signed_token(self):
+        cfg.CONF.set_override(name='execution_token_signing_key', override='secret',
+                              group='auth')
+        self.addCleanup(cfg.CONF.clear_override, name='execution_token_signing_key',
+                        group='auth')
+
+        token = access.create_signed_token(USERNAME, ttl=60, metadata={'service': 'test'})
+        self.assertTrue(access.is_signed_token(token.token))
+        self.assertEqual(token.user, USERNAME)
+
+        # Token is not stored in the database, but it's valid
+        self.assertRaises(TokenNotFoundError, Token.get, token.token)
+
+        token_db = auth_utils.validate_token(token.token)
+        self.assertEqual(token_db.user, USERNAME)
+        self.assertEqual(token_db.metadata, {'service': 'test'})
+        self.assertTrue(token_db.service)
+        self.assertEqual(token_db.expiry, token.expiry)
+
+        # Deleting signed token is a no-op
+        access.delete_token(token.token)
+
+    def test_signed_token_invalid_signature(self):
+        cfg.CONF.set_override(name='execution_token_signing_key', override='secret',
+                              group='auth')
+        self.addCleanup(cfg.CONF.clear_override, name='execution_token_signing_key',
+                        group='auth')
+
+        token = access.create_signed_token(USERNAME, ttl=60)
+        self.assertRaises(TokenNotFoundError, auth_utils.validate_token, token.token + 'a')
+        self.assertRaises(TokenNotFoundError, auth_utils.validate_token,
+                          token.token.split('.')[0] + '.invalid')
+
+        # Token signed with a different key
+        cfg.CONF.set_override(name='execution_token_signing_key', override='other',
+                              group='auth')
+        self.assertRaises(TokenNotFoundError, auth_utils.validate_token, token.token)
+
+    def test_signed_token_expired(self):
+        cfg.CONF.set_override(name='execution_token_signing_key', override='secret',
+                              group='auth')
+        self.addCleanup(cfg.CONF.clear_override, name='execution_token_signing_key',
+                        group='auth')
+
+        token = access.create_signed_token(USERNAME, ttl=-10)
+        self.assertRaises(TokenExpiredError, auth_utils.validate_token, token.token)
+
+    def test_create_signed_token_signing_key_not_set(self):
+        self.assertRaises(ValueError, access.create_signed_token, USERNAME)
@@ -14,6 +14,8 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+import copy
+
 import jsonschema
 import mock
 import six
@@ -23,11 +25,15 @@ from st2common.constants import action as action_constants
 from st2common.exceptions import action as action_exc
 from st2common.exceptions import actionrunner as runner_exc
 from st2common.models.db.liveaction import LiveActionDB
+from st2common.models.db.trace import TraceDB
+from st2common.models.db.trace import TraceComponentDB
 from st2common.models.api.action import RunnerTypeAPI, ActionAPI
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.action import Action
+from st2common.persistence.execution import ActionExecution
 from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.runner import RunnerType
+from st2common.persistence.trace import Trace
 from st2common.runners import utils as runners_utils
 from st2common.services import action as action_service
 from st2common.services import executions
@@ -304,6 +310,65 @@ class TestActionExecutionService(DbTestCase):
         self.assertDictEqual(ex.parameters, req.parameters)
         self.assertEqual(ex.status, action_constants.LIVEACTION_STATUS_REQUESTED)
 
+    def test_create_requests(self):
+        root_liveaction_db = LiveAction.add_or_update(
+            LiveActionDB(action=ACTION_WORKFLOW_REF,
+                         status=action_constants.LIVEACTION_STATUS_RUNNING))
+        root_ex_db = executions.create_execution_object(root_liveaction_db)
+        Trace.add_or_update(TraceDB(trace_tag='bulk', action_executions=[
+            TraceComponentDB(object_id=str(root_ex_db.id))
+        ]))
+
+        parameters = {'hosts': '127.0.0.1', 'cmd': 'uname -a'}
+        context = {'parent': {'execution_id': str(root_ex_db.id), 'user': USERNAME}}
+        liveactions = [LiveActionDB(action=ACTION_REF, context=copy.deepcopy(context),
+                                    parameters=parameters) for _ in range(0, 3)]
+
+        with mock.patch.object(LiveAction, 'publish_create') as publish_mock:
+            requests = action_service.create_requests(liveactions)
+            self.assertFalse(publish_mock.called)
+
+        self.assertEqual(len(requests), 3)
+
+        for liveaction_db, ex_db in requests:
+            liveaction_db = action_db.get_liveaction_by_id(str(liveaction_db.id))
+            self.assertEqual(liveaction_db.status, action_constants.LIVEACTION_STATUS_REQUESTED)
+            self.assertEqual(liveaction_db.context['user'], USERNAME)
+
+            ex_db = ActionExecution.get_by_id(str(ex_db.id))
+            self.assertEqual(ex_db.liveaction['id'], str(liveaction_db.id))
+            self.assertEqual(ex_db.parent, str(root_ex_db.id))
+
+        # Children and trace components are added for all the executions
+        root_ex_db = ActionExecution.get_by_id(str(root_ex_db.id))
+        self.assertEqual(root_ex_db.children, [str(ex_db.id) for _, ex_db in requests])
+
+        trace_db = Trace.query(trace_tag='bulk')[0]
+        self.assertEqual(len(trace_db.action_executions), 4)
+
+    def test_create_requests_invalid_parameters(self):
+        liveactions = [
+            LiveActionDB(action=ACTION_REF, parameters={'hosts': '127.0.0.1', 'cmd': 'ls'}),
+            LiveActionDB(action=ACTION_REF, parameters={'arg_default_value': 123})
+        ]
+        count = LiveAction.count()
+
+        self.assertRaises(jsonschema.ValidationError, action_service.create_requests, liveactions)
+
+        # Nothing is written if any of the requests is invalid
+        self.assertEqual(LiveAction.count(), count)
+
+    def test_publish_requests(self):
+        liveactions = [LiveActionDB(action=ACTION_REF, parameters={'hosts': 'a', 'cmd': 'ls'}),
+                       LiveActionDB(action=ACTION_REF, parameters={'hosts': 'b', 'cmd': 'ls'})]
+        requests = action_service.create_requests(liveactions)
+
+        PoolPublisher.publish.reset_mock()
+        action_service.publish_requests(requests)
+
+        # Create and state messages for the liveaction and create message for the execution
+        self.assertEqual(PoolPublisher.publish.call_count, 6)
+
     def test_req_invalid_parameters(self):
         parameters = {'hosts': '127.0.0.1', 'cmd': 'uname -a', 'arg_default_value': 123}
         liveaction = LiveActionDB(action=ACTION_REF, parameters=parameters)
@@ -0,0 +1,70 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import mock
+import unittest2
+
+from st2common.constants import action as action_constants
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.services import liveaction_watcher
+
+
+class LiveActionWatcherTestCase(unittest2.TestCase):
+
+    def _get_message(self, status):
+        return mock.Mock(delivery_info={'routing_key': status})
+
+    def test_subscribers_are_notified(self):
+        watcher = liveaction_watcher.LiveActionWatcher(queue_suffix='test')
+        liveaction_db = LiveActionDB(id='5c5b3f4b9c7b2a1f1c8b4567')
+
+        subscription_1 = watcher.subscribe(liveaction_db.id)
+        subscription_2 = watcher.subscribe(liveaction_db.id)
+
+        message = self._get_message(action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        watcher.process_task(liveaction_db, message)
+
+        self.assertTrue(message.ack.called)
+        self.assertEqual(subscription_1.wait(timeout=0.1),
+                         action_constants.LIVEACTION_STATUS_SUCCEEDED)
+        self.assertEqual(subscription_2.wait(timeout=0.1),
+                         action_constants.LIVEACTION_STATUS_SUCCEEDED)
+
+    def test_other_liveactions_are_ignored(self):
+        watcher = liveaction_watcher.LiveActionWatcher(queue_suffix='test')
+
+        with watcher.subscribe('5c5b3f4b9c7b2a1f1c8b4567') as subscription:
+            message = self._get_message(action_constants.LIVEACTION_STATUS_FAILED)
+            watcher.process_task(LiveActionDB(id='5c5b3f4b9c7b2a1f1c8b4568'), message)
+
+            self.assertTrue(message.ack.called)
+            self.assertIsNone(subscription.wait(timeout=0.1))
+
+    def test_unsubscribe(self):
+        watcher = liveaction_watcher.LiveActionWatcher(queue_suffix='test')
+
+        with watcher.subscribe('5c5b3f4b9c7b2a1f1c8b4567'):
+            self.assertIn('5c5b3f4b9c7b2a1f1c8b4567', watcher._subscriptions)
+
+        self.assertEqual(watcher._subscriptions, {})
+
+    def test_queue_is_bound_to_watched_statuses(self):
+        watcher = liveaction_watcher.LiveActionWatcher(queue_suffix='test')
+        routing_keys = [item.routing_key for item in watcher._queue.bindings]
+
+        self.assertEqual(sorted(routing_keys), sorted(liveaction_watcher.WATCHED_STATUSES))
+        self.assertTrue(watcher._queue.exclusive)
@@ -0,0 +1,94 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import mock
+import unittest2
+
+from orquesta import statuses as wf_statuses
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.persistence import workflow as wf_db_access
+from st2common.services import workflows as wf_svc
+
+
+def get_wf_ex_db(wf_ex_id, rev, status=wf_statuses.RUNNING):
+    return mock.Mock(id=wf_ex_id, rev=rev, status=status)
+
+
+class WorkflowConductorCacheTest(unittest2.TestCase):
+
+    def setUp(self):
+        super(WorkflowConductorCacheTest, self).setUp()
+        wf_svc.set_conductors_cache_size(2)
+
+    def tearDown(self):
+        wf_svc.set_conductors_cache_size(0)
+        super(WorkflowConductorCacheTest, self).tearDown()
+
+    def test_cache_disabled(self):
+        wf_svc.set_conductors_cache_size(0)
+        wf_ex_db = get_wf_ex_db('wf1', 1)
+
+        wf_svc.checkin_cached_conductor(wf_ex_db, mock.Mock())
+        self.assertEqual(len(wf_svc.CONDUCTORS_CACHE), 0)
+        self.assertIsNone(wf_svc.checkout_cached_conductor(wf_ex_db))
+
+    def test_checkout_matching_revision(self):
+        conductor = mock.Mock()
+        wf_svc.checkin_cached_conductor(get_wf_ex_db('wf1', 2), conductor)
+
+        self.assertEqual(wf_svc.checkout_cached_conductor(get_wf_ex_db('wf1', 2)), conductor)
+
+        # Conductor is removed from the cache until it's checked in again
+        self.assertIsNone(wf_svc.checkout_cached_conductor(get_wf_ex_db('wf1', 2)))
+
+    def test_checkout_revision_mismatch(self):
+        wf_svc.checkin_cached_conductor(get_wf_ex_db('wf1', 2), mock.Mock())
+
+        self.assertIsNone(wf_svc.checkout_cached_conductor(get_wf_ex_db('wf1', 3)))
+        self.assertNotIn('wf1', wf_svc.CONDUCTORS_CACHE)
+
+    def test_completed_workflow_is_not_cached(self):
+        wf_svc.checkin_cached_conductor(get_wf_ex_db('wf1', 2), mock.Mock())
+        wf_svc.checkin_cached_conductor(get_wf_ex_db('wf1', 3, wf_statuses.SUCCEEDED),
+                                        mock.Mock())
+
+        self.assertNotIn('wf1', wf_svc.CONDUCTORS_CACHE)
+
+    def test_least_recently_used_conductor_is_evicted(self):
+        wf_svc.checkin_cached_conductor(get_wf_ex_db('wf1', 1), mock.Mock())
+        wf_svc.checkin_cached_conductor(get_wf_ex_db('wf2', 1), mock.Mock())
+        wf_svc.checkin_cached_conductor(get_wf_ex_db('wf1', 2), mock.Mock())
+        wf_svc.checkin_cached_conductor(get_wf_ex_db('wf3', 1), mock.Mock())
+
+        self.assertEqual(list(wf_svc.CONDUCTORS_CACHE.keys()), ['wf1', 'wf3'])
+
+    @mock.patch.object(wf_svc, 'deserialize_conductor', mock.Mock())
+    def test_refresh_conductor_uses_cached_conductor(self):
+        conductor = mock.Mock()
+        wf_ex_db = get_wf_ex_db('wf1', 5)
+        wf_svc.checkin_cached_conductor(wf_ex_db, conductor)
+
+        with mock.patch.object(wf_db_access.WorkflowExecution, 'get_latest_by_id',
+                               mock.Mock(return_value=wf_ex_db)):
+            self.assertEqual(wf_svc.refresh_conductor('wf1'), (conductor, wf_ex_db))
+            self.assertFalse(wf_svc.deserialize_conductor.called)
+
+            wf_svc.refresh_conductor('wf1')
+            self.assertTrue(wf_svc.deserialize_conductor.called)
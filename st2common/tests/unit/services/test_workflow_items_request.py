@@ -0,0 +1,80 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from __future__ import absolute_import
+
+import mock
+import unittest2
+
+from orquesta import statuses as wf_statuses
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.persistence import workflow as wf_db_access
+from st2common.services import action as ac_svc
+from st2common.services import workflows as wf_svc
+from st2common.util import action_db as action_utils
+
+
+ACTION_DB = mock.Mock(parameters={}, runner_type={'name': 'local-shell-cmd'})
+RUNNER_TYPE_DB = mock.Mock(runner_parameters={})
+
+
+def mock_create_requests(lv_ac_dbs):
+    return [(lv_ac_db, mock.Mock(id='ex%s' % (i))) for i, lv_ac_db in enumerate(lv_ac_dbs)]
+
+
+@mock.patch.object(action_utils, 'get_action_by_ref', mock.MagicMock(return_value=ACTION_DB))
+@mock.patch.object(action_utils, 'get_runnertype_by_name',
+                   mock.MagicMock(return_value=RUNNER_TYPE_DB))
+@mock.patch.object(wf_db_access.TaskExecution, 'update',
+                   mock.MagicMock(side_effect=lambda task_ex_db, **kwargs: task_ex_db))
+@mock.patch.object(ac_svc, 'publish_requests', mock.MagicMock(side_effect=lambda reqs: reqs))
+@mock.patch.object(ac_svc, 'create_requests', mock.MagicMock(side_effect=mock_create_requests))
+class WorkflowItemsRequestTest(unittest2.TestCase):
+
+    def test_request_action_executions(self):
+        wf_ex_db = mock.Mock(id='wf1', action_execution='ac1', notify=None)
+        task_ex_db = mock.Mock(id='task1', itemized=True, task_name='task1', task_id='task1',
+                               task_route=0, status=wf_statuses.REQUESTED)
+        st2_ctx = {'execution_id': 'ac1', 'user': 'stanley'}
+        ac_ex_reqs = [{'action': 'core.local', 'input': {'cmd': 'echo %s' % (i)}, 'item_id': i}
+                      for i in range(0, 3)]
+
+        action_utils.get_action_by_ref.reset_mock()
+        ac_ex_dbs = wf_svc.request_action_executions(wf_ex_db, task_ex_db, st2_ctx, ac_ex_reqs,
+                                                     delays=[2, None, None])
+
+        self.assertEqual([ac_ex_db.id for ac_ex_db in ac_ex_dbs], ['ex0', 'ex1', 'ex2'])
+        self.assertEqual(task_ex_db.status, wf_statuses.RUNNING)
+
+        # Action is looked up once for all the items and requests are created in one batch
+        self.assertEqual(action_utils.get_action_by_ref.call_count, 1)
+        lv_ac_dbs = ac_svc.create_requests.call_args[0][0]
+        self.assertEqual([lv_ac_db.context['orquesta']['item_id'] for lv_ac_db in lv_ac_dbs],
+                         [0, 1, 2])
+        self.assertEqual([lv_ac_db.delay for lv_ac_db in lv_ac_dbs], [2000, None, None])
+        self.assertEqual(ac_svc.publish_requests.call_count, 1)
+
+    def test_request_action_executions_item_id_missing(self):
+        wf_ex_db = mock.Mock(id='wf1', action_execution='ac1', notify=None)
+        task_ex_db = mock.Mock(id='task1', itemized=True, task_name='task1', task_id='task1',
+                               task_route=0)
+        ac_ex_reqs = [{'action': 'core.local', 'input': {}}]
+
+        self.assertRaises(Exception, wf_svc.request_action_executions, wf_ex_db, task_ex_db,
+                          {}, ac_ex_reqs)
@@ -59,7 +59,8 @@ PACKS = [
 TEMP_DIR_PATH = tempfile.mkdtemp()
 
 
-def mock_wf_db_update_conflict(wf_ex_db, publish=True, dispatch_trigger=True, **kwargs):
+def mock_wf_db_update_conflict(wf_ex_db, set_fields, unset_fields=None, publish=True,
+                               dispatch_trigger=True):
     seq_len = len(wf_ex_db.state['sequence'])
 
     if seq_len > 0:
@@ -70,7 +71,8 @@ def mock_wf_db_update_conflict(wf_ex_db, publish=True, dispatch_trigger=True, **
             os.remove(temp_file_path)
             raise db_exc.StackStormDBObjectWriteConflictError(wf_ex_db)
 
-    return wf_db_access.WorkflowExecution._get_impl().update(wf_ex_db, **kwargs)
+    return wf_db_access.WorkflowExecution._get_impl().update_fields(
+        wf_ex_db, set_fields=set_fields, unset_fields=unset_fields)
 
 
 @mock.patch.object(
@@ -104,7 +106,7 @@ class WorkflowExecutionWriteConflictTest(st2tests.WorkflowTestCase):
             actions_registrar.register_from_pack(pack)
 
     @mock.patch.object(
-        wf_db_access.WorkflowExecution, 'update',
+        wf_db_access.WorkflowExecution, 'update_fields',
         mock.MagicMock(side_effect=mock_wf_db_update_conflict))
     def test_retry_on_write_conflict(self):
         # Create a temporary file which will be used to signal
@@ -0,0 +1,97 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import unittest2
+
+from st2tests.benchmarks import base
+from st2tests.benchmarks.base import BaseBenchmark
+
+__all__ = [
+    'BenchmarkHarnessTestCase'
+]
+
+
+class MockBenchmark(BaseBenchmark):
+    group = 'mock'
+    rounds = 3
+    warmup_rounds = 2
+    params = {'count': 10}
+
+    def setUp(self):
+        self.calls = []
+
+    def prepare_two(self):
+        self.calls.append('prepare_two')
+
+    def benchmark_one(self):
+        self.calls.append('one')
+
+    def benchmark_two(self):
+        self.calls.append('two')
+
+
+class BenchmarkHarnessTestCase(unittest2.TestCase):
+    def test_run_benchmarks(self):
+        self.assertEqual(MockBenchmark.get_benchmark_names(), ['one', 'two'])
+
+        results = base.run_benchmarks(benchmark_classes=[MockBenchmark])
+
+        self.assertEqual([item['fullname'] for item in results], ['mock.one', 'mock.two'])
+        self.assertEqual(results[0]['params'], {'count': 10})
+        self.assertEqual(results[0]['stats']['rounds'], 3)
+        self.assertTrue(results[0]['stats']['min'] <= results[0]['stats']['median'] <=
+                        results[0]['stats']['max'])
+
+        results = base.run_benchmarks(benchmark_classes=[MockBenchmark], name_filter='mock.two',
+                                      rounds=1)
+        self.assertEqual([item['fullname'] for item in results], ['mock.two'])
+        self.assertEqual(results[0]['stats']['rounds'], 1)
+
+    def test_get_stats(self):
+        stats = base._get_stats([3.0, 1.0, 2.0, 4.0])
+
+        self.assertEqual(stats['min'], 1.0)
+        self.assertEqual(stats['max'], 4.0)
+        self.assertEqual(stats['mean'], 2.5)
+        self.assertEqual(stats['median'], 2.5)
+        self.assertEqual(stats['rounds'], 4)
+        self.assertEqual(stats['ops'], 0.4)
+
+    def test_get_report(self):
+        report = base.get_report(results=[])
+
+        self.assertEqual(report['benchmarks'], [])
+        self.assertIn('python_version', report['machine_info'])
+        self.assertIn('id', report['commit_info'])
+
+    def test_compare_reports(self):
+        def get_item(fullname, median, params=None):
+            return {'fullname': fullname, 'params': params or {}, 'stats': {'median': median}}
+
+        baseline = {'benchmarks': [get_item('rules.a', 1.0), get_item('rules.b', 1.0),
+                                   get_item('rules.c', 1.0, {'count': 10})]}
+        current = {'benchmarks': [get_item('rules.a', 1.05), get_item('rules.b', 1.5),
+                                  get_item('rules.c', 5.0, {'count': 100}),
+                                  get_item('rules.d', 1.0)]}
+
+        result = base.compare_reports(baseline=baseline, current=current, threshold=0.1)
+
+        # Benchmarks with different parameters and new benchmarks are not compared
+        self.assertEqual([item['fullname'] for item in result], ['rules.a', 'rules.b'])
+        self.assertFalse(result[0]['regression'])
+        self.assertTrue(result[1]['regression'])
+        self.assertAlmostEqual(result[1]['change'], 0.5)
@@ -15,11 +15,15 @@
 
 from __future__ import absolute_import
 import os
+import shutil
+import tempfile
 
 import unittest2
 from mock import Mock
 
 from st2common.content.loader import ContentPackLoader
+from st2common.content.loader import MetaLoader
+from st2common.content.loader import MetadataCache
 from st2common.content.loader import LOG
 
 CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -84,3 +88,87 @@ class ContentLoaderTest(unittest2.TestCase):
 
         result = loader.get_content_from_pack(pack_dir=pack_path, content_type='sensors')
         self.assertEqual(result, None)
+
+
+class MetadataCacheTest(unittest2.TestCase):
+    def setUp(self):
+        super(MetadataCacheTest, self).setUp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'workflow.yaml')
+        self._write_file('version: 1.0\ntasks:\n  task1:\n    action: core.noop\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        super(MetadataCacheTest, self).tearDown()
+
+    def test_load_unchanged_file_is_not_parsed_again(self):
+        cache = MetadataCache()
+        parser_func = Mock(return_value={'tasks': {}})
+
+        content = cache.load(file_path=self.file_path, parser_func=parser_func)
+        content['tasks']['task1'] = {}
+
+        # Copy of the cached content is returned
+        self.assertEqual(cache.load(file_path=self.file_path, parser_func=parser_func),
+                         {'tasks': {}})
+        self.assertEqual(parser_func.call_count, 1)
+
+        # File has been touched, but the content hasn't changed
+        os.utime(self.file_path, (0, 0))
+        cache.load(file_path=self.file_path, parser_func=parser_func)
+        self.assertEqual(parser_func.call_count, 1)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_load_changed_file(self):
+        cache = MetadataCache()
+        self.assertEqual(cache.load(file_path=self.file_path)['tasks']['task1'],
+                         {'action': 'core.noop'})
+
+        self._write_file('version: 1.0\ntasks:\n  task1:\n    action: core.local\n')
+        os.utime(self.file_path, (0, 0))
+
+        self.assertEqual(cache.load(file_path=self.file_path)['tasks']['task1'],
+                         {'action': 'core.local'})
+        self.assertEqual(cache.get_stats()['misses'], 2)
+
+    def test_load_compiled(self):
+        cache = MetadataCache()
+        compile_func = Mock(side_effect=lambda content: object())
+
+        compiled = cache.load_compiled(file_path=self.file_path, name='test',
+                                       compile_func=compile_func)
+        self.assertEqual(cache.load_compiled(file_path=self.file_path, name='test',
+                                             compile_func=compile_func), compiled)
+        self.assertEqual(compile_func.call_count, 1)
+
+        cache.invalidate(self.file_path)
+        self.assertNotEqual(cache.load_compiled(file_path=self.file_path, name='test',
+                                                compile_func=compile_func), compiled)
+
+    def test_max_size(self):
+        cache = MetadataCache(max_size=1)
+        other_file_path = os.path.join(self.temp_dir, 'other.yaml')
+        shutil.copy(self.file_path, other_file_path)
+
+        cache.load(file_path=self.file_path)
+        cache.load(file_path=other_file_path)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_meta_loader_uses_cache(self):
+        cache = MetadataCache()
+        loader = MetaLoader(cache=cache)
+
+        self.assertEqual(loader.load(self.file_path, expected_type=dict),
+                         MetaLoader().load(self.file_path))
+        loader.load(self.file_path)
+        self.assertEqual(cache.get_stats()['hits'], 1)
+
+    def _write_file(self, content):
+        with open(self.file_path, 'w') as fp:
+            fp.write(content)
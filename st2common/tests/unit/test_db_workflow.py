@@ -118,3 +118,113 @@ class WorkflowExecutionModelTest(st2tests.DbTestCase):
             wf_db_access.WorkflowExecution.get_by_id,
             doc_id
         )
+
+
+@mock.patch.object(publishers.PoolPublisher, 'publish', mock.MagicMock())
+class WorkflowExecutionSnapshotTest(st2tests.DbTestCase):
+
+    def setUp(self):
+        super(WorkflowExecutionSnapshotTest, self).setUp()
+        wf_db_access.WorkflowExecution.snapshots.clear()
+
+    def _create_workflow_execution(self):
+        wf_ex_db = wf_db_models.WorkflowExecutionDB()
+        wf_ex_db.action_execution = uuid.uuid4().hex
+        wf_ex_db.state = {'tasks': {'task1': 0}, 'sequence': [{'id': 'task1'}]}
+        wf_ex_db.status = 'requested'
+
+        return wf_db_access.WorkflowExecution.add_or_update(wf_ex_db)
+
+    def test_get_latest_by_id_uses_up_to_date_snapshot(self):
+        created = self._create_workflow_execution()
+        doc_id = str(created.id)
+
+        retrieved = wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+        self.assertIn(doc_id, wf_db_access.WorkflowExecution.snapshots)
+
+        with mock.patch.object(wf_db_access.WorkflowExecution, 'get_by_id') as mock_get_by_id:
+            cached = wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+            self.assertFalse(mock_get_by_id.called)
+
+        self.assertEqual(cached.rev, retrieved.rev)
+        self.assertEqual(cached.status, retrieved.status)
+        self.assertDictEqual(cached.state, retrieved.state)
+
+    def test_get_latest_by_id_revision_mismatch(self):
+        created = self._create_workflow_execution()
+        doc_id = str(created.id)
+
+        retrieved = wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+        wf_db_access.WorkflowExecution.update(retrieved, status='running')
+
+        latest = wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+        self.assertEqual(latest.rev, created.rev + 1)
+        self.assertEqual(latest.status, 'running')
+        self.assertEqual(wf_db_access.WorkflowExecution.snapshots[doc_id]['rev'], latest.rev)
+
+    def test_get_latest_by_id_snapshot_removed_while_checking_revision(self):
+        created = self._create_workflow_execution()
+        doc_id = str(created.id)
+
+        wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+
+        impl = wf_db_access.WorkflowExecution._get_impl()
+        original_get = impl.get
+
+        def mock_get(*args, **kwargs):
+            # Simulate another green thread evicting the snapshot during the database round trip
+            wf_db_access.WorkflowExecution.snapshots.pop(doc_id, None)
+            return original_get(*args, **kwargs)
+
+        with mock.patch.object(impl, 'get', mock.Mock(side_effect=mock_get)):
+            latest = wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+
+        self.assertEqual(latest.rev, created.rev)
+        self.assertIn(doc_id, wf_db_access.WorkflowExecution.snapshots)
+
+    @mock.patch.object(wf_db_access, 'SNAPSHOTS_CACHE_SIZE', 2)
+    def test_least_recently_used_snapshot_is_evicted(self):
+        doc_ids = [str(self._create_workflow_execution().id) for _ in range(0, 3)]
+
+        for doc_id in [doc_ids[0], doc_ids[1], doc_ids[0], doc_ids[2]]:
+            wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+
+        self.assertEqual(list(wf_db_access.WorkflowExecution.snapshots.keys()),
+                         [doc_ids[0], doc_ids[2]])
+
+    def test_update_fields_keeps_snapshot_in_sync(self):
+        created = self._create_workflow_execution()
+        doc_id = str(created.id)
+
+        retrieved = wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+        wf_db_access.WorkflowExecution.update_fields(
+            retrieved,
+            set_fields={'status': 'running', 'state.sequence.1': {'id': 'task2'}},
+            unset_fields={'state.tasks.task1': ''})
+
+        stored = wf_db_access.WorkflowExecution.get_by_id(doc_id)
+        snapshot = wf_db_access.WorkflowExecution.snapshots[doc_id]
+        self.assertEqual(retrieved.rev, stored.rev)
+        self.assertEqual(snapshot['rev'], stored.rev)
+        self.assertEqual(snapshot['status'], 'running')
+        self.assertDictEqual(snapshot['state'], stored.to_mongo().to_dict()['state'])
+
+        cached = wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+        self.assertEqual(cached.status, 'running')
+        self.assertDictEqual(cached.state, stored.state)
+
+    def test_update_fields_write_conflict_drops_snapshot(self):
+        created = self._create_workflow_execution()
+        doc_id = str(created.id)
+
+        retrieved = wf_db_access.WorkflowExecution.get_latest_by_id(doc_id)
+        retrieved.rev = retrieved.rev - 1
+
+        self.assertRaises(
+            db_exc.StackStormDBObjectWriteConflictError,
+            wf_db_access.WorkflowExecution.update_fields,
+            retrieved,
+            set_fields={'status': 'running'}
+        )
+
+        self.assertNotIn(doc_id, wf_db_access.WorkflowExecution.snapshots)
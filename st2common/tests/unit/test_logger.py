@@ -135,6 +135,43 @@ class LoggerTestCase(unittest.TestCase):
         audit_log_entries = open(self.audit_log_path).read()
         self.assertIn(msg, audit_log_entries)
 
+    def test_log_lazy_value(self):
+        logging.setup(self.cfg_path)
+        log = logging.getLogger(__name__)
+        log.setLevel(logbase.INFO)
+        self.addCleanup(log.setLevel, logbase.NOTSET)
+
+        func = mock.Mock(return_value='lazy value')
+
+        # DEBUG is disabled, value is never computed
+        log.debug('Value: %s', logging.lazy(func))
+        self.assertEqual(func.call_count, 0)
+
+        # INFO is enabled, value is computed once for all the handlers
+        msg = uuid.uuid4().hex
+        log.info('%s %s', msg, logging.lazy(func, 1, b=2))
+        func.assert_called_once_with(1, b=2)
+
+        info_log_entries = open(self.info_log_path).read()
+        self.assertIn('%s lazy value' % (msg), info_log_entries)
+
+    @mock.patch('st2common.log.prefix_dict_keys')
+    def test_disabled_log_level_arguments_are_not_processed(self, mock_prefix_dict_keys):
+        mock_prefix_dict_keys.side_effect = lambda dictionary, prefix: dictionary
+
+        logging.setup(self.cfg_path)
+        log = logging.getLogger(__name__)
+        log.setLevel(logbase.INFO)
+        self.addCleanup(log.setLevel, logbase.NOTSET)
+
+        log.debug('debug', extra={'a': 1})
+        log.log(logbase.DEBUG, 'debug', extra={'a': 1})
+        self.assertEqual(mock_prefix_dict_keys.call_count, 0)
+
+        log.info('info', extra={'a': 1})
+        log.log(logbase.INFO, 'info', extra={'a': 1})
+        self.assertTrue(mock_prefix_dict_keys.called)
+
 
 class ConsoleLogFormatterTestCase(unittest.TestCase):
     @classmethod
@@ -363,6 +400,49 @@ class GelfLogFormatterTestCase(unittest.TestCase):
         self.assertEqual(parsed['_obj2'], 'to_dict')
         self.assertEqual(parsed['_obj3'], 'to_serializable_dict')
 
+    def test_extra_attributes_are_formatted_once_per_record(self):
+        to_dict = mock.Mock(return_value={'a': 1})
+        obj = mock.Mock(spec=['to_dict'], to_dict=to_dict)
+        lazy_func = mock.Mock(return_value='lazy value')
+
+        record = MockRecord()
+        record.msg = 'message'
+        record._obj = obj
+        record._lazy = logging.lazy(lazy_func)
+
+        message = GelfLogFormatter().format(record=record)
+        parsed = json.loads(message)
+        self.assertEqual(parsed['_obj'], {'a': 1})
+        self.assertEqual(parsed['_lazy'], 'lazy value')
+
+        message = ConsoleLogFormatter().format(record=record)
+        self.assertIn('lazy=\'lazy value\'', message)
+
+        self.assertEqual(to_dict.call_count, 1)
+        self.assertEqual(lazy_func.call_count, 1)
+
+    def test_long_extra_attribute_values_are_truncated(self):
+        cfg.CONF.set_override(name='max_extra_attribute_length', override=10, group='log')
+        self.addCleanup(cfg.CONF.clear_override, name='max_extra_attribute_length', group='log')
+
+        record = MockRecord()
+        record.msg = 'message'
+        record._short = 'a' * 10
+        record._long = 'b' * 20
+        record._nested = {'result': {'stdout': 'c' * 20, 'items': ['d' * 20]}, 'code': 0}
+
+        message = GelfLogFormatter().format(record=record)
+        parsed = json.loads(message)
+        self.assertEqual(parsed['_short'], 'a' * 10)
+        self.assertEqual(parsed['_long'], 'b' * 10 + '... (truncated)')
+        self.assertEqual(parsed['_nested'], {
+            'result': {
+                'stdout': 'c' * 10 + '... (truncated)',
+                'items': ['d' * 10 + '... (truncated)']
+            },
+            'code': 0
+        })
+
     @mock.patch('st2common.logging.formatters.MASKED_ATTRIBUTES_BLACKLIST',
                 MOCK_MASKED_ATTRIBUTES_BLACKLIST)
     def test_format_blacklisted_attributes_are_masked(self):
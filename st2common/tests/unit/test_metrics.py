@@ -17,6 +17,7 @@ import socket
 from datetime import datetime
 from datetime import timedelta
 
+import eventlet
 import unittest2
 import mock
 from mock import patch, MagicMock
@@ -24,13 +25,23 @@ from mock import patch, MagicMock
 from oslo_config import cfg
 
 from st2common.metrics import base
+from st2common.metrics import collectors
+from st2common.metrics import endpoint
+from st2common.metrics.histogram import Histogram
 from st2common.metrics.utils import get_full_key_name
 from st2common.metrics.drivers.statsd_driver import StatsdDriver
+from st2common.metrics.drivers.prometheus_driver import PrometheusDriver
+from st2common.stream.listener import StreamListener
+from st2common.transport.publishers import PoolPublisher
 from st2common.util.date import get_datetime_utc_now
 
 __all__ = [
     'TestBaseMetricsDriver',
     'TestStatsDMetricsDriver',
+    'TestHistogram',
+    'TestPrometheusMetricsDriver',
+    'TestPrometheusMetricsEndpoint',
+    'TestMetricsCollectors',
     'TestCounterContextManager',
     'TestTimerContextManager',
     'TestCounterWithTimerContextManager'
@@ -251,6 +262,272 @@ class TestStatsDMetricsDriver(unittest2.TestCase):
         mock_gauge.assert_called_once_with(None, 1)
 
 
+class TestHistogram(unittest2.TestCase):
+    def test_percentiles(self):
+        histogram = Histogram(significant_figures=2)
+        self.assertEqual(histogram.get_value_at_percentile(50), None)
+
+        for value in range(1, 1001):
+            histogram.record(value / 1000.0)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.sum, 500.5)
+        self.assertEqual(histogram.min, 0.001)
+        self.assertEqual(histogram.max, 1.0)
+
+        # Values are tracked with 2 significant figures
+        for percentile, expected in [(50, 0.5), (90, 0.9), (99, 0.99)]:
+            value = histogram.get_value_at_percentile(percentile)
+            self.assertTrue(abs(value - expected) / expected < 0.01)
+
+        # Values never fall outside of the recorded range
+        self.assertTrue(0.001 <= histogram.get_value_at_percentile(0) < 0.00101)
+        self.assertEqual(histogram.get_value_at_percentile(100), 1.0)
+
+    def test_memory_is_bounded(self):
+        histogram = Histogram(significant_figures=2, lowest_value=0.000001, highest_value=3600)
+
+        for exponent in range(-6, 6):
+            for multiplier in range(1, 1000):
+                histogram.record(multiplier * 10 ** exponent)
+
+        # 256 sub buckets, values up to 2^32 microseconds
+        self.assertTrue(histogram.get_bucket_count() <= 128 * 26)
+        self.assertEqual(histogram.max, 999 * 10 ** 5)
+        self.assertTrue(histogram.get_value_at_percentile(100) <= 999 * 10 ** 5)
+
+        histogram.record(-1)
+        self.assertEqual(histogram.min, 0)
+
+
+class TestPrometheusMetricsDriver(unittest2.TestCase):
+    def setUp(self):
+        super(TestPrometheusMetricsDriver, self).setUp()
+        cfg.CONF.set_override(name='prefix', group='metrics', override=None)
+
+        self._export_driver = MagicMock()
+        self._driver = PrometheusDriver(export_driver=self._export_driver, flush_interval=60,
+                                        percentiles=['50', '99'])
+
+    def test_metrics_are_aggregated(self):
+        self._driver.inc_counter('action.executions')
+        self._driver.inc_counter('action.executions', 2)
+        self._driver.dec_counter('action.executions')
+        self._driver.set_gauge('queue.length', 10)
+        self._driver.inc_gauge('queue.length', 5)
+        self._driver.dec_gauge('queue.length', 2)
+
+        for value in range(1, 101):
+            self._driver.time('rule.processed', value / 100.0)
+
+        # Nothing is sent until the metrics are flushed
+        self.assertEqual(self._export_driver.method_calls, [])
+
+        self._driver.flush()
+
+        self._export_driver.inc_counter.assert_called_once_with('action.executions', 2)
+        self._export_driver.set_gauge.assert_any_call('queue.length', 13)
+        gauges = dict([call[0] for call in self._export_driver.set_gauge.call_args_list])
+        self.assertTrue(abs(gauges['rule.processed.p50'] - 0.5) < 0.005)
+        self.assertTrue(abs(gauges['rule.processed.p99'] - 0.99) < 0.01)
+
+        # Only counter increments since the last flush are exported
+        self._export_driver.reset_mock()
+        self._driver.inc_counter('action.executions')
+        self._driver.flush()
+
+        self._export_driver.inc_counter.assert_called_once_with('action.executions', 1)
+        self._export_driver.time.assert_not_called()
+
+    def test_metrics_are_flushed_periodically(self):
+        self._driver.time('rule.processed', 0.1)
+        self._export_driver.set_gauge.assert_not_called()
+
+        self._driver._next_flush_time = 0
+        self._driver.time('rule.processed', 0.1)
+        self._export_driver.set_gauge.assert_any_call('rule.processed.p50', 0.1)
+
+    def test_export_failure_is_not_fatal(self):
+        self._export_driver.inc_counter.side_effect = Exception('failure')
+        self._driver.inc_counter('action.executions')
+
+        self._driver._next_flush_time = 0
+        self._driver.inc_counter('action.executions')
+
+    def test_get_prometheus_metrics(self):
+        cfg.CONF.set_override(name='prefix', group='metrics', override='prod')
+        self.addCleanup(cfg.CONF.set_override, name='prefix', group='metrics', override=None)
+
+        self._driver.inc_counter('action.executions', 3)
+        self._driver.set_gauge('orquesta.workflows-running', 1.5)
+        # Values up to 256 microseconds are tracked exactly
+        self._driver.time('rule.processed', 0.0001)
+        self._driver.time('rule.processed', 0.0002)
+
+        # Percentiles are only available once the metrics have been flushed
+        metrics = self._driver.get_prometheus_metrics()
+        self.assertNotIn('quantile', metrics)
+
+        self._driver.flush()
+        metrics = self._driver.get_prometheus_metrics()
+
+        expected = '\n'.join([
+            '# TYPE st2_prod_action_executions_total counter',
+            'st2_prod_action_executions_total 3',
+            '# TYPE st2_prod_orquesta_workflows_running gauge',
+            'st2_prod_orquesta_workflows_running 1.5',
+            '# TYPE st2_prod_rule_processed_seconds summary',
+            'st2_prod_rule_processed_seconds{quantile="0.5"} 0.0001',
+            'st2_prod_rule_processed_seconds{quantile="0.99"} 0.0002',
+            'st2_prod_rule_processed_seconds_sum 0.00030000000000000003',
+            'st2_prod_rule_processed_seconds_count 2'
+        ]) + '\n'
+        self.assertEqual(metrics, expected)
+
+    def test_timer_with_labels(self):
+        labels = {'operation_id': 'st2api.controllers.v1.actions:actions_controller.get_all',
+                  'status': 200}
+        self._driver.time_with_labels('api.request.latency', 0.0001, labels)
+        self._driver.time_with_labels('api.request.latency', 0.0002, labels)
+        self._driver.time_with_labels('api.request.latency', 0.0001,
+                                      {'operation_id': 'get"all', 'status': 500})
+        self._driver.flush()
+
+        # Labelled timers are not exported
+        self._export_driver.set_gauge.assert_not_called()
+
+        metrics = self._driver.get_prometheus_metrics()
+        expected = '\n'.join([
+            '# TYPE st2_api_request_latency_seconds summary',
+            'st2_api_request_latency_seconds{operation_id="get\\"all",status="500",'
+            'quantile="0.5"} 0.0001',
+            'st2_api_request_latency_seconds{operation_id="get\\"all",status="500",'
+            'quantile="0.99"} 0.0001',
+            'st2_api_request_latency_seconds_sum{operation_id="get\\"all",status="500"} 0.0001',
+            'st2_api_request_latency_seconds_count{operation_id="get\\"all",status="500"} 1',
+            'st2_api_request_latency_seconds{operation_id="st2api.controllers.v1.actions:'
+            'actions_controller.get_all",status="200",quantile="0.5"} 0.0001',
+            'st2_api_request_latency_seconds{operation_id="st2api.controllers.v1.actions:'
+            'actions_controller.get_all",status="200",quantile="0.99"} 0.0002',
+            'st2_api_request_latency_seconds_sum{operation_id="st2api.controllers.v1.actions:'
+            'actions_controller.get_all",status="200"} 0.00030000000000000003',
+            'st2_api_request_latency_seconds_count{operation_id="st2api.controllers.v1.actions:'
+            'actions_controller.get_all",status="200"} 2'
+        ]) + '\n'
+        self.assertEqual(metrics, expected)
+
+
+class TestPrometheusMetricsEndpoint(unittest2.TestCase):
+    def setUp(self):
+        super(TestPrometheusMetricsEndpoint, self).setUp()
+        cfg.CONF.set_override(name='prefix', group='metrics', override=None)
+
+    def test_metrics_app(self):
+        driver = PrometheusDriver(export_driver=None)
+        driver.inc_counter('action.executions')
+        start_response = MagicMock()
+
+        with patch.object(base, 'METRICS', driver):
+            body = endpoint.metrics_app({'PATH_INFO': '/metrics'}, start_response)
+
+        self.assertTrue(body[0].startswith(b'# TYPE st2_action_executions_total counter\n'
+                                           b'st2_action_executions_total 1\n'))
+        self.assertIn(b'# TYPE st2_eventlet_hub_pending_timers gauge\n', body[0])
+        self.assertEqual(start_response.call_args[0][0], '200 OK')
+        self.assertIn(('Content-Type', endpoint.CONTENT_TYPE), start_response.call_args[0][1])
+
+        endpoint.metrics_app({'PATH_INFO': '/'}, start_response)
+        self.assertEqual(start_response.call_args[0][0], '404 Not Found')
+
+    @patch('st2common.metrics.endpoint.eventlet')
+    def test_start_metrics_server(self, mock_eventlet):
+        self.assertIsNone(endpoint.start_metrics_server(service='rulesengine'))
+
+        cfg.CONF.set_override(name='driver', group='metrics', override='prometheus')
+        self.addCleanup(cfg.CONF.set_override, name='driver', group='metrics', override='noop')
+        cfg.CONF.set_override(name='prometheus_ports', group='metrics',
+                              override={'rulesengine': '9110'})
+        self.addCleanup(cfg.CONF.clear_override, name='prometheus_ports', group='metrics')
+
+        self.assertIsNone(endpoint.start_metrics_server(service='scheduler'))
+        self.assertFalse(mock_eventlet.listen.called)
+
+        endpoint.start_metrics_server(service='rulesengine')
+        mock_eventlet.listen.assert_called_once_with(('127.0.0.1', 9110))
+        self.assertTrue(mock_eventlet.spawn.called)
+
+        # Failing to bind is not fatal
+        mock_eventlet.listen.side_effect = socket.error('Address already in use')
+        self.assertIsNone(endpoint.start_metrics_server(service='rulesengine'))
+
+
+class TestMetricsCollectors(unittest2.TestCase):
+    def test_get_collected_metrics(self):
+        pool = eventlet.GreenPool(10)
+        pool.spawn(eventlet.sleep, 1)
+        self.addCleanup(pool.waitall)
+        collectors.register_green_pool(name='test', pool=pool)
+        self.addCleanup(collectors._GREEN_POOLS.pop, 'test')
+
+        publisher = MagicMock()
+        publisher.get_pool_stats.return_value = {'limit': 10, 'in_use': 2, 'idle': 8}
+
+        listener = MagicMock()
+        listener.get_stats.return_value = {'clients': 1, 'queued_events': 5,
+                                           'max_queue_depth': 5}
+
+        def failing_collector():
+            raise Exception('failure')
+
+        def collector():
+            return {'custom.gauge': 1}
+
+        collectors.register_collector(failing_collector)
+        self.addCleanup(collectors._COLLECTORS.remove, failing_collector)
+        collectors.register_collector(collector)
+        self.addCleanup(collectors._COLLECTORS.remove, collector)
+
+        with patch('st2common.transport.publishers.SharedPoolPublishers.shared_publishers',
+                   {'amqp://': publisher}):
+            with patch('st2common.stream.listener._stream_listener', listener):
+                metrics = collectors.get_collected_metrics()
+
+        self.assertTrue(metrics['eventlet.hub.pending_timers'] >= 1)
+        self.assertEqual(metrics['green_pool.test.size'], 10)
+        self.assertEqual(metrics['green_pool.test.running'], 1)
+        self.assertEqual(metrics['amqp.pool.in_use'], 2)
+        self.assertEqual(metrics['amqp.pool.idle'], 8)
+        self.assertEqual(metrics['amqp.pool.limit'], 10)
+        self.assertEqual(metrics['stream.listener.stream.clients'], 1)
+        self.assertEqual(metrics['stream.listener.stream.queued_events'], 5)
+        self.assertNotIn('stream.listener.execution_output.clients', metrics)
+        self.assertEqual(metrics['custom.gauge'], 1)
+
+    def test_pool_publisher_stats(self):
+        publisher = PoolPublisher(urls=['memory://'])
+        self.assertEqual(publisher.get_pool_stats()['in_use'], 0)
+
+        connection = publisher.pool.acquire()
+        self.addCleanup(connection.release)
+
+        stats = publisher.get_pool_stats()
+        self.assertEqual(stats['limit'], 10)
+        self.assertEqual(stats['in_use'], 1)
+
+    def test_stream_listener_stats(self):
+        listener = StreamListener(connection=MagicMock())
+        self.assertEqual(listener.get_stats(), {'clients': 0, 'queued_events': 0,
+                                                'max_queue_depth': 0})
+
+        generator = listener.generator()
+        next(generator)
+        listener.emit('event', {'a': 1})
+        listener.emit('event', {'a': 2})
+
+        self.assertEqual(listener.get_stats(), {'clients': 1, 'queued_events': 2,
+                                                'max_queue_depth': 2})
+
+
 class TestCounterContextManager(unittest2.TestCase):
     @patch('st2common.metrics.base.METRICS')
     def test_counter(self, metrics_patch):
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+import mock
 import unittest2
 
 from st2common import operators
@@ -165,6 +166,7 @@ class SearchOperatorTest(unittest2.TestCase):
         result = op(payload, criteria_pattern, 'any', record_function_args)
 
         self.assertTrue(result)
+        # Second item is never evaluated since the first one already matches
         self.assertTrue(list_of_dicts_strict_equal(called_function_args, [
             # Outer loop: payload -> {'field_name': "Status", 'to_value': "Approved"}
             {
@@ -189,30 +191,6 @@ class SearchOperatorTest(unittest2.TestCase):
                     'field_name': "Status",
                     'to_value': "Approved",
                 },
-            },
-            # Outer loop: payload -> {'field_name': "Assigned to", 'to_value': "Stanley"}
-            {
-                # Inner loop: criterion -> item.field_name: {'type': "equals", 'pattern': "Status"}
-                'criterion_k': 'item.field_name',
-                'criterion_v': {
-                    'type': "equals",
-                    'pattern': "Status",
-                },
-                'payload_lookup': {
-                    'field_name': "Assigned to",
-                    'to_value': "Stanley",
-                },
-            }, {
-                # Inner loop: criterion -> item.to_value: {'type': "equals", 'pattern': "Approved"}
-                'criterion_k': 'item.to_value',
-                'criterion_v': {
-                    'type': "equals",
-                    'pattern': "Approved",
-                },
-                'payload_lookup': {
-                    'field_name': "Assigned to",
-                    'to_value': "Stanley",
-                },
             }
         ]))
 
@@ -256,6 +234,7 @@ class SearchOperatorTest(unittest2.TestCase):
         result = op(payload, criteria_pattern, 'any', record_function_args)
 
         self.assertFalse(result)
+        # Remaining criteria of an item are skipped once one of them doesn't match
         self.assertEqual(called_function_args, [
             # Outer loop: payload -> {'field_name': "Status", 'to_value': "Denied"}
             {
@@ -269,17 +248,6 @@ class SearchOperatorTest(unittest2.TestCase):
                     'field_name': "Status",
                     'to_value': "Denied",
                 },
-            }, {
-                # Inner loop: criterion -> item.to_value: {'type': "equals", 'pattern': "Approved"}
-                'criterion_k': 'item.to_value',
-                'criterion_v': {
-                    'type': "equals",
-                    'pattern': "Approved",
-                },
-                'payload_lookup': {
-                    'field_name': "Status",
-                    'to_value': "Denied",
-                },
             },
             # Outer loop: payload -> {'field_name': "Assigned to", 'to_value': "Stanley"}
             {
@@ -347,6 +315,7 @@ class SearchOperatorTest(unittest2.TestCase):
         result = op(payload, criteria_pattern, 'all', record_function_args)
 
         self.assertFalse(result)
+        # Evaluation stops on the first item which doesn't match
         self.assertEqual(called_function_args, [
             # Outer loop: payload -> {'field_name': "Status", 'to_value': "Approved"}
             {
@@ -360,41 +329,6 @@ class SearchOperatorTest(unittest2.TestCase):
                     'field_name': "Status",
                     'to_value': "Approved",
                 },
-            }, {
-                # Inner loop: item.to_value -> {'type': "equals", 'pattern': "Approved"}
-                'criterion_k': 'item.to_value',
-                'criterion_v': {
-                    'type': "equals",
-                    'pattern': "Approved",
-                },
-                'payload_lookup': {
-                    'field_name': "Status",
-                    'to_value': "Approved",
-                },
-            },
-            # Outer loop: payload -> {'field_name': "Assigned to", 'to_value': "Stanley"}
-            {
-                # Inner loop: item.field_name -> {'type': "equals", 'pattern': "Status"}
-                'criterion_k': 'item.field_name',
-                'criterion_v': {
-                    'type': "equals",
-                    'pattern': "Status",
-                },
-                'payload_lookup': {
-                    'field_name': "Assigned to",
-                    'to_value': "Stanley",
-                },
-            }, {
-                # Inner loop: item.to_value -> {'type': "equals", 'pattern': "Approved"}
-                'criterion_k': 'item.to_value',
-                'criterion_v': {
-                    'type': "equals",
-                    'pattern': "Approved",
-                },
-                'payload_lookup': {
-                    'field_name': "Assigned to",
-                    'to_value': "Stanley",
-                },
             }
         ])
 
@@ -489,6 +423,52 @@ class SearchOperatorTest(unittest2.TestCase):
             }
         ])
 
+    def test_search_count_conditions(self):
+        op = operators.get_operator('search')
+
+        def check_function(criterion_k, criterion_v, payload_lookup):
+            return payload_lookup.get_value(criterion_k)[0] == criterion_v['pattern']
+
+        payload = [{'status': 'open'}, {'status': 'closed'}, {'status': 'open'}]
+        criteria_pattern = {
+            'item.status': {
+                'type': 'equals',
+                'pattern': 'open'
+            }
+        }
+
+        self.assertTrue(op(payload, criteria_pattern, 'count', check_function, 2))
+        self.assertFalse(op(payload, criteria_pattern, 'count', check_function, 1))
+        self.assertTrue(op(payload, criteria_pattern, 'count_gt', check_function, 1))
+        self.assertFalse(op(payload, criteria_pattern, 'count_gt', check_function, 2))
+        self.assertTrue(op(payload, criteria_pattern, 'count_gte', check_function, 2))
+        self.assertFalse(op(payload, criteria_pattern, 'count_gte', check_function, 3))
+        self.assertTrue(op(payload, criteria_pattern, 'count_lt', check_function, 3))
+        self.assertFalse(op(payload, criteria_pattern, 'count_lt', check_function, 2))
+        self.assertTrue(op(payload, criteria_pattern, 'count_lte', check_function, 2))
+        self.assertFalse(op(payload, criteria_pattern, 'count_lte', check_function, 1))
+
+        self.assertRaises(ValueError, op, payload, criteria_pattern, 'count', check_function)
+
+    def test_search_count_condition_short_circuits(self):
+        op = operators.get_operator('search')
+        check_function = mock.Mock(return_value=True)
+
+        payload = [{'status': 'open'}] * 100
+        criteria_pattern = {
+            'item.status': {
+                'type': 'equals',
+                'pattern': 'open'
+            }
+        }
+
+        self.assertTrue(op(payload, criteria_pattern, 'count_gte', check_function, 5))
+        self.assertEqual(check_function.call_count, 5)
+
+        check_function.reset_mock()
+        self.assertFalse(op(payload, criteria_pattern, 'count_lte', check_function, 5))
+        self.assertEqual(check_function.call_count, 6)
+
 
 class OperatorTest(unittest2.TestCase):
     def test_matchwildcard(self):
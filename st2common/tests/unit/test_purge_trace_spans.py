@@ -0,0 +1,57 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+from datetime import timedelta
+
+from st2common import log as logging
+from st2common.garbage_collection.trace_spans import purge_trace_spans
+from st2common.models.db.trace import TraceSpanDB
+from st2common.persistence.trace import TraceSpan
+from st2common.util import date as date_utils
+from st2tests.base import CleanDbTestCase
+
+LOG = logging.getLogger(__name__)
+
+
+class TestPurgeTraceSpans(CleanDbTestCase):
+
+    def test_no_timestamp_doesnt_delete(self):
+        now = date_utils.get_datetime_utc_now()
+
+        TraceSpan.add_or_update(TraceSpanDB(trace_id='a' * 32, span_id='b' * 16, name='test',
+                                            start_timestamp=now - timedelta(days=20)))
+
+        self.assertEqual(len(TraceSpan.get_all()), 1)
+        expected_msg = 'Specify a valid timestamp'
+        self.assertRaisesRegexp(ValueError, expected_msg,
+                                purge_trace_spans,
+                                logger=LOG, timestamp=None)
+        self.assertEqual(len(TraceSpan.get_all()), 1)
+
+    def test_purge(self):
+        now = date_utils.get_datetime_utc_now()
+
+        TraceSpan.add_or_update(TraceSpanDB(trace_id='a' * 32, span_id='b' * 16, name='old',
+                                            start_timestamp=now - timedelta(days=20)))
+        TraceSpan.add_or_update(TraceSpanDB(trace_id='a' * 32, span_id='c' * 16, name='new',
+                                            start_timestamp=now - timedelta(days=5)))
+
+        self.assertEqual(len(TraceSpan.get_all()), 2)
+        purge_trace_spans(logger=LOG, timestamp=now - timedelta(days=10))
+
+        span_dbs = TraceSpan.get_all()
+        self.assertEqual(len(span_dbs), 1)
+        self.assertEqual(span_dbs[0].name, 'new')
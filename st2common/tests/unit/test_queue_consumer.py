@@ -16,7 +16,9 @@
 from __future__ import absolute_import
 import mock
 from kombu import Exchange, Queue
+from oslo_config import cfg
 
+from st2common.tracing import base as tracing
 from st2common.transport import consumers
 from st2common.util.greenpooldispatch import BufferedDispatcher
 from st2tests.base import DbTestCase
@@ -56,6 +58,40 @@ class QueueConsumerTest(DbTestCase):
         self.assertTrue(mock_message.ack.called)
         self.assertFalse(FakeMessageHandler.process.called)
 
+    @mock.patch.object(FakeMessageHandler, 'process', mock.MagicMock())
+    def test_process_message_tracing_enabled(self):
+        cfg.CONF.set_override(name='enable', override=True, group='tracing')
+        self.addCleanup(cfg.CONF.clear_override, name='enable', group='tracing')
+
+        sink = mock.Mock()
+        patcher = mock.patch.object(tracing, 'SINK', sink)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with tracing.start_span('publisher') as publisher_span:
+            headers = tracing.get_message_headers()
+
+        payload = FakeModelDB(id='fake-id')
+        handler = get_handler()
+        handler._queue_consumer._dispatcher = mock.Mock()
+        mock_message = mock.MagicMock()
+        mock_message.headers = headers
+
+        handler._queue_consumer.process(payload, mock_message)
+
+        dispatch_args = handler._queue_consumer._dispatcher.dispatch.call_args[0]
+        self.assertEqual(dispatch_args[1:], (payload, headers))
+
+        handler._queue_consumer._process_message(*dispatch_args[1:])
+        FakeMessageHandler.process.assert_called_once_with(payload)
+
+        span = sink.export.call_args[0][0]
+        self.assertEqual(span.name, 'FakeMessageHandler.process')
+        self.assertEqual(span.kind, tracing.SPAN_KIND_CONSUMER)
+        self.assertEqual(span.trace_id, publisher_span.trace_id)
+        self.assertEqual(span.parent_span_id, publisher_span.span_id)
+        self.assertEqual(span.attributes['st2.resource_id'], 'fake-id')
+
 
 class FakeStagedMessageHandler(consumers.StagedMessageHandler):
     message_type = FakeModelDB
@@ -22,7 +22,9 @@ import mock
 from jsonschema import ValidationError
 
 from st2common.content import utils as content_utils
+from st2common.bootstrap import base as registrar_base
 from st2common.bootstrap.base import ResourceRegistrar
+from st2common.bootstrap.base import get_file_content_hash
 from st2common.persistence.pack import Pack
 from st2common.persistence.pack import ConfigSchema
 
@@ -224,3 +226,34 @@ class ResourceRegistrarTestCase(CleanDbTestCase):
         expected_msg = r"'4' is not one of \['2', '3'\]"
         self.assertRaisesRegexp(ValueError, expected_msg, registrar.register_packs,
                                 base_dirs=packs_base_paths)
+
+    def test_get_file_content_hash(self):
+        file_path = os.path.join(PACK_PATH_1, 'pack.yaml')
+
+        content_hash = get_file_content_hash(file_path)
+        self.assertEqual(content_hash, get_file_content_hash(file_path))
+
+        # Version is part of the hash
+        with mock.patch.object(registrar_base, '__version__', '0.0.1'):
+            self.assertNotEqual(get_file_content_hash(file_path), content_hash)
+
+    @mock.patch.object(registrar_base, 'MIN_PARALLEL_METADATA_FILES', 1)
+    def test_load_metadata_files_parallel(self):
+        file_paths = [os.path.join(PACK_PATH_1, 'pack.yaml'),
+                      os.path.join(PACK_PATH_1, 'config.schema.yaml'),
+                      os.path.join(PACK_PATH_1, 'doesnt-exist.yaml')]
+
+        registrar = ResourceRegistrar(use_pack_cache=False)
+        expected = registrar._load_metadata_files(file_paths)
+
+        registrar = ResourceRegistrar(use_pack_cache=False, parallelism=2)
+
+        try:
+            result = registrar._load_metadata_files(file_paths)
+        finally:
+            registrar._close_process_pool()
+
+        self.assertEqual([item[:2] for item in result], [item[:2] for item in expected])
+        self.assertEqual(result[0][1]['name'], 'dummy_pack_1')
+        self.assertEqual(result[2][1], None)
+        self.assertTrue(result[2][2] is not None)
@@ -0,0 +1,93 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import mock
+import unittest2
+from stevedore.exception import NoMatches
+
+from st2common.constants.runners import RUNNERS_NAMESPACE
+from st2common.constants.runners import RUNNERS_QUERY_MODULES_NAMESPACE
+from st2common.runners import registry as registry_module
+from st2common.runners.registry import RunnerRegistry
+from st2common.util import loader
+
+
+class RunnerRegistryTestCase(unittest2.TestCase):
+    def test_get_module_is_cached(self):
+        registry = RunnerRegistry()
+
+        with mock.patch.object(registry_module, 'get_plugin_instance',
+                               wraps=loader.get_plugin_instance) as mock_get_plugin_instance:
+            module_1 = registry.get_module(namespace=RUNNERS_NAMESPACE, name='local-shell-cmd')
+            module_2 = registry.get_module(namespace=RUNNERS_NAMESPACE, name='local-shell-cmd')
+
+            self.assertEqual(module_1, module_2)
+            self.assertEqual(mock_get_plugin_instance.call_count, 1)
+
+    def test_get_module_backward_compatible_name(self):
+        registry = RunnerRegistry()
+
+        module_1 = registry.get_module(namespace=RUNNERS_NAMESPACE, name='local-shell-cmd')
+        module_2 = registry.get_module(namespace=RUNNERS_NAMESPACE, name='local_shell_cmd')
+        self.assertEqual(module_1, module_2)
+
+        # Module is also cached under the original name
+        with mock.patch.object(registry_module, 'get_plugin_instance') as mock_get_plugin_instance:
+            registry.get_module(namespace=RUNNERS_NAMESPACE, name='local_shell_cmd')
+            self.assertEqual(mock_get_plugin_instance.call_count, 0)
+
+    def test_get_module_not_found(self):
+        registry = RunnerRegistry()
+
+        self.assertRaises(NoMatches, registry.get_module, namespace=RUNNERS_NAMESPACE,
+                          name='invalid-name-not-found')
+
+    def test_load_all_and_reload(self):
+        registry = RunnerRegistry()
+
+        load_times = registry.load_all(namespaces=[RUNNERS_QUERY_MODULES_NAMESPACE])
+        self.assertTrue((RUNNERS_QUERY_MODULES_NAMESPACE, 'mistral-v2') in load_times)
+        self.assertEqual(load_times, registry.get_load_times())
+
+        registry.reload()
+        self.assertEqual(registry.get_load_times(), {})
+
+        with mock.patch.object(registry_module, 'get_plugin_instance',
+                               wraps=loader.get_plugin_instance) as mock_get_plugin_instance:
+            registry.get_module(namespace=RUNNERS_QUERY_MODULES_NAMESPACE, name='mistral-v2')
+            self.assertEqual(mock_get_plugin_instance.call_count, 1)
+
+    def test_watcher_reloads_registry_on_runner_type_event(self):
+        registry = mock.Mock(spec=RunnerRegistry)
+        reload_callback = mock.Mock()
+
+        watcher = registry_module.RunnerRegistryWatcher(registry=registry,
+                                                        reload_callback=reload_callback)
+
+        runner_type_db = mock.Mock()
+        runner_type_db.name = 'local-shell-cmd'
+
+        message = mock.Mock()
+        watcher.process_task(runner_type_db, message)
+
+        self.assertEqual(registry.reload.call_count, 1)
+        self.assertEqual(reload_callback.call_count, 1)
+        self.assertEqual(message.ack.call_count, 1)
+
+        # Events published while the connection was down are lost
+        watcher.on_connection_revived()
+        self.assertEqual(registry.reload.call_count, 2)
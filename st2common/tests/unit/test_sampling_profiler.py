@@ -0,0 +1,180 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+
+import eventlet
+import mock
+import unittest2
+from oslo_config import cfg
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.util import sampling_profiler
+from st2common.util.sampling_profiler import SamplingProfiler
+from st2common.util.sampling_profiler import ProfilerRequestWatcher
+
+__all__ = [
+    'SamplingProfilerTestCase',
+    'ProfilerInitializeTestCase',
+    'ProfilerRequestWatcherTestCase'
+]
+
+
+def busy_function(duration):
+    end_time = eventlet.patcher.original('time').time() + duration
+
+    while eventlet.patcher.original('time').time() < end_time:
+        pass
+
+
+class SamplingProfilerTestCase(unittest2.TestCase):
+    def setUp(self):
+        super(SamplingProfilerTestCase, self).setUp()
+
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+        self.profiler = SamplingProfiler(service='test', sample_rate=200,
+                                         output_dir=self.output_dir)
+
+    def test_sampling_busy_main_thread(self):
+        self.assertTrue(self.profiler.start(duration=10))
+        self.assertTrue(self.profiler.is_running())
+
+        # Profiling session is already in progress
+        self.assertFalse(self.profiler.start())
+
+        # Main thread never yields to the hub while busy_function is running
+        busy_function(duration=0.3)
+        self.profiler.stop()
+        self.assertFalse(self.profiler.is_running())
+
+        samples = self.profiler.get_samples(reset=True)
+        self.assertTrue(sum(samples.values()) > 10)
+
+        busy_samples = [count for stack, count in samples.items() if 'busy_function' in stack]
+        self.assertTrue(sum(busy_samples) > sum(samples.values()) / 2)
+
+        # Stacks are in the root first collapsed format
+        stack = [stack for stack in samples.keys() if 'busy_function' in stack][0]
+        self.assertTrue(stack.split(';')[-1].startswith('busy_function ('))
+
+        self.assertEqual(self.profiler.get_samples(), {})
+
+    def test_sampling_stops_after_duration(self):
+        self.profiler.start(duration=0.1)
+        eventlet.patcher.original('time').sleep(0.3)
+        self.assertFalse(self.profiler.is_running())
+
+    def test_dump(self):
+        def sleeping_green_thread():
+            eventlet.sleep(10)
+
+        green_thread = eventlet.spawn(sleeping_green_thread)
+        self.addCleanup(green_thread.kill)
+        eventlet.sleep(0)
+
+        self.profiler.start()
+        busy_function(duration=0.1)
+        self.profiler.stop()
+
+        stacks_path, greenlets_path = self.profiler.dump()
+
+        self.assertEqual(os.path.dirname(stacks_path), self.output_dir)
+        self.assertTrue(os.path.basename(stacks_path).startswith('test-'))
+        self.assertTrue(stacks_path.endswith('.collapsed'))
+
+        with open(stacks_path, 'r') as fp:
+            lines = fp.read().strip().split('\n')
+
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(int(count) >= 1)
+
+        self.assertTrue(any(['busy_function' in line for line in lines]))
+
+        with open(greenlets_path, 'r') as fp:
+            content = fp.read()
+
+        self.assertIn('Green threads: ', content)
+        self.assertIn('sleeping_green_thread', content)
+        self.assertIn('test_dump', content)
+
+        # Samples are reset after the dump
+        self.assertEqual(self.profiler.get_samples(), {})
+
+    def test_get_collapsed_stacks(self):
+        samples = {'main;b;c': 2, 'main;a': 5}
+        self.assertEqual(sampling_profiler.get_collapsed_stacks(samples=samples),
+                         'main;a 5\nmain;b;c 2\n')
+
+
+class ProfilerInitializeTestCase(unittest2.TestCase):
+    def tearDown(self):
+        super(ProfilerInitializeTestCase, self).tearDown()
+        sampling_profiler._PROFILER = None
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(sampling_profiler.profiler_initialize(service='test'))
+        self.assertIsNone(sampling_profiler.start_profiling())
+
+    @mock.patch.object(ProfilerRequestWatcher, 'start', mock.Mock())
+    @mock.patch('st2common.util.sampling_profiler.signal.signal')
+    def test_start_profiling(self, mock_signal):
+        cfg.CONF.set_override(name='enable', override=True, group='profiler')
+        self.addCleanup(cfg.CONF.clear_override, name='enable', group='profiler')
+
+        profiler = sampling_profiler.profiler_initialize(service='test')
+        self.assertIsNotNone(profiler)
+        mock_signal.assert_called_once_with(sampling_profiler.signal.SIGPROF,
+                                            sampling_profiler._handle_sigprof)
+
+        with mock.patch.object(profiler, 'dump') as mock_dump:
+            green_thread = sampling_profiler.start_profiling(duration=0.1)
+            self.assertTrue(profiler.is_running())
+
+            # Second request is ignored while the session is in progress
+            self.assertIsNone(sampling_profiler.start_profiling(duration=0.1))
+
+            green_thread.wait()
+
+        self.assertFalse(profiler.is_running())
+        mock_dump.assert_called_once_with()
+
+
+class ProfilerRequestWatcherTestCase(unittest2.TestCase):
+    def test_process_task(self):
+        handler = mock.Mock()
+        watcher = ProfilerRequestWatcher(service='test', handler=handler)
+        message = mock.Mock()
+
+        # Request for a different host
+        watcher.process_task({'hostname': 'doesnt-exist', 'pid': None, 'duration': 10}, message)
+        self.assertEqual(handler.call_count, 0)
+
+        # Request for a different process
+        watcher.process_task({'hostname': None, 'pid': os.getpid() + 1, 'duration': 10}, message)
+        self.assertEqual(handler.call_count, 0)
+
+        watcher.process_task({'hostname': None, 'pid': os.getpid(), 'duration': 10}, message)
+        handler.assert_called_once_with(duration=10)
+
+        self.assertEqual(message.ack.call_count, 3)
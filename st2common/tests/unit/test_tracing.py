@@ -0,0 +1,343 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import os
+import json
+import time
+import tempfile
+
+import bson
+import mock
+import unittest2
+from oslo_config import cfg
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.models.db.trace import TraceDB
+from st2common.models.db.trace import TraceComponentDB
+from st2common.persistence.execution import ActionExecution
+from st2common.persistence.trace import Trace
+from st2common.persistence.trace import TraceSpan
+from st2common.services import trace as trace_service
+from st2common.tracing import base as tracing
+from st2common.tracing.sinks.database_sink import DatabaseSink
+from st2common.tracing.sinks.file_sink import FileSink
+from st2tests.base import CleanDbTestCase
+
+__all__ = [
+    'TracingTestCase',
+    'FileSinkTestCase',
+    'DatabaseSinkTestCase'
+]
+
+
+class TracingTestCaseMixin(object):
+    def _enable_tracing(self, sink):
+        cfg.CONF.set_override(name='enable', override=True, group='tracing')
+        self.addCleanup(cfg.CONF.clear_override, name='enable', group='tracing')
+
+        patcher = mock.patch.object(tracing, 'SINK', sink)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TracingTestCase(TracingTestCaseMixin, unittest2.TestCase):
+    def test_tracing_disabled(self):
+        with tracing.start_span('test') as span:
+            self.assertIsNone(span)
+            self.assertIsNone(tracing.get_current_span())
+            self.assertIsNone(tracing.get_message_headers())
+
+    def test_nested_spans(self):
+        sink = mock.Mock()
+        self._enable_tracing(sink=sink)
+
+        with tracing.start_span('parent', attributes={'a': 1}) as parent:
+            self.assertEqual(tracing.get_current_span(), parent)
+
+            with tracing.start_span('child') as child:
+                self.assertEqual(tracing.get_current_span(), child)
+
+            self.assertEqual(tracing.get_current_span(), parent)
+
+        self.assertIsNone(tracing.get_current_span())
+
+        self.assertEqual(len(parent.trace_id), 32)
+        self.assertEqual(len(parent.span_id), 16)
+        self.assertIsNone(parent.parent_span_id)
+        self.assertEqual(parent.attributes, {'a': 1})
+        self.assertEqual(child.trace_id, parent.trace_id)
+        self.assertEqual(child.parent_span_id, parent.span_id)
+
+        # Spans are exported once finished
+        self.assertEqual(sink.export.call_args_list, [mock.call(child), mock.call(parent)])
+        self.assertTrue(child.duration >= 0)
+        self.assertTrue(parent.duration >= child.duration)
+
+    def test_span_context_is_propagated_using_message_headers(self):
+        sink = mock.Mock()
+        self._enable_tracing(sink=sink)
+
+        with tracing.start_span('publisher') as publisher:
+            headers = tracing.get_message_headers()
+
+        self.assertEqual(headers[tracing.TRACEPARENT_HEADER],
+                         '00-%s-%s-01' % (publisher.trace_id, publisher.span_id))
+
+        # Message waited in the queue for a while
+        headers[tracing.PUBLISHED_AT_HEADER] = time.time() - 2
+
+        with tracing.start_span('consumer', headers=headers,
+                                kind=tracing.SPAN_KIND_CONSUMER) as consumer:
+            pass
+
+        self.assertEqual(consumer.trace_id, publisher.trace_id)
+        self.assertEqual(consumer.parent_span_id, publisher.span_id)
+        self.assertEqual(consumer.kind, tracing.SPAN_KIND_CONSUMER)
+        self.assertTrue(2 <= consumer.queue_wait < 10)
+
+    def test_message_without_tracing_headers_starts_a_new_trace(self):
+        self._enable_tracing(sink=mock.Mock())
+
+        with tracing.start_span('parent'):
+            with tracing.start_span('consumer', headers={}) as consumer:
+                pass
+
+        self.assertIsNone(consumer.parent_span_id)
+        self.assertIsNone(consumer.queue_wait)
+
+        # Invalid headers are ignored
+        headers = {tracing.TRACEPARENT_HEADER: 'invalid'}
+
+        with tracing.start_span('consumer', headers=headers) as consumer:
+            pass
+
+        self.assertIsNone(consumer.parent_span_id)
+
+    def test_failed_span(self):
+        sink = mock.Mock()
+        self._enable_tracing(sink=sink)
+
+        def run():
+            with tracing.start_span('test'):
+                raise ValueError('Failure')
+
+        self.assertRaises(ValueError, run)
+
+        span = sink.export.call_args[0][0]
+        self.assertEqual(span.status, tracing.SPAN_STATUS_ERROR)
+        self.assertEqual(span.status_message, 'Failure')
+        self.assertIsNone(tracing.get_current_span())
+
+    def test_sink_failure_doesnt_affect_traced_code(self):
+        sink = mock.Mock()
+        sink.export.side_effect = Exception('Sink failure')
+        self._enable_tracing(sink=sink)
+
+        with tracing.start_span('test') as span:
+            pass
+
+        self.assertEqual(span.status, tracing.SPAN_STATUS_OK)
+
+    def test_get_consumer_span_attributes(self):
+        execution_db = ActionExecutionDB(id=bson.ObjectId())
+
+        attributes = tracing.get_consumer_span_attributes(execution_db)
+        self.assertEqual(attributes, {'st2.resource_type': 'ActionExecutionDB',
+                                      'st2.resource_id': str(execution_db.id)})
+
+        attributes = tracing.get_consumer_span_attributes({'trigger': 'core.st2.webhook'})
+        self.assertEqual(attributes, {'st2.resource_type': 'dict'})
+
+
+class FileSinkTestCase(TracingTestCaseMixin, unittest2.TestCase):
+    def setUp(self):
+        super(FileSinkTestCase, self).setUp()
+
+        fd, self.file_path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, self.file_path)
+
+    def test_spans_are_written_in_otlp_format(self):
+        sink = FileSink(file_path=self.file_path)
+        self.addCleanup(sink.close)
+        self._enable_tracing(sink=sink)
+
+        headers = {tracing.PUBLISHED_AT_HEADER: time.time() - 1}
+
+        with mock.patch.object(tracing, 'SERVICE_NAME', 'rulesengine'):
+            with tracing.start_span('parent', headers=headers, kind=tracing.SPAN_KIND_CONSUMER,
+                                    attributes={'st2.resource_id': 'id1'}) as parent:
+                with tracing.start_span('child') as child:
+                    child.set_attribute('count', 10)
+
+        with open(self.file_path, 'r') as fp:
+            lines = fp.read().strip().split('\n')
+
+        self.assertEqual(len(lines), 2)
+
+        child_request = json.loads(lines[0])
+        parent_request = json.loads(lines[1])
+
+        resource = parent_request['resourceSpans'][0]['resource']
+        self.assertEqual(resource['attributes'],
+                         [{'key': 'service.name', 'value': {'stringValue': 'st2rulesengine'}}])
+
+        otlp_span = parent_request['resourceSpans'][0]['scopeSpans'][0]['spans'][0]
+        self.assertEqual(otlp_span['traceId'], parent.trace_id)
+        self.assertEqual(otlp_span['spanId'], parent.span_id)
+        self.assertNotIn('parentSpanId', otlp_span)
+        self.assertEqual(otlp_span['name'], 'parent')
+        self.assertEqual(otlp_span['kind'], 5)
+        self.assertEqual(otlp_span['status'], {'code': 1})
+        self.assertEqual(otlp_span['startTimeUnixNano'], str(int(parent.start_time * 1e9)))
+        self.assertEqual(otlp_span['endTimeUnixNano'], str(int(parent.end_time * 1e9)))
+
+        attributes = dict([(item['key'], item['value']) for item in otlp_span['attributes']])
+        self.assertEqual(attributes['st2.resource_id'], {'stringValue': 'id1'})
+        self.assertTrue(attributes['st2.queue_wait_ms']['doubleValue'] >= 1000)
+
+        otlp_span = child_request['resourceSpans'][0]['scopeSpans'][0]['spans'][0]
+        self.assertEqual(otlp_span['parentSpanId'], parent.span_id)
+        self.assertEqual(otlp_span['kind'], 1)
+        self.assertEqual(otlp_span['attributes'], [{'key': 'count', 'value': {'intValue': '10'}}])
+
+    def test_file_is_reopened_after_rotation(self):
+        sink = FileSink(file_path=self.file_path)
+        self.addCleanup(sink.close)
+        self._enable_tracing(sink=sink)
+
+        with mock.patch('st2common.tracing.sinks.file_sink.open', mock.Mock(wraps=open),
+                        create=True) as mock_open:
+            with tracing.start_span('first'):
+                pass
+
+            with tracing.start_span('second'):
+                pass
+
+            self.assertEqual(mock_open.call_count, 1)
+
+            os.rename(self.file_path, self.file_path + '.1')
+            self.addCleanup(os.unlink, self.file_path + '.1')
+
+            with tracing.start_span('third'):
+                pass
+
+            self.assertEqual(mock_open.call_count, 2)
+
+        with open(self.file_path + '.1', 'r') as fp:
+            self.assertEqual(len(fp.read().strip().split('\n')), 2)
+
+        with open(self.file_path, 'r') as fp:
+            self.assertEqual(len(fp.read().strip().split('\n')), 1)
+
+
+class DatabaseSinkTestCase(TracingTestCaseMixin, CleanDbTestCase):
+    def test_spans_are_buffered_and_written_in_batches(self):
+        sink = DatabaseSink(batch_size=2, flush_interval=3600, max_buffer_size=3)
+        self._enable_tracing(sink=sink)
+
+        for index in range(0, 4):
+            with tracing.start_span('span%s' % (index)):
+                pass
+
+        # Nothing is written on the traced code path and spans over the limit are dropped
+        self.assertEqual(len(TraceSpan.get_all()), 0)
+
+        with mock.patch.object(TraceSpan, 'insert_many',
+                               mock.Mock(wraps=TraceSpan.insert_many)) as mock_insert_many:
+            sink.flush()
+
+        self.assertEqual(mock_insert_many.call_count, 2)
+        self.assertEqual(sorted([span_db.name for span_db in TraceSpan.get_all()]),
+                         ['span0', 'span1', 'span2'])
+
+        # Buffer is empty after the flush
+        sink.flush()
+        self.assertEqual(len(TraceSpan.get_all()), 3)
+
+    def test_get_trace_latency(self):
+        sink = DatabaseSink(flush_interval=3600)
+        self._enable_tracing(sink=sink)
+
+        trigger_instance_id = str(bson.ObjectId())
+        liveaction_id = str(bson.ObjectId())
+
+        execution_db = ActionExecution.add_or_update(ActionExecutionDB(
+            action={'ref': 'core.local'}, runner={'name': 'local-shell-cmd'},
+            liveaction={'id': liveaction_id}, status='succeeded'))
+
+        trace_db = Trace.add_or_update(TraceDB(
+            trace_tag='test',
+            trigger_instances=[TraceComponentDB(object_id=trigger_instance_id)],
+            action_executions=[TraceComponentDB(object_id=str(execution_db.id))]))
+
+        # Webhook -> rules engine -> action runner
+        with tracing.start_span('webhook', kind=tracing.SPAN_KIND_SERVER) as webhook_span:
+            headers = tracing.get_message_headers()
+
+        headers[tracing.PUBLISHED_AT_HEADER] -= 0.5
+        attributes = {'st2.resource_type': 'TriggerInstanceDB',
+                      'st2.resource_id': trigger_instance_id}
+
+        with tracing.start_span('TriggerInstanceDispatcher.process', headers=headers,
+                                attributes=attributes):
+            headers = tracing.get_message_headers()
+
+        attributes = {'st2.resource_type': 'LiveActionDB', 'st2.resource_id': liveaction_id}
+
+        with tracing.start_span('ActionExecutionDispatcher.process', headers=headers,
+                                attributes=attributes):
+            pass
+
+        # Span from an unrelated trace
+        with tracing.start_span('other'):
+            pass
+
+        sink.flush()
+        self.assertEqual(len(TraceSpan.get_all()), 4)
+
+        result = trace_service.get_trace_latency(trace_db=trace_db)
+
+        self.assertEqual(result['id'], str(trace_db.id))
+        self.assertEqual(result['trace_tag'], 'test')
+
+        spans = result['spans']
+        self.assertEqual([span['name'] for span in spans],
+                         ['webhook', 'TriggerInstanceDispatcher.process',
+                          'ActionExecutionDispatcher.process'])
+        self.assertEqual(set([span['trace_id'] for span in spans]), set([webhook_span.trace_id]))
+        self.assertTrue(spans[0]['offset'] >= 0)
+        self.assertTrue(spans[1]['offset'] >= spans[0]['offset'])
+        self.assertIsNone(spans[0]['queue_wait'])
+        self.assertEqual(spans[1]['resource_id'], trigger_instance_id)
+        self.assertEqual(spans[1]['parent_span_id'], webhook_span.span_id)
+        self.assertTrue(spans[1]['queue_wait'] >= 0.5)
+        self.assertEqual(spans[2]['resource_id'], liveaction_id)
+        self.assertTrue(result['queue_wait'] >= 0.5)
+        self.assertTrue(result['duration'] >= 0.5)
+
+    def test_get_trace_latency_no_spans(self):
+        trace_db = Trace.add_or_update(TraceDB(
+            trace_tag='test',
+            trigger_instances=[TraceComponentDB(object_id=str(bson.ObjectId()))]))
+
+        result = trace_service.get_trace_latency(trace_db=trace_db)
+        self.assertEqual(result['spans'], [])
+        self.assertIsNone(result['duration'])
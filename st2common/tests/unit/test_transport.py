@@ -15,12 +15,18 @@
 
 import ssl
 
+import mock
 import unittest2
+from kombu import Exchange
+from oslo_config import cfg
 
+from st2common.tracing import base as tracing
+from st2common.transport import publishers
 from st2common.transport.utils import _get_ssl_kwargs
 
 __all__ = [
-    'TransportUtilsTestCase'
+    'TransportUtilsTestCase',
+    'PoolPublisherTestCase'
 ]
 
 
@@ -78,3 +84,61 @@ class TransportUtilsTestCase(unittest2.TestCase):
             'ca_certs': '/tmp/ca_certs',
             'cert_reqs': ssl.CERT_REQUIRED
         })
+
+
+@mock.patch.object(publishers.transport_utils, 'get_connection')
+@mock.patch.object(publishers, 'Producer')
+class PoolPublisherTestCase(unittest2.TestCase):
+    def test_batch_publishes_over_single_connection(self, mock_producer, mock_get_connection):
+        publisher = publishers.PoolPublisher(urls=['amqp://localhost'])
+        connection = publisher.pool.acquire.return_value
+        exchange = Exchange('st2.test', type='topic')
+
+        with publisher.batch():
+            with publisher.batch():
+                publisher.publish({'a': 1}, exchange, 'create')
+
+            publisher.publish({'b': 2}, exchange, 'create')
+            publisher.publish({'c': 3}, exchange, 'update')
+
+            self.assertFalse(connection.release.called)
+
+        self.assertEqual(publisher.pool.acquire.call_count, 1)
+        self.assertEqual(connection.channel.call_count, 1)
+        self.assertEqual(mock_producer.call_count, 1)
+        self.assertEqual(connection.ensure.return_value.call_count, 3)
+        self.assertEqual(connection.release.call_count, 1)
+        self.assertEqual(mock_producer.return_value.channel.close.call_count, 1)
+
+    def test_empty_batch_does_not_acquire_connection(self, mock_producer, mock_get_connection):
+        publisher = publishers.PoolPublisher(urls=['amqp://localhost'])
+
+        with publisher.batch():
+            pass
+
+        self.assertFalse(publisher.pool.acquire.called)
+        self.assertFalse(mock_producer.called)
+
+    def test_tracing_headers_are_included_when_tracing_is_enabled(self, mock_producer,
+                                                                 mock_get_connection):
+        publisher = publishers.PoolPublisher(urls=['amqp://localhost'])
+        connection = publisher.pool.acquire.return_value
+        exchange = Exchange('st2.test', type='topic')
+
+        with publisher.batch():
+            publisher.publish({'a': 1}, exchange, 'create')
+
+        kwargs = connection.ensure.return_value.call_args[1]
+        self.assertNotIn('headers', kwargs)
+
+        cfg.CONF.set_override(name='enable', override=True, group='tracing')
+        self.addCleanup(cfg.CONF.clear_override, name='enable', group='tracing')
+
+        with mock.patch.object(tracing, 'SINK', mock.Mock()):
+            with tracing.start_span('test') as span:
+                with publisher.batch():
+                    publisher.publish({'a': 1}, exchange, 'create')
+
+        headers = connection.ensure.return_value.call_args[1]['headers']
+        self.assertEqual(headers[tracing.TRACEPARENT_HEADER], span.get_traceparent())
+        self.assertIn(tracing.PUBLISHED_AT_HEADER, headers)
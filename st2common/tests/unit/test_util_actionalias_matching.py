@@ -125,3 +125,96 @@ class ActionAliasTestCase(unittest2.TestCase):
         self.assertEqual(match[0]['representation'], "{{choice}} cross the {{target}}")
 
     # we need some more complex scenarios in here.
+
+    def test_get_format_string_prefix(self, mock_get_uid):
+        self.assertEqual(matching.get_format_string_prefix('Nobody puts {{name}} in a corner'),
+                         ['Nobody', 'puts'])
+        self.assertEqual(matching.get_format_string_prefix('^Say hello to my little friend'),
+                         ['Say', 'hello', 'to', 'my', 'little', 'friend'])
+        self.assertEqual(matching.get_format_string_prefix("I'll be back{{punctuation=.}}"),
+                         ["I'll", 'be'])
+
+        # Formats with regular expressions
+        self.assertEqual(matching.get_format_string_prefix('Wax on, wax (on|off)'), [])
+        self.assertEqual(matching.get_format_string_prefix('Game over, man. Game over!'),
+                         ['Game', 'over,'])
+        self.assertEqual(matching.get_format_string_prefix('Roads? ?{{where}}'), [])
+        self.assertEqual(matching.get_format_string_prefix('Inconceivable$'), [])
+
+    def test_index_match(self, mock_get_uid):
+        ALIASES = [
+            MemoryActionAliasDB(name="spengler", ref="ghostbusters.1",
+                                formats=["{{choice}} cross the {{target}}"]),
+            MemoryActionAliasDB(name="venkman", ref="ghostbusters.2",
+                                formats=["Back off man, I'm a {{profession}}"]),
+            MemoryActionAliasDB(name="stantz", ref="ghostbusters.3",
+                                formats=["Back off man, I'm a scientist"]),
+            MemoryActionAliasDB(name="zeddemore", ref="ghostbusters.4",
+                                formats=[{'representation': ["If there's a {{thing}}, I'll say",
+                                                             "Who you gonna call {{who}}"],
+                                          'match_multiple': True}])
+        ]
+        COMMANDS = [
+            "Don't cross the streams",
+            "Back off man, I'm a scientist",
+            "Back off man, I'm a scientist profession=doctor",
+            "Back off man",
+            "Who you gonna call ghostbusters",
+            "Who you gonna call"
+        ]
+
+        index = matching.ActionAliasIndex()
+
+        with mock.patch.object(matching.ActionAlias, 'query', mock.Mock(return_value=ALIASES)):
+            for command in COMMANDS:
+                for match_multiple in [False, True]:
+                    aliases = [alias for alias in ALIASES if
+                               match_multiple == (alias.name == 'zeddemore')]
+                    expected = matching.match_command_to_alias(command, aliases)
+                    result = index.match(command, match_multiple=match_multiple)
+
+                    self.assertEqual([(item['alias'].ref, item['representation'])
+                                      for item in result],
+                                     [(item['alias'].ref, item['representation'])
+                                      for item in expected])
+
+            self.assertEqual(matching.ActionAlias.query.call_count, 1)
+
+            # Index is built again once it's invalidated
+            index.invalidate()
+            index.match(COMMANDS[0])
+            self.assertEqual(matching.ActionAlias.query.call_count, 2)
+
+    def test_index_build_reuses_compiled_formats(self, mock_get_uid):
+        ALIASES = [
+            MemoryActionAliasDB(name="spengler", ref="ghostbusters.1",
+                                formats=["{{choice}} cross the {{target}}"])
+        ]
+
+        index = matching.ActionAliasIndex()
+        index.build(action_alias_dbs=ALIASES)
+
+        with mock.patch.object(matching, 'compile_format_string',
+                               mock.Mock(wraps=matching.compile_format_string)) as mock_compile:
+            index.build(action_alias_dbs=ALIASES)
+            self.assertEqual(mock_compile.call_count, 0)
+
+            ALIASES.append(MemoryActionAliasDB(name="venkman", ref="ghostbusters.2",
+                                               formats=["Back off man, I'm a {{profession}}"]))
+            index.build(action_alias_dbs=ALIASES)
+            self.assertEqual(mock_compile.call_count, 1)
+
+    def test_get_matching_alias_uses_index(self, mock_get_uid):
+        ALIASES = [
+            MemoryActionAliasDB(name="kyle_reese", ref="terminator.1",
+                                formats=["Come with me if you want to {{verb}}"])
+        ]
+
+        with mock.patch.object(matching, '_INDEX', matching.ActionAliasIndex()):
+            with mock.patch.object(matching.ActionAlias, 'query',
+                                   mock.Mock(return_value=ALIASES)):
+                format_ = matching.get_matching_alias('Come with me if you want to live')
+                matching.get_matching_alias('Come with me if you want to live')
+
+                self.assertEqual(format_['alias'].ref, 'terminator.1')
+                self.assertEqual(matching.ActionAlias.query.call_count, 1)
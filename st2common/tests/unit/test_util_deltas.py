@@ -0,0 +1,117 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import copy
+import unittest
+
+import mock
+from mongoengine.base.datastructures import BaseDict
+from mongoengine.base.datastructures import BaseList
+
+from st2common.util import deltas
+from st2common.util import mongoescape
+
+
+class DeltasTestCase(unittest.TestCase):
+    def _assert_applied(self, old_value, new_value, escape=deltas.ESCAPE_DICT):
+        set_fields, unset_fields = deltas.get_field_updates(old_value, new_value, 'field',
+                                                            escape=escape)
+
+        if escape == deltas.ESCAPE_DICT:
+            document = {'field': mongoescape.escape_chars(copy.deepcopy(old_value))}
+            expected = {'field': mongoescape.escape_chars(copy.deepcopy(new_value))}
+        else:
+            document = {'field': copy.deepcopy(old_value)}
+            expected = {'field': copy.deepcopy(new_value)}
+
+        deltas.apply_field_updates(document, set_fields, unset_fields)
+        self.assertEqual(document, expected)
+
+        return set_fields, unset_fields
+
+    def test_no_changes(self):
+        value = {'a': 1, 'b': [1, 2, {'c': 3}]}
+        set_fields, unset_fields = self._assert_applied(value, copy.deepcopy(value))
+        self.assertEqual(set_fields, {})
+        self.assertEqual(unset_fields, {})
+
+    def test_only_changed_keys_are_set(self):
+        old_value = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': 4}
+        new_value = {'a': 1, 'b': {'c': 2, 'd': 5}, 'f': 6}
+        set_fields, unset_fields = self._assert_applied(old_value, new_value)
+        self.assertEqual(set_fields, {'field.b.d': 5, 'field.f': 6})
+        self.assertEqual(unset_fields, {'field.e': ''})
+
+    def test_appended_list_items_are_set_by_index(self):
+        old_value = {'sequence': [{'id': 'task1'}]}
+        new_value = {'sequence': [{'id': 'task1'}, {'id': 'task2'}, {'id': 'task3'}]}
+        set_fields, unset_fields = self._assert_applied(old_value, new_value)
+        self.assertEqual(set_fields, {'field.sequence.1': {'id': 'task2'},
+                                      'field.sequence.2': {'id': 'task3'}})
+        self.assertEqual(unset_fields, {})
+
+    def test_shrunk_list_is_set_as_a_whole(self):
+        old_value = {'items': [1, 2, 3]}
+        new_value = {'items': [1]}
+        set_fields, _ = self._assert_applied(old_value, new_value)
+        self.assertEqual(set_fields, {'field.items': [1]})
+
+    def test_unchanged_values_loaded_from_database_are_skipped(self):
+        old_value = {'a': BaseDict({'b': BaseList([1, 2], None, 'a'), 'c': 3}, None, 'a'), 'd': 4}
+        new_value = {'a': {'b': [1, 2], 'c': 3}, 'd': 5}
+
+        with mock.patch.object(deltas, '_diff', wraps=deltas._diff) as mock_diff:
+            set_fields, unset_fields = self._assert_applied(old_value, new_value)
+
+        self.assertEqual(set_fields, {'field.d': 5})
+        self.assertEqual(unset_fields, {})
+
+        # Unchanged subtree is not walked
+        paths = [call[0][2] for call in mock_diff.call_args_list]
+        self.assertEqual(sorted(paths), ['field', 'field.a', 'field.d'])
+
+    def test_value_type_change(self):
+        set_fields, _ = self._assert_applied({'a': 1, 'b': 1}, {'a': True, 'b': 2})
+        self.assertEqual(set_fields, {'field.a': True, 'field.b': 2})
+
+        set_fields, _ = self._assert_applied({'a': {'b': 1}}, {'a': [1]})
+        self.assertEqual(set_fields, {'field.a': [1]})
+
+    def test_keys_are_escaped(self):
+        old_value = {'a.b': {'c$': 1}}
+        new_value = {'a.b': {'c$': 2, 'd.e': {'f.g': 3}}}
+        set_fields, _ = self._assert_applied(old_value, new_value)
+        self.assertEqual(set_fields, {
+            u'field.a\uff0eb.c\uff04': 2,
+            u'field.a\uff0eb.d\uff0ee': {u'f\uff0eg': 3}
+        })
+
+    def test_keys_are_not_escaped_for_escape_none(self):
+        old_value = [{'a': 1}]
+        new_value = [{'a': 1}, {'b.c': 2}]
+        set_fields, _ = self._assert_applied(old_value, new_value, escape=deltas.ESCAPE_NONE)
+        self.assertEqual(set_fields, {'field.1': {'b.c': 2}})
+
+    def test_invalid_path_key_falls_back_to_setting_parent(self):
+        set_fields, _ = self._assert_applied({'a': {'': 1}}, {'a': {'': 2}},
+                                             escape=deltas.ESCAPE_NONE)
+        self.assertEqual(set_fields, {'field.a': {'': 2}})
+
+    def test_whole_value_is_set_when_old_value_is_missing(self):
+        set_fields, unset_fields = deltas.get_field_updates(None, {'a.b': 1}, 'field')
+        self.assertEqual(set_fields, {'field': {u'a\uff0eb': 1}})
+        self.assertEqual(unset_fields, {})
@@ -14,10 +14,15 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+import os
+import tempfile
+
 import unittest2
 
 from st2common.util.shell import quote_unix
 from st2common.util.shell import quote_windows
+from st2common.util.shell import split_simple_command
+from st2common.util.shell import is_directly_executable
 from six.moves import zip
 
 
@@ -101,3 +106,48 @@ class ShellUtilsTestCase(unittest2.TestCase):
             actual_value = quote_windows(value=argument)
             expected_value = expected_value.lstrip()
             self.assertEqual(actual_value, expected_value.strip())
+
+    def test_split_simple_command(self):
+        self.assertEqual(split_simple_command('uname -s'), ['uname', '-s'])
+        self.assertEqual(split_simple_command('/bin/ls -la /tmp'), ['/bin/ls', '-la', '/tmp'])
+
+        # Commands which use shell features, builtins or executable which can't be resolved
+        commands = [
+            'ls | wc -l',
+            'ls $HOME',
+            'ls "foo bar"',
+            'ls > /tmp/out',
+            'ls\nuname',
+            'FOO=bar ls',
+            'echo foo',
+            'cd /tmp',
+            './script.sh',
+            'doesnt-exist-command'
+        ]
+
+        for command in commands:
+            self.assertEqual(split_simple_command(command), None, command)
+
+        # Executable is resolved using PATH from the provided environment
+        self.assertEqual(split_simple_command('uname', env={'PATH': '/doesnt-exist'}), None)
+
+    def test_is_directly_executable(self):
+        _, path = tempfile.mkstemp()
+
+        try:
+            with open(path, 'w') as fp:
+                fp.write('#!/usr/bin/env bash\necho 1\n')
+
+            # Not executable
+            self.assertFalse(is_directly_executable(path))
+
+            os.chmod(path, 0o755)
+            self.assertTrue(is_directly_executable(path))
+
+            # Script without a shebang line is executed by the shell
+            with open(path, 'w') as fp:
+                fp.write('echo 1\n')
+
+            self.assertFalse(is_directly_executable(path))
+        finally:
+            os.unlink(path)
@@ -52,7 +52,28 @@ def _register_app_opts():
     dump_opts = [
         cfg.StrOpt(
             'dump_dir', default='/opt/stackstorm/exports/',
-            help='Directory to dump data to.')
+            help='Directory to dump data to.'),
+        cfg.StrOpt(
+            'file_format', default='json', choices=['json', 'jsonl'],
+            help='Format of the export files. "jsonl" streams executions to line delimited JSON '
+                 'files which are rotated based on size and age.'),
+        cfg.StrOpt(
+            'compression', default='gzip', choices=['none', 'gzip', 'zstd'],
+            help='Compression of the "jsonl" export files. "zstd" requires "zstandard" Python '
+                 'package.'),
+        cfg.IntOpt(
+            'max_file_size', default=64 * 1024 * 1024,
+            help='"jsonl" export file is rotated once it reaches this size (uncompressed bytes).'),
+        cfg.IntOpt(
+            'max_file_age', default=300,
+            help='"jsonl" export file is rotated once it is older than this value (seconds).'),
+        cfg.IntOpt(
+            'queue_size', default=10000,
+            help='Maximum number of executions waiting to be written to "jsonl" export files.'),
+        cfg.IntOpt(
+            'bootstrap_batch_size', default=500,
+            help='Number of executions which are retrieved from the database at once while '
+                 'exporting executions which were missed while exporter was not running.')
     ]
 
     CONF.register_opts(dump_opts, group='exporter')
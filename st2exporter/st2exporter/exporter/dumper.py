@@ -14,28 +14,39 @@
 # limitations under the License.
 
 import os
+import time
 
 import eventlet
 from six.moves import queue
 
 from st2common import log as logging
+from st2common.metrics.base import get_driver
+from st2exporter.exporter.file_writer import COMPRESSION_GZIP
+from st2exporter.exporter.file_writer import COMPRESSIONS
+from st2exporter.exporter.file_writer import StreamFileWriter
 from st2exporter.exporter.file_writer import TextFileWriter
 from st2exporter.exporter.json_converter import JsonConverter
+from st2exporter.exporter.json_converter import JsonLinesConverter
 from st2common.models.db.marker import DumperMarkerDB
 from st2common.persistence.marker import DumperMarker
 from st2common.util import date as date_utils
 from st2common.util import isotime
 
 __all__ = [
-    'Dumper'
+    'Dumper',
+    'StreamingDumper'
 ]
 
-ALLOWED_EXTENSIONS = ['json']
+ALLOWED_EXTENSIONS = ['json', 'jsonl']
 
 CONVERTERS = {
-    'json': JsonConverter
+    'json': JsonConverter,
+    'jsonl': JsonLinesConverter
 }
 
+# How often (in seconds) the streaming dumper checks if it should stop while the queue is empty
+STOP_CHECK_INTERVAL = 1
+
 LOG = logging.getLogger(__name__)
 
 
@@ -71,8 +82,7 @@ class Dumper(object):
         self._shutdown = False
         self._persisted_marker = None
 
-        if not file_writer:
-            self._file_writer = TextFileWriter()
+        self._file_writer = file_writer or TextFileWriter()
 
     def start(self, wait=False):
         self._flush_thread = eventlet.spawn(self._flush)
@@ -157,8 +167,9 @@ class Dumper(object):
 
     def _update_marker(self, batch):
         timestamps = [isotime.parse(item.end_timestamp) for item in batch]
-        new_marker = max(timestamps)
+        return self._persist_marker(max(timestamps))
 
+    def _persist_marker(self, new_marker):
         if self._persisted_marker and self._persisted_marker > new_marker:
             LOG.warn('Older executions are being exported. Perhaps out of order messages.')
 
@@ -188,3 +199,123 @@ class Dumper(object):
 
         marker_db = DumperMarkerDB(id=marker_id, marker=marker, updated_at=updated_at)
         return DumperMarker.add_or_update(marker_db)
+
+
+class StreamingDumper(Dumper):
+    """
+    Dumper which writes each execution to the currently open (optionally compressed) line
+    delimited JSON file as soon as it's received from the queue.
+
+    Files are rotated once they reach max_file_size (uncompressed bytes) or once they are older
+    than max_file_age seconds. Export marker is only updated after a file has been completed and
+    atomically renamed to its final name so the marker never points past executions which are
+    not on disk yet.
+    """
+
+    def __init__(self, queue, export_dir, file_prefix='st2-executions-',
+                 compression=COMPRESSION_GZIP, max_file_size=64 * 1024 * 1024,
+                 max_file_age=300):
+        super(StreamingDumper, self).__init__(queue=queue, export_dir=export_dir,
+                                              file_format='jsonl', file_prefix=file_prefix)
+
+        if compression not in COMPRESSIONS:
+            raise ValueError('Unsupported compression "%s". Supported compressions are: %s' %
+                             (compression, ', '.join(COMPRESSIONS)))
+
+        self._compression = compression
+        self._max_file_size = max_file_size
+        self._max_file_age = max_file_age
+
+        self._current_file = None
+        self._current_marker = None
+
+        # Time spent converting and writing documents of the current file
+        self._write_duration = 0.0
+
+    def stop(self):
+        # Flush thread finishes the file which is currently open before it exits
+        self._shutdown = True
+        return self._flush_thread.wait()
+
+    def _flush(self):
+        while not self._shutdown:
+            try:
+                item = self._queue.get(timeout=self._get_wait_timeout())
+            except queue.Empty:
+                item = None
+
+            self._process_item(item)
+
+        # Drain items which are already in the queue and finish the current file
+        while True:
+            try:
+                item = self._queue.get(block=False)
+            except queue.Empty:
+                break
+
+            self._process_item(item)
+
+        self._rotate()
+
+    def _process_item(self, item):
+        try:
+            if item is not None:
+                self._write_item(item)
+
+            if self._should_rotate():
+                self._rotate()
+        except:
+            LOG.exception('Failed writing data to disk.')
+
+    def _get_wait_timeout(self):
+        if not self._current_file:
+            return STOP_CHECK_INTERVAL
+
+        age = time.time() - self._current_file.created_at
+        return max(min(self._max_file_age - age, STOP_CHECK_INTERVAL), 0)
+
+    def _should_rotate(self):
+        if not self._current_file:
+            return False
+
+        if self._current_file.size >= self._max_file_size:
+            return True
+
+        return (time.time() - self._current_file.created_at) >= self._max_file_age
+
+    def _write_item(self, item):
+        if not self._current_file:
+            self._create_date_folder()
+            self._current_file = StreamFileWriter(file_path=self._get_file_name(),
+                                                  compression=self._compression)
+            self._write_duration = 0.0
+
+        start = time.time()
+        self._current_file.write(self._converter.convert_item(item))
+        self._write_duration += time.time() - start
+
+        end_timestamp = isotime.parse(item.end_timestamp)
+        if not self._current_marker or end_timestamp > self._current_marker:
+            self._current_marker = end_timestamp
+
+    def _rotate(self):
+        if not self._current_file:
+            return None
+
+        current_file = self._current_file
+        marker = self._current_marker
+        self._current_file = None
+        self._current_marker = None
+
+        file_path = current_file.close()
+
+        documents_per_second = current_file.count / max(self._write_duration, 0.000001)
+        LOG.info('Exported %s executions to %s (%s bytes, %.1f documents/second).',
+                 current_file.count, file_path, current_file.size, documents_per_second)
+
+        metrics_driver = get_driver()
+        metrics_driver.inc_counter('exporter.files')
+        metrics_driver.inc_counter('exporter.documents', current_file.count)
+        metrics_driver.set_gauge('exporter.documents_per_second', documents_per_second)
+
+        return self._persist_marker(marker)
@@ -14,15 +14,35 @@
 # limitations under the License.
 
 import os
+import gzip
+import time
 
 import abc
 import six
 
 __all__ = [
+    'COMPRESSION_NONE',
+    'COMPRESSION_GZIP',
+    'COMPRESSION_ZSTD',
+    'COMPRESSIONS',
+
     'FileWriter',
-    'TextFileWriter'
+    'TextFileWriter',
+    'StreamFileWriter'
 ]
 
+COMPRESSION_NONE = 'none'
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+
+COMPRESSION_EXTENSIONS = {
+    COMPRESSION_NONE: '',
+    COMPRESSION_GZIP: '.gz',
+    COMPRESSION_ZSTD: '.zst'
+}
+
+COMPRESSIONS = sorted(COMPRESSION_EXTENSIONS.keys())
+
 
 @six.add_metaclass(abc.ABCMeta)
 class FileWriter(object):
@@ -50,3 +70,79 @@ class TextFileWriter(FileWriter):
 
         with open(file_path, 'w') as f:
             f.write(data)
+
+
+class StreamFileWriter(object):
+    """
+    Writer which appends data to a (optionally compressed) temporary file. Once the writer is
+    closed, the temporary file is synced to disk and atomically renamed to the final path so
+    partially written files are never visible under the final name.
+    """
+
+    def __init__(self, file_path, compression=COMPRESSION_NONE):
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError('Unsupported compression "%s". Supported compressions are: %s' %
+                             (compression, ', '.join(COMPRESSIONS)))
+
+        self.file_path = file_path + COMPRESSION_EXTENSIONS[compression]
+
+        if os.path.exists(self.file_path):
+            raise Exception('File %s already exists.' % self.file_path)
+
+        self._compression = compression
+        self._temp_file_path = os.path.join(os.path.dirname(self.file_path),
+                                            '.%s.partial' % (os.path.basename(self.file_path)))
+
+        self._raw_file = open(self._temp_file_path, 'wb')
+        self._file = self._get_compressed_file(self._raw_file)
+
+        # Number of written (uncompressed) bytes and documents
+        self.size = 0
+        self.count = 0
+        self.created_at = time.time()
+
+    def write(self, data, count=1):
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+
+        self._file.write(data)
+        self.size += len(data)
+        self.count += count
+
+    def close(self):
+        """
+        Finish the file and move it to the final path.
+
+        :return: Final file path.
+        :rtype: ``str``
+        """
+        if self._compression == COMPRESSION_GZIP:
+            # Only writes the trailer, underlying file object is not closed
+            self._file.close()
+        elif self._compression == COMPRESSION_ZSTD:
+            import zstandard
+            self._file.flush(zstandard.FLUSH_FRAME)
+
+        self._raw_file.flush()
+        os.fsync(self._raw_file.fileno())
+        self._raw_file.close()
+
+        os.rename(self._temp_file_path, self.file_path)
+        return self.file_path
+
+    def _get_compressed_file(self, raw_file):
+        if self._compression == COMPRESSION_GZIP:
+            return gzip.GzipFile(filename=os.path.basename(self.file_path)[:-3], mode='wb',
+                                 fileobj=raw_file)
+        elif self._compression == COMPRESSION_ZSTD:
+            try:
+                import zstandard
+            except ImportError:
+                raw_file.close()
+                os.remove(self._temp_file_path)
+                raise ValueError('"zstd" compression requires "zstandard" Python package to be '
+                                 'installed.')
+
+            return zstandard.ZstdCompressor().stream_writer(raw_file)
+
+        return raw_file
@@ -16,7 +16,8 @@
 from st2common.util.jsonify import json_encode
 
 __all__ = [
-    'JsonConverter'
+    'JsonConverter',
+    'JsonLinesConverter'
 ]
 
 
@@ -27,3 +28,17 @@ class JsonConverter(object):
             raise ValueError('Items to be converted should be a list.')
         json_doc = json_encode(items_list)
         return json_doc
+
+
+class JsonLinesConverter(object):
+    """
+    Converter which produces line delimited JSON (one compact JSON document per line).
+    """
+
+    def convert(self, items_list):
+        if not isinstance(items_list, list):
+            raise ValueError('Items to be converted should be a list.')
+        return ''.join([self.convert_item(item) for item in items_list])
+
+    def convert_item(self, item):
+        return json_encode(item, indent=None) + '\n'
@@ -28,6 +28,7 @@ from st2common.transport import consumers
 from st2common.transport import utils as transport_utils
 from st2common.util import isotime
 from st2exporter.exporter.dumper import Dumper
+from st2exporter.exporter.dumper import StreamingDumper
 from st2common.transport.queues import EXPORTER_WORK_QUEUE
 
 __all__ = [
@@ -45,12 +46,26 @@ class ExecutionsExporter(consumers.MessageHandler):
 
     def __init__(self, connection, queues):
         super(ExecutionsExporter, self).__init__(connection, queues)
-        self.pending_executions = queue.Queue()
-        self._dumper = Dumper(queue=self.pending_executions,
-                              export_dir=cfg.CONF.exporter.dump_dir)
+
+        if cfg.CONF.exporter.file_format == 'jsonl':
+            # Bounded queue blocks bootstrap and message consumption while the dumper catches up
+            self.pending_executions = queue.Queue(maxsize=cfg.CONF.exporter.queue_size)
+            self._dumper = StreamingDumper(queue=self.pending_executions,
+                                           export_dir=cfg.CONF.exporter.dump_dir,
+                                           compression=cfg.CONF.exporter.compression,
+                                           max_file_size=cfg.CONF.exporter.max_file_size,
+                                           max_file_age=cfg.CONF.exporter.max_file_age)
+        else:
+            self.pending_executions = queue.Queue()
+            self._dumper = Dumper(queue=self.pending_executions,
+                                  export_dir=cfg.CONF.exporter.dump_dir)
+
         self._consumer_thread = None
 
     def start(self, wait=False):
+        # Dumper is started first so bootstrapped executions are written while they are read
+        self._dumper.start()
+
         LOG.info('Bootstrapping executions from db...')
         try:
             self._bootstrap()
@@ -58,7 +73,6 @@ class ExecutionsExporter(consumers.MessageHandler):
             LOG.exception('Unable to bootstrap executions from db. Aborting.')
             raise
         self._consumer_thread = eventlet.spawn(super(ExecutionsExporter, self).start, wait=True)
-        self._dumper.start()
         if wait:
             self.wait()
 
@@ -75,26 +89,29 @@ class ExecutionsExporter(consumers.MessageHandler):
         if execution.status not in COMPLETION_STATUSES:
             return
         execution_api = ActionExecutionAPI.from_model(execution, mask_secrets=True)
-        self.pending_executions.put_nowait(execution_api)
+        self.pending_executions.put(execution_api)
         LOG.debug("Added execution to queue.")
 
     def _bootstrap(self):
         marker = self._get_export_marker_from_db()
         LOG.info('Using marker %s...' % marker)
         missed_executions = self._get_missed_executions_from_db(export_marker=marker)
-        LOG.info('Found %d executions not exported yet...', len(missed_executions))
 
-        for missed_execution in missed_executions:
+        # Executions are read using a database cursor and are not cached by the query set so
+        # they are never all kept in memory at once
+        count = 0
+        for missed_execution in missed_executions.no_cache():
             if missed_execution.status not in COMPLETION_STATUSES:
                 continue
             execution_api = ActionExecutionAPI.from_model(missed_execution, mask_secrets=True)
             try:
                 LOG.debug('Missed execution %s', execution_api)
-                self.pending_executions.put_nowait(execution_api)
+                self.pending_executions.put(execution_api)
             except:
                 LOG.exception('Failed adding execution to in-memory queue.')
                 continue
-        LOG.info('Bootstrapped executions...')
+            count += 1
+        LOG.info('Bootstrapped %d executions...', count)
 
     def _get_export_marker_from_db(self):
         try:
@@ -109,17 +126,14 @@ class ExecutionsExporter(consumers.MessageHandler):
                 return None
 
     def _get_missed_executions_from_db(self, export_marker=None):
-        if not export_marker:
-            return self._get_all_executions_from_db()
+        filters = {'status__in': COMPLETION_STATUSES}
 
-        # XXX: Should adapt this query to get only executions with status
-        # in COMPLETION_STATUSES.
-        filters = {'end_timestamp__gt': export_marker}
-        LOG.info('Querying for executions with filters: %s', filters)
-        return ActionExecution.query(**filters)
+        if export_marker:
+            filters['end_timestamp__gt'] = export_marker
 
-    def _get_all_executions_from_db(self):
-        return ActionExecution.get_all()  # XXX: Paginated call.
+        LOG.info('Querying for executions with filters: %s', filters)
+        executions = ActionExecution.query(order_by=['end_timestamp'], **filters)
+        return executions.batch_size(cfg.CONF.exporter.bootstrap_batch_size)
 
 
 def get_worker():
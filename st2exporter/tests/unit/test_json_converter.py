@@ -19,6 +19,7 @@ import unittest2
 
 from st2tests.fixturesloader import FixturesLoader
 from st2exporter.exporter.json_converter import JsonConverter
+from st2exporter.exporter.json_converter import JsonLinesConverter
 
 DESCENDANTS_PACK = 'descendants'
 
@@ -51,3 +52,12 @@ class TestJsonConverter(unittest2.TestCase):
             self.fail('Should have thrown exception.')
         except ValueError:
             pass
+
+    def test_convert_json_lines(self):
+        executions_list = list(self.loaded_fixtures['executions'].values())
+        converter = JsonLinesConverter()
+        converted_doc = converter.convert(executions_list)
+
+        lines = converted_doc.splitlines()
+        self.assertEqual(len(lines), len(executions_list))
+        self.assertListEqual(executions_list, [json.loads(line) for line in lines])
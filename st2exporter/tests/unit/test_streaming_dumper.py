@@ -0,0 +1,152 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+from six.moves import queue
+
+from st2common.models.api.execution import ActionExecutionAPI
+from st2common.util import isotime
+from st2exporter.exporter.dumper import StreamingDumper
+from st2tests.base import EventletTestCase
+from st2tests.fixturesloader import FixturesLoader
+
+DESCENDANTS_PACK = 'descendants'
+
+DESCENDANTS_FIXTURES = {
+    'executions': ['root_execution.yaml', 'child1_level1.yaml', 'child2_level1.yaml',
+                   'child1_level2.yaml', 'child2_level2.yaml', 'child3_level2.yaml',
+                   'child1_level3.yaml', 'child2_level3.yaml', 'child3_level3.yaml']
+}
+
+
+class TestStreamingDumper(EventletTestCase):
+
+    fixtures_loader = FixturesLoader()
+    loaded_fixtures = fixtures_loader.load_fixtures(fixtures_pack=DESCENDANTS_PACK,
+                                                    fixtures_dict=DESCENDANTS_FIXTURES)
+    loaded_executions = loaded_fixtures['executions']
+    execution_apis = []
+    for execution in loaded_executions.values():
+        execution_apis.append(ActionExecutionAPI(**execution))
+
+    def setUp(self):
+        super(TestStreamingDumper, self).setUp()
+        self.export_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.export_dir)
+        super(TestStreamingDumper, self).tearDown()
+
+    def get_queue(self):
+        executions_queue = queue.Queue()
+
+        for execution in self.execution_apis:
+            executions_queue.put(execution)
+        return executions_queue
+
+    def get_exported_files(self):
+        result = []
+
+        for root, _, file_names in os.walk(self.export_dir):
+            result.extend([os.path.join(root, file_name) for file_name in file_names])
+
+        return sorted(result)
+
+    def test_invalid_compression(self):
+        self.assertRaises(ValueError, StreamingDumper, queue=queue.Queue(),
+                          export_dir=self.export_dir, compression='invalid')
+
+    @mock.patch.object(StreamingDumper, '_write_marker_to_db', mock.MagicMock(return_value=True))
+    def test_write_and_rotate_gzip_file(self):
+        dumper = StreamingDumper(queue=self.get_queue(), export_dir=self.export_dir,
+                                 compression='gzip')
+
+        for execution in self.execution_apis:
+            dumper._write_item(execution)
+
+        # File is only visible under the final name once it's finished
+        self.assertEqual(len(self.get_exported_files()), 1)
+        self.assertTrue(os.path.basename(self.get_exported_files()[0]).endswith('.partial'))
+
+        new_marker = dumper._rotate()
+
+        timestamps = [isotime.parse(execution.end_timestamp) for execution in self.execution_apis]
+        self.assertEqual(new_marker, max(timestamps))
+        dumper._write_marker_to_db.assert_called_once_with(new_marker)
+
+        exported_files = self.get_exported_files()
+        self.assertEqual(len(exported_files), 1)
+        self.assertTrue(exported_files[0].endswith('.jsonl.gz'))
+
+        with gzip.open(exported_files[0], 'rb') as fp:
+            lines = fp.read().decode('utf-8').splitlines()
+
+        self.assertEqual(len(lines), len(self.execution_apis))
+        self.assertEqual([json.loads(line)['id'] for line in lines],
+                         [execution.id for execution in self.execution_apis])
+
+        # Nothing to rotate
+        self.assertEqual(dumper._rotate(), None)
+        self.assertEqual(dumper._write_marker_to_db.call_count, 1)
+
+    @mock.patch.object(StreamingDumper, '_write_marker_to_db', mock.MagicMock(return_value=True))
+    def test_rotate_on_file_size(self):
+        dumper = StreamingDumper(queue=self.get_queue(), export_dir=self.export_dir,
+                                 compression='none', max_file_size=1)
+
+        self.assertFalse(dumper._should_rotate())
+        dumper._process_item(self.execution_apis[0])
+        dumper._process_item(self.execution_apis[1])
+
+        exported_files = self.get_exported_files()
+        self.assertEqual(len(exported_files), 2)
+        self.assertTrue(exported_files[0].endswith('.jsonl'))
+        self.assertEqual(dumper._write_marker_to_db.call_count, 2)
+
+    @mock.patch.object(StreamingDumper, '_write_marker_to_db', mock.MagicMock(return_value=True))
+    def test_rotate_on_file_age(self):
+        dumper = StreamingDumper(queue=self.get_queue(), export_dir=self.export_dir,
+                                 compression='none', max_file_age=10)
+
+        dumper._process_item(self.execution_apis[0])
+        self.assertFalse(dumper._should_rotate())
+        self.assertTrue(dumper._get_wait_timeout() <= 1)
+
+        dumper._current_file.created_at -= 20
+        self.assertTrue(dumper._should_rotate())
+        self.assertEqual(dumper._get_wait_timeout(), 0)
+
+    @mock.patch.object(StreamingDumper, '_write_marker_to_db', mock.MagicMock(return_value=True))
+    def test_start_stop_dumper(self):
+        dumper = StreamingDumper(queue=self.get_queue(), export_dir=self.export_dir,
+                                 compression='gzip')
+        dumper.start()
+        dumper.stop()
+
+        # All the queued executions are written to a finished file on stop
+        exported_files = self.get_exported_files()
+        self.assertEqual(len(exported_files), 1)
+
+        with gzip.open(exported_files[0], 'rb') as fp:
+            lines = fp.read().decode('utf-8').splitlines()
+
+        self.assertEqual(len(lines), len(self.execution_apis))
+        self.assertEqual(dumper._write_marker_to_db.call_count, 1)
@@ -0,0 +1,296 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Partitioner which automatically distributes sensors across all the running sensor container
+nodes.
+
+Each sensor container joins a coordination service (tooz) group. Group members are placed on a
+consistent hash ring (with virtual nodes so the load is spread evenly) and each sensor is owned by
+the first member which follows the sensor reference hash on the ring. When a node joins or leaves
+the group only the sensors which map to that node move and the rest of the nodes keep running
+their sensors undisturbed.
+"""
+
+from __future__ import absolute_import
+
+import bisect
+import hashlib
+import struct
+
+import six
+import eventlet
+from tooz.coordination import GroupAlreadyExist
+from tooz.coordination import MemberAlreadyExist
+
+from st2common import log as logging
+from st2common.services import coordination
+from st2reactor.container.partitioners import DefaultPartitioner, get_all_enabled_sensors
+
+__all__ = [
+    'ConsistentHashRing',
+    'ConsistentHashPartitioner'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Name of the coordination group all the partitioned sensor containers join
+DEFAULT_GROUP_ID = 'sensorcontainer_partition'
+
+# Number of virtual nodes each member is represented with on the ring
+DEFAULT_REPLICAS = 64
+
+# How often (in seconds) to check for group membership changes
+DEFAULT_MEMBERSHIP_CHECK_INTERVAL = 5
+
+
+def _hash_key(key):
+    """
+    Hash the provided key into an unsigned 32 bit integer.
+
+    Only the first 4 bytes of a md5 digest are used which is all done in C and is
+    considerably faster than any per character Python level hashing.
+    """
+    if isinstance(key, six.text_type):
+        key = key.encode('utf-8')
+
+    return struct.unpack('>I', hashlib.md5(key).digest()[:4])[0]
+
+
+class ConsistentHashRing(object):
+    """
+    Consistent hash ring with virtual nodes.
+    """
+
+    def __init__(self, nodes=None, replicas=DEFAULT_REPLICAS):
+        """
+        :param nodes: Initial ring members.
+        :type nodes: ``list`` of ``str``
+
+        :param replicas: Number of virtual nodes per member.
+        :type replicas: ``int``
+        """
+        self._replicas = replicas
+
+        self._nodes = set([])
+        self._ring = {}  # maps point hash -> node
+        self._sorted_points = []
+
+        for node in nodes or []:
+            self.add_node(node)
+
+    @property
+    def nodes(self):
+        return frozenset(self._nodes)
+
+    def add_node(self, node):
+        if node in self._nodes:
+            return
+
+        self._nodes.add(node)
+
+        for index in range(0, self._replicas):
+            point = _hash_key('%s-%s' % (node, index))
+            self._ring[point] = node
+            bisect.insort(self._sorted_points, point)
+
+    def remove_node(self, node):
+        if node not in self._nodes:
+            return
+
+        self._nodes.remove(node)
+
+        for index in range(0, self._replicas):
+            point = _hash_key('%s-%s' % (node, index))
+
+            if self._ring.get(point, None) == node:
+                del self._ring[point]
+                self._sorted_points.remove(point)
+
+    def get_node(self, key):
+        """
+        Return the node which owns the provided key or None if the ring is empty.
+        """
+        if not self._sorted_points:
+            return None
+
+        point = _hash_key(key)
+        index = bisect.bisect(self._sorted_points, point)
+
+        if index == len(self._sorted_points):
+            index = 0
+
+        return self._ring[self._sorted_points[index]]
+
+
+class ConsistentHashPartitioner(DefaultPartitioner):
+    """
+    Partitioner which assigns sensors to the sensor container nodes which are members of the
+    same coordination group using a consistent hash ring.
+
+    Note: This partitioner requires a working coordination backend (cfg.CONF.coordination.url)
+    to be configured. Without it, each node will only know about itself and run all the sensors.
+    """
+
+    def __init__(self, sensor_node_name, group_id=DEFAULT_GROUP_ID, replicas=DEFAULT_REPLICAS,
+                 membership_check_interval=DEFAULT_MEMBERSHIP_CHECK_INTERVAL, coordinator=None):
+        super(ConsistentHashPartitioner, self).__init__(sensor_node_name=sensor_node_name)
+
+        # NOTE: Partition provider config values are passed in as strings
+        self._group_id = six.b(group_id) if isinstance(group_id, six.text_type) else group_id
+        self._replicas = int(replicas)
+        self._membership_check_interval = float(membership_check_interval)
+
+        self._coordinator = coordinator
+        self._member_id = coordination.get_member_id()
+
+        self._ring = ConsistentHashRing(replicas=self._replicas)
+        self._rebalance_handler = None
+        self._watcher_thread = None
+        self._stopped = True
+
+    @property
+    def members(self):
+        return self._ring.nodes
+
+    def is_sensor_owner(self, sensor_db):
+        return self._is_owned_by_this_node(sensor_db.get_reference().ref)
+
+    def get_sensors(self):
+        self._ensure_group_membership()
+
+        all_enabled_sensors = get_all_enabled_sensors()
+
+        partition_members = []
+
+        for sensor in all_enabled_sensors:
+            sensor_ref = sensor.get_reference()
+            if self._is_owned_by_this_node(sensor_ref.ref):
+                partition_members.append(sensor)
+
+        return partition_members
+
+    def start(self, rebalance_handler=None):
+        """
+        Start watching group membership for changes.
+
+        :param rebalance_handler: Function which is called without any arguments each time the
+                                  group membership changes and the ring has been rebuilt.
+        :type rebalance_handler: ``callable``
+        """
+        self._rebalance_handler = rebalance_handler
+        self._ensure_group_membership()
+
+        coordinator = self._get_coordinator()
+        coordinator.watch_join_group(self._group_id, self._on_membership_change)
+        coordinator.watch_leave_group(self._group_id, self._on_membership_change)
+
+        self._stopped = False
+        self._watcher_thread = eventlet.spawn(self._watch_membership)
+
+    def stop(self):
+        self._stopped = True
+
+        if self._watcher_thread:
+            self._watcher_thread.kill()
+            self._watcher_thread = None
+
+        coordinator = self._get_coordinator()
+
+        try:
+            coordinator.unwatch_join_group(self._group_id, self._on_membership_change)
+            coordinator.unwatch_leave_group(self._group_id, self._on_membership_change)
+            coordinator.leave_group(self._group_id).get()
+        except Exception:
+            LOG.exception('Failed to leave partition group "%s".', self._group_id)
+
+    def _is_owned_by_this_node(self, sensor_ref):
+        owner = self._ring.get_node(sensor_ref)
+
+        # No members known yet, fall back to running all the sensors locally
+        if owner is None:
+            return True
+
+        return owner == self._member_id
+
+    def _get_coordinator(self):
+        if not self._coordinator:
+            self._coordinator = coordination.get_coordinator(start_heart=True)
+
+        return self._coordinator
+
+    def _ensure_group_membership(self):
+        coordinator = self._get_coordinator()
+
+        try:
+            coordinator.create_group(self._group_id).get()
+        except GroupAlreadyExist:
+            pass
+
+        try:
+            capabilities = {'sensor_node_name': self.sensor_node_name}
+            coordinator.join_group(self._group_id, capabilities=capabilities).get()
+        except MemberAlreadyExist:
+            pass
+
+        self._refresh_ring()
+
+    def _watch_membership(self):
+        while not self._stopped:
+            try:
+                # Triggers join / leave callbacks on backends which support them
+                self._get_coordinator().run_watchers()
+
+                # Some backends (e.g. the no-op one) don't support watchers so we also compare
+                # the member list with the one which was used to build the ring
+                if self._refresh_ring():
+                    self._rebalance()
+            except Exception:
+                LOG.exception('Failed to refresh sensor partition group membership.')
+
+            eventlet.sleep(self._membership_check_interval)
+
+    def _on_membership_change(self, event):
+        LOG.info('Sensor partition group membership changed (%s).', event)
+
+        if self._refresh_ring():
+            self._rebalance()
+
+    def _refresh_ring(self):
+        """
+        Rebuild the ring if the group membership has changed.
+
+        :return: True if the ring has been updated, False otherwise.
+        :rtype: ``bool``
+        """
+        members = set(self._get_coordinator().get_members(self._group_id).get())
+        current_members = self._ring.nodes
+
+        if members == current_members:
+            return False
+
+        for member in current_members - members:
+            LOG.info('Sensor container "%s" left the partition group.', member)
+            self._ring.remove_node(member)
+
+        for member in members - current_members:
+            LOG.info('Sensor container "%s" joined the partition group.', member)
+            self._ring.add_node(member)
+
+        return True
+
+    def _rebalance(self):
+        if self._rebalance_handler:
+            self._rebalance_handler()
@@ -14,7 +14,6 @@
 # limitations under the License.
 
 from __future__ import absolute_import
-import ctypes
 import hashlib
 
 from st2reactor.container.partitioners import DefaultPartitioner, get_all_enabled_sensors
@@ -28,6 +27,9 @@ __all__ = [
 SUB_RANGE_SEPARATOR = '|'
 RANGE_BOUNDARY_SEPARATOR = '..'
 
+UINT32_MASK = 0xffffffff
+ZERO_ORDINAL = ord('0')
+
 
 class Range(object):
 
@@ -101,22 +103,18 @@ class HashPartitioner(DefaultPartitioner):
         return False
 
     def _hash_sensor_ref(self, sensor_ref):
-        # Hmm... maybe this should be done in C. If it becomes a performance
-        # bottleneck will look at that optimization.
-
         # From http://www.cs.hmc.edu/~geoff/classes/hmc.cs070.200101/homework10/hashfuncs.html
-        # The 'liberal' use of ctypes.c_unit is to guarantee unsigned integer and workaround
-        # inifinite precision.
+        # Plain integer arithmetic masked to 32 bits produces exactly the same values as the
+        # previous per-digit ctypes.c_uint implementation (so existing hash range
+        # configurations keep mapping to the same sensors) while avoiding the allocation of
+        # several ctypes objects per digit.
         md5_hash = hashlib.md5(sensor_ref.encode())
         md5_hash_int_repr = int(md5_hash.hexdigest(), 16)
-        h = ctypes.c_uint(0)
+        h = 0
         for d in reversed(str(md5_hash_int_repr)):
-            d = ctypes.c_uint(int(d))
-            higherorder = ctypes.c_uint(h.value & 0xf8000000)
-            h = ctypes.c_uint(h.value << 5)
-            h = ctypes.c_uint(h.value ^ (higherorder.value >> 27))
-            h = ctypes.c_uint(h.value ^ d.value)
-        return h.value
+            higherorder = h & 0xf8000000
+            h = ((h << 5) & UINT32_MASK) ^ (higherorder >> 27) ^ (ord(d) - ZERO_ORDINAL)
+        return h
 
     def _create_hash_ranges(self, hash_ranges_repr):
         """
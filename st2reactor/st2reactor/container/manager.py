@@ -18,10 +18,14 @@ import os
 import sys
 import signal
 
+import six
 import eventlet
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2reactor.container.process_container import ProcessSensorContainer
+from st2reactor.container.multi_process_container import MultiSensorProcessContainer
+from st2reactor.container.consistent_hash_partitioner import ConsistentHashPartitioner
 from st2common.services.sensor_watcher import SensorWatcher
 from st2common.models.system.common import ResourceReference
 
@@ -73,14 +77,27 @@ class SensorContainerManager(object):
         exit_code = 0
 
         try:
-            self._sensor_container = ProcessSensorContainer(
-                sensors=sensors,
-                single_sensor_mode=self._single_sensor_mode)
+            sensors_per_process = cfg.CONF.sensorcontainer.sensors_per_process
+
+            if sensors_per_process > 1 and not self._single_sensor_mode:
+                LOG.info('Running up to %s sensors from the same pack in a single process.',
+                         sensors_per_process)
+                self._sensor_container = MultiSensorProcessContainer(
+                    sensors=sensors,
+                    sensors_per_process=sensors_per_process)
+            else:
+                self._sensor_container = ProcessSensorContainer(
+                    sensors=sensors,
+                    single_sensor_mode=self._single_sensor_mode)
             self._container_thread = eventlet.spawn(self._sensor_container.run)
 
             LOG.debug('Starting sensor CUD watcher...')
             self._sensors_watcher.start()
 
+            if isinstance(self._sensors_partitioner, ConsistentHashPartitioner):
+                LOG.debug('Starting sensor partition group membership watcher...')
+                self._sensors_partitioner.start(rebalance_handler=self._handle_rebalance)
+
             exit_code = self._container_thread.wait()
             LOG.error('Process container quit with exit_code %d.', exit_code)
             LOG.error('(PID:%s) SensorContainer stopped.', os.getpid())
@@ -88,6 +105,9 @@ class SensorContainerManager(object):
             self._sensor_container.shutdown()
             self._sensors_watcher.stop()
 
+            if isinstance(self._sensors_partitioner, ConsistentHashPartitioner):
+                self._sensors_partitioner.stop()
+
             LOG.info('(PID:%s) SensorContainer stopped. Reason - %s', os.getpid(),
                      sys.exc_info()[0].__name__)
 
@@ -124,6 +144,34 @@ class SensorContainerManager(object):
 
         return sensor_obj
 
+    def _handle_rebalance(self):
+        """
+        Start and stop sensors so the ones running in this container match the current
+        partition (called when a sensor container node joins or leaves the partition group).
+        """
+        owned_sensors = {}
+        for sensor in self._sensors_partitioner.get_sensors():
+            owned_sensors[self._get_sensor_ref(sensor)] = sensor
+
+        # NOTE: This includes sensors which have died and are waiting to be respawned. Removing
+        # such sensor cancels the pending respawn and sensors which are still owned are not added
+        # again (they are started once the respawn delay passes) so a sensor never runs twice.
+        running_sensors = self._sensor_container.get_sensors()
+
+        for sensor_ref, sensor_obj in six.iteritems(running_sensors):
+            if sensor_ref not in owned_sensors:
+                LOG.info('Sensor %s moved to a different node. Unloading sensor.', sensor_ref)
+                self._sensor_container.remove_sensor(sensor=sensor_obj)
+
+        for sensor_ref, sensor in six.iteritems(owned_sensors):
+            if sensor_ref not in running_sensors:
+                LOG.info('Sensor %s moved to this node. Adding sensor.', sensor_ref)
+
+                try:
+                    self._sensor_container.add_sensor(sensor=self._to_sensor_object(sensor))
+                except Exception:
+                    LOG.exception('Failed to add sensor %s', sensor_ref)
+
     #################################################
     # Event handler methods for the sensor CUD events
     #################################################
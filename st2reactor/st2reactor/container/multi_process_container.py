@@ -0,0 +1,280 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import os
+import sys
+import json
+import subprocess
+
+from st2common import log as logging
+from st2reactor.container.process_container import ProcessSensorContainer
+
+__all__ = [
+    'MultiSensorProcessContainer'
+]
+
+LOG = logging.getLogger('st2reactor.multi_process_sensor_container')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WRAPPER_SCRIPT_NAME = 'multi_sensor_wrapper.py'
+WRAPPER_SCRIPT_PATH = os.path.join(BASE_DIR, WRAPPER_SCRIPT_NAME)
+
+
+class MultiSensorProcessContainer(ProcessSensorContainer):
+    """
+    Sensor container which packs multiple sensors from the same pack into a single host process.
+
+    Process supervision (respawns, exit triggers, resource usage tracking) works on the host
+    process level. Failures of an individual sensor are handled inside the host process.
+
+    Sensors are added to and removed from a running host process in place (using a control
+    channel on the host process stdin) so other sensors running in the same process are not
+    affected.
+    """
+
+    def __init__(self, sensors, sensors_per_process, poll_interval=5, single_sensor_mode=False,
+                 dispatcher=None):
+        """
+        :param sensors_per_process: Maximum number of sensors to run inside a single process.
+        :type sensors_per_process: ``int``
+        """
+        super(MultiSensorProcessContainer, self).__init__(sensors=None,
+                                                          poll_interval=poll_interval,
+                                                          single_sensor_mode=single_sensor_mode,
+                                                          dispatcher=dispatcher)
+        self._sensors_per_process = sensors_per_process
+
+        # NOTE: Unlike self._sensors, hosts stay registered while the host process is being
+        # respawned so sensors which are added or removed in the mean time are applied to the
+        # respawned process
+        self._hosts = {}  # maps host_id -> host object
+        self._hosted_sensors = {}  # maps sensor_id -> sensor object
+        self._sensor_hosts = {}  # maps sensor_id -> host_id
+        self._host_cmds = {}  # maps host_id -> command used to start the host process
+
+        for sensor_obj in sensors or []:
+            host, _ = self._assign_sensor_to_host(sensor=sensor_obj)
+            self._sensors[host['ref']] = host
+
+    def get_sensors(self):
+        return dict(self._hosted_sensors)
+
+    def add_sensor(self, sensor):
+        sensor_id = self._get_sensor_id(sensor=sensor)
+
+        if sensor_id in self._hosted_sensors:
+            LOG.warning('Sensor %s already exists and running.', sensor_id)
+            return False
+
+        host, created = self._assign_sensor_to_host(sensor=sensor)
+        host_id = host['ref']
+
+        if created:
+            try:
+                self._spawn_sensor_process(sensor=host)
+            except Exception:
+                self._remove_host(host_id=host_id)
+                raise
+        elif host_id in self._processes:
+            command = {'action': 'add', 'sensor': self._get_hosted_sensor_args(sensor=sensor)}
+            if self._send_host_command(host_id=host_id, command=command):
+                self._dispatch_trigger_for_hosted_sensor_spawn(host_id=host_id, sensor=sensor)
+        else:
+            LOG.debug('Host %s is being respawned, sensor %s will be started with it.',
+                      host_id, sensor_id)
+
+        LOG.debug('Sensor %s started in host %s.', sensor_id, host_id)
+        return True
+
+    def remove_sensor(self, sensor):
+        sensor_id = self._get_sensor_id(sensor=sensor)
+
+        if sensor_id not in self._hosted_sensors:
+            LOG.warning('Sensor %s isn\'t running in this container.', sensor_id)
+            return False
+
+        host_id = self._sensor_hosts.pop(sensor_id)
+        del self._hosted_sensors[sensor_id]
+
+        host = self._hosts.get(host_id, None)
+
+        if host:
+            # NOTE: Host object is updated in place so a pending respawn uses the new list
+            host['sensors'] = [item for item in host['sensors'] if item['ref'] != sensor_id]
+
+            if not host['sensors']:
+                self._remove_host(host_id=host_id)
+            elif host_id in self._processes:
+                self._send_host_command(host_id=host_id,
+                                        command={'action': 'remove', 'ref': sensor_id})
+
+        LOG.debug('Sensor %s stopped.', sensor_id)
+        return True
+
+    def _assign_sensor_to_host(self, sensor):
+        """
+        Assign sensor to a host process for the sensor pack which still has room for it or to a
+        new host process if there is none.
+
+        :return: Tuple of (host the sensor has been assigned to, True if host has been created).
+        :rtype: ``tuple``
+        """
+        sensor_id = self._get_sensor_id(sensor=sensor)
+        pack = sensor['pack']
+
+        host = None
+        created = False
+        index = 0
+
+        while True:
+            host_id = '%s.sensor_host_%s' % (pack, index)
+            host = self._hosts.get(host_id, None)
+
+            if not host:
+                host = {
+                    'ref': host_id,
+                    'pack': pack,
+                    'class_name': host_id,
+                    'file_path': WRAPPER_SCRIPT_PATH,
+                    'sensors': []
+                }
+                self._hosts[host_id] = host
+                created = True
+                break
+
+            if len(host['sensors']) < self._sensors_per_process:
+                break
+
+            index += 1
+
+        host['sensors'].append(sensor)
+        self._hosted_sensors[sensor_id] = sensor
+        self._sensor_hosts[sensor_id] = host['ref']
+
+        return host, created
+
+    def _remove_host(self, host_id):
+        """
+        Remove host and all the sensors assigned to it and stop the host process.
+        """
+        host = self._hosts.pop(host_id, None)
+
+        for sensor in (host or {}).get('sensors', []):
+            sensor_id = self._get_sensor_id(sensor=sensor)
+            self._hosted_sensors.pop(sensor_id, None)
+            self._sensor_hosts.pop(sensor_id, None)
+
+        self._host_cmds.pop(host_id, None)
+
+        if host_id in self._processes:
+            self._stop_sensor_process(sensor_id=host_id)
+        else:
+            self._sensors.pop(host_id, None)
+
+    def _send_host_command(self, host_id, command):
+        """
+        Send a command to the host process control channel.
+
+        :rtype: ``bool``
+        """
+        process = self._processes[host_id]
+
+        try:
+            process.stdin.write((json.dumps(command) + '\n').encode('utf-8'))
+            process.stdin.flush()
+        except (IOError, OSError, ValueError) as e:
+            # Host process has exited. Host object is already up to date so the change will be
+            # picked up when the host process is respawned
+            LOG.warning('Failed to send command to host %s: %s', host_id, e)
+            return False
+
+        return True
+
+    def _spawn_sensor_process(self, sensor):
+        host_id = self._get_sensor_id(sensor=sensor)
+
+        if self._hosts.get(host_id, None) is not sensor:
+            # Host has been removed while waiting to be respawned
+            LOG.debug('Host %s has been removed, not spawning a process for it.', host_id)
+            return None
+
+        return super(MultiSensorProcessContainer, self)._spawn_sensor_process(sensor=sensor)
+
+    def _respawn_sensor(self, sensor_id, sensor, exit_code):
+        super(MultiSensorProcessContainer, self)._respawn_sensor(sensor_id=sensor_id,
+                                                                 sensor=sensor,
+                                                                 exit_code=exit_code)
+
+        if sensor_id not in self._processes and self._hosts.get(sensor_id, None) is sensor:
+            # Host process hasn't been respawned (e.g. it has already been respawned max times)
+            # so the sensors assigned to it are not running anymore
+            self._remove_host(host_id=sensor_id)
+
+    def _get_sensor_process_stdin(self):
+        # Used as a control channel for adding and removing sensors
+        return subprocess.PIPE
+
+    def _get_metrics_sensor_ids(self, sensor_id):
+        # NOTE: Resource usage is that of the whole host process which is shared by all the
+        # sensors running inside it
+        host = self._hosts.get(sensor_id, None)
+
+        if not host:
+            return [sensor_id]
+
+        return [self._get_sensor_id(sensor=item) for item in host['sensors']]
+
+    def _get_hosted_sensor_args(self, sensor):
+        return {
+            'ref': sensor['ref'],
+            'file_path': sensor['file_path'],
+            'class_name': sensor['class_name'],
+            'trigger_types': sensor['trigger_types'] or [],
+            'poll_interval': sensor['poll_interval']
+        }
+
+    def _get_sensor_process_args(self, sensor, python_path):
+        sensors = [self._get_hosted_sensor_args(sensor=item) for item in sensor['sensors']]
+
+        args = [
+            python_path,
+            WRAPPER_SCRIPT_PATH,
+            '--pack=%s' % (sensor['pack']),
+            '--sensors=%s' % (json.dumps(sensors)),
+            '--parent-args=%s' % (json.dumps(sys.argv[1:]))
+        ]
+
+        return args
+
+    def _dispatch_trigger_for_sensor_spawn(self, sensor, process, cmd):
+        # NOTE: To stay compatible with the existing rules, trigger is dispatched for each of the
+        # sensors running inside the host process
+        self._host_cmds[sensor['ref']] = cmd
+
+        for item in sensor.get('sensors', []):
+            super(MultiSensorProcessContainer, self)._dispatch_trigger_for_sensor_spawn(
+                sensor=item, process=process, cmd=cmd)
+
+    def _dispatch_trigger_for_hosted_sensor_spawn(self, host_id, sensor):
+        super(MultiSensorProcessContainer, self)._dispatch_trigger_for_sensor_spawn(
+            sensor=sensor, process=self._processes[host_id],
+            cmd=self._host_cmds.get(host_id, ''))
+
+    def _dispatch_trigger_for_sensor_exit(self, sensor, exit_code):
+        for item in sensor.get('sensors', []):
+            super(MultiSensorProcessContainer, self)._dispatch_trigger_for_sensor_exit(
+                sensor=item, exit_code=exit_code)
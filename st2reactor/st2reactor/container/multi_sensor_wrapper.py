@@ -0,0 +1,435 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Wrapper script which runs multiple sensors from the same pack (and as such, the same pack
+virtual environment) inside a single host process.
+
+Each sensor runs in a separate green thread and uses its own logger. All the sensors share a
+single DB connection, trigger watcher and trigger dispatcher. If a sensor fails, only that sensor
+is restarted, the other sensors in the same process keep running.
+
+Sensors can be added to and removed from a running process by writing JSON commands (one per
+line) to the process stdin:
+
+    {"action": "add", "sensor": {"ref": ..., "file_path": ..., "class_name": ..., ...}}
+    {"action": "remove", "ref": ...}
+"""
+
+from __future__ import absolute_import
+
+import os
+import sys
+import time
+import json
+import atexit
+import random
+import argparse
+
+import six
+import eventlet
+from eventlet import event
+from eventlet import greenio
+
+from st2common import log as logging
+from st2common.persistence.trigger import Trigger
+from st2common.services.triggerwatcher import TriggerWatcher
+from st2common.services.trigger_dispatcher import TriggerDispatcherService
+from st2common.util.system_info import get_process_resource_usage
+from st2reactor.container.sensor_wrapper import SensorService
+from st2reactor.container.sensor_wrapper import SensorWrapper
+from st2reactor.container.sensor_wrapper import setup_sensor_process
+
+__all__ = [
+    'HostedSensor',
+    'MultiSensorWrapper'
+]
+
+# How many times to try to subsequently restart a failed sensor before giving up
+SENSOR_MAX_RESTART_COUNTS = 6
+
+# How many seconds a sensor needs to be running before the restart counter is reset
+SENSOR_SUCCESSFUL_START_THRESHOLD = 10
+
+# Base and maximum delay (in seconds) used for the exponential restart backoff
+SENSOR_RESTART_DELAY = 2.5
+SENSOR_RESTART_MAX_DELAY = 60
+
+# How long to wait after starting all the sensors before reporting memory usage
+MEMORY_USAGE_REPORT_DELAY = 10
+
+
+class HostedSensor(SensorWrapper):
+    """
+    A single sensor running inside a multi sensor host process.
+
+    Unlike SensorWrapper, this class doesn't perform any process wide set up (config, DB
+    connection, logging, trigger watcher), that's handled once by the MultiSensorWrapper.
+    """
+
+    def __init__(self, pack, file_path, class_name, trigger_types, poll_interval=None,
+                 trigger_dispatcher_service=None, ref=None):
+        self._pack = pack
+        self._ref = ref or '%s.%s' % (pack, class_name)
+        self._file_path = file_path
+        self._class_name = class_name
+        self._trigger_types = trigger_types or []
+        self._poll_interval = poll_interval
+        self._trigger_names = {}
+        self._trigger_dispatcher_service = trigger_dispatcher_service
+
+        self._logger = logging.getLogger('SensorWrapper.%s.%s' %
+                                         (self._pack, self._class_name))
+
+        # NOTE: Sensor class is instantiated lazily inside the sensor green thread so a sensor
+        # which fails to load doesn't affect other sensors in the same process
+        self._sensor_instance = None
+
+    def run(self):
+        self._sensor_instance = self._get_sensor_instance()
+
+        # Replay triggers which have been loaded before the sensor instance was created
+        for trigger in list(self._trigger_names.values()):
+            self._sensor_instance.add_trigger(trigger=self._sanitize_trigger(trigger=trigger))
+
+        self._logger.info('Running sensor initialization code')
+        self._sensor_instance.setup()
+
+        if self._poll_interval:
+            message = ('Running sensor in active mode (poll interval=%ss)' %
+                       (self._poll_interval))
+        else:
+            message = 'Running sensor in passive mode'
+
+        self._logger.info(message)
+
+        try:
+            self._sensor_instance.run()
+        except Exception as e:
+            msg = ('Sensor "%s" run method raised an exception: %s.' %
+                   (self._class_name, six.text_type(e)))
+            self._logger.warn(msg, exc_info=True)
+            raise Exception(msg)
+
+    def stop(self):
+        if not self._sensor_instance:
+            return
+
+        self._logger.info('Invoking cleanup on sensor')
+
+        try:
+            self._sensor_instance.cleanup()
+        except Exception:
+            self._logger.exception('Sensor cleanup failed')
+
+        self._sensor_instance = None
+
+    def _handle_create_trigger(self, trigger):
+        if not self._sensor_instance:
+            self._trigger_names[str(trigger.id)] = trigger
+            return
+
+        super(HostedSensor, self)._handle_create_trigger(trigger=trigger)
+
+    def _handle_update_trigger(self, trigger):
+        if not self._sensor_instance:
+            self._trigger_names[str(trigger.id)] = trigger
+            return
+
+        super(HostedSensor, self)._handle_update_trigger(trigger=trigger)
+
+    def _handle_delete_trigger(self, trigger):
+        if not self._sensor_instance:
+            self._trigger_names.pop(str(trigger.id), None)
+            return
+
+        super(HostedSensor, self)._handle_delete_trigger(trigger=trigger)
+
+    def _get_sensor_service(self):
+        return SensorService(sensor_wrapper=self,
+                             trigger_dispatcher_service=self._trigger_dispatcher_service)
+
+
+class MultiSensorWrapper(object):
+    def __init__(self, pack, sensors, parent_args=None):
+        """
+        :param pack: Name of the pack all the sensors belong to.
+        :type pack: ``str``
+
+        :param sensors: A list of sensor dicts with "file_path", "class_name", "trigger_types"
+                        and "poll_interval" keys.
+        :type sensors: ``list`` of ``dict``
+
+        :param parent_args: Command line arguments passed to the parent process.
+        :type parse_args: ``list``
+        """
+        self._pack = pack
+        self._parent_args = parent_args or []
+
+        # 1. Parse the config, establish DB connection and set up logging
+        setup_sensor_process(parent_args=self._parent_args)
+
+        self._logger = logging.getLogger('MultiSensorWrapper.%s' % (self._pack))
+
+        # 2. Instantiate hosted sensors which all share a single trigger dispatcher
+        self._trigger_dispatcher_service = TriggerDispatcherService(logger=self._logger)
+
+        self._sensors = []
+        self._trigger_types = []
+
+        for sensor in sensors:
+            self._sensors.append(self._create_hosted_sensor(sensor=sensor))
+
+        # 3. Instantiate a single watcher for the triggers of all the hosted sensors. The list of
+        # trigger types is shared with the watcher so it can be extended when a sensor is added.
+        self._trigger_watcher = TriggerWatcher(create_handler=self._handle_create_trigger,
+                                               update_handler=self._handle_update_trigger,
+                                               delete_handler=self._handle_delete_trigger,
+                                               trigger_types=self._trigger_types,
+                                               queue_suffix='multisensorwrapper_%s' %
+                                               (self._pack),
+                                               exclusive=True)
+
+        self._threads = {}  # maps sensor ref -> green thread running the sensor
+        self._stopped = False
+        self._done = event.Event()
+
+    def run(self):
+        atexit.register(self.stop)
+
+        self._trigger_watcher.start()
+        self._logger.info('Watcher started')
+
+        for sensor in self._sensors:
+            self._threads[sensor._ref] = eventlet.spawn(self._run_sensor, sensor)
+
+        eventlet.spawn_n(self._read_commands)
+        eventlet.spawn_after(MEMORY_USAGE_REPORT_DELAY, self._report_memory_usage)
+
+        # Wait until all the sensors have finished or the process is stopped
+        if self._threads:
+            self._done.wait()
+
+    def stop(self):
+        self._stopped = True
+
+        self._logger.info('Stopping trigger watcher')
+        self._trigger_watcher.stop()
+
+        for thread in list(self._threads.values()):
+            thread.kill()
+
+        for sensor in self._sensors:
+            sensor.stop()
+
+    def add_sensor(self, sensor):
+        """
+        Start a new sensor inside this process.
+
+        :param sensor: Sensor dict with "ref", "file_path", "class_name", "trigger_types" and
+                       "poll_interval" keys.
+        :type sensor: ``dict``
+        """
+        if any(item._ref == sensor['ref'] for item in self._sensors):
+            self._logger.warning('Sensor %s is already running.', sensor['ref'])
+            return False
+
+        hosted_sensor = self._create_hosted_sensor(sensor=sensor)
+        self._sensors.append(hosted_sensor)
+
+        # Trigger watcher only delivers existing triggers on start so they need to be loaded for
+        # the new sensor
+        for trigger_type in hosted_sensor._trigger_types:
+            for trigger in Trigger.query(type=trigger_type):
+                hosted_sensor._handle_create_trigger(trigger=trigger)
+
+        self._threads[hosted_sensor._ref] = eventlet.spawn(self._run_sensor, hosted_sensor)
+        self._logger.info('Sensor %s added.', hosted_sensor._ref)
+        return True
+
+    def remove_sensor(self, ref):
+        """
+        Stop a sensor running inside this process.
+        """
+        hosted_sensor = None
+
+        for item in self._sensors:
+            if item._ref == ref:
+                hosted_sensor = item
+                break
+
+        if not hosted_sensor:
+            self._logger.warning('Sensor %s isn\'t running.', ref)
+            return False
+
+        self._sensors.remove(hosted_sensor)
+
+        thread = self._threads.pop(ref, None)
+        if thread:
+            thread.kill()
+
+        hosted_sensor.stop()
+        self._logger.info('Sensor %s removed.', ref)
+        return True
+
+    def _create_hosted_sensor(self, sensor):
+        hosted_sensor = HostedSensor(
+            pack=self._pack,
+            file_path=sensor['file_path'],
+            class_name=sensor['class_name'],
+            trigger_types=sensor.get('trigger_types', None),
+            poll_interval=sensor.get('poll_interval', None),
+            trigger_dispatcher_service=self._trigger_dispatcher_service,
+            ref=sensor.get('ref', None))
+
+        for trigger_type in hosted_sensor._trigger_types:
+            if trigger_type not in self._trigger_types:
+                self._trigger_types.append(trigger_type)
+
+        return hosted_sensor
+
+    def _read_commands(self):
+        """
+        Read and handle commands sent by the sensor container on the control channel (stdin).
+        """
+        stdin = greenio.GreenPipe(sys.stdin.fileno(), 'r')
+
+        while not self._stopped:
+            line = stdin.readline()
+
+            if not line:
+                # Parent process has closed the control channel
+                break
+
+            try:
+                command = json.loads(line)
+            except ValueError:
+                self._logger.warning('Ignoring invalid command: %s', line)
+                continue
+
+            try:
+                self._handle_command(command=command)
+            except Exception:
+                self._logger.exception('Failed to handle command: %s', line)
+
+    def _handle_command(self, command):
+        action = command.get('action', None)
+
+        if action == 'add':
+            self.add_sensor(sensor=command['sensor'])
+        elif action == 'remove':
+            self.remove_sensor(ref=command['ref'])
+        else:
+            self._logger.warning('Ignoring unknown command: %s', action)
+
+    def _run_sensor(self, sensor):
+        """
+        Run a single hosted sensor and restart it (with exponential backoff) if it fails.
+        """
+        try:
+            self._run_sensor_with_restarts(sensor=sensor)
+        finally:
+            if self._threads.get(sensor._ref, None) is eventlet.getcurrent():
+                del self._threads[sensor._ref]
+
+            if not self._threads and not self._done.ready():
+                self._done.send()
+
+    def _run_sensor_with_restarts(self, sensor):
+        restart_count = 0
+
+        while not self._stopped:
+            start_time = time.time()
+
+            try:
+                sensor.run()
+                return
+            except Exception:
+                self._logger.exception('Sensor %s failed.', sensor._class_name)
+            finally:
+                sensor.stop()
+
+            if (time.time() - start_time) >= SENSOR_SUCCESSFUL_START_THRESHOLD:
+                restart_count = 0
+
+            if restart_count >= SENSOR_MAX_RESTART_COUNTS:
+                self._logger.error('Sensor %s has already been restarted max times, giving up.',
+                                   sensor._class_name)
+                return
+
+            restart_count += 1
+
+            delay = min(SENSOR_RESTART_MAX_DELAY,
+                        SENSOR_RESTART_DELAY * (2 ** (restart_count - 1)))
+            delay = (delay / 2.0) + random.uniform(0, delay / 2.0)
+
+            self._logger.info('Restarting sensor %s in %.2f seconds.', sensor._class_name, delay)
+            eventlet.sleep(delay)
+
+    def _report_memory_usage(self):
+        usage = get_process_resource_usage(pid=os.getpid())
+
+        if not usage or not self._sensors:
+            return
+
+        rss_mb = float(usage['rss']) / (1024 * 1024)
+        self._logger.info('Sensor host process uses %.2f MB of memory for %s sensors (%.2f MB per '
+                          'sensor).', rss_mb, len(self._sensors), rss_mb / len(self._sensors))
+
+    ##############################################
+    # Event handler methods for the trigger events
+    ##############################################
+
+    def _handle_create_trigger(self, trigger):
+        self._dispatch_trigger_event(trigger=trigger, handler_name='_handle_create_trigger')
+
+    def _handle_update_trigger(self, trigger):
+        self._dispatch_trigger_event(trigger=trigger, handler_name='_handle_update_trigger')
+
+    def _handle_delete_trigger(self, trigger):
+        self._dispatch_trigger_event(trigger=trigger, handler_name='_handle_delete_trigger')
+
+    def _dispatch_trigger_event(self, trigger, handler_name):
+        for sensor in self._sensors:
+            if trigger.type not in sensor._trigger_types:
+                continue
+
+            # Failure in one sensor shouldn't affect other sensors
+            try:
+                getattr(sensor, handler_name)(trigger=trigger)
+            except Exception:
+                self._logger.exception('Sensor %s failed to handle trigger event.',
+                                       sensor._class_name)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Multi sensor runner wrapper')
+    parser.add_argument('--pack', required=True,
+                        help='Name of the pack all the sensors belong to')
+    parser.add_argument('--sensors', required=True,
+                        help='JSON serialized list of sensors to run')
+    parser.add_argument('--parent-args', required=False,
+                        help='Command line arguments passed to the parent process')
+    args = parser.parse_args()
+
+    sensors = json.loads(args.sensors)
+    assert isinstance(sensors, list)
+    parent_args = json.loads(args.parent_args) if args.parent_args else []
+    assert isinstance(parent_args, list)
+
+    obj = MultiSensorWrapper(pack=args.pack,
+                             sensors=sensors,
+                             parent_args=parent_args)
+    obj.run()
@@ -18,12 +18,18 @@ import os
 import sys
 import time
 import json
+import errno
+import fcntl
+import random
+import signal
 import subprocess
 
 from collections import defaultdict
 
 import six
 import eventlet
+from eventlet import hubs
+from eventlet import patcher
 from eventlet.support import greenlets as greenlet
 from oslo_config import cfg
 
@@ -35,6 +41,7 @@ from st2common.constants.system import AUTH_TOKEN_ENV_VARIABLE_NAME
 from st2common.constants.triggers import (SENSOR_SPAWN_TRIGGER, SENSOR_EXIT_TRIGGER)
 from st2common.constants.exit_codes import SUCCESS_EXIT_CODE
 from st2common.constants.exit_codes import FAILURE_EXIT_CODE
+from st2common.metrics.base import get_driver
 from st2common.models.system.common import ResourceReference
 from st2common.services.access import create_token
 from st2common.transport.reactor import TriggerDispatcher
@@ -45,6 +52,7 @@ from st2common.util.sandboxing import get_sandbox_python_path
 from st2common.util.sandboxing import get_sandbox_python_binary_path
 from st2common.util.sandboxing import get_sandbox_virtualenv_path
 from st2common.util.sandboxing import is_pack_virtualenv_using_python3
+from st2common.util.system_info import get_process_resource_usage
 
 __all__ = [
     'ProcessSensorContainer'
@@ -56,20 +64,28 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 WRAPPER_SCRIPT_NAME = 'sensor_wrapper.py'
 WRAPPER_SCRIPT_PATH = os.path.join(BASE_DIR, WRAPPER_SCRIPT_NAME)
 
-# How many times to try to subsequently respawn a sensor after a non-zero exit before giving up
-SENSOR_MAX_RESPAWN_COUNTS = 2
+# How many times to try to subsequently respawn a sensor after a non-zero exit before giving up.
+# With the exponential backoff below, the last attempts are made about a minute apart.
+SENSOR_MAX_RESPAWN_COUNTS = 6
 
 # How many seconds after the sensor has been started we should wait before considering sensor as
 # being started and running successfully
 SENSOR_SUCCESSFUL_START_THRESHOLD = 10
 
-# How long to wait (in seconds) before respawning a dead process
+# How long to wait (in seconds) before respawning a dead process. The delay is doubled on each
+# subsequent respawn (up to SENSOR_RESPAWN_MAX_DELAY) and randomized to avoid respawning many
+# sensors which died at the same time in lockstep
 SENSOR_RESPAWN_DELAY = 2.5
+SENSOR_RESPAWN_MAX_DELAY = 60
 
 # How long to wait for process to exit after sending SIGTERM signal. If the process doesn't
 # exit in this amount of seconds, SIGKILL signal will be sent to the process.
 PROCESS_EXIT_TIMEOUT = 5
 
+# Non green version of the os module. Used to read and write to the SIGCHLD self-pipe from the
+# signal handler where we can't yield to the hub.
+original_os = patcher.original('os')
+
 # TODO: Allow multiple instances of the same sensor with different configuration
 # options - we need to update sensors for that and add "get_id" or similar
 # method to the sensor class
@@ -85,7 +101,9 @@ class ProcessSensorContainer(object):
         :param sensors: A list of sensor dicts.
         :type sensors: ``list`` of ``dict``
 
-        :param poll_interval: How long to sleep between each poll for running / dead sensors.
+        :param poll_interval: Maximum amount of time to wait between each poll for dead sensors.
+                              Sensor process exits are detected immediately via SIGCHLD and
+                              this is only used as a fallback.
         :type poll_interval: ``float``
         """
         self._poll_interval = poll_interval
@@ -114,6 +132,11 @@ class ProcessSensorContainer(object):
         # Stores information needed for respawning dead sensors
         self._sensor_start_times = {}  # maps sensor_id -> sensor start time
         self._sensor_respawn_counts = defaultdict(int)  # maps sensor_id -> number of respawns
+        self._sensor_cpu_times = {}  # maps sensor_id -> (timestamp, cpu time) of the last check
+
+        # Sensors which have died and are waiting to be respawned. Removing a sensor from this
+        # dict (e.g. when the sensor is removed or moved to a different node) cancels the respawn.
+        self._pending_respawns = {}  # maps sensor_id -> sensor object
 
         # A list of all the instance variables which hold internal state information about a
         # particular_sensor
@@ -123,12 +146,26 @@ class ProcessSensorContainer(object):
             self._processes,
             self._sensors,
             self._sensor_start_times,
+            self._sensor_cpu_times
         ]
 
         self._enable_common_pack_libs = cfg.CONF.packs.enable_common_libs or False
 
+        # Self-pipe which is written to by the SIGCHLD handler to wake up the main loop as soon as
+        # any of the sensor processes exits
+        self._sigchld_read_fd = None
+        self._sigchld_write_fd = None
+
+        # Stores information needed for tracking resource usage of the sensor processes
+        self._resource_usage_check_interval = \
+            cfg.CONF.sensorcontainer.resource_usage_check_interval
+        self._max_sensor_memory_usage = cfg.CONF.sensorcontainer.max_sensor_memory_usage
+        self._max_sensor_cpu_usage = cfg.CONF.sensorcontainer.max_sensor_cpu_usage
+        self._last_resource_usage_check_time = time.time()
+
     def run(self):
         self._run_all_sensors()
+        self._setup_sigchld_handler()
 
         try:
             while not self._stopped:
@@ -141,7 +178,15 @@ class ProcessSensorContainer(object):
                 else:
                     LOG.debug('No active sensors')
 
-                eventlet.sleep(self._poll_interval)
+                if self._resource_usage_check_interval > 0:
+                    now = time.time()
+                    delta = now - self._last_resource_usage_check_time
+
+                    if delta >= self._resource_usage_check_interval:
+                        self._last_resource_usage_check_time = now
+                        self._check_sensors_resource_usage()
+
+                self._wait_for_sensor_exit(timeout=self._poll_interval)
         except greenlet.GreenletExit:
             # This exception is thrown when sensor container manager
             # kills the thread which runs process container. Not sure
@@ -152,6 +197,8 @@ class ProcessSensorContainer(object):
             LOG.exception('Container failed to run sensors.')
             self._stopped = True
             return FAILURE_EXIT_CODE
+        finally:
+            self._teardown_sigchld_handler()
 
         self._stopped = True
         LOG.error('Process container stopped.')
@@ -166,7 +213,12 @@ class ProcessSensorContainer(object):
         for sensor_id in sensor_ids:
             now = int(time.time())
 
-            process = self._processes[sensor_id]
+            process = self._processes.get(sensor_id, None)
+
+            if not process:
+                # Sensor has been removed or is being respawned in the mean time
+                continue
+
             status = process.poll()
 
             if status is not None:
@@ -181,6 +233,7 @@ class ProcessSensorContainer(object):
 
                 # Try to respawn a dead process (maybe it was a simple failure which can be
                 # resolved with a restart)
+                self._pending_respawns[sensor_id] = sensor
                 eventlet.spawn_n(self._respawn_sensor, sensor_id=sensor_id, sensor=sensor,
                                  exit_code=status)
             else:
@@ -194,15 +247,160 @@ class ProcessSensorContainer(object):
                     # respawn counter so we can try to restart the sensor if it dies later on
                     self._sensor_respawn_counts[sensor_id] = 0
 
+    def _setup_sigchld_handler(self):
+        """
+        Register SIGCHLD handler which wakes up the main loop as soon as a sensor process exits.
+
+        If the handler can't be registered (e.g. we are not running in the main thread), we fall
+        back to polling sensor processes every poll_interval seconds.
+        """
+        read_fd, write_fd = os.pipe()
+
+        for fd in [read_fd, write_fd]:
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+        def sigchld_handler(signum=None, frame=None):
+            try:
+                original_os.write(write_fd, b'x')
+            except OSError:
+                # Pipe is full which means wake up is already pending
+                pass
+
+        try:
+            signal.signal(signal.SIGCHLD, sigchld_handler)
+        except ValueError:
+            LOG.warning('Unable to register SIGCHLD handler, falling back to polling sensor '
+                        'processes every %s seconds.', self._poll_interval)
+            os.close(read_fd)
+            os.close(write_fd)
+            return
+
+        self._sigchld_read_fd = read_fd
+        self._sigchld_write_fd = write_fd
+
+    def _teardown_sigchld_handler(self):
+        if self._sigchld_read_fd is None:
+            return
+
+        try:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        except ValueError:
+            pass
+
+        os.close(self._sigchld_read_fd)
+        os.close(self._sigchld_write_fd)
+
+        self._sigchld_read_fd = None
+        self._sigchld_write_fd = None
+
+    def _wait_for_sensor_exit(self, timeout):
+        """
+        Block (without blocking other green threads) until a child process exits or until
+        timeout is reached.
+        """
+        if self._sigchld_read_fd is None:
+            eventlet.sleep(timeout)
+            return
+
+        try:
+            hubs.trampoline(self._sigchld_read_fd, read=True, timeout=timeout)
+        except eventlet.Timeout:
+            return
+
+        # Drain the pipe - multiple exits are handled by a single poll
+        try:
+            while original_os.read(self._sigchld_read_fd, 1024):
+                pass
+        except OSError as e:
+            if e.errno not in [errno.EAGAIN, errno.EWOULDBLOCK]:
+                raise
+
+    def _wake_up(self):
+        if self._sigchld_write_fd is None:
+            return
+
+        try:
+            original_os.write(self._sigchld_write_fd, b'x')
+        except OSError:
+            pass
+
+    def _check_sensors_resource_usage(self):
+        """
+        Collect CPU and memory usage for all the running sensor processes, report it as metrics
+        and restart processes which exceed the configured limits.
+        """
+        metrics_driver = get_driver()
+        now = time.time()
+
+        for sensor_id, process in list(self._processes.items()):
+            usage = get_process_resource_usage(pid=process.pid)
+
+            if not usage:
+                continue
+
+            rss_mb = float(usage['rss']) / (1024 * 1024)
+
+            cpu_usage = None
+            previous = self._sensor_cpu_times.get(sensor_id, None)
+            self._sensor_cpu_times[sensor_id] = (now, usage['cpu_time'])
+
+            if previous and now > previous[0]:
+                cpu_usage = (100 * (usage['cpu_time'] - previous[1]) / (now - previous[0]))
+
+            for metrics_sensor_id in self._get_metrics_sensor_ids(sensor_id):
+                metrics_driver.set_gauge('sensor.%s.memory_usage' % (metrics_sensor_id),
+                                         usage['rss'])
+
+                if cpu_usage is not None:
+                    metrics_driver.set_gauge('sensor.%s.cpu_usage' % (metrics_sensor_id),
+                                             cpu_usage)
+
+            extra = {'sensor_id': sensor_id, 'memory_usage': rss_mb, 'cpu_usage': cpu_usage}
+
+            if self._max_sensor_memory_usage and rss_mb > self._max_sensor_memory_usage:
+                LOG.warning('Sensor %s uses %.2f MB of memory which is more than the limit of '
+                            '%s MB, restarting it.', sensor_id, rss_mb,
+                            self._max_sensor_memory_usage, extra=extra)
+                self._restart_sensor_process(sensor_id=sensor_id, process=process)
+            elif (self._max_sensor_cpu_usage and cpu_usage is not None and
+                    cpu_usage > self._max_sensor_cpu_usage):
+                LOG.warning('Sensor %s uses %.2f%% CPU which is more than the limit of %s%%, '
+                            'restarting it.', sensor_id, cpu_usage, self._max_sensor_cpu_usage,
+                            extra=extra)
+                self._restart_sensor_process(sensor_id=sensor_id, process=process)
+
+    def _restart_sensor_process(self, sensor_id, process):
+        """
+        Terminate the sensor process. The process exits with a non-zero exit code so it's picked
+        up and respawned by the main loop as any other crashed sensor.
+        """
+        for metrics_sensor_id in self._get_metrics_sensor_ids(sensor_id):
+            get_driver().inc_counter('sensor.%s.resource_limit_restarts' % (metrics_sensor_id))
+
+        process.terminate()
+
     def running(self):
         return len(self._processes)
 
+    def get_sensors(self):
+        """
+        Return all the sensors which are currently managed by this container (including the ones
+        which are waiting to be respawned).
+
+        :rtype: ``dict`` (maps sensor_id -> sensor object)
+        """
+        sensors = dict(self._pending_respawns)
+        sensors.update(self._sensors)
+        return sensors
+
     def stopped(self):
         return self._stopped
 
     def shutdown(self, force=False):
         LOG.info('Container shutting down. Invoking cleanup on sensors.')
         self._stopped = True
+        self._wake_up()
 
         if force:
             exit_timeout = 0
@@ -217,6 +415,7 @@ class ProcessSensorContainer(object):
 
         self._sensors = {}
         self._processes = {}
+        self._pending_respawns = {}
 
     def add_sensor(self, sensor):
         """
@@ -230,6 +429,9 @@ class ProcessSensorContainer(object):
             LOG.warning('Sensor %s already exists and running.', sensor_id)
             return False
 
+        if self._pending_respawns.pop(sensor_id, None):
+            LOG.debug('Sensor %s is being started, cancelling pending respawn.', sensor_id)
+
         self._spawn_sensor_process(sensor=sensor)
         LOG.debug('Sensor %s started.', sensor_id)
         self._sensors[sensor_id] = sensor
@@ -243,6 +445,10 @@ class ProcessSensorContainer(object):
         """
         sensor_id = self._get_sensor_id(sensor=sensor)
 
+        if self._pending_respawns.pop(sensor_id, None) and sensor_id not in self._sensors:
+            LOG.debug('Sensor %s is waiting to be respawned, respawn cancelled.', sensor_id)
+            return True
+
         if sensor_id not in self._sensors:
             LOG.warning('Sensor %s isn\'t running in this container.', sensor_id)
             return False
@@ -295,23 +501,7 @@ class ProcessSensorContainer(object):
             msg = PACK_VIRTUALENV_USES_PYTHON3 % format_values
             raise Exception(msg)
 
-        trigger_type_refs = sensor['trigger_types'] or []
-        trigger_type_refs = ','.join(trigger_type_refs)
-
-        parent_args = json.dumps(sys.argv[1:])
-
-        args = [
-            python_path,
-            WRAPPER_SCRIPT_PATH,
-            '--pack=%s' % (sensor['pack']),
-            '--file-path=%s' % (sensor['file_path']),
-            '--class-name=%s' % (sensor['class_name']),
-            '--trigger-type-refs=%s' % (trigger_type_refs),
-            '--parent-args=%s' % (parent_args)
-        ]
-
-        if sensor['poll_interval']:
-            args.append('--poll-interval=%s' % (sensor['poll_interval']))
+        args = self._get_sensor_process_args(sensor=sensor, python_path=python_path)
 
         sandbox_python_path = get_sandbox_python_path(inherit_from_parent=True,
                                                       inherit_parent_virtualenv=True)
@@ -349,8 +539,8 @@ class ProcessSensorContainer(object):
 
         # TODO: Intercept stdout and stderr for aggregated logging purposes
         try:
-            process = subprocess.Popen(args=args, stdin=None, stdout=None,
-                                       stderr=None, shell=False, env=env,
+            process = subprocess.Popen(args=args, stdin=self._get_sensor_process_stdin(),
+                                       stdout=None, stderr=None, shell=False, env=env,
                                        preexec_fn=on_parent_exit('SIGTERM'))
         except Exception as e:
             cmd = ' '.join(args)
@@ -366,6 +556,47 @@ class ProcessSensorContainer(object):
 
         return process
 
+    def _get_sensor_process_args(self, sensor, python_path):
+        """
+        Return command line arguments for the process which runs the provided sensor.
+
+        :rtype: ``list`` of ``str``
+        """
+        trigger_type_refs = sensor['trigger_types'] or []
+        trigger_type_refs = ','.join(trigger_type_refs)
+
+        parent_args = json.dumps(sys.argv[1:])
+
+        args = [
+            python_path,
+            WRAPPER_SCRIPT_PATH,
+            '--pack=%s' % (sensor['pack']),
+            '--file-path=%s' % (sensor['file_path']),
+            '--class-name=%s' % (sensor['class_name']),
+            '--trigger-type-refs=%s' % (trigger_type_refs),
+            '--parent-args=%s' % (parent_args)
+        ]
+
+        if sensor['poll_interval']:
+            args.append('--poll-interval=%s' % (sensor['poll_interval']))
+
+        return args
+
+    def _get_sensor_process_stdin(self):
+        """
+        Return value for the stdin argument of the sensor process (None means inherited).
+        """
+        return None
+
+    def _get_metrics_sensor_ids(self, sensor_id):
+        """
+        Return a list of sensor ids under which the resource usage metrics for the process with
+        the provided id are reported.
+
+        :rtype: ``list`` of ``str``
+        """
+        return [sensor_id]
+
     def _stop_sensor_process(self, sensor_id, exit_timeout=PROCESS_EXIT_TIMEOUT):
         """
         Stop a sensor process for the provided sensor.
@@ -418,10 +649,12 @@ class ProcessSensorContainer(object):
 
             self._stopped = True
             self._exit_code = exit_code
+            self._pending_respawns.pop(sensor_id, None)
             return
 
         if self._stopped:
             LOG.debug('Stopped, not respawning a dead sensor', extra=extra)
+            self._pending_respawns.pop(sensor_id, None)
             return
 
         should_respawn = self._should_respawn_sensor(sensor_id=sensor_id, sensor=sensor,
@@ -429,21 +662,37 @@ class ProcessSensorContainer(object):
 
         if not should_respawn:
             LOG.debug('Not respawning a dead sensor', extra=extra)
+            self._pending_respawns.pop(sensor_id, None)
             return
 
         LOG.debug('Respawning dead sensor', extra=extra)
 
         self._sensor_respawn_counts[sensor_id] += 1
-        sleep_delay = (SENSOR_RESPAWN_DELAY * self._sensor_respawn_counts[sensor_id])
+        sleep_delay = self._get_respawn_delay(self._sensor_respawn_counts[sensor_id])
         eventlet.sleep(sleep_delay)
 
+        if self._pending_respawns.pop(sensor_id, None) is not sensor:
+            # Sensor has been removed or moved to a different node while waiting
+            LOG.debug('Respawn has been cancelled, not respawning a dead sensor', extra=extra)
+            return
+
+        if sensor_id in self._sensors:
+            # Sensor has already been started again while waiting (e.g. on rebalance), spawning
+            # another process would leave the existing one running untracked
+            LOG.debug('Sensor is already running, not respawning a dead sensor', extra=extra)
+            return
+
+        if self._stopped:
+            LOG.debug('Stopped while waiting, not respawning a dead sensor', extra=extra)
+            return
+
         try:
             self._spawn_sensor_process(sensor=sensor)
         except Exception as e:
             LOG.warning(six.text_type(e), exc_info=True)
 
             # Disable sensor which we are unable to start
-            del self._sensors[sensor_id]
+            self._sensors.pop(sensor_id, None)
 
     def _should_respawn_sensor(self, sensor_id, sensor, exit_code):
         """
@@ -460,6 +709,16 @@ class ProcessSensorContainer(object):
 
         return True
 
+    def _get_respawn_delay(self, respawn_count):
+        """
+        Return how long to wait (in seconds) before respawning a sensor for the n-th time.
+
+        Exponential backoff with jitter is used - the upper bound doubles with every respawn and
+        the actual delay is picked randomly from the upper half of that interval.
+        """
+        delay = min(SENSOR_RESPAWN_MAX_DELAY, SENSOR_RESPAWN_DELAY * (2 ** (respawn_count - 1)))
+        return (delay / 2.0) + random.uniform(0, delay / 2.0)
+
     def _get_sensor_id(self, sensor):
         """
         Return unique identifier for the provider sensor dict.
@@ -29,6 +29,7 @@ from st2common.constants.keyvalue import SYSTEM_SCOPE
 from st2common.logging.misc import set_log_level_for_all_loggers
 from st2common.models.api.trigger import TriggerAPI
 from st2common.persistence.db_init import db_setup_with_retry
+from st2common.tracing.base import tracing_initialize
 from st2common.util import loader
 from st2common.util.config_loader import ContentPackConfigLoader
 from st2common.services.triggerwatcher import TriggerWatcher
@@ -42,24 +43,75 @@ from st2common.util.monkey_patch import use_select_poll_workaround
 
 __all__ = [
     'SensorWrapper',
-    'SensorService'
+    'SensorService',
+
+    'setup_sensor_process'
 ]
 
 monkey_patch()
 use_select_poll_workaround(nose_only=False)
 
 
+def setup_sensor_process(parent_args):
+    """
+    Perform process wide set up for a process which runs one or more sensors - parse the config
+    with inherited parent args, establish DB connection and set up logging.
+
+    :param parent_args: Command line arguments passed to the parent process.
+    :type parent_args: ``list``
+    """
+    # 1. Parse the config with inherited parent args
+    try:
+        config.parse_args(args=parent_args)
+    except Exception:
+        pass
+
+    # 2. Establish DB connection
+    username = cfg.CONF.database.username if hasattr(cfg.CONF.database, 'username') else None
+    password = cfg.CONF.database.password if hasattr(cfg.CONF.database, 'password') else None
+    db_setup_with_retry(cfg.CONF.database.db_name, cfg.CONF.database.host,
+                        cfg.CONF.database.port, username=username, password=password,
+                        ssl=cfg.CONF.database.ssl, ssl_keyfile=cfg.CONF.database.ssl_keyfile,
+                        ssl_certfile=cfg.CONF.database.ssl_certfile,
+                        ssl_cert_reqs=cfg.CONF.database.ssl_cert_reqs,
+                        ssl_ca_certs=cfg.CONF.database.ssl_ca_certs,
+                        authentication_mechanism=cfg.CONF.database.authentication_mechanism,
+                        ssl_match_hostname=cfg.CONF.database.ssl_match_hostname)
+
+    # 3. Set up logging
+    logging.setup(cfg.CONF.sensorcontainer.logging)
+
+    if '--debug' in parent_args:
+        set_log_level_for_all_loggers()
+    else:
+        # NOTE: statsd logger logs everything by default under INFO so we ignore those log
+        # messages unless verbose / debug mode is used
+        logging.ignore_statsd_log_messages()
+
+    # 4. Set up latency tracing (trigger dispatches are the first hop of the traces)
+    tracing_initialize(service='sensor')
+
+
 class SensorService(object):
     """
     Instance of this class is passed to the sensor instance and exposes "public"
     methods which can be called by the sensor.
     """
 
-    def __init__(self, sensor_wrapper):
+    def __init__(self, sensor_wrapper, trigger_dispatcher_service=None):
+        """
+        :param trigger_dispatcher_service: Optional dispatcher service instance to use. This
+                                           allows multiple sensors running in the same process
+                                           to share a single dispatcher (and its connections).
+        :type trigger_dispatcher_service: :class:`TriggerDispatcherService`
+        """
         self._sensor_wrapper = sensor_wrapper
         self._logger = self._sensor_wrapper._logger
 
-        self._trigger_dispatcher_service = TriggerDispatcherService(logger=sensor_wrapper._logger)
+        if not trigger_dispatcher_service:
+            trigger_dispatcher_service = TriggerDispatcherService(logger=sensor_wrapper._logger)
+
+        self._trigger_dispatcher_service = trigger_dispatcher_service
         self._datastore_service = SensorDatastoreService(
             logger=self._logger,
             pack_name=self._sensor_wrapper._pack,
@@ -168,25 +220,10 @@ class SensorWrapper(object):
         self._parent_args = parent_args or []
         self._trigger_names = {}
 
-        # 1. Parse the config with inherited parent args
-        try:
-            config.parse_args(args=self._parent_args)
-        except Exception:
-            pass
-
-        # 2. Establish DB connection
-        username = cfg.CONF.database.username if hasattr(cfg.CONF.database, 'username') else None
-        password = cfg.CONF.database.password if hasattr(cfg.CONF.database, 'password') else None
-        db_setup_with_retry(cfg.CONF.database.db_name, cfg.CONF.database.host,
-                            cfg.CONF.database.port, username=username, password=password,
-                            ssl=cfg.CONF.database.ssl, ssl_keyfile=cfg.CONF.database.ssl_keyfile,
-                            ssl_certfile=cfg.CONF.database.ssl_certfile,
-                            ssl_cert_reqs=cfg.CONF.database.ssl_cert_reqs,
-                            ssl_ca_certs=cfg.CONF.database.ssl_ca_certs,
-                            authentication_mechanism=cfg.CONF.database.authentication_mechanism,
-                            ssl_match_hostname=cfg.CONF.database.ssl_match_hostname)
-
-        # 3. Instantiate the watcher
+        # 1. Parse the config, establish DB connection and set up logging
+        setup_sensor_process(parent_args=self._parent_args)
+
+        # 2. Instantiate the watcher
         self._trigger_watcher = TriggerWatcher(create_handler=self._handle_create_trigger,
                                                update_handler=self._handle_update_trigger,
                                                delete_handler=self._handle_delete_trigger,
@@ -195,17 +232,9 @@ class SensorWrapper(object):
                                                (self._pack, self._class_name),
                                                exclusive=True)
 
-        # 4. Set up logging
+        # 3. Set up logger
         self._logger = logging.getLogger('SensorWrapper.%s.%s' %
                                          (self._pack, self._class_name))
-        logging.setup(cfg.CONF.sensorcontainer.logging)
-
-        if '--debug' in parent_args:
-            set_log_level_for_all_loggers()
-        else:
-            # NOTE: statsd logger logs everything by default under INFO so we ignore those log
-            # messages unless verbose / debug mode is used
-            logging.ignore_statsd_log_messages()
 
         self._sensor_instance = self._get_sensor_instance()
 
@@ -300,7 +329,7 @@ class SensorWrapper(object):
                              (self._class_name))
 
         sensor_class_kwargs = {}
-        sensor_class_kwargs['sensor_service'] = SensorService(sensor_wrapper=self)
+        sensor_class_kwargs['sensor_service'] = self._get_sensor_service()
 
         sensor_config = self._get_sensor_config()
         sensor_class_kwargs['config'] = sensor_config
@@ -316,6 +345,9 @@ class SensorWrapper(object):
 
         return sensor_instance
 
+    def _get_sensor_service(self):
+        return SensorService(sensor_wrapper=self)
+
     def _get_sensor_config(self):
         config_loader = ContentPackConfigLoader(pack_name=self._pack)
         config = config_loader.get_config()
@@ -35,11 +35,13 @@ from st2common.constants.garbage_collection import DEFAULT_COLLECTION_INTERVAL
 from st2common.constants.garbage_collection import DEFAULT_SLEEP_DELAY
 from st2common.constants.garbage_collection import MINIMUM_TTL_DAYS
 from st2common.constants.garbage_collection import MINIMUM_TTL_DAYS_EXECUTION_OUTPUT
+from st2common.constants.garbage_collection import MINIMUM_TTL_DAYS_TRACE_SPANS
 from st2common.util import isotime
 from st2common.util.date import get_datetime_utc_now
 from st2common.garbage_collection.executions import purge_executions
 from st2common.garbage_collection.executions import purge_execution_output_objects
 from st2common.garbage_collection.inquiries import purge_inquiries
+from st2common.garbage_collection.trace_spans import purge_trace_spans
 from st2common.garbage_collection.trigger_instances import purge_trigger_instances
 
 __all__ = [
@@ -66,6 +68,7 @@ class GarbageCollectorService(object):
         self._action_executions_ttl = cfg.CONF.garbagecollector.action_executions_ttl
         self._action_executions_output_ttl = cfg.CONF.garbagecollector.action_executions_output_ttl
         self._trigger_instances_ttl = cfg.CONF.garbagecollector.trigger_instances_ttl
+        self._trace_spans_ttl = cfg.CONF.garbagecollector.trace_spans_ttl
         self._purge_inquiries = cfg.CONF.garbagecollector.purge_inquiries
 
         self._validate_ttl_values()
@@ -129,6 +132,10 @@ class GarbageCollectorService(object):
             raise ValueError(('Minimum possible TTL for action_executions_output_ttl in days '
                               'is %s') % (MINIMUM_TTL_DAYS_EXECUTION_OUTPUT))
 
+        if self._trace_spans_ttl and self._trace_spans_ttl < MINIMUM_TTL_DAYS_TRACE_SPANS:
+            raise ValueError('Minimum possible TTL for trace_spans_ttl in days is %s' %
+                             (MINIMUM_TTL_DAYS_TRACE_SPANS))
+
     def _perform_garbage_collection(self):
         LOG.info('Performing garbage collection...')
 
@@ -156,6 +163,12 @@ class GarbageCollectorService(object):
             LOG.debug('Skipping garbage collection for trigger instances since it\'s not '
                       'configured')
 
+        if self._trace_spans_ttl and self._trace_spans_ttl >= MINIMUM_TTL_DAYS_TRACE_SPANS:
+            self._purge_trace_spans()
+            eventlet.sleep(self._sleep_delay)
+        else:
+            LOG.debug('Skipping garbage collection for trace spans since it\'s not configured')
+
         if self._purge_inquiries:
             self._timeout_inquiries()
             eventlet.sleep(self._sleep_delay)
@@ -236,6 +249,31 @@ class GarbageCollectorService(object):
 
         return True
 
+    def _purge_trace_spans(self):
+        """
+        Purge latency tracing spans which match the criteria defined in the config.
+        """
+        LOG.info('Performing garbage collection for trace spans')
+
+        utc_now = get_datetime_utc_now()
+        timestamp = (utc_now - datetime.timedelta(days=self._trace_spans_ttl))
+
+        # Another sanity check to make sure we don't delete new spans
+        if timestamp > (utc_now - datetime.timedelta(days=MINIMUM_TTL_DAYS_TRACE_SPANS)):
+            raise ValueError('Calculated timestamp would violate the minimum TTL constraint')
+
+        timestamp_str = isotime.format(dt=timestamp)
+        LOG.info('Deleting trace spans older than: %s' % (timestamp_str))
+
+        assert timestamp < utc_now
+
+        try:
+            purge_trace_spans(logger=LOG, timestamp=timestamp)
+        except Exception as e:
+            LOG.exception('Failed to delete trace spans: %s' % (six.text_type(e)))
+
+        return True
+
     def _timeout_inquiries(self):
         """Mark Inquiries as "timeout" that have exceeded their TTL
         """
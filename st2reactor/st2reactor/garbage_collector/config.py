@@ -78,7 +78,11 @@ def _register_garbage_collector_opts():
                  'streaming) older than this value (days) will be automatically deleted.'),
         cfg.IntOpt(
             'trigger_instances_ttl', default=None,
-            help='Trigger instances older than this value (days) will be automatically deleted.')
+            help='Trigger instances older than this value (days) will be automatically deleted.'),
+        cfg.IntOpt(
+            'trace_spans_ttl', default=7,
+            help='Latency tracing spans (stored by the "database" tracing sink) older than this '
+                 'value (days) will be automatically deleted.')
     ]
 
     CONF.register_opts(ttl_opts, group='garbagecollector')
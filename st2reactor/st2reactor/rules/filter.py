@@ -96,12 +96,11 @@ class RuleFilter(object):
             )
             if not is_rule_applicable:
                 if self.extra_info:
-                    criteria_extra_info = '\n'.join([
-                        '  key: %s' % criterion_k,
-                        '  pattern: %s' % criterion_pattern,
-                        '  type: %s' % criterion_v['type'],
-                        '  payload: %s' % payload_value
-                    ])
+                    criteria_extra_info = logging.lazy(self._get_criteria_extra_info,
+                                                       criterion_k=criterion_k,
+                                                       criterion_v=criterion_v,
+                                                       criterion_pattern=criterion_pattern,
+                                                       payload_value=payload_value)
                     LOG.info('Validation for rule %s failed on criteria -\n%s', self.rule.ref,
                              criteria_extra_info,
                              extra=self._base_logger_context)
@@ -113,6 +112,15 @@ class RuleFilter(object):
 
         return is_rule_applicable
 
+    def _get_criteria_extra_info(self, criterion_k, criterion_v, criterion_pattern,
+                                 payload_value):
+        return '\n'.join([
+            '  key: %s' % criterion_k,
+            '  pattern: %s' % criterion_pattern,
+            '  type: %s' % criterion_v['type'],
+            '  payload: %s' % payload_value
+        ])
+
     def _check_criterion(self, criterion_k, criterion_v, payload_lookup):
         if 'type' not in criterion_v:
             # Comparison operator type not specified, can't perform a comparison
@@ -156,7 +164,8 @@ class RuleFilter(object):
             if criteria_operator == criteria_operators.SEARCH:
                 result = op_func(value=payload_value, criteria_pattern=criteria_pattern,
                                  criteria_condition=criteria_condition,
-                                 check_function=self._bool_criterion)
+                                 check_function=self._bool_criterion,
+                                 criteria_count=criterion_v.get('count', None))
             else:
                 result = op_func(value=payload_value, criteria_pattern=criteria_pattern)
         except Exception as e:
@@ -184,6 +193,11 @@ class RuleFilter(object):
             # makes no sense
             return criteria_pattern
 
+        if '{' not in criteria_pattern and not criteria_pattern.endswith('\n'):
+            # Pattern contains no template markup so rendering would return the same value. This
+            # matters for the search operator where patterns are evaluated for each list item
+            return criteria_pattern
+
         LOG.debug(
             'Rendering criteria pattern (%s) with context: %s',
             criteria_pattern,
@@ -77,6 +77,32 @@ def _register_sensor_container_opts(ignore_errors=False):
 
     st2cfg.do_register_opts(other_opts, group='sensorcontainer', ignore_errors=ignore_errors)
 
+    # Sensor process supervision options
+    supervision_opts = [
+        cfg.IntOpt(
+            'sensors_per_process', default=1,
+            help='Maximum number of sensors from the same pack to run inside a single sensor '
+                 'process. Running multiple sensors in a single process (each one in a separate '
+                 'green thread) considerably reduces memory usage and number of connections to '
+                 'the database and message bus. 1 means each sensor runs in a dedicated process.'),
+        cfg.IntOpt(
+            'resource_usage_check_interval', default=30,
+            help='How often (in seconds) to collect CPU and memory usage of the sensor processes '
+                 'and report it as metrics. 0 disables the collection.'),
+        cfg.IntOpt(
+            'max_sensor_memory_usage', default=0,
+            help='Maximum resident memory usage (in MB) of a single sensor process. Sensor '
+                 'processes which exceed this limit are restarted. 0 means no limit.'),
+        cfg.IntOpt(
+            'max_sensor_cpu_usage', default=0,
+            help='Maximum CPU usage (in percent of a single core, averaged over the resource '
+                 'usage check interval) of a single sensor process. Sensor processes which exceed '
+                 'this limit are restarted. 0 means no limit.')
+    ]
+
+    st2cfg.do_register_opts(supervision_opts, group='sensorcontainer',
+                            ignore_errors=ignore_errors)
+
     # CLI options
     cli_opts = [
         cfg.StrOpt(
@@ -0,0 +1,185 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import eventlet
+import mock
+import unittest2
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.services.coordination import NoOpDriver
+from st2reactor.container.consistent_hash_partitioner import ConsistentHashRing
+from st2reactor.container.consistent_hash_partitioner import ConsistentHashPartitioner
+from st2reactor.container.manager import SensorContainerManager
+from st2reactor.container.process_container import ProcessSensorContainer
+
+REFS = ['pack%s.Sensor%s' % (index % 7, index) for index in range(0, 3000)]
+
+
+class ConsistentHashRingTestCase(unittest2.TestCase):
+
+    def test_empty_ring(self):
+        ring = ConsistentHashRing()
+        self.assertEqual(ring.get_node('pack.Sensor'), None)
+
+    def test_keys_are_evenly_distributed(self):
+        ring = ConsistentHashRing(nodes=['node1', 'node2', 'node3'], replicas=128)
+
+        counts = {'node1': 0, 'node2': 0, 'node3': 0}
+        for ref in REFS:
+            counts[ring.get_node(ref)] += 1
+
+        mean = len(REFS) / 3.0
+        for count in counts.values():
+            self.assertTrue(abs(count - mean) / mean <= 0.25, counts)
+
+    def test_only_keys_of_removed_node_move(self):
+        ring = ConsistentHashRing(nodes=['node1', 'node2', 'node3'])
+        before = dict([(ref, ring.get_node(ref)) for ref in REFS])
+
+        ring.remove_node('node2')
+        after = dict([(ref, ring.get_node(ref)) for ref in REFS])
+
+        for ref in REFS:
+            if before[ref] != 'node2':
+                self.assertEqual(before[ref], after[ref])
+            else:
+                self.assertTrue(after[ref] in ['node1', 'node3'])
+
+    def test_only_keys_of_added_node_move(self):
+        ring = ConsistentHashRing(nodes=['node1', 'node2'])
+        before = dict([(ref, ring.get_node(ref)) for ref in REFS])
+
+        ring.add_node('node3')
+        after = dict([(ref, ring.get_node(ref)) for ref in REFS])
+
+        for ref in REFS:
+            if before[ref] != after[ref]:
+                self.assertEqual(after[ref], 'node3')
+
+        self.assertEqual(ring.nodes, frozenset(['node1', 'node2', 'node3']))
+
+
+class ConsistentHashPartitionerTestCase(unittest2.TestCase):
+
+    def setUp(self):
+        super(ConsistentHashPartitionerTestCase, self).setUp()
+        NoOpDriver.stop()
+
+    def _get_partitioner(self, member_id):
+        with mock.patch('st2common.services.coordination.get_member_id',
+                        mock.Mock(return_value=member_id)):
+            coordinator = NoOpDriver(member_id)
+            partitioner = ConsistentHashPartitioner('sensornode1', coordinator=coordinator,
+                                                    replicas='16')
+            partitioner._ensure_group_membership()
+
+        return partitioner
+
+    def test_single_node_owns_all_sensors(self):
+        partitioner = self._get_partitioner(b'node1')
+        self.assertEqual(partitioner.members, frozenset([b'node1']))
+
+        for ref in REFS[:100]:
+            self.assertTrue(partitioner._is_owned_by_this_node(ref))
+
+    def test_membership_change_rebuilds_ring_and_calls_handler(self):
+        partitioner = self._get_partitioner(b'node1')
+        handler = mock.Mock()
+        partitioner._rebalance_handler = handler
+
+        NoOpDriver.groups[partitioner._group_id]['members'][b'node2'] = {}
+        partitioner._on_membership_change(event=None)
+
+        self.assertEqual(partitioner.members, frozenset([b'node1', b'node2']))
+        self.assertEqual(handler.call_count, 1)
+
+        owned = [ref for ref in REFS if partitioner._is_owned_by_this_node(ref)]
+        self.assertTrue(0 < len(owned) < len(REFS))
+
+        # No change, handler shouldn't be called again
+        partitioner._on_membership_change(event=None)
+        self.assertEqual(handler.call_count, 1)
+
+
+class SensorContainerManagerRebalanceTestCase(unittest2.TestCase):
+
+    def test_handle_rebalance_starts_and_stops_sensors(self):
+        sensor_2 = mock.Mock(pack='pack', artifact_uri='file:///sensor2.py',
+                             entry_point='sensor2.Sensor2', trigger_types=[],
+                             poll_interval=None)
+        sensor_2.name = 'Sensor2'
+
+        partitioner = mock.Mock()
+        partitioner.get_sensors.return_value = [sensor_2]
+
+        container = mock.Mock()
+        container.get_sensors.return_value = {'pack.Sensor1': {'ref': 'pack.Sensor1'}}
+
+        manager = SensorContainerManager(sensors_partitioner=partitioner)
+        manager._sensor_container = container
+        manager._handle_rebalance()
+
+        container.remove_sensor.assert_called_once_with(sensor={'ref': 'pack.Sensor1'})
+        self.assertEqual(container.add_sensor.call_count, 1)
+
+        added_sensor = container.add_sensor.call_args[1]['sensor']
+        self.assertEqual(added_sensor['ref'], 'pack.Sensor2')
+        self.assertEqual(added_sensor['class_name'], 'Sensor2')
+
+    def test_handle_rebalance_during_respawn_delay(self):
+        sensor_1 = mock.Mock(pack='pack', artifact_uri='file:///sensor1.py',
+                             entry_point='sensor1.Sensor1', trigger_types=[],
+                             poll_interval=None)
+        sensor_1.name = 'Sensor1'
+        sensor_2 = mock.Mock(pack='pack', artifact_uri='file:///sensor2.py',
+                             entry_point='sensor2.Sensor2', trigger_types=[],
+                             poll_interval=None)
+        sensor_2.name = 'Sensor2'
+
+        partitioner = mock.Mock()
+        partitioner.get_sensors.return_value = [sensor_1, sensor_2]
+
+        manager = SensorContainerManager(sensors_partitioner=partitioner)
+        sensors = [manager._to_sensor_object(sensor_1), manager._to_sensor_object(sensor_2)]
+
+        container = ProcessSensorContainer(sensors=sensors, poll_interval=0.1,
+                                           dispatcher=mock.Mock())
+        container._get_respawn_delay = mock.Mock(return_value=0.1)
+        container._processes = {
+            'pack.Sensor1': mock.Mock(**{'poll.return_value': 1}),
+            'pack.Sensor2': mock.Mock(**{'poll.return_value': 1})
+        }
+        manager._sensor_container = container
+
+        with mock.patch.object(ProcessSensorContainer, '_spawn_sensor_process') as mock_spawn:
+            # Both sensors die and wait to be respawned
+            container._poll_sensors_for_results(['pack.Sensor1', 'pack.Sensor2'])
+            self.assertEqual(container._sensors, {})
+
+            # Sensor1 moved to a different node, Sensor2 is still owned by this node
+            partitioner.get_sensors.return_value = [sensor_2]
+            manager._handle_rebalance()
+            self.assertEqual(mock_spawn.call_count, 0)
+
+            eventlet.sleep(0.3)
+
+            # Only Sensor2 is respawned and only once
+            self.assertEqual(mock_spawn.call_count, 1)
+            self.assertEqual(mock_spawn.call_args[1]['sensor']['ref'], 'pack.Sensor2')
+            self.assertEqual(container._pending_respawns, {})
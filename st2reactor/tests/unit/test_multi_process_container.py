@@ -0,0 +1,279 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import json
+
+import mock
+import unittest2
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2common.models.db.trigger import TriggerDB
+from st2reactor.container.multi_process_container import MultiSensorProcessContainer
+from st2reactor.container.process_container import ProcessSensorContainer
+from st2reactor.container import multi_sensor_wrapper
+from st2reactor.container.multi_sensor_wrapper import MultiSensorWrapper
+
+__all__ = [
+    'MultiSensorProcessContainerTestCase',
+    'MultiSensorWrapperTestCase'
+]
+
+
+def get_sensor(pack, name, trigger_types=None):
+    return {
+        'pack': pack,
+        'ref': '%s.%s' % (pack, name),
+        'class_name': name,
+        'file_path': '/opt/stackstorm/packs/%s/sensors/%s.py' % (pack, name),
+        'trigger_types': trigger_types or [],
+        'poll_interval': None
+    }
+
+
+class MultiSensorProcessContainerTestCase(unittest2.TestCase):
+
+    def test_sensors_are_grouped_by_pack(self):
+        sensors = [
+            get_sensor('pack1', 'Sensor1'),
+            get_sensor('pack1', 'Sensor2'),
+            get_sensor('pack1', 'Sensor3'),
+            get_sensor('pack2', 'Sensor1')
+        ]
+        container = MultiSensorProcessContainer(sensors=sensors, sensors_per_process=2,
+                                                dispatcher=mock.Mock())
+
+        self.assertEqual(sorted(container._sensors.keys()),
+                         ['pack1.sensor_host_0', 'pack1.sensor_host_1', 'pack2.sensor_host_0'])
+        self.assertEqual(len(container._sensors['pack1.sensor_host_0']['sensors']), 2)
+        self.assertEqual(len(container._sensors['pack1.sensor_host_1']['sensors']), 1)
+        self.assertEqual(sorted(container.get_sensors().keys()),
+                         ['pack1.Sensor1', 'pack1.Sensor2', 'pack1.Sensor3', 'pack2.Sensor1'])
+
+    def test_new_host_process_is_spawned_for_sensor_from_new_pack(self):
+        container = MultiSensorProcessContainer(sensors=[], sensors_per_process=10,
+                                                dispatcher=mock.Mock())
+        container._spawn_sensor_process = mock.Mock()
+
+        self.assertTrue(container.add_sensor(get_sensor('pack1', 'Sensor1')))
+        self.assertFalse(container.add_sensor(get_sensor('pack1', 'Sensor1')))
+
+        host = container._hosts['pack1.sensor_host_0']
+        container._spawn_sensor_process.assert_called_once_with(sensor=host)
+
+    def test_sensors_are_added_and_removed_in_place(self):
+        sensors = [get_sensor('pack1', 'Sensor1')]
+        container = MultiSensorProcessContainer(sensors=sensors, sensors_per_process=10,
+                                                dispatcher=mock.Mock())
+        container._spawn_sensor_process = mock.Mock()
+        container._stop_sensor_process = mock.Mock()
+
+        process = mock.Mock()
+        container._processes['pack1.sensor_host_0'] = process
+
+        self.assertTrue(container.add_sensor(get_sensor('pack1', 'Sensor2')))
+        self.assertTrue(container.remove_sensor(get_sensor('pack1', 'Sensor1')))
+
+        # Host process is not restarted so the other sensors in it are not affected
+        self.assertEqual(container._spawn_sensor_process.call_count, 0)
+        self.assertEqual(container._stop_sensor_process.call_count, 0)
+
+        commands = [json.loads(call[0][0].decode('utf-8'))
+                    for call in process.stdin.write.call_args_list]
+        self.assertEqual(commands[0]['action'], 'add')
+        self.assertEqual(commands[0]['sensor']['ref'], 'pack1.Sensor2')
+        self.assertEqual(commands[1], {'action': 'remove', 'ref': 'pack1.Sensor1'})
+
+        host = container._hosts['pack1.sensor_host_0']
+        self.assertEqual([item['ref'] for item in host['sensors']], ['pack1.Sensor2'])
+        self.assertEqual(sorted(container.get_sensors().keys()), ['pack1.Sensor2'])
+
+        # Spawn trigger is dispatched for the added sensor
+        payload = container._dispatcher.dispatch.call_args[1]['payload']
+        self.assertEqual(payload['id'], 'Sensor2')
+
+        # Host process is stopped once the last sensor is removed
+        self.assertTrue(container.remove_sensor(get_sensor('pack1', 'Sensor2')))
+        container._stop_sensor_process.assert_called_once_with(sensor_id='pack1.sensor_host_0')
+        self.assertEqual(container._hosts, {})
+
+    def test_changes_while_host_is_being_respawned_are_applied_to_respawned_host(self):
+        sensors = [get_sensor('pack1', 'Sensor1'), get_sensor('pack1', 'Sensor2')]
+        container = MultiSensorProcessContainer(sensors=sensors, sensors_per_process=10,
+                                                dispatcher=mock.Mock())
+        container._get_respawn_delay = mock.Mock(return_value=0)
+
+        host = container._hosts['pack1.sensor_host_0']
+
+        # Host process has exited and is waiting to be respawned
+        container._delete_sensor('pack1.sensor_host_0')
+        container._pending_respawns['pack1.sensor_host_0'] = host
+
+        container.add_sensor(get_sensor('pack1', 'Sensor3'))
+        container.remove_sensor(get_sensor('pack1', 'Sensor1'))
+
+        self.assertEqual(list(container._hosts.keys()), ['pack1.sensor_host_0'])
+        self.assertEqual(container._processes, {})
+
+        with mock.patch.object(ProcessSensorContainer, '_spawn_sensor_process') as mock_spawn:
+            container._respawn_sensor(sensor_id='pack1.sensor_host_0', sensor=host, exit_code=1)
+
+        mock_spawn.assert_called_once_with(sensor=host)
+        self.assertEqual([item['ref'] for item in host['sensors']],
+                         ['pack1.Sensor2', 'pack1.Sensor3'])
+
+    def test_removed_host_is_not_respawned(self):
+        sensors = [get_sensor('pack1', 'Sensor1')]
+        container = MultiSensorProcessContainer(sensors=sensors, sensors_per_process=10,
+                                                dispatcher=mock.Mock())
+        container._get_respawn_delay = mock.Mock(return_value=0)
+
+        host = container._hosts['pack1.sensor_host_0']
+        container._delete_sensor('pack1.sensor_host_0')
+        container._pending_respawns['pack1.sensor_host_0'] = host
+        container.remove_sensor(get_sensor('pack1', 'Sensor1'))
+
+        with mock.patch.object(ProcessSensorContainer, '_spawn_sensor_process') as mock_spawn:
+            container._respawn_sensor(sensor_id='pack1.sensor_host_0', sensor=host, exit_code=1)
+
+        self.assertEqual(mock_spawn.call_count, 0)
+
+    def test_host_which_is_not_respawned_is_removed(self):
+        sensors = [get_sensor('pack1', 'Sensor1')]
+        container = MultiSensorProcessContainer(sensors=sensors, sensors_per_process=10,
+                                                dispatcher=mock.Mock())
+
+        host = container._hosts['pack1.sensor_host_0']
+        container._delete_sensor('pack1.sensor_host_0')
+        container._respawn_sensor(sensor_id='pack1.sensor_host_0', sensor=host, exit_code=0)
+
+        self.assertEqual(container._hosts, {})
+        self.assertEqual(container.get_sensors(), {})
+
+    def test_triggers_and_metrics_use_hosted_sensor_ids(self):
+        sensors = [get_sensor('pack1', 'Sensor1'), get_sensor('pack1', 'Sensor2')]
+        container = MultiSensorProcessContainer(sensors=sensors, sensors_per_process=10,
+                                                dispatcher=mock.Mock())
+
+        host = container._hosts['pack1.sensor_host_0']
+        container._dispatch_trigger_for_sensor_exit(sensor=host, exit_code=1)
+
+        payloads = [call[1]['payload'] for call in container._dispatcher.dispatch.call_args_list]
+        self.assertEqual([payload['id'] for payload in payloads], ['Sensor1', 'Sensor2'])
+        self.assertEqual(container._get_metrics_sensor_ids('pack1.sensor_host_0'),
+                         ['pack1.Sensor1', 'pack1.Sensor2'])
+
+    def test_get_sensor_process_args(self):
+        sensors = [get_sensor('pack1', 'Sensor1', trigger_types=['pack1.trigger1']),
+                   get_sensor('pack1', 'Sensor2')]
+        container = MultiSensorProcessContainer(sensors=sensors, sensors_per_process=10,
+                                                dispatcher=mock.Mock())
+
+        host = container._sensors['pack1.sensor_host_0']
+        args = container._get_sensor_process_args(sensor=host, python_path='/usr/bin/python')
+
+        self.assertTrue(args[1].endswith('multi_sensor_wrapper.py'))
+        self.assertEqual(args[2], '--pack=pack1')
+
+        hosted_sensors = json.loads(args[3].replace('--sensors=', '', 1))
+        self.assertEqual([item['class_name'] for item in hosted_sensors], ['Sensor1', 'Sensor2'])
+        self.assertEqual(hosted_sensors[0]['trigger_types'], ['pack1.trigger1'])
+
+
+@mock.patch.object(multi_sensor_wrapper, 'setup_sensor_process', mock.Mock())
+@mock.patch.object(multi_sensor_wrapper, 'TriggerWatcher', mock.Mock())
+@mock.patch.object(multi_sensor_wrapper, 'TriggerDispatcherService', mock.Mock())
+@mock.patch.object(multi_sensor_wrapper, 'Trigger', mock.Mock())
+class MultiSensorWrapperTestCase(unittest2.TestCase):
+
+    def _get_wrapper(self):
+        sensors = [get_sensor('pack1', 'Sensor1', trigger_types=['pack1.trigger1']),
+                   get_sensor('pack1', 'Sensor2', trigger_types=['pack1.trigger2'])]
+        return MultiSensorWrapper(pack='pack1', sensors=sensors)
+
+    def test_single_trigger_watcher_for_all_sensors(self):
+        self._get_wrapper()
+
+        call_kwargs = multi_sensor_wrapper.TriggerWatcher.call_args[1]
+        self.assertEqual(call_kwargs['trigger_types'], ['pack1.trigger1', 'pack1.trigger2'])
+
+    def test_trigger_events_are_routed_to_matching_sensors(self):
+        wrapper = self._get_wrapper()
+        sensor1, sensor2 = wrapper._sensors
+
+        sensor1._sensor_instance = mock.Mock()
+        sensor2._sensor_instance = mock.Mock()
+        sensor1._sensor_instance.add_trigger.side_effect = Exception('failure')
+
+        trigger = TriggerDB(id='57861fcb0640fd1524e577c0', name='test', pack='pack1',
+                            type='pack1.trigger1')
+
+        with mock.patch.object(sensor1, '_sanitize_trigger', mock.Mock(return_value={})):
+            # Exception in one sensor shouldn't propagate
+            wrapper._handle_create_trigger(trigger=trigger)
+
+        self.assertEqual(sensor1._sensor_instance.add_trigger.call_count, 1)
+        self.assertEqual(sensor2._sensor_instance.add_trigger.call_count, 0)
+
+    def test_triggers_are_recorded_before_sensor_is_instantiated(self):
+        wrapper = self._get_wrapper()
+        sensor1 = wrapper._sensors[0]
+
+        trigger = TriggerDB(id='57861fcb0640fd1524e577c0', name='test', pack='pack1',
+                            type='pack1.trigger1')
+        wrapper._handle_create_trigger(trigger=trigger)
+        self.assertEqual(list(sensor1._trigger_names.keys()), ['57861fcb0640fd1524e577c0'])
+
+        wrapper._handle_delete_trigger(trigger=trigger)
+        self.assertEqual(sensor1._trigger_names, {})
+
+    @mock.patch.object(multi_sensor_wrapper.eventlet, 'sleep', mock.Mock())
+    def test_failed_sensor_is_restarted_up_to_max_times(self):
+        wrapper = self._get_wrapper()
+        sensor1 = wrapper._sensors[0]
+
+        with mock.patch.object(sensor1, 'run', mock.Mock(side_effect=Exception('failure'))):
+            wrapper._run_sensor(sensor1)
+
+            expected_count = multi_sensor_wrapper.SENSOR_MAX_RESTART_COUNTS + 1
+            self.assertEqual(sensor1.run.call_count, expected_count)
+
+    @mock.patch.object(multi_sensor_wrapper.eventlet, 'spawn', mock.Mock())
+    def test_add_and_remove_sensor_commands(self):
+        wrapper = self._get_wrapper()
+
+        trigger = TriggerDB(id='57861fcb0640fd1524e577c0', name='test', pack='pack1',
+                            type='pack1.trigger3')
+        multi_sensor_wrapper.Trigger.query.return_value = [trigger]
+
+        sensor = get_sensor('pack1', 'Sensor3', trigger_types=['pack1.trigger3'])
+        wrapper._handle_command({'action': 'add', 'sensor': sensor})
+
+        sensor3 = wrapper._sensors[2]
+        self.assertEqual(sensor3._ref, 'pack1.Sensor3')
+        self.assertEqual(list(sensor3._trigger_names.keys()), ['57861fcb0640fd1524e577c0'])
+        self.assertIn('pack1.trigger3', wrapper._trigger_types)
+        multi_sensor_wrapper.eventlet.spawn.assert_called_once_with(wrapper._run_sensor, sensor3)
+
+        thread = wrapper._threads['pack1.Sensor3']
+        wrapper._handle_command({'action': 'remove', 'ref': 'pack1.Sensor3'})
+
+        thread.kill.assert_called_once_with()
+        self.assertEqual([item._ref for item in wrapper._sensors],
+                         ['pack1.Sensor1', 'pack1.Sensor2'])
+        self.assertNotIn('pack1.Sensor3', wrapper._threads)
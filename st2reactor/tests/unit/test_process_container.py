@@ -16,12 +16,16 @@
 from __future__ import absolute_import
 import os
 import time
+import subprocess
 
 import eventlet
 from mock import (MagicMock, Mock, patch)
 import unittest2
 
 from st2reactor.container.process_container import ProcessSensorContainer
+from st2reactor.container.process_container import SENSOR_MAX_RESPAWN_COUNTS
+from st2reactor.container.process_container import SENSOR_RESPAWN_DELAY
+from st2reactor.container.process_container import SENSOR_RESPAWN_MAX_DELAY
 from st2common.models.db.pack import PackDB
 from st2common.persistence.pack import Pack
 
@@ -153,3 +157,93 @@ class ProcessContainerTests(unittest2.TestCase):
                 'timestamp': 1439441533,
                 'exit_code': 1
             })
+
+    def test_sensor_process_exit_wakes_up_main_loop(self):
+        process_container = ProcessSensorContainer(None, poll_interval=10)
+        process_container._setup_sigchld_handler()
+
+        try:
+            process = subprocess.Popen(['sleep', '0.1'])
+
+            start = time.time()
+            eventlet.spawn(process_container._wait_for_sensor_exit, timeout=10).wait()
+            self.assertTrue(time.time() - start < 5)
+            self.assertEqual(process.wait(), 0)
+        finally:
+            process_container._teardown_sigchld_handler()
+
+    def test_respawn_delay_uses_exponential_backoff_with_jitter(self):
+        process_container = ProcessSensorContainer(None, poll_interval=0.1)
+
+        for respawn_count in range(1, 10):
+            delay = process_container._get_respawn_delay(respawn_count)
+            upper_bound = min(SENSOR_RESPAWN_MAX_DELAY,
+                              SENSOR_RESPAWN_DELAY * (2 ** (respawn_count - 1)))
+
+            self.assertTrue(upper_bound / 2.0 <= delay <= upper_bound)
+
+        # Maximum delay is reached before the container gives up on the sensor
+        max_upper_bound = SENSOR_RESPAWN_DELAY * (2 ** (SENSOR_MAX_RESPAWN_COUNTS - 1))
+        self.assertTrue(max_upper_bound >= SENSOR_RESPAWN_MAX_DELAY)
+
+    def test_sensor_started_during_respawn_delay_is_not_respawned(self):
+        sensor = {'ref': 'pack.Sensor', 'class_name': 'Sensor'}
+        process_container = ProcessSensorContainer([sensor], poll_interval=0.1,
+                                                   dispatcher=Mock())
+        process_container._get_respawn_delay = Mock(return_value=0.1)
+        process_container._processes = {'pack.Sensor': Mock(**{'poll.return_value': 1})}
+
+        with patch.object(ProcessSensorContainer, '_spawn_sensor_process') as mock_spawn:
+            process_container._poll_sensors_for_results(['pack.Sensor'])
+            self.assertEqual(list(process_container.get_sensors().keys()), ['pack.Sensor'])
+
+            # Sensor is started again (e.g. re-created) while waiting to be respawned
+            self.assertTrue(process_container.add_sensor(sensor))
+            eventlet.sleep(0.3)
+
+            self.assertEqual(mock_spawn.call_count, 1)
+
+    def test_sensor_removed_during_respawn_delay_is_not_respawned(self):
+        sensor = {'ref': 'pack.Sensor', 'class_name': 'Sensor'}
+        process_container = ProcessSensorContainer([sensor], poll_interval=0.1,
+                                                   dispatcher=Mock())
+        process_container._get_respawn_delay = Mock(return_value=0.1)
+        process_container._processes = {'pack.Sensor': Mock(**{'poll.return_value': 1})}
+
+        with patch.object(ProcessSensorContainer, '_spawn_sensor_process') as mock_spawn:
+            process_container._poll_sensors_for_results(['pack.Sensor'])
+
+            self.assertTrue(process_container.remove_sensor(sensor))
+            self.assertEqual(process_container.get_sensors(), {})
+            eventlet.sleep(0.3)
+
+            self.assertEqual(mock_spawn.call_count, 0)
+
+    @patch('st2reactor.container.process_container.get_process_resource_usage')
+    def test_sensor_process_exceeding_resource_limits_is_restarted(self, mock_get_usage):
+        process_container = ProcessSensorContainer(None, poll_interval=0.1)
+        process_container._max_sensor_memory_usage = 100
+
+        process = Mock(pid=1234)
+        process_container._processes = {'pack.Sensor': process}
+
+        mock_get_usage.return_value = {'cpu_time': 1.0, 'rss': 50 * 1024 * 1024}
+        process_container._check_sensors_resource_usage()
+        self.assertEqual(process.terminate.call_count, 0)
+
+        mock_get_usage.return_value = {'cpu_time': 2.0, 'rss': 200 * 1024 * 1024}
+        process_container._check_sensors_resource_usage()
+        self.assertEqual(process.terminate.call_count, 1)
+
+    @patch('st2reactor.container.process_container.get_process_resource_usage')
+    def test_sensor_process_exceeding_cpu_limit_is_restarted(self, mock_get_usage):
+        process_container = ProcessSensorContainer(None, poll_interval=0.1)
+        process_container._max_sensor_cpu_usage = 50
+
+        process = Mock(pid=1234)
+        process_container._processes = {'pack.Sensor': process}
+        process_container._sensor_cpu_times = {'pack.Sensor': (time.time() - 10, 0.0)}
+
+        mock_get_usage.return_value = {'cpu_time': 9.0, 'rss': 1024}
+        process_container._check_sensors_resource_usage()
+        self.assertEqual(process.terminate.call_count, 1)
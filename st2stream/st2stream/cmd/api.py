@@ -23,6 +23,7 @@ from eventlet import wsgi
 from st2common import log as logging
 from st2common.service_setup import setup as common_setup
 from st2common.service_setup import teardown as common_teardown
+from st2common.metrics.collectors import register_green_pool
 from st2common.stream.listener import get_listener_if_set
 from st2common.util.wsgi import shutdown_server_kill_pending_requests
 from st2stream.signal_handlers import register_stream_signal_handlers
@@ -68,6 +69,7 @@ def _run_server():
 
     max_pool_size = eventlet.wsgi.DEFAULT_MAX_SIMULTANEOUS_REQUESTS
     worker_pool = eventlet.GreenPool(max_pool_size)
+    register_green_pool(name='wsgi', pool=worker_pool)
     sock = eventlet.listen((host, port))
 
     def queue_shutdown(signal_number, stack_frame):
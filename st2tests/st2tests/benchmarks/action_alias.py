@@ -0,0 +1,112 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Action alias matching benchmarks - matching ChatOps commands against all the action alias formats
+and against the precompiled action alias index.
+
+Number of commands per second is included in the report (extra_info).
+"""
+
+from __future__ import absolute_import
+
+from st2common.models.db.actionalias import ActionAliasDB
+from st2common.util import actionalias_matching
+from st2tests.benchmarks.base import BaseBenchmark
+from st2tests.benchmarks.base import default_timer
+
+__all__ = [
+    'ActionAliasMatchingBenchmark'
+]
+
+ALIASES_COUNT = 2000
+
+COMMANDS_COUNT = 20
+
+VERBS = ['deploy', 'restart', 'show', 'create', 'delete', 'list', 'run', 'scale']
+
+
+def get_aliases(count=ALIASES_COUNT):
+    """
+    Return aliases with formats which mix literal words, required and optional parameters.
+    """
+    action_alias_dbs = []
+
+    for index in range(0, count):
+        verb = VERBS[index % len(VERBS)]
+        formats = [
+            '%s service%s {{name}} to {{environment=staging}}' % (verb, index),
+            {'display': '%s service%s {{name}}' % (verb, index),
+             'representation': ['%s svc%s {{name}}' % (verb, index)]}
+        ]
+
+        action_alias_dbs.append(ActionAliasDB(pack='benchmark', name='alias%s' % (index),
+                                              ref='benchmark.alias%s' % (index),
+                                              action_ref='benchmark.action%s' % (index),
+                                              formats=formats))
+
+    return action_alias_dbs
+
+
+def get_commands(count=COMMANDS_COUNT, aliases_count=ALIASES_COUNT):
+    step = max(aliases_count // count, 1)
+    return ['%s service%s web to production region=eu' % (VERBS[index % len(VERBS)], index)
+            for index in range(0, aliases_count, step)][:count]
+
+
+class ActionAliasMatchingBenchmark(BaseBenchmark):
+    group = 'action_alias'
+    rounds = 3
+    params = {
+        'aliases_count': ALIASES_COUNT,
+        'commands_count': COMMANDS_COUNT
+    }
+
+    def setUp(self):
+        super(ActionAliasMatchingBenchmark, self).setUp()
+
+        self.action_alias_dbs = get_aliases()
+        self.commands = get_commands()
+
+        self.index = actionalias_matching.ActionAliasIndex()
+        self.index.build(action_alias_dbs=self.action_alias_dbs)
+
+    def benchmark_match_commands(self):
+        self._match_commands(self._match_command)
+
+    def benchmark_match_commands_index(self):
+        self._match_commands(self.index.match)
+
+    def get_extra_info(self, name):
+        match_func = self.index.match if name.endswith('_index') else self._match_command
+
+        start = default_timer()
+        self._match_commands(match_func)
+        duration = default_timer() - start
+
+        return {
+            'commands_per_second': round(len(self.commands) / duration, 1)
+        }
+
+    def _match_command(self, command):
+        return actionalias_matching.match_command_to_alias(command=command,
+                                                           aliases=self.action_alias_dbs)
+
+    def _match_commands(self, match_func):
+        for command in self.commands:
+            matches = match_func(command)
+
+            if len(matches) != 1:
+                raise Exception('Command "%s" matched %s patterns' % (command, len(matches)))
@@ -0,0 +1,338 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Minimal benchmark harness used by the benchmark suite (tools/benchmark_suite.py).
+
+Benchmarks are written as classes with "benchmark_<name>" methods (similar to unittest test
+cases). Only the benchmark method itself is timed, per round preparation can be done in an
+optional "prepare_<name>" method.
+
+Results are written as JSON in a layout compatible with pytest-benchmark reports so the reports
+can be compared between runs and used to gate upgrades.
+"""
+
+from __future__ import absolute_import
+
+import gc
+import math
+import socket
+import inspect
+import platform
+import subprocess
+import multiprocessing
+
+import six
+from oslo_config import cfg
+
+from st2common.util.date import get_datetime_utc_now
+
+__all__ = [
+    'BaseBenchmark',
+    'BaseDbBenchmark',
+
+    'setup_benchmarks',
+    'teardown_benchmarks',
+    'run_benchmarks',
+    'get_report',
+    'compare_reports'
+]
+
+BENCHMARK_METHOD_PREFIX = 'benchmark_'
+PREPARE_METHOD_PREFIX = 'prepare_'
+
+BENCHMARK_DB_NAME = 'st2-benchmark'
+
+# Wall clock timer with the best resolution available on this platform
+if six.PY3:
+    import time
+    default_timer = time.perf_counter
+else:
+    import timeit
+    default_timer = timeit.default_timer
+
+
+class BaseBenchmark(object):
+    """
+    Base class for benchmarks which don't need a database connection.
+    """
+
+    # Benchmark group (e.g. rules, scheduler)
+    group = None
+
+    # Number of timed rounds and untimed warmup rounds for each benchmark method
+    rounds = 10
+    warmup_rounds = 1
+
+    # Parameters which describe the fixture size. Those are included in the report so it's clear
+    # which reports can be compared
+    params = {}
+
+    requires_db = False
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def get_extra_info(self, name):
+        """
+        Return additional (non timing) information about the benchmark which is included in the
+        report.
+
+        :rtype: ``dict``
+        """
+        return {}
+
+    @classmethod
+    def get_benchmark_names(cls):
+        names = [name[len(BENCHMARK_METHOD_PREFIX):] for name, _ in
+                 inspect.getmembers(cls, predicate=callable)
+                 if name.startswith(BENCHMARK_METHOD_PREFIX)]
+        return sorted(names)
+
+    @classmethod
+    def get_full_name(cls, name):
+        return '%s.%s' % (cls.group, name)
+
+
+class BaseDbBenchmark(BaseBenchmark):
+    """
+    Base class for benchmarks which use the database. Database is dropped before and after the
+    benchmark class runs.
+    """
+
+    requires_db = True
+
+    def setUp(self):
+        _drop_database()
+
+    def tearDown(self):
+        _drop_database()
+
+
+def setup_benchmarks(use_db=True):
+    """
+    Set up config, database connection and in-memory message bus transport for the benchmarks.
+
+    Local MongoDB instance is used. Messages are published using kombu in-memory transport so no
+    message bus server is needed.
+    """
+    # NOTE: Imported here so benchmarks which don't need a database don't depend on the test config
+    import st2tests.config as tests_config
+    from st2common.database_setup import db_setup
+
+    tests_config.parse_args(coordinator_noop=True)
+
+    cfg.CONF.set_override(name='db_name', override=BENCHMARK_DB_NAME, group='database')
+    cfg.CONF.set_override(name='url', override='memory://', group='messaging')
+
+    if use_db:
+        db_setup(ensure_indexes=True)
+
+
+def teardown_benchmarks():
+    from st2common.database_setup import db_teardown
+
+    db_teardown()
+
+
+def run_benchmarks(benchmark_classes, name_filter=None, rounds=None, output_func=None):
+    """
+    Run benchmarks and return a list of results.
+
+    :param name_filter: Optional substring which needs to be part of the full benchmark name
+                        (<group>.<name>) for the benchmark to run.
+    :type name_filter: ``str``
+
+    :param rounds: Optional number of rounds which overrides the value defined on the class.
+    :type rounds: ``int``
+
+    :rtype: ``list`` of ``dict``
+    """
+    results = []
+
+    for benchmark_cls in benchmark_classes:
+        names = benchmark_cls.get_benchmark_names()
+        names = [name for name in names
+                 if not name_filter or name_filter in benchmark_cls.get_full_name(name)]
+
+        if not names:
+            continue
+
+        benchmark = benchmark_cls()
+        benchmark.setUp()
+
+        try:
+            for name in names:
+                durations = _run_benchmark(benchmark=benchmark, name=name,
+                                           rounds=rounds or benchmark_cls.rounds,
+                                           warmup_rounds=benchmark_cls.warmup_rounds)
+
+                result = {
+                    'group': benchmark_cls.group,
+                    'name': name,
+                    'fullname': benchmark_cls.get_full_name(name),
+                    'params': benchmark_cls.params,
+                    'stats': _get_stats(durations),
+                    'extra_info': benchmark.get_extra_info(name)
+                }
+                results.append(result)
+
+                if output_func:
+                    output_func(result)
+        finally:
+            benchmark.tearDown()
+
+    return results
+
+
+def get_report(results):
+    """
+    Return report in the pytest-benchmark JSON layout.
+
+    :rtype: ``dict``
+    """
+    from st2common import __version__
+
+    return {
+        'machine_info': {
+            'node': socket.gethostname(),
+            'machine': platform.machine(),
+            'system': platform.system(),
+            'release': platform.release(),
+            'python_implementation': platform.python_implementation(),
+            'python_version': platform.python_version(),
+            'cpu_count': multiprocessing.cpu_count()
+        },
+        'commit_info': _get_commit_info(),
+        'datetime': get_datetime_utc_now().isoformat(),
+        'version': __version__,
+        'benchmarks': results
+    }
+
+
+def compare_reports(baseline, current, threshold=0.1, stat='median'):
+    """
+    Compare two reports and return comparison for each benchmark which is present in both
+    reports.
+
+    Benchmark is marked as a regression if the compared stat in the current report is more than
+    threshold (relative) slower than in the baseline report. Benchmarks with different fixture
+    parameters are not compared.
+
+    :rtype: ``list`` of ``dict``
+    """
+    baseline_benchmarks = dict([(item['fullname'], item) for item in baseline['benchmarks']])
+
+    result = []
+
+    for item in current['benchmarks']:
+        baseline_item = baseline_benchmarks.get(item['fullname'], None)
+
+        if not baseline_item or baseline_item.get('params', {}) != item.get('params', {}):
+            continue
+
+        baseline_value = baseline_item['stats'][stat]
+        current_value = item['stats'][stat]
+        change = ((current_value - baseline_value) / baseline_value) if baseline_value else 0.0
+
+        result.append({
+            'fullname': item['fullname'],
+            'baseline': baseline_value,
+            'current': current_value,
+            'change': change,
+            'regression': change > threshold
+        })
+
+    return result
+
+
+def _run_benchmark(benchmark, name, rounds, warmup_rounds):
+    benchmark_func = getattr(benchmark, BENCHMARK_METHOD_PREFIX + name)
+    prepare_func = getattr(benchmark, PREPARE_METHOD_PREFIX + name, None)
+
+    durations = []
+
+    for index in range(0, warmup_rounds + rounds):
+        if prepare_func:
+            prepare_func()
+
+        # Garbage collection is disabled while timing to reduce the variance between the rounds
+        gc.collect()
+        gc.disable()
+
+        try:
+            start_time = default_timer()
+            benchmark_func()
+            duration = default_timer() - start_time
+        finally:
+            gc.enable()
+
+        if index >= warmup_rounds:
+            durations.append(duration)
+
+    return durations
+
+
+def _get_stats(durations):
+    durations = sorted(durations)
+    count = len(durations)
+
+    mean = sum(durations) / count
+    middle = count // 2
+    median = durations[middle] if count % 2 else (durations[middle - 1] + durations[middle]) / 2
+
+    if count > 1:
+        stddev = math.sqrt(sum([(value - mean) ** 2 for value in durations]) / (count - 1))
+    else:
+        stddev = 0.0
+
+    return {
+        'min': durations[0],
+        'max': durations[-1],
+        'mean': mean,
+        'median': median,
+        'stddev': stddev,
+        'rounds': count,
+        'iterations': 1,
+        'ops': (1.0 / mean) if mean else 0.0
+    }
+
+
+def _get_commit_info():
+    try:
+        commit_id = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                            stderr=subprocess.STDOUT).strip()
+        status = subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                         stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return {'id': None, 'dirty': None}
+
+    return {'id': commit_id.decode('utf-8'), 'dirty': bool(status.strip())}
+
+
+def _drop_database():
+    from mongoengine.connection import get_db
+
+    db = get_db()
+    for collection_name in db.list_collection_names():
+        if not collection_name.startswith('system.'):
+            db.drop_collection(collection_name)
+
+    # Indexes are dropped together with the collections so they are re-created here
+    from st2common.models.db import db_ensure_indexes
+    db_ensure_indexes()
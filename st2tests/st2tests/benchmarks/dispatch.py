@@ -0,0 +1,158 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Action runner dispatch benchmarks - resolving action, runner type, pack config and auth token
+which are needed before the execution is handed to the runner.
+
+Number of database round-trips per execution is included in the report (extra_info).
+"""
+
+from __future__ import absolute_import
+
+import bson
+from oslo_config import cfg
+from pymongo import monitoring
+
+from st2actions.container.base import RunnerContainer
+from st2actions.container.cache import DispatchContextCache
+from st2common.models.db.action import ActionDB
+from st2common.models.db.keyvalue import KeyValuePairDB
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.models.db.pack import ConfigDB
+from st2common.models.db.pack import ConfigSchemaDB
+from st2common.models.db.runner import RunnerTypeDB
+from st2common.persistence.action import Action
+from st2common.persistence.keyvalue import KeyValuePair
+from st2common.persistence.pack import Config
+from st2common.persistence.pack import ConfigSchema
+from st2common.persistence.runner import RunnerType
+from st2tests.benchmarks.base import BaseDbBenchmark
+
+__all__ = [
+    'DispatchContextBenchmark'
+]
+
+EXECUTIONS_COUNT = 100
+
+ACTION_REF = 'benchmark.python'
+
+
+class DatabaseCommandCounter(monitoring.CommandListener):
+    """
+    Counts commands sent to the database.
+
+    NOTE: Listener needs to be registered before the database connection is established.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+COMMAND_COUNTER = DatabaseCommandCounter()
+monitoring.register(COMMAND_COUNTER)
+
+
+class DispatchContextBenchmark(BaseDbBenchmark):
+    group = 'dispatch'
+    rounds = 10
+    params = {
+        'executions_count': EXECUTIONS_COUNT
+    }
+
+    def setUp(self):
+        super(DispatchContextBenchmark, self).setUp()
+
+        runner_type_db = RunnerTypeDB(name='python-script', runner_module='python_runner',
+                                      runner_parameters={'env': {'type': 'object'}})
+        RunnerType.add_or_update(runner_type_db, publish=False, dispatch_trigger=False)
+
+        action_db = ActionDB(pack='benchmark', name='python', entry_point='action.py',
+                             runner_type={'name': 'python-script'},
+                             parameters={'count': {'type': 'integer', 'default': 1}})
+        Action.add_or_update(action_db, publish=False, dispatch_trigger=False)
+
+        config_schema_db = ConfigSchemaDB(pack='benchmark', attributes={
+            'api_key': {'type': 'string', 'secret': True, 'required': True},
+            'region': {'type': 'string', 'default': 'us-east-1'}
+        })
+        ConfigSchema.add_or_update(config_schema_db, publish=False, dispatch_trigger=False)
+
+        config_db = ConfigDB(pack='benchmark',
+                             values={'api_key': '{{ st2kv.system.benchmark_api_key }}'})
+        Config.add_or_update(config_db, publish=False, dispatch_trigger=False)
+
+        kvp_db = KeyValuePairDB(name='benchmark_api_key', value='secret')
+        KeyValuePair.add_or_update(kvp_db, publish=False, dispatch_trigger=False)
+
+        self.container = RunnerContainer()
+        self.liveaction_db = LiveActionDB(id=bson.ObjectId(), action=ACTION_REF,
+                                          context={'user': 'stanley'})
+
+    def tearDown(self):
+        cfg.CONF.clear_override(name='execution_token_signing_key', group='auth')
+        super(DispatchContextBenchmark, self).tearDown()
+
+    def prepare_resolve_context_uncached(self):
+        self._configure(cache_size=0, signing_key=None)
+
+    def benchmark_resolve_context_uncached(self):
+        for index in range(0, EXECUTIONS_COUNT):
+            self._resolve_context()
+
+    def prepare_resolve_context_cached(self):
+        self._configure(cache_size=1000, signing_key='benchmark')
+
+    def benchmark_resolve_context_cached(self):
+        for index in range(0, EXECUTIONS_COUNT):
+            self._resolve_context()
+
+    def get_extra_info(self, name):
+        getattr(self, 'prepare_' + name)()
+
+        # Warm up the cache so only the steady state is measured
+        self._resolve_context()
+
+        count = COMMAND_COUNTER.count
+        self._resolve_context()
+
+        return {
+            'db_round_trips_per_execution': COMMAND_COUNTER.count - count
+        }
+
+    def _configure(self, cache_size, signing_key):
+        self.cache = DispatchContextCache(size=cache_size)
+        cfg.CONF.set_override(name='execution_token_signing_key', override=signing_key,
+                              group='auth')
+
+    def _resolve_context(self):
+        # Same steps as RunnerContainer.dispatch() performs before the runner is invoked
+        action_db = self.cache.get_action(ACTION_REF)
+        self.cache.get_runner_type(action_db.runner_type['name'])
+        self.cache.get_config(pack=action_db.pack, user='stanley')
+
+        token_db = self.container._create_auth_token(context=self.liveaction_db.context,
+                                                     action_db=action_db,
+                                                     liveaction_db=self.liveaction_db)
+        self.container._delete_auth_token(token_db)
@@ -0,0 +1,113 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Exporter benchmarks - write throughput of the streaming exporter (line delimited JSON) with and
+without compression.
+
+Number of documents written per second is included in the report (extra_info).
+
+NOTE: Exporter module needs to be importable (st2exporter in PYTHONPATH).
+"""
+
+from __future__ import absolute_import
+
+import shutil
+import tempfile
+import datetime
+
+from six.moves import queue
+
+from st2common.models.api.execution import ActionExecutionAPI
+from st2common.util import isotime
+from st2tests.benchmarks.base import BaseBenchmark
+from st2tests.benchmarks.base import default_timer
+
+__all__ = [
+    'ExporterBenchmark'
+]
+
+DOCUMENTS_COUNT = 5000
+
+RESULT_SIZE = 1024
+
+
+class ExporterBenchmark(BaseBenchmark):
+    group = 'exporter'
+    rounds = 5
+    params = {
+        'documents_count': DOCUMENTS_COUNT,
+        'result_size': RESULT_SIZE
+    }
+
+    def setUp(self):
+        super(ExporterBenchmark, self).setUp()
+
+        self.export_dir = tempfile.mkdtemp()
+        self.compression = None
+
+        end_timestamp = datetime.datetime(2018, 1, 1)
+        self.documents = []
+
+        for index in range(0, DOCUMENTS_COUNT):
+            end_timestamp += datetime.timedelta(seconds=1)
+            self.documents.append(ActionExecutionAPI(
+                id='%024x' % (index),
+                action={'ref': 'core.local'},
+                status='succeeded',
+                start_timestamp=isotime.format(end_timestamp, offset=False),
+                end_timestamp=isotime.format(end_timestamp, offset=False),
+                result={'stdout': 'a' * RESULT_SIZE, 'stderr': '', 'return_code': 0}))
+
+    def tearDown(self):
+        shutil.rmtree(self.export_dir)
+        super(ExporterBenchmark, self).tearDown()
+
+    def prepare_write_jsonl(self):
+        self.compression = 'none'
+
+    def benchmark_write_jsonl(self):
+        self._write_documents()
+
+    def prepare_write_jsonl_gzip(self):
+        self.compression = 'gzip'
+
+    def benchmark_write_jsonl_gzip(self):
+        self._write_documents()
+
+    def get_extra_info(self, name):
+        getattr(self, 'prepare_' + name)()
+
+        start = default_timer()
+        self._write_documents()
+        duration = default_timer() - start
+
+        return {
+            'documents_per_second': round(DOCUMENTS_COUNT / duration, 1)
+        }
+
+    def _write_documents(self):
+        from st2exporter.exporter.dumper import StreamingDumper
+
+        dumper = StreamingDumper(queue=queue.Queue(), export_dir=self.export_dir,
+                                 compression=self.compression)
+
+        # Only the file writes are measured
+        dumper._write_marker_to_db = lambda new_marker: None
+
+        for document in self.documents:
+            dumper._write_item(document)
+
+        dumper._rotate()
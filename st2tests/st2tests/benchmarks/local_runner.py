@@ -0,0 +1,115 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local runner benchmarks - throughput of tiny "core.local" commands executed through a shell and
+executed directly (local_runner.direct_exec).
+
+Number of commands per second is included in the report (extra_info).
+
+NOTE: Local runner module needs to be importable (contrib/runners/local_runner in PYTHONPATH).
+"""
+
+from __future__ import absolute_import
+
+import uuid
+
+from oslo_config import cfg
+
+from st2common.models.db.action import ActionDB
+from st2tests.benchmarks.base import BaseBenchmark
+from st2tests.benchmarks.base import default_timer
+
+__all__ = [
+    'LocalRunnerBenchmark'
+]
+
+COMMANDS_COUNT = 50
+
+COMMAND = 'uname -s'
+
+
+class LocalRunnerBenchmark(BaseBenchmark):
+    group = 'local_runner'
+    rounds = 5
+    params = {
+        'commands_count': COMMANDS_COUNT,
+        'command': COMMAND
+    }
+
+    def setUp(self):
+        super(LocalRunnerBenchmark, self).setUp()
+
+        from local_runner import base as local_runner
+
+        self.action_db = ActionDB(pack='benchmark', name='local', entry_point='',
+                                  runner_type={'name': 'local-shell-cmd'})
+
+        # Commands which need sudo are never executed directly
+        cfg.CONF.set_override(name='user', override=local_runner.LOGGED_USER_USERNAME,
+                              group='system_user')
+        cfg.CONF.set_override(name='stream_output', override=False, group='actionrunner')
+
+    def tearDown(self):
+        cfg.CONF.clear_override(name='direct_exec', group='local_runner')
+        cfg.CONF.clear_override(name='user', group='system_user')
+        cfg.CONF.clear_override(name='stream_output', group='actionrunner')
+        super(LocalRunnerBenchmark, self).tearDown()
+
+    def prepare_run_command_shell(self):
+        cfg.CONF.set_override(name='direct_exec', override=False, group='local_runner')
+
+    def benchmark_run_command_shell(self):
+        self._run_commands()
+
+    def prepare_run_command_direct_exec(self):
+        cfg.CONF.set_override(name='direct_exec', override=True, group='local_runner')
+
+    def benchmark_run_command_direct_exec(self):
+        self._run_commands()
+
+    def get_extra_info(self, name):
+        getattr(self, 'prepare_' + name)()
+
+        start = default_timer()
+        self._run_commands()
+        duration = default_timer() - start
+
+        return {
+            'commands_per_second': round(COMMANDS_COUNT / duration, 1)
+        }
+
+    def _run_commands(self):
+        for index in range(0, COMMANDS_COUNT):
+            status, result, _ = self._run_command()
+
+            if not result['succeeded']:
+                raise Exception('Command failed: %s' % (result))
+
+    def _run_command(self):
+        from local_runner.local_shell_command_runner import LocalShellCommandRunner
+        from local_runner.base import RUNNER_COMMAND
+
+        runner = LocalShellCommandRunner(uuid.uuid4().hex)
+        runner.action = self.action_db
+        runner.action_name = self.action_db.name
+        runner.liveaction_id = uuid.uuid4().hex
+        runner.execution_id = uuid.uuid4().hex
+        runner.runner_parameters = {RUNNER_COMMAND: COMMAND}
+        runner.context = {}
+        runner.callback = {}
+
+        runner.pre_run()
+        return runner.run({})
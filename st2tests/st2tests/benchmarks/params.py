@@ -0,0 +1,99 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Action parameter rendering benchmarks.
+"""
+
+from __future__ import absolute_import
+
+from st2common.models.db.keyvalue import KeyValuePairDB
+from st2common.persistence.keyvalue import KeyValuePair
+from st2common.util import param as param_utils
+from st2tests.benchmarks.base import BaseDbBenchmark
+
+__all__ = [
+    'ParameterRenderingBenchmark'
+]
+
+PARAMETERS_COUNT = 50
+
+
+def get_parameters(count=PARAMETERS_COUNT):
+    """
+    Return runner and action parameter schemas and live parameters which mix plain values,
+    defaults, Jinja references between the parameters and datastore lookups.
+    """
+    runner_parameters = {
+        'cmd': {'type': 'string'},
+        'hosts': {'type': 'string'},
+        'timeout': {'type': 'integer', 'default': 60},
+        'env': {'type': 'object', 'default': {}},
+        'sudo': {'type': 'boolean', 'default': False}
+    }
+
+    action_parameters = {}
+    params = {}
+
+    for index in range(0, count):
+        name = 'param_%s' % (index)
+
+        if index % 4 == 0:
+            action_parameters[name] = {'type': 'string', 'default': 'value %s' % (index)}
+        elif index % 4 == 1:
+            action_parameters[name] = {'type': 'string',
+                                       'default': '{{ param_%s }}-suffix' % (index - 1)}
+        elif index % 4 == 2:
+            action_parameters[name] = {'type': 'integer'}
+            params[name] = str(index)
+        else:
+            action_parameters[name] = {'type': 'string',
+                                       'default': '{{ st2kv.system.benchmark_key_%s }}' % (index)}
+
+    action_parameters['cmd'] = {'type': 'string',
+                                'default': 'echo {{ param_0 }} {{ param_1 }} {{ param_3 }}'}
+    params['hosts'] = 'host1,host2'
+
+    return runner_parameters, action_parameters, params
+
+
+class ParameterRenderingBenchmark(BaseDbBenchmark):
+    group = 'params'
+    rounds = 20
+    params = {
+        'parameters_count': PARAMETERS_COUNT
+    }
+
+    def setUp(self):
+        super(ParameterRenderingBenchmark, self).setUp()
+
+        for index in range(0, PARAMETERS_COUNT):
+            kvp_db = KeyValuePairDB(name='benchmark_key_%s' % (index), value='kv %s' % (index))
+            KeyValuePair.add_or_update(kvp_db, publish=False, dispatch_trigger=False)
+
+        self.runner_parameters, self.action_parameters, self.live_params = get_parameters()
+        self.action_context = {'pack': 'benchmark', 'user': 'stanley'}
+
+    def benchmark_render_live_params(self):
+        param_utils.render_live_params(self.runner_parameters, self.action_parameters,
+                                       self.live_params, self.action_context)
+
+    def prepare_render_final_params(self):
+        self.rendered_params = param_utils.render_live_params(
+            self.runner_parameters, self.action_parameters, self.live_params, self.action_context)
+
+    def benchmark_render_final_params(self):
+        param_utils.render_final_params(self.runner_parameters, self.action_parameters,
+                                        self.rendered_params, self.action_context)
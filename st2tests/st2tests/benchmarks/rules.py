@@ -0,0 +1,167 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Rules engine benchmarks - matching a trigger instance against a large number of rules.
+"""
+
+from __future__ import absolute_import
+
+from st2common.models.db.rule import RuleDB
+from st2common.models.db.rule import ActionExecutionSpecDB
+from st2common.models.db.trigger import TriggerDB
+from st2common.models.db.trigger import TriggerInstanceDB
+from st2common.models.db.trigger import TriggerTypeDB
+from st2common.persistence.trigger import Trigger
+from st2common.persistence.trigger import TriggerType
+from st2common.util import date as date_utils
+from st2common.util.payload import PayloadLookup
+from st2reactor.rules.engine import RulesEngine
+from st2reactor.rules.matcher import RulesMatcher
+from st2tests.benchmarks.base import BaseBenchmark
+from st2tests.benchmarks.base import BaseDbBenchmark
+
+__all__ = [
+    'RulesMatcherBenchmark',
+    'RulesEngineBenchmark'
+]
+
+RULES_COUNT = 10000
+HOSTS_COUNT = 100
+PAYLOAD_ITEMS_COUNT = 1000
+
+TRIGGER_REF = 'benchmark.event'
+
+
+def get_payload(host_index=7):
+    return {
+        'host': 'host-%s.example.com' % (host_index),
+        'severity': 'critical',
+        'message': 'Disk usage on /var is above 90%',
+        'tags': ['disk', 'production', 'storage'],
+        'items': [{'name': 'item-%s' % (index), 'status': 'ok' if index % 10 else 'failed',
+                   'value': index} for index in range(0, PAYLOAD_ITEMS_COUNT)]
+    }
+
+
+def get_rules(count=RULES_COUNT):
+    """
+    Return a realistic mix of rules for a single trigger - most of the rules filter on the host
+    and only a couple of them match.
+    """
+    rules = []
+
+    for index in range(0, count):
+        host_index = index % HOSTS_COUNT
+
+        criteria = {
+            'trigger.host': {
+                'type': 'equals',
+                'pattern': 'host-%s.example.com' % (host_index)
+            },
+            'trigger.severity': {
+                'type': 'iequals',
+                'pattern': 'CRITICAL'
+            }
+        }
+
+        if index % 3 == 0:
+            criteria['trigger.message'] = {
+                'type': 'regex',
+                'pattern': '^Disk usage on .* is above \\d+%$'
+            }
+
+        if index % 5 == 0:
+            criteria['trigger.items'] = {
+                'type': 'search',
+                'condition': 'any',
+                'pattern': {
+                    'item.status': {
+                        'type': 'equals',
+                        'pattern': 'failed'
+                    }
+                }
+            }
+
+        rule_type = 'backstop' if index % 100 == 0 else 'standard'
+        rule = RuleDB(pack='benchmark', name='rule_%s' % (index), criteria=criteria,
+                      trigger=TRIGGER_REF, type={'ref': rule_type, 'parameters': {}},
+                      action=ActionExecutionSpecDB(ref='core.local', parameters={'cmd': 'date'}),
+                      enabled=True)
+        rules.append(rule)
+
+    return rules
+
+
+class RulesMatcherBenchmark(BaseBenchmark):
+    group = 'rules'
+    rounds = 5
+    params = {
+        'rules_count': RULES_COUNT,
+        'payload_items_count': PAYLOAD_ITEMS_COUNT
+    }
+
+    def setUp(self):
+        self.trigger = {'name': 'event', 'pack': 'benchmark', 'ref': TRIGGER_REF}
+        self.trigger_instance = TriggerInstanceDB(trigger=TRIGGER_REF, payload=get_payload(),
+                                                  occurrence_time=date_utils.get_datetime_utc_now())
+        self.rules = get_rules()
+
+    def benchmark_rules_matcher(self):
+        matcher = RulesMatcher(trigger_instance=self.trigger_instance, trigger=self.trigger,
+                               rules=self.rules)
+        matching_rules = matcher.get_matching_rules()
+        assert len(matching_rules) == RULES_COUNT // HOSTS_COUNT
+
+    def benchmark_payload_lookup(self):
+        lookup = PayloadLookup(self.trigger_instance.payload)
+
+        for index in range(0, 100):
+            lookup.get_value('trigger.host')
+            lookup.get_value('trigger.items[%s].status' % (index))
+
+
+class RulesEngineBenchmark(BaseDbBenchmark):
+    """
+    Rules engine trigger instance processing with the rules stored in the database.
+    """
+
+    group = 'rules'
+    rounds = 5
+    params = {
+        'rules_count': RULES_COUNT,
+        'payload_items_count': PAYLOAD_ITEMS_COUNT
+    }
+
+    def setUp(self):
+        super(RulesEngineBenchmark, self).setUp()
+
+        trigger_type_db = TriggerTypeDB(pack='benchmark', name='event', payload_schema={},
+                                        parameters_schema={})
+        TriggerType.add_or_update(trigger_type_db, publish=False, dispatch_trigger=False)
+
+        trigger_db = TriggerDB(pack='benchmark', name='event', type='benchmark.event',
+                               parameters={})
+        Trigger.add_or_update(trigger_db, publish=False, dispatch_trigger=False)
+
+        RuleDB.objects.insert(get_rules(), load_bulk=False)
+
+        self.trigger_instance = TriggerInstanceDB(trigger=TRIGGER_REF, payload=get_payload(),
+                                                  occurrence_time=date_utils.get_datetime_utc_now())
+        self.rules_engine = RulesEngine()
+
+    def benchmark_get_matching_rules_for_trigger(self):
+        matching_rules = self.rules_engine.get_matching_rules_for_trigger(self.trigger_instance)
+        assert len(matching_rules) == RULES_COUNT // HOSTS_COUNT
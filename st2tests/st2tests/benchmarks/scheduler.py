@@ -0,0 +1,110 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Action execution scheduler benchmarks - placing requests into the scheduling queue and
+scheduling the queued requests.
+"""
+
+from __future__ import absolute_import
+
+from st2actions.scheduler import entrypoint as scheduler_entrypoint
+from st2actions.scheduler import handler as scheduler_handler
+from st2common.constants import action as action_constants
+from st2common.models.db.action import ActionDB
+from st2common.models.db.execution_queue import ActionExecutionSchedulingQueueItemDB
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.models.db.runner import RunnerTypeDB
+from st2common.persistence.action import Action
+from st2common.persistence.execution_queue import ActionExecutionSchedulingQueue
+from st2common.persistence.liveaction import LiveAction
+from st2common.persistence.runner import RunnerType
+from st2common.services import executions as execution_service
+from st2tests.benchmarks.base import BaseDbBenchmark
+
+__all__ = [
+    'SchedulerBenchmark'
+]
+
+REQUESTS_COUNT = 100
+
+ACTION_REF = 'benchmark.local'
+
+
+class SchedulerBenchmark(BaseDbBenchmark):
+    group = 'scheduler'
+    rounds = 5
+    params = {
+        'requests_count': REQUESTS_COUNT
+    }
+
+    def setUp(self):
+        super(SchedulerBenchmark, self).setUp()
+
+        runner_type_db = RunnerTypeDB(name='local-shell-cmd', runner_module='local_runner',
+                                      runner_parameters={'cmd': {'type': 'string'}})
+        RunnerType.add_or_update(runner_type_db, publish=False, dispatch_trigger=False)
+
+        action_db = ActionDB(pack='benchmark', name='local', entry_point='',
+                             runner_type={'name': 'local-shell-cmd'},
+                             parameters={'sleep': {'type': 'integer', 'default': 1}})
+        Action.add_or_update(action_db, publish=False, dispatch_trigger=False)
+
+        self.entrypoint = scheduler_entrypoint.get_scheduler_entrypoint()
+        self.handler = scheduler_handler.get_handler()
+
+    def prepare_enqueue(self):
+        self._clear_queue()
+        self.liveaction_dbs = self._create_liveaction_dbs()
+
+    def benchmark_enqueue(self):
+        for liveaction_db in self.liveaction_dbs:
+            self.entrypoint.process(liveaction_db)
+
+    def prepare_schedule(self):
+        self._clear_queue()
+
+        for liveaction_db in self._create_liveaction_dbs():
+            self.entrypoint.process(liveaction_db)
+
+    def benchmark_schedule(self):
+        scheduled_count = 0
+
+        while True:
+            execution_queue_item_db = self.handler._get_next_execution()
+
+            if not execution_queue_item_db:
+                break
+
+            self.handler._handle_execution(execution_queue_item_db)
+            scheduled_count += 1
+
+        assert scheduled_count == REQUESTS_COUNT
+        assert ActionExecutionSchedulingQueue.count() == 0
+
+    def _clear_queue(self):
+        ActionExecutionSchedulingQueueItemDB.objects.delete()
+
+    def _create_liveaction_dbs(self):
+        liveaction_dbs = []
+
+        for index in range(0, REQUESTS_COUNT):
+            liveaction_db = LiveActionDB(action=ACTION_REF, parameters={'sleep': index},
+                                         status=action_constants.LIVEACTION_STATUS_REQUESTED)
+            liveaction_db = LiveAction.add_or_update(liveaction_db, publish=False)
+            execution_service.create_execution_object(liveaction_db, publish=False)
+            liveaction_dbs.append(liveaction_db)
+
+        return liveaction_dbs
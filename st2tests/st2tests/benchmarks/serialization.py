@@ -0,0 +1,113 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+API serialization and database persistence benchmarks for executions with large results.
+"""
+
+from __future__ import absolute_import
+
+import copy
+
+from st2common.constants import action as action_constants
+from st2common.models.api.execution import ActionExecutionAPI
+from st2common.models.db.execution import ActionExecutionDB
+from st2common.persistence.execution import ActionExecution
+from st2common.util import date as date_utils
+from st2common.util import jsonify
+from st2tests.benchmarks.base import BaseDbBenchmark
+
+__all__ = [
+    'ExecutionSerializationBenchmark'
+]
+
+RESULT_ITEMS_COUNT = 10000
+
+
+def get_result(count=RESULT_ITEMS_COUNT):
+    """
+    Return a large execution result similar to the result of an action which lists resources
+    (roughly 2 MB when serialized).
+    """
+    items = []
+
+    for index in range(0, count):
+        items.append({
+            'id': 'i-%08d' % (index),
+            'name': 'instance-%s' % (index),
+            'state': 'running',
+            'tags': {'env': 'production', 'team.name': 'ops', '$owner': 'stanley'},
+            'ips': ['10.0.%s.%s' % (index // 256 % 256, index % 256)],
+            'cpu_usage': index / 100.0
+        })
+
+    return {
+        'succeeded': True,
+        'failed': False,
+        'return_code': 0,
+        'stderr': '',
+        'stdout': {'items': items}
+    }
+
+
+def get_execution_db():
+    now = date_utils.get_datetime_utc_now()
+
+    return ActionExecutionDB(
+        action={'ref': 'benchmark.list_instances', 'runner_type': 'python-script',
+                'parameters': {'password': {'type': 'string', 'secret': True}}},
+        runner={'name': 'python-script', 'runner_parameters': {}},
+        liveaction={'action': 'benchmark.list_instances', 'parameters': {}},
+        status=action_constants.LIVEACTION_STATUS_SUCCEEDED,
+        start_timestamp=now,
+        end_timestamp=now,
+        parameters={'region': 'us-east-1', 'password': 'secret'},
+        result=get_result(),
+        context={'user': 'stanley'})
+
+
+class ExecutionSerializationBenchmark(BaseDbBenchmark):
+    group = 'serialization'
+    rounds = 5
+    params = {
+        'result_items_count': RESULT_ITEMS_COUNT
+    }
+
+    def setUp(self):
+        super(ExecutionSerializationBenchmark, self).setUp()
+
+        self.execution_db = get_execution_db()
+        self.execution_api = ActionExecutionAPI.from_model(self.execution_db)
+
+        persisted_execution_db = ActionExecution.add_or_update(copy.deepcopy(self.execution_db),
+                                                               publish=False,
+                                                               dispatch_trigger=False)
+        self.execution_id = str(persisted_execution_db.id)
+
+    def benchmark_from_model(self):
+        ActionExecutionAPI.from_model(self.execution_db, mask_secrets=True)
+
+    def benchmark_json_encode(self):
+        jsonify.json_encode(self.execution_api.__json__())
+
+    def prepare_db_insert(self):
+        self.new_execution_db = copy.deepcopy(self.execution_db)
+
+    def benchmark_db_insert(self):
+        ActionExecution.add_or_update(self.new_execution_db, publish=False,
+                                      dispatch_trigger=False)
+
+    def benchmark_db_get_by_id(self):
+        ActionExecution.get_by_id(self.execution_id)
@@ -0,0 +1,94 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Stream service fan-out benchmarks - delivering execution events to many connected clients.
+"""
+
+from __future__ import absolute_import
+
+import bson
+
+from st2common.models.api.execution import ActionExecutionAPI
+from st2common.stream.listener import StreamListener
+from st2stream.controllers.v1.stream import DEFAULT_EVENTS_WHITELIST
+from st2stream.controllers.v1.stream import format as format_events
+from st2tests.benchmarks.base import BaseBenchmark
+from st2tests.benchmarks.serialization import get_execution_db
+
+__all__ = [
+    'StreamFanOutBenchmark'
+]
+
+CLIENTS_COUNT = 500
+EVENTS_COUNT = 50
+
+
+class MockMessage(object):
+    delivery_info = {
+        'exchange': 'st2.execution',
+        'routing_key': 'update'
+    }
+
+    def ack(self):
+        pass
+
+
+class StreamFanOutBenchmark(BaseBenchmark):
+    group = 'stream'
+    rounds = 5
+    params = {
+        'clients_count': CLIENTS_COUNT,
+        'events_count': EVENTS_COUNT
+    }
+
+    def setUp(self):
+        self.execution_db = get_execution_db()
+        self.execution_db.id = bson.ObjectId()
+
+        # Executions which are sent to the stream usually have small results
+        self.execution_db.result = {'stdout': 'ok', 'stderr': '', 'return_code': 0}
+
+    def prepare_fan_out(self):
+        # Disconnect clients from the previous round
+        for client in getattr(self, 'clients', []):
+            client.close()
+
+        self.listener = StreamListener(connection=None)
+        self.clients = []
+
+        for index in range(0, CLIENTS_COUNT):
+            # Half of the clients filter on the action ref
+            action_refs = ['benchmark.list_instances'] if index % 2 else None
+            generator = self.listener.generator(events=DEFAULT_EVENTS_WHITELIST,
+                                                action_refs=action_refs)
+            client = format_events(generator)
+
+            # Initial heartbeat which registers the client queue
+            next(client)
+            self.clients.append(client)
+
+    def benchmark_fan_out(self):
+        process = self.listener.processor(ActionExecutionAPI)
+        message = MockMessage()
+
+        for _ in range(0, EVENTS_COUNT):
+            process(self.execution_db, message)
+
+        for client in self.clients:
+            for _ in range(0, EVENTS_COUNT):
+                next(client)
+
+        assert self.listener.get_stats()['queued_events'] == 0
@@ -0,0 +1,144 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Orquesta workflow conductor and workflow state persistence benchmarks for a large workflow.
+"""
+
+from __future__ import absolute_import
+
+import copy
+
+from orquesta import conducting
+from orquesta import events
+from orquesta import statuses
+from orquesta.specs import loader as specs_loader
+
+from st2common.models.db.workflow import WorkflowExecutionDB
+from st2common.persistence.workflow import WorkflowExecution
+from st2common.util import deltas
+from st2tests.benchmarks.base import BaseDbBenchmark
+
+__all__ = [
+    'WorkflowConductorBenchmark'
+]
+
+TASKS_COUNT = 1000
+
+
+def get_workflow_definition(count=TASKS_COUNT):
+    """
+    Return definition of a sequential workflow with the provided number of tasks.
+    """
+    tasks = {}
+
+    for index in range(0, count):
+        task = {
+            'action': 'core.noop',
+            'input': {'index': index}
+        }
+
+        if index < count - 1:
+            task['next'] = [{'when': '<% succeeded() %>', 'do': 'task%s' % (index + 1)}]
+
+        tasks['task%s' % (index)] = task
+
+    return {
+        'version': 1.0,
+        'input': ['count'],
+        'tasks': tasks
+    }
+
+
+def run_next_task(conductor, status=statuses.SUCCEEDED):
+    next_tasks = conductor.get_next_tasks()
+
+    for task in next_tasks:
+        conductor.update_task_state(task['id'], task['route'],
+                                    events.ActionExecutionEvent(statuses.RUNNING))
+
+        if status != statuses.RUNNING:
+            event = events.ActionExecutionEvent(status, result={'index': task['id']})
+            conductor.update_task_state(task['id'], task['route'], event)
+
+    return next_tasks
+
+
+class WorkflowConductorBenchmark(BaseDbBenchmark):
+    """
+    Benchmarks for a workflow execution with all but the last task completed and the last task
+    being started (the largest workflow state).
+    """
+
+    group = 'workflows'
+    rounds = 10
+    params = {
+        'tasks_count': TASKS_COUNT
+    }
+
+    def setUp(self):
+        super(WorkflowConductorBenchmark, self).setUp()
+
+        spec_module = specs_loader.get_spec_module('native')
+        wf_spec = spec_module.instantiate(get_workflow_definition())
+
+        conductor = conducting.WorkflowConductor(wf_spec, inputs={'count': TASKS_COUNT})
+        conductor.request_workflow_status(statuses.REQUESTED)
+        conductor.request_workflow_status(statuses.RUNNING)
+
+        for _ in range(0, TASKS_COUNT - 1):
+            run_next_task(conductor)
+
+        data = conductor.serialize()
+        self.old_state = copy.deepcopy(data['state'])
+
+        wf_ex_db = WorkflowExecutionDB(action_execution='benchmark', spec=data['spec'],
+                                       graph=data['graph'], input=data['input'],
+                                       context=data['context'], state=data['state'],
+                                       status=data['state']['status'], output=data['output'],
+                                       errors=[])
+        self.wf_ex_db = WorkflowExecution.add_or_update(wf_ex_db, publish=False,
+                                                        dispatch_trigger=False)
+
+        run_next_task(conductor, status=statuses.RUNNING)
+        self.conductor = conductor
+        self.data = conductor.serialize()
+
+        new_state = self.conductor.workflow_state.serialize()
+        self.set_fields, self.unset_fields = deltas.get_field_updates(self.old_state, new_state,
+                                                                      'state')
+
+    def benchmark_conductor_serialize(self):
+        self.conductor.serialize()
+
+    def benchmark_conductor_deserialize(self):
+        conducting.WorkflowConductor.deserialize(self.data)
+
+    def benchmark_state_delta(self):
+        new_state = self.conductor.workflow_state.serialize()
+        deltas.get_field_updates(self.old_state, new_state, 'state')
+
+    def benchmark_persist_delta(self):
+        self.wf_ex_db = WorkflowExecution.update_fields(self.wf_ex_db, set_fields=self.set_fields,
+                                                        unset_fields=self.unset_fields,
+                                                        publish=False, dispatch_trigger=False)
+
+    def benchmark_persist_full(self):
+        self.wf_ex_db.state = self.data['state']
+        self.wf_ex_db = WorkflowExecution.add_or_update(self.wf_ex_db, publish=False,
+                                                        dispatch_trigger=False)
+
+    def benchmark_get_latest_by_id(self):
+        WorkflowExecution.get_latest_by_id(str(self.wf_ex_db.id))
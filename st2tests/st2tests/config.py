@@ -293,7 +293,25 @@ def _register_exporter_opts():
     exporter_opts = [
         cfg.StrOpt(
             'dump_dir', default='/opt/stackstorm/exports/',
-            help='Directory to dump data to.')
+            help='Directory to dump data to.'),
+        cfg.StrOpt(
+            'file_format', default='json', choices=['json', 'jsonl'],
+            help='Format of the export files.'),
+        cfg.StrOpt(
+            'compression', default='gzip', choices=['none', 'gzip', 'zstd'],
+            help='Compression of the "jsonl" export files.'),
+        cfg.IntOpt(
+            'max_file_size', default=64 * 1024 * 1024,
+            help='"jsonl" export file is rotated once it reaches this size (uncompressed bytes).'),
+        cfg.IntOpt(
+            'max_file_age', default=300,
+            help='"jsonl" export file is rotated once it is older than this value (seconds).'),
+        cfg.IntOpt(
+            'queue_size', default=10000,
+            help='Maximum number of executions waiting to be written to "jsonl" export files.'),
+        cfg.IntOpt(
+            'bootstrap_batch_size', default=500,
+            help='Number of executions which are retrieved from the database at once.')
     ]
 
     _register_opts(exporter_opts, group='exporter')
@@ -324,6 +342,31 @@ def _register_sensor_container_opts():
 
     _register_opts(other_opts, group='sensorcontainer')
 
+    # Sensor process supervision options
+    supervision_opts = [
+        cfg.IntOpt(
+            'sensors_per_process', default=1,
+            help='Maximum number of sensors from the same pack to run inside a single sensor '
+                 'process. Running multiple sensors in a single process (each one in a separate '
+                 'green thread) considerably reduces memory usage and number of connections to '
+                 'the database and message bus. 1 means each sensor runs in a dedicated process.'),
+        cfg.IntOpt(
+            'resource_usage_check_interval', default=30,
+            help='How often (in seconds) to collect CPU and memory usage of the sensor processes '
+                 'and report it as metrics. 0 disables the collection.'),
+        cfg.IntOpt(
+            'max_sensor_memory_usage', default=0,
+            help='Maximum resident memory usage (in MB) of a single sensor process. Sensor '
+                 'processes which exceed this limit are restarted. 0 means no limit.'),
+        cfg.IntOpt(
+            'max_sensor_cpu_usage', default=0,
+            help='Maximum CPU usage (in percent of a single core, averaged over the resource '
+                 'usage check interval) of a single sensor process. Sensor processes which exceed '
+                 'this limit are restarted. 0 means no limit.')
+    ]
+
+    _register_opts(supervision_opts, group='sensorcontainer')
+
     # CLI options
     cli_opts = [
         cfg.StrOpt(
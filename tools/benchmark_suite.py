@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark suite for the critical execution pipeline (rules engine, scheduler, action runner
+dispatch, local runner command execution, parameter rendering, API serialization, stream fan-out,
+workflow conductor persistence, exporter write throughput and ChatOps action alias matching).
+
+Benchmarks use a local MongoDB instance (database "st2-benchmark" which is dropped before and
+after each benchmark class) and kombu in-memory transport instead of RabbitMQ.
+
+Usage:
+
+    # Run all the benchmarks and write the report
+    tools/benchmark_suite.py run --output benchmarks.json
+
+    # Run only the rules engine benchmarks
+    tools/benchmark_suite.py run --filter rules. --output rules.json
+
+    # Compare the report with a baseline and exit with non-zero status code if any benchmark
+    # is more than 10% slower
+    tools/benchmark_suite.py compare baseline.json benchmarks.json --threshold 0.1
+"""
+
+from __future__ import absolute_import
+from __future__ import print_function
+
+from st2common.util.monkey_patch import monkey_patch
+monkey_patch()
+
+import sys
+import json
+import argparse
+
+from st2tests.benchmarks import base
+from st2tests.benchmarks.action_alias import ActionAliasMatchingBenchmark
+from st2tests.benchmarks.dispatch import DispatchContextBenchmark
+from st2tests.benchmarks.exporter import ExporterBenchmark
+from st2tests.benchmarks.local_runner import LocalRunnerBenchmark
+from st2tests.benchmarks.params import ParameterRenderingBenchmark
+from st2tests.benchmarks.rules import RulesMatcherBenchmark
+from st2tests.benchmarks.rules import RulesEngineBenchmark
+from st2tests.benchmarks.scheduler import SchedulerBenchmark
+from st2tests.benchmarks.serialization import ExecutionSerializationBenchmark
+from st2tests.benchmarks.stream import StreamFanOutBenchmark
+from st2tests.benchmarks.workflows import WorkflowConductorBenchmark
+
+BENCHMARKS = [
+    RulesMatcherBenchmark,
+    RulesEngineBenchmark,
+    SchedulerBenchmark,
+    DispatchContextBenchmark,
+    LocalRunnerBenchmark,
+    ParameterRenderingBenchmark,
+    ExecutionSerializationBenchmark,
+    StreamFanOutBenchmark,
+    WorkflowConductorBenchmark,
+    ExporterBenchmark,
+    ActionAliasMatchingBenchmark
+]
+
+
+def print_result(result):
+    stats = result['stats']
+    print('%-50s min=%.4fs median=%.4fs mean=%.4fs max=%.4fs stddev=%.4fs rounds=%s' %
+          (result['fullname'], stats['min'], stats['median'], stats['mean'], stats['max'],
+           stats['stddev'], stats['rounds']))
+
+    for key, value in sorted(result.get('extra_info', {}).items()):
+        print('%-50s %s=%s' % ('', key, value))
+
+
+def run(name_filter=None, rounds=None, output=None):
+    benchmark_classes = BENCHMARKS
+
+    if name_filter:
+        benchmark_classes = [benchmark_cls for benchmark_cls in benchmark_classes
+                             if any([name_filter in benchmark_cls.get_full_name(name)
+                                     for name in benchmark_cls.get_benchmark_names()])]
+
+    use_db = any([benchmark_cls.requires_db for benchmark_cls in benchmark_classes])
+    base.setup_benchmarks(use_db=use_db)
+
+    try:
+        results = base.run_benchmarks(benchmark_classes=benchmark_classes,
+                                      name_filter=name_filter, rounds=rounds,
+                                      output_func=print_result)
+    finally:
+        if use_db:
+            base.teardown_benchmarks()
+
+    report = base.get_report(results)
+
+    if output:
+        with open(output, 'w') as fp:
+            json.dump(report, fp, indent=4, sort_keys=True)
+
+        print('Report written to %s' % (output))
+
+    return 0
+
+
+def compare(baseline_path, current_path, threshold=0.1, stat='median'):
+    with open(baseline_path, 'r') as fp:
+        baseline = json.load(fp)
+
+    with open(current_path, 'r') as fp:
+        current = json.load(fp)
+
+    comparisons = base.compare_reports(baseline=baseline, current=current, threshold=threshold,
+                                       stat=stat)
+
+    for item in comparisons:
+        print('%-50s baseline=%.4fs current=%.4fs change=%+.1f%%%s' %
+              (item['fullname'], item['baseline'], item['current'], item['change'] * 100,
+               ' REGRESSION' if item['regression'] else ''))
+
+    regressions = [item for item in comparisons if item['regression']]
+
+    if regressions:
+        print('%s benchmark(s) are more than %.1f%% slower than the baseline' %
+              (len(regressions), threshold * 100))
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='StackStorm benchmark suite')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks')
+    run_parser.add_argument('--filter', default=None,
+                            help='Only run benchmarks which full name (<group>.<name>) contains '
+                                 'this string')
+    run_parser.add_argument('--rounds', type=int, default=None,
+                            help='Override number of rounds for each benchmark')
+    run_parser.add_argument('--output', default=None,
+                            help='Path to the file JSON report is written to')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare report with a baseline')
+    compare_parser.add_argument('baseline', help='Path to the baseline report')
+    compare_parser.add_argument('current', help='Path to the current report')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='Maximum allowed relative slowdown (0.1 means 10%%)')
+    compare_parser.add_argument('--stat', default='median',
+                                choices=['min', 'median', 'mean'],
+                                help='Statistic which is compared')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        sys.exit(run(name_filter=args.filter, rounds=args.rounds, output=args.output))
+    elif args.command == 'compare':
+        sys.exit(compare(baseline_path=args.baseline, current_path=args.current,
+                         threshold=args.threshold, stat=args.stat))
+    else:
+        parser.print_help()
+        sys.exit(2)
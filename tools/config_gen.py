@@ -158,6 +158,14 @@ def _print_options(opt_group, options):
                 value = ''
 
             value += ' # comma separated list allowed here.'
+        elif isinstance(opt, cfg.DictOpt):
+            if opt.default:
+                value = ','.join(['%s:%s' % (key, opt.default[key])
+                                  for key in sorted(opt.default.keys())])
+            else:
+                value = ''
+
+            value += ' # comma separated list of key:value pairs allowed here.'
         else:
             value = opt.default
 
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tool which measures how much CPU time the rules engine and the workflow engine hot paths spend
+on logging with the provided log level.
+
+For the workflow engine, debug messages which include serialized conductor state are logged with
+the state serialized eagerly (old behavior) and lazily.
+
+No database or message bus connection is needed.
+"""
+
+from __future__ import absolute_import
+
+import os
+import time
+import logging as stdlib_logging
+import argparse
+
+from st2common import config
+from st2common import log as logging
+from st2common.logging.formatters import ConsoleLogFormatter
+from st2common.logging.formatters import GelfLogFormatter
+from st2common.models.db.rule import RuleDB
+from st2common.models.db.rule import ActionExecutionSpecDB
+from st2common.models.db.trigger import TriggerInstanceDB
+from st2reactor.rules.filter import RuleFilter
+
+LOG = logging.getLogger('st2.benchmark')
+
+get_cpu_time = getattr(time, 'process_time', None) or time.clock
+
+
+class MockConductor(object):
+    def __init__(self, count):
+        self._count = count
+
+    def serialize(self):
+        items = [{'status': 'succeeded', 'result': {'stdout': 'x' * 100}}
+                 for _ in range(0, self._count)]
+
+        return {
+            'spec': {'tasks': {'task1': {'action': 'core.noop', 'with': 'items'}}},
+            'state': {
+                'sequence': [{'id': 'task1', 'route': 0, 'items': items}],
+                'status': 'running'
+            }
+        }
+
+
+def setup_logging(level):
+    stream = open(os.devnull, 'w')
+
+    root = stdlib_logging.getLogger()
+    root.setLevel(level)
+
+    for formatter in [ConsoleLogFormatter(), GelfLogFormatter()]:
+        handler = stdlib_logging.StreamHandler(stream)
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+
+def get_rules(count):
+    rules = []
+
+    for index in range(0, count):
+        criteria = {
+            'trigger.value': {
+                'type': 'equals',
+                'pattern': 'value_%s' % (index)
+            }
+        }
+        rule = RuleDB(pack='benchmark', name='rule_%s' % (index), criteria=criteria,
+                      trigger='benchmark.trigger', action=ActionExecutionSpecDB(ref='core.local'))
+        rules.append(rule)
+
+    return rules
+
+
+def benchmark_rules_engine(count):
+    trigger = {'name': 'trigger', 'pack': 'benchmark'}
+    trigger_instance = TriggerInstanceDB(trigger='benchmark.trigger',
+                                         payload={'value': 'value_0', 'data': 'x' * 1000})
+    rules = get_rules(count=count)
+
+    start_time = get_cpu_time()
+    matched = 0
+
+    for rule in rules:
+        rule_filter = RuleFilter(trigger_instance=trigger_instance, trigger=trigger, rule=rule)
+        matched += int(rule_filter.filter())
+
+    duration = get_cpu_time() - start_time
+    print(' - rules engine: %s rules evaluated, %s matched, %.4fs CPU' %
+          (count, matched, duration))
+
+
+def benchmark_workflow_engine(count, items):
+    conductor = MockConductor(count=items)
+
+    start_time = get_cpu_time()
+    for _ in range(0, count):
+        LOG.debug('[%s] %s', 'wf_ex_id', conductor.serialize())
+    eager_duration = get_cpu_time() - start_time
+
+    start_time = get_cpu_time()
+    for _ in range(0, count):
+        LOG.debug('[%s] %s', 'wf_ex_id', logging.lazy(conductor.serialize))
+    lazy_duration = get_cpu_time() - start_time
+
+    print(' - workflow engine: %s conductor state debug messages (%s items), eager: %.4fs CPU, '
+          'lazy: %.4fs CPU' % (count, items, eager_duration, lazy_duration))
+
+
+def main(level, rules, messages, items):
+    config.register_opts(ignore_errors=True)
+    setup_logging(level=getattr(stdlib_logging, level))
+
+    print('Measuring logging overhead with log level %s' % (level))
+    benchmark_rules_engine(count=rules)
+    benchmark_workflow_engine(count=messages, items=items)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Logging overhead benchmark')
+    parser.add_argument('--level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING'],
+                        help='Log level to use')
+    parser.add_argument('--rules', type=int, default=5000,
+                        help='Number of rules to evaluate')
+    parser.add_argument('--messages', type=int, default=1000,
+                        help='Number of conductor state debug messages to log')
+    parser.add_argument('--items', type=int, default=100,
+                        help='Number of with items task items in the conductor state')
+    args = parser.parse_args()
+
+    main(level=args.level, rules=args.rules, messages=args.messages, items=args.items)
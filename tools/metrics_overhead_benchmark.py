@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tool which measures overhead of a single instrumented call (CounterWithTimer and Timer
+decorators which wrap hot paths such as "rule.processed" and "amqp.publish.*") with the noop,
+statsd and prometheus metrics drivers.
+
+Statsd driver sends UDP packets to the configured host and port (127.0.0.1:8125 by default),
+nothing needs to listen there.
+"""
+
+from __future__ import absolute_import
+
+import time
+import argparse
+
+from oslo_config import cfg
+
+from st2common import config
+from st2common.metrics import base as metrics
+from st2common.metrics.drivers.noop_driver import NoopDriver
+from st2common.metrics.drivers.statsd_driver import StatsdDriver
+from st2common.metrics.drivers.prometheus_driver import PrometheusDriver
+
+get_cpu_time = getattr(time, 'process_time', None) or time.clock
+
+
+def get_drivers():
+    return [
+        ('noop', NoopDriver()),
+        ('statsd', StatsdDriver()),
+        ('prometheus', PrometheusDriver(export_driver=None)),
+        ('prometheus (statsd export)', PrometheusDriver(export_driver=StatsdDriver()))
+    ]
+
+
+def benchmark_driver(driver, count, keys):
+    metrics.METRICS = driver
+
+    @metrics.CounterWithTimer(key='rule.processed')
+    def process_rule():
+        pass
+
+    def publish(index):
+        with metrics.Timer(key='amqp.publish.%s' % (index % keys)):
+            pass
+
+    start_time = get_cpu_time()
+    for index in range(0, count):
+        process_rule()
+        publish(index)
+    duration = get_cpu_time() - start_time
+
+    # Two instrumented calls per iteration
+    return (duration / (count * 2)) * 1000000
+
+
+def main(count, keys):
+    config.register_opts(ignore_errors=True)
+    cfg.CONF.set_override(name='flush_interval', override=1, group='metrics')
+
+    print('Measuring metrics overhead (%s instrumented calls per driver)' % (count * 2))
+
+    baseline = None
+    for name, driver in get_drivers():
+        overhead = benchmark_driver(driver=driver, count=count, keys=keys)
+
+        if baseline is None:
+            baseline = overhead
+
+        print(' - %s: %.2f us CPU per call (%.2f us more than noop)' %
+              (name, overhead, overhead - baseline))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Metrics overhead benchmark')
+    parser.add_argument('--count', type=int, default=50000,
+                        help='Number of iterations')
+    parser.add_argument('--keys', type=int, default=10,
+                        help='Number of distinct timer keys')
+    args = parser.parse_args()
+
+    main(count=args.count, keys=args.keys)
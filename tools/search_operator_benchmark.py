@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tool which measures how long it takes the rules engine to evaluate "search" operator criteria
+against a trigger payload with a large list (e.g. JIRA issue change log or a list of monitoring
+alerts).
+
+No database or message bus connection is needed.
+"""
+
+from __future__ import absolute_import
+
+import time
+import argparse
+
+from st2common.models.db.rule import RuleDB
+from st2common.models.db.rule import ActionExecutionSpecDB
+from st2common.models.db.trigger import TriggerInstanceDB
+from st2reactor.rules.filter import RuleFilter
+
+CRITERIA = {
+    'any': {
+        'condition': 'any',
+    },
+    'all': {
+        'condition': 'all',
+    },
+    'count_gte': {
+        'condition': 'count_gte',
+        'count': 10
+    }
+}
+
+
+def get_payload(count):
+    fields = []
+
+    for index in range(0, count):
+        fields.append({
+            'field_name': 'Status',
+            'to_value': 'Approved' if index == (count - 1) else 'Open',
+            'index': index
+        })
+
+    return {'fields': fields}
+
+
+def get_rule(condition):
+    criteria = {
+        'trigger.fields': {
+            'type': 'search',
+            'pattern': {
+                'item.field_name': {
+                    'type': 'equals',
+                    'pattern': 'Status'
+                },
+                'item.to_value': {
+                    'type': 'equals',
+                    'pattern': 'Approved'
+                }
+            }
+        }
+    }
+    criteria['trigger.fields'].update(CRITERIA[condition])
+
+    rule = RuleDB(pack='benchmark', name='search_%s' % (condition), criteria=criteria,
+                  trigger='benchmark.trigger', action=ActionExecutionSpecDB(ref='core.local'))
+    return rule
+
+
+def main(count, iterations):
+    trigger = {'name': 'trigger', 'pack': 'benchmark'}
+    trigger_instance = TriggerInstanceDB(trigger='benchmark.trigger', payload=get_payload(count))
+
+    print('Evaluating search criteria against a list with %s items (%s iterations)' %
+          (count, iterations))
+
+    for condition in sorted(CRITERIA.keys()):
+        rule = get_rule(condition=condition)
+        durations = []
+
+        for _ in range(0, iterations):
+            rule_filter = RuleFilter(trigger_instance=trigger_instance, trigger=trigger,
+                                     rule=rule)
+
+            start_time = time.time()
+            result = rule_filter.filter()
+            durations.append(time.time() - start_time)
+
+        print(' - condition=%s, matched=%s, min=%.4fs, avg=%.4fs, max=%.4fs' %
+              (condition, result, min(durations), sum(durations) / len(durations),
+               max(durations)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Search operator benchmark')
+    parser.add_argument('--count', type=int, default=10000,
+                        help='Number of items in the payload list')
+    parser.add_argument('--iterations', type=int, default=5,
+                        help='Number of times to evaluate each rule')
+    args = parser.parse_args()
+
+    main(count=args.count, iterations=args.iterations)
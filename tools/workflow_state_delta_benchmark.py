@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tool which compares the amount of data written to the database when persisting orquesta
+workflow state of a large with items task as a whole versus as a delta for each completed item.
+
+No database or message bus connection is needed.
+"""
+
+from __future__ import absolute_import
+
+import copy
+import json
+import time
+import argparse
+
+from st2common.util import deltas
+
+
+def get_state(count):
+    items = [{'status': 'running', 'result': None} for _ in range(0, count)]
+
+    return {
+        'contexts': [{'items': list(range(0, count))}],
+        'routes': [[]],
+        'sequence': [{'id': 'task1', 'route': 0, 'ctxs': {'in': [0]}, 'items': items,
+                      'status': 'running'}],
+        'staged': [{'id': 'task1', 'route': 0, 'ctxs': {'in': [0]}, 'ready': False}],
+        'status': 'running',
+        'tasks': {'task1__r0': 0}
+    }
+
+
+def main(count):
+    state = get_state(count)
+
+    full_bytes = 0
+    delta_bytes = 0
+    delta_duration = 0.0
+
+    for index in range(0, count):
+        new_state = copy.deepcopy(state)
+        new_state['sequence'][0]['items'][index] = {'status': 'succeeded', 'result': index}
+
+        full_bytes += len(json.dumps(new_state))
+
+        start_time = time.time()
+        set_fields, unset_fields = deltas.get_field_updates(state, new_state, 'state')
+        delta_duration += time.time() - start_time
+
+        delta_bytes += len(json.dumps(set_fields)) + len(json.dumps(unset_fields))
+        state = new_state
+
+    print('Persisting workflow state of a with items task with %s items' % (count))
+    print(' - full state: %.2f MB written' % (float(full_bytes) / (1024 * 1024)))
+    print(' - delta: %.2f MB written, %.4fs spent computing deltas' %
+          (float(delta_bytes) / (1024 * 1024), delta_duration))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Workflow state delta benchmark')
+    parser.add_argument('--count', type=int, default=5000,
+                        help='Number of items in the with items task')
+    args = parser.parse_args()
+
+    main(count=args.count)